@@ -78,6 +78,7 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'core.middleware.CurrentRequestMiddleware',
+    'core.middleware.CacheLocalMiddleware',
     'core.middleware.PermissionDeniedMiddleware',
     'employee.middleware.LoginRequiredMiddleware',
     'employee.middleware.ContratExpirationMiddleware',
@@ -260,8 +261,29 @@ else:
 # TTL par type de donnée (en secondes) — utilisé dans les vues
 CACHE_TTL_DASHBOARD = 300       # 5 min  — dashboards (données fraîches)
 CACHE_TTL_STATS = 3600          # 1 h    — statistiques annuelles
-CACHE_TTL_PLANNING = 300        # 5 min  — calendrier planning
 CACHE_TTL_DETAIL = 1800         # 30 min — pages de détail (matériel, employé)
+# Caches invalidés par tags de modèles (core.cache) : le TTL n'est qu'un
+# filet de sécurité pour les écritures faites sans signal
+CACHE_TTL_TAGUE = 21600         # 6 h
+# Cache mémoire par processus devant Redis pour les données de référence
+# (paramètres, entreprise, jours fériés, plafonds) : versions relues à
+# chaque requête, au plus tous les CACHE_LOCAL_DELAI s hors requête
+CACHE_LOCAL_ACTIF = True
+CACHE_LOCAL_DELAI = 5           # s
+
+
+# ============================================
+# TRAITEMENTS PLANIFIES
+# ============================================
+
+# Nombre de règles du scanner d'alertes exécutées en parallèle (audit.scanner)
+AUDIT_SCANNER_WORKERS = int(os.environ.get('AUDIT_SCANNER_WORKERS', '4'))
+
+# Tâches de fond (core.taches) : exécutées par `python manage.py executer_taches`
+# Sans worker (développement), TACHES_EXECUTION_IMMEDIATE=True les exécute dans la requête
+TACHES_EXECUTION_IMMEDIATE = os.environ.get('TACHES_EXECUTION_IMMEDIATE', 'False').lower() == 'true'
+TACHES_DELAI_BLOCAGE = 600      # s sans signe de vie avant remise en file d'une tâche EN_COURS
+TACHES_TENTATIVES_MAX = 3
 
 
 # ============================================
@@ -23,6 +23,10 @@ CACHES = {
     }
 }
 
+# Pas de cache mémoire par processus : les retours arrière des tests
+# n'émettent pas de signal d'invalidation
+CACHE_LOCAL_ACTIF = False
+
 # Accélérer les tests en utilisant MD5 pour les mots de passe
 PASSWORD_HASHERS = [
     'django.contrib.auth.hashers.MD5PasswordHasher',
@@ -38,3 +42,6 @@ LOGGING = {
 
 # Mode test
 DEBUG = False
+
+# Tâches de fond exécutées dans la requête (pas de worker pendant les tests)
+TACHES_EXECUTION_IMMEDIATE = True
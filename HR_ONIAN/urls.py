@@ -77,6 +77,8 @@ urlpatterns = [
     path('gac/', include('gestion_achats.urls', namespace='gestion_achats')),
     # Module Planning
     path('planning/', include('planning.urls', namespace='planning')),
+    # Suivi des tâches de fond
+    path('core/', include('core.urls', namespace='core')),
 
 ]
 if settings.DEBUG:
@@ -12,7 +12,8 @@ from .models import (
     AcquisitionConges,
     Absence,
     NotificationAbsence,
-    ValidationAbsence
+    ValidationAbsence,
+    MouvementConges
 )
 
 
@@ -615,4 +616,29 @@ class ValidationAbsenceAdmin(admin.ModelAdmin):
             obj.get_decision_display()
         )
 
-    decision_badge.short_description = 'Décision'
\ No newline at end of file
+    decision_badge.short_description = 'Décision'
+
+# ========================================
+# 9. MouvementConges
+# ========================================
+
+@admin.register(MouvementConges)
+class MouvementCongesAdmin(admin.ModelAdmin):
+    """Registre des soldes : consultation seule (les écarts se corrigent par un mouvement)"""
+    list_display = [
+        'employe', 'annee_reference', 'type_mouvement', 'jours',
+        'solde_apres', 'date_mouvement', 'absence', 'libelle'
+    ]
+    list_filter = ['type_mouvement', 'annee_reference']
+    search_fields = ['employe__nom', 'employe__prenoms', 'employe__matricule', 'libelle']
+    date_hierarchy = 'date_mouvement'
+    list_select_related = ['employe', 'absence']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -7,6 +7,28 @@ class AbsenceConfig(AppConfig):
     name = 'absence'
 
     def ready(self):
+        from django.db.models.signals import post_delete, post_save, pre_delete
+
+        from .services.approbation_service import ApprobationService
+        from .services.solde_service import SoldeService
+
+        # Validateur attendu des absences : recalculé quand la hiérarchie change
+        for modele in ('departement.ZYMA', 'departement.ZDPO', 'employee.ZYAF'):
+            post_save.connect(
+                ApprobationService.hierarchie_modifiee, sender=modele,
+                dispatch_uid=f'absence.validateur_attendu.post_save.{modele}'
+            )
+            post_delete.connect(
+                ApprobationService.hierarchie_modifiee, sender=modele,
+                dispatch_uid=f'absence.validateur_attendu.post_delete.{modele}'
+            )
+
+        # Registre des congés : la suppression d'une acquisition y est inscrite
+        pre_delete.connect(
+            SoldeService.acquisition_supprimee, sender='absence.AcquisitionConges',
+            dispatch_uid='absence.registre.pre_delete'
+        )
+
         # Créer les permissions par défaut
         from django.contrib.auth.models import Permission
         from django.contrib.contenttypes.models import ContentType
@@ -1,5 +1,6 @@
 # absence/context_processors.py
 from absence.models import NotificationAbsence
+from absence.services.approbation_service import ApprobationService
 
 
 def notifications_absences(request):
@@ -15,9 +16,12 @@ def notifications_absences(request):
             'notifications_absences': notifications_non_lues[:5],
             'notifications_absences_count': notifications_non_lues.count(),
             # ⚠️ Ces clés ne seront utilisées que si le context processor unifié n'est pas activé
+            # Boîtes de validation (en-tête), en cache par valideur
+            'compteurs_validation': ApprobationService.compteurs(request.user.employe),
         }
 
     return {
         'notifications_absences': [],
-        'notifications_absences_count': 0
+        'notifications_absences_count': 0,
+        'compteurs_validation': {'manager': 0, 'rh': 0},
     }
\ No newline at end of file
@@ -5,9 +5,9 @@ from decimal import Decimal
 
 from django import forms
 from django.core.exceptions import ValidationError
-from django.db import models
 from django.utils import timezone
 
+from core.chevauchement import filtrer_chevauchements
 from employee.models import ZY00
 from .models import (
     Absence, AcquisitionConges, ConfigurationConventionnelle,
@@ -698,13 +698,12 @@ class AbsenceForm(forms.ModelForm):
         ✅ VALIDATION RENFORCÉE
         """
         # Chercher les absences qui chevauchent
-        query = Absence.objects.filter(
-            employe=employe,
-            statut__in=['EN_ATTENTE_MANAGER', 'EN_ATTENTE_RH', 'VALIDE']
-        ).filter(
-            # ✅ Condition de chevauchement :
-            # (date_debut_nouvelle <= date_fin_existante) ET (date_fin_nouvelle >= date_debut_existante)
-            models.Q(date_debut__lte=date_fin) & models.Q(date_fin__gte=date_debut)
+        query = filtrer_chevauchements(
+            Absence.objects.filter(
+                employe=employe,
+                statut__in=['EN_ATTENTE_MANAGER', 'EN_ATTENTE_RH', 'VALIDE']
+            ),
+            date_debut, date_fin
         )
 
         # Exclure l'absence en cours de modification
@@ -733,19 +732,9 @@ class AbsenceForm(forms.ModelForm):
 
     def get_solde_disponible(self, employe, date_absence):
         """Calcule le solde disponible selon le système N+1"""
-        from .models import AcquisitionConges
-
-        annee_absence = date_absence.year
-        annee_acquisition = annee_absence - 1
+        from .services.solde_service import SoldeService
 
-        try:
-            acquisition = AcquisitionConges.objects.get(
-                employe=employe,
-                annee_reference=annee_acquisition
-            )
-            return acquisition.jours_restants
-        except AcquisitionConges.DoesNotExist:
-            return Decimal('0.00')
+        return SoldeService.solde(employe, date_absence.year - 1)
 
     def calculer_jours_ouvrables_avec_periode(self, date_debut, date_fin, periode):
         """Calcule le nombre de jours ouvrables avec la période"""
@@ -13,11 +13,11 @@ import logging
 from decimal import Decimal
 
 from django.core.management.base import BaseCommand
-from django.db import transaction
 from django.db.models import Q
 from django.utils import timezone
 
 from absence.models import AcquisitionConges
+from absence.services.solde_service import SoldeService
 from absence.utils import calculer_jours_acquis_au
 from employee.models import ZY00
 
@@ -206,9 +206,7 @@ class Command(BaseCommand):
 
         # --- Sauvegarde ---
         if not dry_run:
-            with transaction.atomic():
-                acquisition.jours_acquis = jours_acquis
-                acquisition.save()
+            SoldeService.fixer_acquis(acquisition, jours_acquis)
 
         status = "CREE" if created else "MAJ"
         resultats['succes'].append({
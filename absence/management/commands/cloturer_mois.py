@@ -0,0 +1,82 @@
+# absence/management/commands/cloturer_mois.py
+"""
+Commande Django de clôture mensuelle des acquisitions de congés.
+
+Usage:
+    python manage.py cloturer_mois --annee 2026 --mois 3
+    python manage.py cloturer_mois --annee 2026 --mois 3 --tranches 8
+    python manage.py cloturer_mois --annee 2026 --mois 3 --tranches 8 --tranche 5 --tranche 6
+    python manage.py cloturer_mois --annee 2026 --mois 3 --recalculer
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from absence.services.cloture_service import ClotureService
+
+
+class Command(BaseCommand):
+    help = 'Fige un mois d\'acquisition de congés pour tous les employés actifs'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--annee',
+            type=int,
+            default=None,
+            help="Année de référence (par défaut: année en cours)"
+        )
+        parser.add_argument(
+            '--mois',
+            type=int,
+            required=True,
+            help='Mois à figer (1-12)'
+        )
+        parser.add_argument(
+            '--tranches',
+            type=int,
+            default=1,
+            help='Nombre de tranches d\'employés (une transaction par tranche)'
+        )
+        parser.add_argument(
+            '--tranche',
+            type=int,
+            action='append',
+            help='Tranche à traiter (répétable ; par défaut: toutes)'
+        )
+        parser.add_argument(
+            '--recalculer',
+            action='store_true',
+            help='Refiger aussi les mois déjà figés'
+        )
+
+    def handle(self, *args, **options):
+        annee = options.get('annee') or timezone.now().year
+        mois = options['mois']
+        nb_tranches = options['tranches']
+
+        if nb_tranches < 1:
+            raise CommandError("--tranches doit être supérieur ou égal à 1")
+
+        self.stdout.write(f"\n🔒 Clôture du mois {mois:02d}/{annee} ({nb_tranches} tranche(s))\n")
+
+        try:
+            resultat = ClotureService.cloturer_mois(
+                annee, mois,
+                nb_tranches=nb_tranches,
+                tranches=options.get('tranche'),
+                recalculer=options['recalculer'],
+                avancer=lambda fait, total, message: self.stdout.write(f"  {message} ({fait}/{total})")
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write("=" * 70)
+        self.stdout.write(self.style.SUCCESS(f"  Mois figés : {resultat['figes']}"))
+        self.stdout.write(f"  Déjà figés : {resultat['deja_figes']}")
+        self.stdout.write(f"  Acquisitions créées : {resultat['crees']}")
+        if resultat['erreurs']:
+            self.stdout.write(self.style.ERROR(f"  Erreurs : {resultat['erreurs']}"))
+            for erreur in resultat['details_erreurs']:
+                self.stdout.write(f"    - {erreur['matricule']} {erreur['employe']}: {erreur['erreur']}")
+        self.stdout.write("  Durées : " + ", ".join(
+            f"{phase} {duree:.2f}s" for phase, duree in resultat['durees'].items()
+        ))
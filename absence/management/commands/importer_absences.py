@@ -0,0 +1,78 @@
+# absence/management/commands/importer_absences.py
+"""
+Commande Django d'import en masse d'absences (CSV ou Excel).
+
+Usage:
+    python manage.py importer_absences historique.xlsx --auteur MT000001
+    python manage.py importer_absences historique.csv --dry-run
+    python manage.py importer_absences historique.csv --sans-controle-solde --sans-notification
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from absence.services.import_absences_service import ImportAbsencesService
+from employee.models import ZY00
+
+
+class Command(BaseCommand):
+    help = 'Importe des absences depuis un fichier CSV ou Excel'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'fichier',
+            help='Fichier .csv ou .xlsx (Matricule, Type_CODE, Date_debut, Date_fin, Periode, Statut, Motif)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Contrôle le fichier sans rien écrire'
+        )
+        parser.add_argument(
+            '--auteur',
+            help='Matricule de l\'employé RH qui importe (validateur des absences validées)'
+        )
+        parser.add_argument(
+            '--sans-controle-solde',
+            action='store_true',
+            help='Ne rejette pas les lignes qui dépassent le solde'
+        )
+        parser.add_argument(
+            '--sans-notification',
+            action='store_true',
+            help='Ne notifie pas les managers des absences en attente'
+        )
+
+    def handle(self, *args, **options):
+        auteur = None
+        if options.get('auteur'):
+            auteur = ZY00.objects.filter(matricule=options['auteur']).first()
+            if auteur is None:
+                raise CommandError(f"Employé {options['auteur']} non trouvé")
+
+        self.stdout.write(f"\n📥 Import des absences : {options['fichier']}"
+                          f"{' (simulation)' if options['dry_run'] else ''}\n")
+
+        try:
+            resultat = ImportAbsencesService(
+                options['fichier'],
+                dry_run=options['dry_run'],
+                auteur=auteur,
+                controler_solde=not options['sans_controle_solde'],
+                notifier=not options['sans_notification'],
+                ecrire=self.stdout.write,
+            ).executer()
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        stats = resultat['stats']
+        self.stdout.write("=" * 70)
+        self.stdout.write(f"  Lignes : {stats['lignes']}")
+        self.stdout.write(self.style.SUCCESS(f"  Absences créées : {stats['creees']}"))
+        for statut, nombre in stats['par_statut'].items():
+            self.stdout.write(f"    - {statut} : {nombre}")
+        if stats['erreurs']:
+            self.stdout.write(self.style.ERROR(f"  Erreurs : {stats['erreurs']}"))
+            for erreur in resultat['erreurs']:
+                self.stdout.write(f"    - ligne {erreur['ligne']} {erreur['matricule']}: {erreur['erreur']}")
+        self.stdout.write("  Durées : " + ", ".join(
+            f"{phase} {duree:.2f}s" for phase, duree in resultat['durees'].items()
+        ))
@@ -0,0 +1,72 @@
+# absence/management/commands/valider_absences.py
+"""
+Commande Django de validation par lot des absences en attente.
+
+Usage:
+    python manage.py valider_absences --valideur MT000001 --ids 12 13 14
+    python manage.py valider_absences --valideur MT000001 --en-attente
+    python manage.py valider_absences --valideur MT000001 --ids 12 --rejeter --commentaire "Hors délai"
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from absence.services.approbation_service import ApprobationService
+from employee.models import ZY00
+
+
+class Command(BaseCommand):
+    help = 'Valide ou rejette un lot d\'absences en attente (étape manager ou RH)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--valideur',
+            required=True,
+            help='Matricule du manager ou du valideur RH'
+        )
+        parser.add_argument(
+            '--ids',
+            type=int,
+            nargs='+',
+            help='Identifiants des absences'
+        )
+        parser.add_argument(
+            '--en-attente',
+            action='store_true',
+            help='Toutes les absences en attente de ce valideur (boîte manager, file RH si autorisé)'
+        )
+        parser.add_argument(
+            '--rejeter',
+            action='store_true',
+            help='Rejette au lieu d\'approuver'
+        )
+        parser.add_argument(
+            '--commentaire',
+            default='',
+            help='Commentaire appliqué à tout le lot'
+        )
+
+    def handle(self, *args, **options):
+        valideur = ZY00.objects.filter(matricule=options['valideur']).first()
+        if valideur is None:
+            raise CommandError(f"Employé {options['valideur']} non trouvé")
+
+        ids = set(options.get('ids') or [])
+        if options['en_attente']:
+            ids.update(ApprobationService.a_valider_manager(valideur).values_list('pk', flat=True))
+            if valideur.peut_valider_absence_rh():
+                ids.update(ApprobationService.a_valider_rh().values_list('pk', flat=True))
+        if not ids:
+            raise CommandError("Aucune absence à traiter (--ids ou --en-attente)")
+
+        decision = 'REJETE' if options['rejeter'] else 'APPROUVE'
+        self.stdout.write(f"\n✅ Décision {decision} sur {len(ids)} absence(s) par {valideur}\n")
+
+        resultat = ApprobationService.valider_lot(ids, valideur, decision, options['commentaire'])
+
+        self.stdout.write("=" * 70)
+        self.stdout.write(self.style.SUCCESS(f"  Validées : {resultat['validees']}"))
+        self.stdout.write(f"  Transmises aux RH : {resultat['transmises_rh']}")
+        self.stdout.write(f"  Rejetées : {resultat['rejetees']}")
+        if resultat['refusees']:
+            self.stdout.write(self.style.WARNING(f"  Non traitées : {len(resultat['refusees'])}"))
+            for refus in resultat['refusees']:
+                self.stdout.write(f"    - absence {refus['id']}: {refus['erreur']}")
@@ -3,6 +3,7 @@
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 from absence.models import AcquisitionConges
+from absence.services.solde_service import SoldeService
 from absence.views import calculer_jours_acquis
 from decimal import Decimal
 
@@ -64,8 +65,7 @@ class Command(BaseCommand):
 
                     # Recalculer si demandé
                     if recalculer:
-                        acq.jours_acquis = jours_calcules
-                        acq.save()
+                        SoldeService.fixer_acquis(acq, jours_calcules)
                         status = "🔄"
 
                 self.stdout.write(
@@ -0,0 +1,44 @@
+# Generated by Django 5.0.6 on 2026-10-19 04:05
+
+from django.db import migrations
+
+# Période d'une absence, identique à core.chevauchement.periode_colonnes
+PERIODE = 'daterange(LEAST("date_debut", COALESCE("date_fin", "date_debut")), "date_fin", \'[]\')'
+
+SQL_INDEX = (
+    'CREATE INDEX CONCURRENTLY IF NOT EXISTS "absence_absence_periode_gist" ON "absence_absence" '
+    f'USING GIST ("employe_id", ({PERIODE}))'
+)
+
+SQL_SUPPRESSION = 'DROP INDEX CONCURRENTLY IF EXISTS "absence_absence_periode_gist"'
+
+
+def installer_index(apps, schema_editor):
+    """Index GiST (employé, période) des absences (PostgreSQL uniquement)."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        # btree_gist : égalité sur l'employé dans un index GiST
+        cursor.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+        cursor.execute(SQL_INDEX)
+
+
+def supprimer_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(SQL_SUPPRESSION)
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY ne peut pas s'exécuter dans une transaction
+    atomic = False
+
+    dependencies = [
+        ('absence', '0021_configurationconventionnelle_mode_validation'),
+    ]
+
+    operations = [
+        migrations.RunPython(installer_index, supprimer_index),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.0.6 on 2026-10-19 04:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def renseigner_validateurs(apps, schema_editor):
+    """Validateur attendu des absences en attente du manager (une requête UPDATE)."""
+    Absence = apps.get_model('absence', 'Absence')
+    ZYAF = apps.get_model('employee', 'ZYAF')
+    ZYMA = apps.get_model('departement', 'ZYMA')
+
+    departement = ZYAF.objects.filter(
+        employe=OuterRef(OuterRef('employe_id')), date_fin__isnull=True
+    ).order_by('-date_debut').values('poste__DEPARTEMENT')[:1]
+    manager = ZYMA.objects.filter(
+        departement=Subquery(departement), actif=True, date_fin__isnull=True
+    ).order_by('-date_debut').values('employe')[:1]
+
+    Absence.objects.filter(statut='EN_ATTENTE_MANAGER').update(validateur_attendu=Subquery(manager))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('absence', '0022_absence_periode_gist'),
+        ('departement', '0002_initial'),
+        ('employee', '0005_periodes_gist'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='absence',
+            name='validateur_attendu',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='absences_a_valider', to='employee.zy00', verbose_name='Validateur attendu'),
+        ),
+        migrations.AddIndex(
+            model_name='absence',
+            index=models.Index(fields=['validateur_attendu', 'statut'], name='absence_abs_validat_cc432f_idx'),
+        ),
+        migrations.RunPython(renseigner_validateurs, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.0.6 on 2026-10-19 04:06
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def reprendre_soldes(apps, schema_editor):
+    """Mouvements d'ouverture du registre : acquis, report et jours pris des acquisitions existantes."""
+    AcquisitionConges = apps.get_model('absence', 'AcquisitionConges')
+    MouvementConges = apps.get_model('absence', 'MouvementConges')
+
+    mouvements = []
+    for acquisition in AcquisitionConges.objects.all().iterator():
+        solde = 0
+        for type_mouvement, jours in (
+            ('ACQUISITION', acquisition.jours_acquis),
+            ('AJUSTEMENT', acquisition.jours_report_anterieur),
+            ('CONSOMMATION', -acquisition.jours_pris),
+        ):
+            if jours:
+                solde += jours
+                mouvements.append(MouvementConges(
+                    employe_id=acquisition.employe_id,
+                    annee_reference=acquisition.annee_reference,
+                    type_mouvement=type_mouvement,
+                    jours=jours,
+                    solde_apres=solde,
+                    date_mouvement=acquisition.date_calcul,
+                    libelle='Reprise du solde',
+                ))
+    MouvementConges.objects.bulk_create(mouvements, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('absence', '0023_absence_validateur_attendu'),
+        ('employee', '0005_periodes_gist'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MouvementConges',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('annee_reference', models.IntegerField(verbose_name='Année de référence')),
+                ('type_mouvement', models.CharField(choices=[('ACQUISITION', 'Acquisition'), ('CONSOMMATION', 'Consommation'), ('RESTITUTION', 'Restitution'), ('AJUSTEMENT', 'Ajustement')], max_length=20, verbose_name='Type de mouvement')),
+                ('jours', models.DecimalField(decimal_places=2, help_text='Variation du solde (négative pour une consommation)', max_digits=6, verbose_name='Jours')),
+                ('solde_apres', models.DecimalField(decimal_places=2, max_digits=6, verbose_name='Solde après mouvement')),
+                ('date_mouvement', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Date du mouvement')),
+                ('libelle', models.CharField(blank=True, max_length=200, verbose_name='Libellé')),
+                ('absence', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='mouvements_conges', to='absence.absence')),
+                ('auteur', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='mouvements_conges_saisis', to='employee.zy00')),
+                ('employe', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='mouvements_conges', to='employee.zy00')),
+            ],
+            options={
+                'verbose_name': 'Mouvement de congés',
+                'verbose_name_plural': 'Mouvements de congés',
+                'ordering': ['employe', 'annee_reference', 'date_mouvement', 'id'],
+                'indexes': [models.Index(fields=['employe', 'annee_reference', 'date_mouvement'], name='absence_mou_employe_062254_idx')],
+            },
+        ),
+        migrations.RunPython(reprendre_soldes, migrations.RunPython.noop),
+    ]
@@ -7,8 +7,15 @@ from django.db import models, transaction
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 
+from core.cache import FamilleCache
+
 from .utils import calculer_jours_acquis_au
 
+# Données de référence lues à chaque calcul de jours et filtre d'écran :
+# cache mémoire du processus devant Redis (core.cache)
+CACHE_TYPES_ABSENCE = FamilleCache('absence.types_actifs', tags=['absence.typeabsence'], locale=1)
+CACHE_JOURS_FERIES = FamilleCache('absence.jours_feries', tags=['absence.jourferie'], locale=1)
+
 
 # ========================================
 # FONCTION D'UPLOAD
@@ -393,6 +400,11 @@ class TypeAbsence(models.Model):
         self.full_clean()
         super().save(*args, **kwargs)
 
+    @classmethod
+    def actifs(cls):
+        """Types d'absence actifs (ordre d'affichage), en cache ; ne pas modifier les instances"""
+        return CACHE_TYPES_ABSENCE.obtenir(lambda: tuple(cls.objects.filter(actif=True)))
+
 
 # 3. JourFerie
 class JourFerie(models.Model):
@@ -507,6 +519,13 @@ class JourFerie(models.Model):
         self.full_clean()
         super().save(*args, **kwargs)
 
+    @classmethod
+    def get_dates_feriees(cls):
+        """frozenset des dates des jours fériés actifs (en cache)"""
+        return CACHE_JOURS_FERIES.obtenir(
+            lambda: frozenset(cls.objects.filter(actif=True).values_list('date', flat=True))
+        )
+
 
 # 4. ParametreCalculConges
 class ParametreCalculConges(models.Model):
@@ -676,7 +695,6 @@ class AcquisitionConges(models.Model):
             mois (int): Mois à figer (1-12)
             jours_acquis (Decimal): Si None, calcule automatiquement
         """
-        from django.utils import timezone
         import calendar
 
         if jours_acquis is None:
@@ -686,16 +704,14 @@ class AcquisitionConges(models.Model):
             resultat = self.calculer_acquis_au(date_fin_mois)
             jours_acquis = resultat['jours_acquis']
 
+        from .services.cloture_service import entree_mois
+
         mois_key = f"{mois:02d}"
 
         if mois_key not in self.detail_mensuel:
             self.detail_mensuel[mois_key] = {}
 
-        self.detail_mensuel[mois_key].update({
-            'jours_acquis': str(jours_acquis),
-            'date_figement': timezone.now().isoformat(),
-            'fige': True
-        })
+        self.detail_mensuel[mois_key].update(entree_mois(jours_acquis))
 
         self.save(update_fields=['detail_mensuel'])
 
@@ -802,6 +818,17 @@ class Absence(models.Model):
         verbose_name="Validateur RH"
     )
 
+    # Manager attendu à l'étape manager (ApprobationService) : fixé à
+    # l'entrée dans l'étape, recalculé quand la hiérarchie change
+    validateur_attendu = models.ForeignKey(
+        'employee.ZY00',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='absences_a_valider',
+        verbose_name="Validateur attendu"
+    )
+
     date_validation_manager = models.DateTimeField(
         null=True,
         blank=True,
@@ -862,6 +889,7 @@ class Absence(models.Model):
             models.Index(fields=['employe', 'statut']),
             models.Index(fields=['statut', 'date_debut']),
             models.Index(fields=['type_absence', 'date_debut']),
+            models.Index(fields=['validateur_attendu', 'statut']),
         ]
 
     def __str__(self):
@@ -882,6 +910,14 @@ class Absence(models.Model):
             if self.motif or self.justificatif:
                 self.statut = 'EN_ATTENTE_MANAGER'
 
+        # Validateur attendu : (re)calculé à chaque enregistrement du statut en attente du manager
+        update_fields = kwargs.get('update_fields')
+        if self.statut == 'EN_ATTENTE_MANAGER' and (update_fields is None or 'statut' in update_fields):
+            from .services.approbation_service import ApprobationService
+            self.validateur_attendu_id = ApprobationService.manager_attendu(self.employe_id)
+            if update_fields is not None:
+                kwargs['update_fields'] = [*update_fields, 'validateur_attendu']
+
         super().save(*args, **kwargs)
 
         # ✅ NOTIFICATION : Nouvelle demande créée
@@ -967,7 +1003,7 @@ class Absence(models.Model):
 
     def _notifier_nouvelle_demande(self):
         """Notifier le manager d'une nouvelle demande"""
-        manager = self.employe.get_manager_departement()
+        manager = self.validateur_attendu
 
         if manager:
             NotificationAbsence.creer_notification(
@@ -1071,71 +1107,21 @@ class Absence(models.Model):
 
     def get_solde_disponible(self):
         """Retourne le solde de congés disponible selon le système N+1"""
-        from .models import AcquisitionConges
+        from .services.solde_service import SoldeService
 
-        annee_absence = self.date_debut.year
-        annee_acquisition = annee_absence - 1
+        return SoldeService.solde(self.employe, self.date_debut.year - 1)
 
-        try:
-            acquisition = AcquisitionConges.objects.get(
-                employe=self.employe,
-                annee_reference=annee_acquisition
-            )
-            return acquisition.jours_restants
-        except AcquisitionConges.DoesNotExist:
-            return Decimal('0.00')
-
-    def decompter_solde(self):
-        """Déduit les jours du solde selon le système N+1"""
-        from .models import AcquisitionConges
+    def decompter_solde(self, auteur=None):
+        """Déduit les jours du solde selon le système N+1 (registre des congés)"""
+        from .services.solde_service import SoldeService
 
-        if not self.type_absence.decompte_solde:
-            return
+        SoldeService.consommer(self, auteur=auteur)
 
-        annee_absence = self.date_debut.year
-        annee_acquisition = annee_absence - 1
-
-        try:
-            with transaction.atomic():
-                acquisition = AcquisitionConges.objects.select_for_update().get(
-                    employe=self.employe,
-                    annee_reference=annee_acquisition
-                )
-                acquisition.jours_pris += self.jours_ouvrables
-                acquisition.save()
-
-        except AcquisitionConges.DoesNotExist:
-            AcquisitionConges.objects.create(
-                employe=self.employe,
-                annee_reference=annee_acquisition,
-                jours_acquis=Decimal('0.00'),
-                jours_pris=self.jours_ouvrables,
-                jours_restants=-self.jours_ouvrables,
-                jours_report_anterieur=Decimal('0.00'),
-                jours_report_nouveau=Decimal('0.00'),
-            )
-
-    def restituer_solde(self):
+    def restituer_solde(self, auteur=None):
         """Restitue les jours au solde (en cas d'annulation)"""
-        from .models import AcquisitionConges
-
-        if not self.type_absence.decompte_solde:
-            return
-
-        annee_absence = self.date_debut.year
-        annee_acquisition = annee_absence - 1
+        from .services.solde_service import SoldeService
 
-        try:
-            with transaction.atomic():
-                acquisition = AcquisitionConges.objects.select_for_update().get(
-                    employe=self.employe,
-                    annee_reference=annee_acquisition
-                )
-                acquisition.jours_pris -= self.jours_ouvrables
-                acquisition.save()
-
-        except AcquisitionConges.DoesNotExist:
-            pass
+        SoldeService.restituer(self, auteur=auteur)
 
     # ========================================
     # TRAÇABILITÉ DES VALIDATIONS
@@ -1177,44 +1163,15 @@ class Absence(models.Model):
         if not manager.peut_valider_absence_manager():
             raise ValidationError("Vous n'avez pas la permission de valider les absences")
 
-        # 2. VÉRIFICATION CRITIQUE : L'employé est-il dans le département du manager ?
-        if not self.employe.est_dans_departement_manager(manager):
+        # 2. VÉRIFICATION CRITIQUE : seul le validateur attendu (manager actif
+        #    du département de l'employé, tenu à jour par ApprobationService) valide
+        if self.validateur_attendu_id != manager.pk:
             raise ValidationError(
                 f"Vous n'êtes pas le manager du département de {self.employe.nom}. "
                 f"Seul le manager de son département peut valider cette absence."
             )
 
-        # 3. Vérifier que le manager est bien le manager actif du département
-        try:
-            from django.apps import apps
-            ZYMA = apps.get_model('departement', 'ZYMA')
-            ZYAF = apps.get_model('employee', 'ZYAF')
-
-            affectation = ZYAF.objects.filter(
-                employe=self.employe,
-                date_fin__isnull=True
-            ).select_related('poste__DEPARTEMENT').first()
-
-            if not affectation:
-                raise ValidationError("L'employé n'a pas d'affectation active")
-
-            is_manager_of_dept = ZYMA.objects.filter(
-                employe=manager,
-                departement=affectation.poste.DEPARTEMENT,
-                actif=True,
-                date_fin__isnull=True
-            ).exists()
-
-            if not is_manager_of_dept:
-                raise ValidationError(
-                    f"Vous n'êtes pas le manager actif du département "
-                    f"{affectation.poste.DEPARTEMENT.LIBELLE}"
-                )
-
-        except Exception as e:
-            raise ValidationError(f"Erreur de vérification manager: {str(e)}")
-
-        # 4. Appliquer la décision
+        # 3. Appliquer la décision
         with transaction.atomic():
             if decision == 'APPROUVE':
                 mode = self._get_mode_validation()
@@ -1239,7 +1196,7 @@ class Absence(models.Model):
 
                 if mode == 'MANAGER_SEUL':
                     # Décompter le solde (normalement fait par RH)
-                    self.decompter_solde()
+                    self.decompter_solde(auteur=manager)
                     # Notification finale à l'employé
                     self._notifier_validation_finale_manager()
                 else:
@@ -1292,7 +1249,7 @@ class Absence(models.Model):
                 ])
 
                 # ✅ Décompter les jours du solde (système N+1)
-                self.decompter_solde()
+                self.decompter_solde(auteur=rh)
 
                 # ✅ NOTIFICATION
                 self._notifier_validation_rh()
@@ -1344,7 +1301,7 @@ class Absence(models.Model):
         with transaction.atomic():
             # Si l'absence était validée ET qu'elle décompte le solde, restituer les jours
             if self.statut == 'VALIDE' and self.type_absence.decompte_solde:
-                self.restituer_solde()
+                self.restituer_solde(auteur=utilisateur)
 
             # Changer le statut
             self.statut = 'ANNULE'
@@ -1375,7 +1332,7 @@ class Absence(models.Model):
     def prochain_validateur(self):
         """Retourne le prochain validateur attendu"""
         if self.statut == 'EN_ATTENTE_MANAGER':
-            return self.employe.get_manager_departement()
+            return self.validateur_attendu
         elif self.statut == 'EN_ATTENTE_RH':
             from employee.models import ZY00
             return ZY00.objects.filter(
@@ -1429,31 +1386,11 @@ class Absence(models.Model):
     def get_absences_a_valider_par_manager(cls, manager):
         """
         Retourne les absences que ce manager peut valider
-        (uniquement les employés de ses départements)
+        (celles dont il est le validateur attendu)
         """
-        from django.apps import apps
-        ZYMA = apps.get_model('departement', 'ZYMA')
-        ZYAF = apps.get_model('employee', 'ZYAF')
+        from .services.approbation_service import ApprobationService
 
-        departements_geres = ZYMA.objects.filter(
-            employe=manager,
-            actif=True,
-            date_fin__isnull=True
-        ).values_list('departement', flat=True)
-
-        if not departements_geres:
-            return cls.objects.none()
-
-        employes_departements = ZYAF.objects.filter(
-            poste__DEPARTEMENT__in=departements_geres,
-            date_fin__isnull=True,
-            employe__etat='actif'
-        ).values_list('employe', flat=True).distinct()
-
-        return cls.objects.filter(
-            employe__in=employes_departements,
-            statut='EN_ATTENTE_MANAGER'
-        ).select_related('employe', 'type_absence')
+        return ApprobationService.a_valider_manager(manager).select_related('employe', 'type_absence')
 
     @classmethod
     def get_absences_a_valider_par_rh(cls, rh):
@@ -1846,3 +1783,85 @@ class ValidationAbsence(models.Model):
     def __str__(self):
         return f"Validation {self.etape} - {self.absence}"
 
+
+
+# ========================================
+# 8. MouvementConges (registre des soldes)
+# ========================================
+class MouvementConges(models.Model):
+    """
+    Registre des mouvements de solde de congés (ajout seul).
+
+    Chaque mouvement fait varier une composante de l'AcquisitionConges de
+    l'année par une mise à jour atomique (F()) : jours acquis (ACQUISITION),
+    report antérieur (AJUSTEMENT) ou jours pris (CONSOMMATION,
+    RESTITUTION). `solde_apres` fige le solde courant après le mouvement :
+    le solde à une date donnée est lu sur l'index
+    (employe, annee_reference, date_mouvement). Voir SoldeService.
+    """
+
+    TYPE_CHOICES = [
+        ('ACQUISITION', 'Acquisition'),
+        ('CONSOMMATION', 'Consommation'),
+        ('RESTITUTION', 'Restitution'),
+        ('AJUSTEMENT', 'Ajustement'),
+    ]
+
+    employe = models.ForeignKey(
+        'employee.ZY00',
+        on_delete=models.CASCADE,
+        related_name='mouvements_conges'
+    )
+    annee_reference = models.IntegerField(verbose_name="Année de référence")
+    type_mouvement = models.CharField(
+        max_length=20,
+        choices=TYPE_CHOICES,
+        verbose_name="Type de mouvement"
+    )
+    jours = models.DecimalField(
+        max_digits=6,
+        decimal_places=2,
+        verbose_name="Jours",
+        help_text="Variation du solde (négative pour une consommation)"
+    )
+    solde_apres = models.DecimalField(
+        max_digits=6,
+        decimal_places=2,
+        verbose_name="Solde après mouvement"
+    )
+    date_mouvement = models.DateTimeField(
+        default=timezone.now,
+        verbose_name="Date du mouvement"
+    )
+    absence = models.ForeignKey(
+        Absence,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='mouvements_conges'
+    )
+    libelle = models.CharField(max_length=200, blank=True, verbose_name="Libellé")
+    auteur = models.ForeignKey(
+        'employee.ZY00',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='mouvements_conges_saisis'
+    )
+
+    class Meta:
+        ordering = ['employe', 'annee_reference', 'date_mouvement', 'id']
+        indexes = [
+            models.Index(fields=['employe', 'annee_reference', 'date_mouvement']),
+        ]
+        verbose_name = "Mouvement de congés"
+        verbose_name_plural = "Mouvements de congés"
+
+    def __str__(self):
+        return f"{self.employe} - {self.annee_reference} - {self.get_type_mouvement_display()} {self.jours}"
+
+    def save(self, *args, **kwargs):
+        """Le registre n'est pas modifiable : un écart se corrige par un nouveau mouvement"""
+        if not self._state.adding:
+            raise ValidationError("Un mouvement de congés ne peut pas être modifié")
+        super().save(*args, **kwargs)
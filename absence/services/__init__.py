@@ -6,12 +6,20 @@ Contient la logique métier extraite des modèles et vues.
 
 from .acquisition_service import AcquisitionService
 from .absence_service import AbsenceService
+from .approbation_service import ApprobationService
+from .cloture_service import ClotureService
+from .import_absences_service import ImportAbsencesService
 from .notification_service import NotificationService
+from .solde_service import SoldeService
 from .validation_service import ValidationService
 
 __all__ = [
     'AcquisitionService',
     'AbsenceService',
+    'ApprobationService',
+    'ClotureService',
+    'ImportAbsencesService',
     'NotificationService',
+    'SoldeService',
     'ValidationService',
 ]
@@ -43,18 +43,12 @@ class AbsenceService:
 
         jours = Decimal('0.00')
         current = date_debut
+        jours_feries = JourFerie.get_dates_feriees()
 
         while current <= date_fin:
-            # Ignorer les weekends
-            if current.weekday() < 5:  # Lundi=0 à Vendredi=4
-                # Vérifier si c'est un jour férié
-                est_ferie = JourFerie.objects.filter(
-                    date=current,
-                    actif=True
-                ).exists()
-
-                if not est_ferie:
-                    jours += Decimal('1.00')
+            # Ignorer les weekends et les jours fériés
+            if current.weekday() < 5 and current not in jours_feries:  # Lundi=0 à Vendredi=4
+                jours += Decimal('1.00')
 
             current += timedelta(days=1)
 
@@ -74,7 +68,7 @@ class AbsenceService:
         Returns:
             dict: Résultat de la vérification
         """
-        from absence.models import AcquisitionConges
+        from absence.services.solde_service import SoldeService
 
         if annee is None:
             annee = timezone.now().year - 1  # Année N-1
@@ -87,27 +81,14 @@ class AbsenceService:
                 'message': 'Ce type d\'absence ne décompte pas le solde'
             }
 
-        try:
-            acquisition = AcquisitionConges.objects.get(
-                employe=employe,
-                annee_reference=annee
-            )
-            solde = acquisition.jours_solde
+        solde = SoldeService.solde(employe, annee)
 
-            return {
-                'suffisant': solde >= nombre_jours,
-                'solde_disponible': str(solde),
-                'jours_demandes': str(nombre_jours),
-                'message': 'Solde suffisant' if solde >= nombre_jours else 'Solde insuffisant'
-            }
-
-        except AcquisitionConges.DoesNotExist:
-            return {
-                'suffisant': False,
-                'solde_disponible': '0.00',
-                'jours_demandes': str(nombre_jours),
-                'message': 'Aucune acquisition trouvée pour cette année'
-            }
+        return {
+            'suffisant': solde >= nombre_jours,
+            'solde_disponible': str(solde),
+            'jours_demandes': str(nombre_jours),
+            'message': 'Solde suffisant' if solde >= nombre_jours else 'Solde insuffisant'
+        }
 
     @staticmethod
     def soumettre_absence(absence, user):
@@ -245,8 +226,9 @@ class AbsenceService:
         Returns:
             dict: Résultat de la validation
         """
-        from absence.models import ValidationAbsence, AcquisitionConges
+        from absence.models import ValidationAbsence
         from absence.services.notification_service import NotificationService
+        from absence.services.solde_service import SoldeService
 
         if absence.statut != AbsenceService.EN_ATTENTE_RH:
             return {
@@ -270,22 +252,8 @@ class AbsenceService:
                 commentaire=commentaire
             )
 
-            # Décompter du solde si nécessaire
-            if absence.type_absence.decompte_solde:
-                annee_acquisition = absence.date_debut.year - 1
-                try:
-                    acquisition = AcquisitionConges.objects.get(
-                        employe=absence.employe,
-                        annee_reference=annee_acquisition
-                    )
-                    acquisition.jours_pris += absence.nombre_jours
-                    acquisition.jours_solde = acquisition.jours_acquis - acquisition.jours_pris
-                    acquisition.save()
-                except AcquisitionConges.DoesNotExist:
-                    logger.warning(
-                        "Acquisition non trouvée pour %s année %s",
-                        absence.employe, annee_acquisition
-                    )
+            # Décompter du solde si nécessaire (registre des congés)
+            SoldeService.consommer(absence)
 
             NotificationService.notifier_validation_rh(absence, 'VALIDE')
 
@@ -351,7 +319,8 @@ class AbsenceService:
         Returns:
             dict: Résultat de l'annulation
         """
-        from absence.models import ValidationAbsence, AcquisitionConges
+        from absence.models import ValidationAbsence
+        from absence.services.solde_service import SoldeService
 
         statuts_annulables = [
             AbsenceService.BROUILLON,
@@ -370,18 +339,8 @@ class AbsenceService:
             ancien_statut = absence.statut
 
             # Si était validée, restituer le solde
-            if ancien_statut == AbsenceService.VALIDE and absence.type_absence.decompte_solde:
-                annee_acquisition = absence.date_debut.year - 1
-                try:
-                    acquisition = AcquisitionConges.objects.get(
-                        employe=absence.employe,
-                        annee_reference=annee_acquisition
-                    )
-                    acquisition.jours_pris -= absence.nombre_jours
-                    acquisition.jours_solde = acquisition.jours_acquis - acquisition.jours_pris
-                    acquisition.save()
-                except AcquisitionConges.DoesNotExist:
-                    pass
+            if ancien_statut == AbsenceService.VALIDE:
+                SoldeService.restituer(absence)
 
             absence.statut = AbsenceService.ANNULE
             absence.save()
@@ -436,21 +395,9 @@ class AbsenceService:
         Returns:
             QuerySet: Absences en attente de validation
         """
-        from absence.models import Absence
-        from departement.models import ZYMA
-
-        # Récupérer les départements gérés
-        departements_geres = ZYMA.objects.filter(
-            employe=manager,
-            actif=True,
-            date_fin__isnull=True
-        ).values_list('departement_id', flat=True)
+        from absence.services.approbation_service import ApprobationService
 
-        return Absence.objects.filter(
-            statut=AbsenceService.EN_ATTENTE_MANAGER,
-            employe__affectations__poste__DEPARTEMENT_id__in=departements_geres,
-            employe__affectations__date_fin__isnull=True
-        ).distinct().order_by('date_debut')
+        return ApprobationService.a_valider_manager(manager).order_by('date_debut')
 
     @staticmethod
     def get_absences_a_valider_rh():
@@ -460,8 +407,6 @@ class AbsenceService:
         Returns:
             QuerySet: Absences en attente de validation RH
         """
-        from absence.models import Absence
+        from absence.services.approbation_service import ApprobationService
 
-        return Absence.objects.filter(
-            statut=AbsenceService.EN_ATTENTE_RH
-        ).order_by('date_debut')
+        return ApprobationService.a_valider_rh().order_by('date_debut')
@@ -29,8 +29,6 @@ class AcquisitionService:
         Returns:
             dict: Résultat du calcul avec détails
         """
-        from absence.models import ParametreCalculConges
-
         logger.info("Calcul acquisition pour %s - Année %s - Date %s",
                     employe, annee_reference, date_reference)
 
@@ -39,17 +37,68 @@ class AcquisitionService:
         if not convention:
             raise ValueError(f"Aucune convention applicable pour {employe}")
 
-        # 2. Récupérer les paramètres
+        # 2. Récupérer les paramètres et le début du contrat actif
+        parametres = AcquisitionService.parametres_convention(convention)
+        date_debut_contrat = AcquisitionService.contrats_au(date_reference).filter(
+            employe=employe
+        ).values_list('date_debut', flat=True).first()
+
+        return AcquisitionService.calculer_acquis(
+            employe, convention, parametres, annee_reference, date_reference, date_debut_contrat
+        )
+
+    @staticmethod
+    def parametres_convention(convention):
+        """Paramètres de calcul d'une convention (créés s'ils n'existent pas)."""
+        from absence.models import ParametreCalculConges
+
         try:
-            parametres = convention.parametres_calcul
+            return convention.parametres_calcul
         except Exception:
-            parametres = ParametreCalculConges.objects.create(
+            # La convention peut venir du cache (copie antérieure à la création)
+            return ParametreCalculConges.objects.get_or_create(
                 configuration=convention
-            )
+            )[0]
+
+    @staticmethod
+    def contrats_au(date_limite):
+        """
+        Contrats actifs à une date (sans date de fin ou se terminant après),
+        par employé, le plus récent d'abord.
+
+        Returns:
+            QuerySet[ZYCO]
+        """
+        from django.db.models import Q
+        from employee.models import ZYCO
+
+        return ZYCO.objects.filter(
+            actif=True
+        ).filter(
+            Q(date_fin__isnull=True) | Q(date_fin__gte=date_limite)
+        ).order_by('employe', '-date_debut')
+
+    @staticmethod
+    def calculer_acquis(employe, convention, parametres, annee_reference, date_reference, date_debut_contrat):
+        """
+        Calcule les jours acquis à partir de données déjà chargées, sans
+        requête : utilisé pour un employé (calculer_jours_acquis_au) et
+        pour toute une population (clôture mensuelle).
+
+        Args:
+            employe: Instance de l'employé (temps partiel, ancienneté)
+            convention: Convention applicable
+            parametres: Paramètres de calcul de la convention
+            annee_reference: Année de référence
+            date_reference: Date jusqu'à laquelle calculer
+            date_debut_contrat: Début du contrat actif (None si aucun)
 
+        Returns:
+            dict: Résultat du calcul avec détails
+        """
         # 3. Calculer les mois travaillés et jours restants
-        mois_travailles, jours_restants = AcquisitionService.calculer_mois_travailles_jusquau(
-            employe, annee_reference, date_reference
+        mois_travailles, jours_restants = AcquisitionService.mois_travailles(
+            date_debut_contrat, convention, annee_reference, date_reference
         )
 
         # 4. Vérifier le minimum requis
@@ -123,24 +172,34 @@ class AcquisitionService:
         Returns:
             tuple: (mois_complets: Decimal, jours_restants: int)
         """
-        from django.db.models import Q
-
         # Récupérer la date de début du contrat actif (ZYCO)
-        contrat_actif = employe.contrats.filter(
-            actif=True
-        ).filter(
-            Q(date_fin__isnull=True) | Q(date_fin__gte=date_limite)
-        ).order_by('-date_debut').first()
+        date_debut_contrat = AcquisitionService.contrats_au(date_limite).filter(
+            employe=employe
+        ).values_list('date_debut', flat=True).first()
 
-        if not contrat_actif:
+        if not date_debut_contrat:
             return Decimal('0'), 0
 
-        date_debut_contrat = contrat_actif.date_debut
-
         convention = employe.convention_applicable
         if not convention:
             return Decimal('0'), 0
 
+        return AcquisitionService.mois_travailles(
+            date_debut_contrat, convention, annee_reference, date_limite
+        )
+
+    @staticmethod
+    def mois_travailles(date_debut_contrat, convention, annee_reference, date_limite):
+        """
+        Mois complets et jours restants travaillés sur la période
+        d'acquisition, depuis le début du contrat (sans requête).
+
+        Returns:
+            tuple: (mois_complets: Decimal, jours_restants: int)
+        """
+        if not date_debut_contrat:
+            return Decimal('0'), 0
+
         debut_annee, fin_annee = convention.get_periode_acquisition(annee_reference)
 
         if date_limite < debut_annee:
@@ -206,6 +265,7 @@ class AcquisitionService:
         """
         from employee.models import ZY00
         from absence.models import AcquisitionConges
+        from absence.services.solde_service import SoldeService
 
         if employes is None:
             employes = ZY00.objects.filter(statut='ACTIF')
@@ -221,12 +281,7 @@ class AcquisitionService:
                 with transaction.atomic():
                     acquisition, created = AcquisitionConges.objects.get_or_create(
                         employe=employe,
-                        annee_reference=annee,
-                        defaults={
-                            'jours_acquis': Decimal('0.00'),
-                            'jours_pris': Decimal('0.00'),
-                            'jours_solde': Decimal('0.00'),
-                        }
+                        annee_reference=annee
                     )
 
                     # Recalculer
@@ -236,9 +291,8 @@ class AcquisitionService:
                         timezone.now().date()
                     )
 
-                    acquisition.jours_acquis = resultat['jours_acquis']
-                    acquisition.jours_solde = acquisition.jours_acquis - acquisition.jours_pris
-                    acquisition.save()
+                    # Écart enregistré au registre des congés
+                    SoldeService.fixer_acquis(acquisition, resultat['jours_acquis'])
 
                     resultats['succes'].append({
                         'employe': str(employe),
@@ -266,20 +320,19 @@ class AcquisitionService:
         Returns:
             dict: Résultat du recalcul
         """
+        from absence.services.solde_service import SoldeService
+
         resultat = AcquisitionService.calculer_jours_acquis_au(
             acquisition.employe,
             acquisition.annee_reference,
             timezone.now().date()
         )
 
-        with transaction.atomic():
-            acquisition.jours_acquis = resultat['jours_acquis']
-            acquisition.jours_solde = acquisition.jours_acquis - acquisition.jours_pris
-            acquisition.save()
+        SoldeService.fixer_acquis(acquisition, resultat['jours_acquis'])
 
         return {
             'jours_acquis': str(acquisition.jours_acquis),
             'jours_pris': str(acquisition.jours_pris),
-            'jours_solde': str(acquisition.jours_solde),
+            'jours_solde': str(acquisition.jours_restants),
             'detail': resultat['detail']
         }
@@ -0,0 +1,348 @@
+# absence/services/approbation_service.py
+"""
+Service du validateur attendu des absences.
+
+Le manager qui doit valider une demande (manager actif du département de
+l'affectation active de l'employé) est enregistré sur l'absence
+(`Absence.validateur_attendu`) à son entrée dans l'étape manager, puis
+recalculé en une requête UPDATE quand la hiérarchie change (ZYMA, ZYAF,
+ZDPO). Les boîtes de validation deviennent une requête indexée sur
+(validateur_attendu, statut) ; l'étape RH reste une file commune à tous
+les valideurs RH (statut EN_ATTENTE_RH).
+
+`valider_lot` applique une décision à un lot d'absences en une passe
+(lecture verrouillée, bulk_update, traces et mouvements de solde groupés,
+notifications envoyées en un lot après validation de la transaction).
+"""
+import logging
+
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from core.cache import FamilleCache, invalider_apres_commit
+
+logger = logging.getLogger(__name__)
+
+# Compteurs des boîtes de validation, par valideur (en-tête, tableaux de bord)
+CACHE_A_VALIDER = FamilleCache('absence.a_valider', tags=['absence.absence', 'employee.zy00'])
+
+# Champs écrits par une décision (manager ou RH)
+CHAMPS_DECISION = (
+    'statut', 'manager_validateur', 'date_validation_manager', 'commentaire_manager',
+    'rh_validateur', 'date_validation_rh', 'commentaire_rh', 'updated_at',
+)
+
+
+class ApprobationService:
+    """Service pour le validateur attendu et les boîtes de validation des absences."""
+
+    @staticmethod
+    def requete_manager(employe):
+        """
+        Managers actifs du département de l'affectation active d'un employé,
+        le plus récent d'abord.
+
+        Args:
+            employe: Instance, matricule ou OuterRef vers le matricule (la
+                référence est reportée d'un niveau : elle vise la requête
+                qui englobe le Subquery)
+
+        Returns:
+            QuerySet[ZYMA]
+        """
+        from departement.models import ZYMA
+        from employee.models import ZYAF
+
+        if isinstance(employe, OuterRef):
+            employe = OuterRef(employe)
+
+        departement = ZYAF.objects.filter(
+            employe=employe,
+            date_fin__isnull=True
+        ).order_by('-date_debut').values('poste__DEPARTEMENT')[:1]
+
+        return ZYMA.objects.filter(
+            departement=Subquery(departement),
+            actif=True,
+            date_fin__isnull=True
+        ).order_by('-date_debut')
+
+    @staticmethod
+    def manager_attendu(employe):
+        """
+        Matricule du manager attendu (une requête).
+
+        Returns:
+            str ou None: None si l'employé n'a pas d'affectation active ou si
+            son département n'a pas de manager actif
+        """
+        return ApprobationService.requete_manager(employe).values_list('employe', flat=True).first()
+
+    @staticmethod
+    def reaffecter(employes=None):
+        """
+        Recalcule le validateur attendu des absences en attente du manager
+        (une requête UPDATE avec sous-requête corrélée).
+
+        Args:
+            employes: matricules concernés (None : toutes les absences en attente)
+
+        Returns:
+            int: nombre d'absences recalculées
+        """
+        from absence.models import Absence
+
+        absences = Absence.objects.filter(statut='EN_ATTENTE_MANAGER')
+        if employes is not None:
+            absences = absences.filter(employe_id__in=employes)
+
+        nombre = absences.update(
+            validateur_attendu=Subquery(
+                ApprobationService.requete_manager(OuterRef('employe_id')).values('employe')[:1]
+            )
+        )
+        if nombre:
+            # update() n'émet pas de signal : invalider les caches des absences
+            invalider_apres_commit(Absence, 'absence')
+            logger.info("Validateur attendu recalculé pour %s absence(s)", nombre)
+        return nombre
+
+    @staticmethod
+    def hierarchie_modifiee(sender, instance, **kwargs):
+        """
+        Récepteur post_save/post_delete de ZYMA, ZYAF et ZDPO (connecté dans
+        AbsenceConfig.ready) : recalcul après validation de la transaction.
+        """
+        from employee.models import ZYAF
+
+        employes = [instance.employe_id] if sender is ZYAF else None
+        transaction.on_commit(lambda: ApprobationService.reaffecter(employes))
+
+    @staticmethod
+    def a_valider_manager(manager):
+        """
+        Absences en attente de validation par ce manager.
+
+        Args:
+            manager: Instance du manager (ZY00)
+
+        Returns:
+            QuerySet: une requête sur l'index (validateur_attendu, statut)
+        """
+        from absence.models import Absence
+
+        return Absence.objects.filter(
+            validateur_attendu=manager,
+            statut='EN_ATTENTE_MANAGER',
+            employe__etat='actif'
+        )
+
+    @staticmethod
+    def a_valider_rh():
+        """Absences en attente de validation RH (file commune)."""
+        from absence.models import Absence
+
+        return Absence.objects.filter(statut='EN_ATTENTE_RH')
+
+    @staticmethod
+    def compteurs(employe):
+        """
+        Nombre d'absences à valider, en cache par valideur.
+
+        Returns:
+            dict: {'manager': n, 'rh': n}
+        """
+        return CACHE_A_VALIDER.obtenir(lambda: {
+            'manager': ApprobationService.a_valider_manager(employe).count(),
+            'rh': ApprobationService.a_valider_rh().count(),
+        }, employe.pk)
+
+    @staticmethod
+    def valider_lot(absence_ids, valideur, decision='APPROUVE', commentaire=''):
+        """
+        Approuve ou rejette un lot d'absences, chacune à son étape, avec les
+        règles de Absence.valider_par_manager / valider_par_rh : l'étape
+        manager est réservée au validateur attendu, l'étape RH aux valideurs
+        RH ; le mode MANAGER_SEUL de la convention valide dès l'étape manager.
+
+        Une requête verrouille les absences, un bulk_update enregistre les
+        décisions, un bulk_create les traces ; les soldes sont décomptés par
+        SoldeService.consommer_lot et les notifications envoyées en un lot.
+
+        Args:
+            absence_ids: Identifiants des absences
+            valideur: Employé qui décide (ZY00)
+            decision: 'APPROUVE' ou 'REJETE'
+            commentaire: Commentaire appliqué à tout le lot
+
+        Returns:
+            dict: {'validees', 'transmises_rh', 'rejetees',
+                   'refusees': [{'id', 'erreur'}]}
+        """
+        from absence.models import Absence, ValidationAbsence
+        from absence.services.solde_service import SoldeService
+        from absence.services.notification_service import NotificationService
+        from employee.models import ZY00
+
+        if decision not in ('APPROUVE', 'REJETE'):
+            raise ValueError(f"Décision invalide : {decision}")
+
+        ids = {int(absence_id) for absence_id in absence_ids}
+        resultat = {'validees': 0, 'transmises_rh': 0, 'rejetees': 0, 'refusees': []}
+        memo = {}  # permissions du valideur et responsables RH, lus une fois
+        maintenant = timezone.now()
+        traitees, traces, notifications = [], [], []
+
+        def responsables_rh():
+            if 'responsables_rh' not in memo:
+                memo['responsables_rh'] = list(ZY00.objects.filter(
+                    roles_attribues__role__CODE='RH',
+                    roles_attribues__actif=True,
+                    roles_attribues__date_fin__isnull=True,
+                    etat='actif'
+                ).distinct().values_list('matricule', flat=True))
+            return memo['responsables_rh']
+
+        def autorise(etape):
+            if etape not in memo:
+                memo[etape] = (
+                    valideur.peut_valider_absence_manager() if etape == 'MANAGER'
+                    else valideur.peut_valider_absence_rh()
+                )
+            return memo[etape]
+
+        with transaction.atomic():
+            absences = list(
+                Absence.objects.select_for_update(of=('self',)).select_related(
+                    'employe', 'type_absence'
+                ).filter(pk__in=ids).order_by('pk')
+            )
+            for absence_id in sorted(ids - {absence.pk for absence in absences}):
+                resultat['refusees'].append({'id': absence_id, 'erreur': "Absence introuvable"})
+
+            for absence in absences:
+                if absence.statut == 'EN_ATTENTE_MANAGER':
+                    etape = 'MANAGER'
+                    if not autorise(etape):
+                        erreur = "Vous n'avez pas la permission de valider les absences"
+                    elif absence.validateur_attendu_id != valideur.pk:
+                        erreur = f"Vous n'êtes pas le manager du département de {absence.employe.nom}"
+                    else:
+                        erreur = None
+                elif absence.statut == 'EN_ATTENTE_RH':
+                    etape = 'RH'
+                    erreur = None if autorise(etape) else (
+                        "Vous n'avez pas la permission de valider les absences RH"
+                    )
+                else:
+                    erreur = "Cette absence n'est pas en attente de validation"
+                if erreur:
+                    resultat['refusees'].append({'id': absence.pk, 'erreur': erreur})
+                    continue
+
+                if etape == 'MANAGER':
+                    absence.manager_validateur = valideur
+                    absence.date_validation_manager = maintenant
+                    absence.commentaire_manager = commentaire
+                    if decision == 'REJETE':
+                        absence.statut = 'REJETE'
+                    elif absence._get_mode_validation() == 'MANAGER_SEUL':
+                        absence.statut = 'VALIDE'
+                    else:
+                        absence.statut = 'EN_ATTENTE_RH'
+                else:
+                    absence.rh_validateur = valideur
+                    absence.date_validation_rh = maintenant
+                    absence.commentaire_rh = commentaire
+                    absence.statut = 'VALIDE' if decision == 'APPROUVE' else 'REJETE'
+                absence.updated_at = maintenant
+
+                traitees.append(absence)
+                traces.append(ValidationAbsence(
+                    absence=absence,
+                    etape=etape,
+                    ordre=1 if etape == 'MANAGER' else 2,
+                    validateur=valideur,
+                    decision=decision,
+                    commentaire=commentaire,
+                    date_validation=maintenant,
+                ))
+                notifications.extend(ApprobationService._notifications_decision(
+                    absence, etape, valideur, responsables_rh
+                ))
+
+            Absence.objects.bulk_update(traitees, CHAMPS_DECISION, batch_size=500)
+            ValidationAbsence.objects.bulk_create(traces, batch_size=500)
+            SoldeService.consommer_lot(
+                [absence for absence in traitees if absence.statut == 'VALIDE'], auteur=valideur
+            )
+            NotificationService.envoyer_lot(notifications)
+
+        for absence in traitees:
+            cle = {'VALIDE': 'validees', 'EN_ATTENTE_RH': 'transmises_rh'}.get(absence.statut, 'rejetees')
+            resultat[cle] += 1
+
+        if traitees:
+            # bulk_update / bulk_create n'émettent pas de signal
+            invalider_apres_commit(Absence, ValidationAbsence, 'absence')
+            logger.info(
+                "Décision %s de %s sur %s absence(s) : %s validée(s), %s transmise(s) aux RH, "
+                "%s rejetée(s), %s refusée(s)",
+                decision, valideur.matricule, len(ids), resultat['validees'],
+                resultat['transmises_rh'], resultat['rejetees'], len(resultat['refusees'])
+            )
+        return resultat
+
+    @staticmethod
+    def _notifications_decision(absence, etape, valideur, responsables_rh):
+        """
+        Notifications d'une décision (non enregistrées), mêmes messages que
+        les méthodes _notifier_* d'Absence.
+
+        Args:
+            responsables_rh: Fonction renvoyant les matricules des
+                responsables RH (lus une fois par lot)
+        """
+        from absence.models import NotificationAbsence
+
+        libelle = absence.type_absence.libelle
+        if absence.statut == 'REJETE':
+            par = 'votre manager' if etape == 'MANAGER' else 'les RH'
+            return [NotificationAbsence(
+                destinataire=absence.employe, absence=absence, contexte='EMPLOYE',
+                type_notification='REJET_MANAGER' if etape == 'MANAGER' else 'REJET_RH',
+                message=f"Votre demande d'absence ({libelle}) a été rejetée par {par}",
+            )]
+        if etape == 'RH':
+            return [NotificationAbsence(
+                destinataire=absence.employe, absence=absence, contexte='EMPLOYE',
+                type_notification='VALIDATION_RH',
+                message=f"Votre demande d'absence ({libelle}) a été validée par les RH. Elle est maintenant confirmée.",
+            )]
+        if absence.statut == 'VALIDE':
+            return [NotificationAbsence(
+                destinataire=absence.employe, absence=absence, contexte='EMPLOYE',
+                type_notification='VALIDATION_MANAGER',
+                message=(
+                    f"Votre demande d'absence ({libelle}) a été validée par votre manager "
+                    f"{valideur.nom}. Elle est maintenant confirmée."
+                ),
+            )]
+
+        employe = absence.employe
+        return [NotificationAbsence(
+            destinataire=employe, absence=absence, contexte='EMPLOYE',
+            type_notification='VALIDATION_MANAGER',
+            message=f"Votre demande d'absence ({libelle}) a été approuvée par votre manager {valideur.nom}",
+        )] + [
+            NotificationAbsence(
+                destinataire_id=matricule, absence=absence, contexte='RH',
+                type_notification='DEMANDE_VALIDEE_MANAGER',
+                message=(
+                    f"Nouvelle demande à valider (RH) : {employe.nom} {employe.prenoms} - {libelle} "
+                    f"- Approuvée par {valideur.nom}"
+                ),
+            )
+            for matricule in responsables_rh()
+        ]
@@ -0,0 +1,226 @@
+# absence/services/cloture_service.py
+"""
+Clôture mensuelle des acquisitions de congés.
+
+La clôture d'un mois fige, pour tous les employés actifs, les jours acquis
+à la fin du mois dans `AcquisitionConges.detail_mensuel` (même entrée que
+`AcquisitionConges.figer_mois`). Elle traite les employés par tranches, en
+trois phases chronométrées :
+
+1. chargement : employés de la tranche, contrat actif à la fin du mois et
+   acquisitions de l'année (trois requêtes ; conventions en cache) ;
+2. calcul : `AcquisitionService.calculer_acquis` sur les données chargées,
+   sans requête par employé ;
+3. écriture : acquisitions manquantes créées déjà figées (bulk_create) et
+   un seul bulk_update de detail_mensuel pour les autres.
+
+Les tranches sont stables (crc32 du matricule) et chacune est validée dans
+sa propre transaction. Un mois déjà figé n'est pas recalculé (sauf
+recalculer=True) : une clôture interrompue reprend où elle s'était
+arrêtée, et relancer une clôture terminée ne modifie rien.
+"""
+import calendar
+import logging
+import time
+import zlib
+from datetime import date
+
+from django.db import transaction
+from django.utils import timezone
+
+from core.cache import invalider_apres_commit
+
+logger = logging.getLogger(__name__)
+
+PHASES = ('chargement', 'calcul', 'ecriture')
+
+# Champs de ZY00 lus par le calcul (convention, temps partiel, ancienneté)
+CHAMPS_EMPLOYE = (
+    'matricule', 'nom', 'prenoms', 'entreprise', 'convention_personnalisee',
+    'coefficient_temps_travail', 'date_entree_entreprise',
+)
+
+
+def tranche_matricule(matricule, nb_tranches):
+    """Tranche d'un employé : stable quels que soient l'ordre et les embauches."""
+    return zlib.crc32(matricule.encode()) % nb_tranches
+
+
+def entree_mois(jours_acquis, date_figement=None):
+    """Entrée de detail_mensuel d'un mois figé."""
+    return {
+        'jours_acquis': str(jours_acquis),
+        'date_figement': (date_figement or timezone.now()).isoformat(),
+        'fige': True,
+    }
+
+
+class ClotureService:
+    """Service de clôture mensuelle des acquisitions de congés."""
+
+    @staticmethod
+    def cloturer_mois(annee, mois, nb_tranches=1, tranches=None, recalculer=False,
+                      matricules=None, avancer=None):
+        """
+        Fige un mois pour tous les employés actifs.
+
+        Args:
+            annee: Année de référence des acquisitions
+            mois: Mois à figer (1-12)
+            nb_tranches: Nombre de tranches d'employés
+            tranches: Numéros des tranches à traiter (défaut : toutes) ;
+                permet de répartir ou de reprendre une clôture
+            recalculer: Refige aussi les mois déjà figés
+            matricules: Employés sélectionnés (défaut : tous les actifs)
+            avancer: Fonction d'avancement (fait, total, message), ex. job.avancer
+
+        Returns:
+            dict: compteurs, erreurs et durées par phase (secondes)
+        """
+        from employee.models import ZY00
+
+        if not 1 <= mois <= 12:
+            raise ValueError(f"Mois invalide : {mois}")
+        if tranches is None:
+            tranches = range(nb_tranches)
+        tranches = sorted(set(tranches))
+        if any(not 0 <= tranche < nb_tranches for tranche in tranches):
+            raise ValueError(f"Tranches attendues entre 0 et {nb_tranches - 1}")
+
+        resultat = {
+            'annee': annee,
+            'mois': mois,
+            'employes': 0,
+            'figes': 0,
+            'deja_figes': 0,
+            'crees': 0,
+            'erreurs': 0,
+            'details_erreurs': [],
+            'tranches': [],
+            'durees': dict.fromkeys(PHASES, 0.0),
+        }
+
+        # Répartition en tranches (une requête sur les matricules)
+        employes = ZY00.objects.filter(etat='actif', entreprise__isnull=False)
+        if matricules:
+            employes = employes.filter(matricule__in=matricules)
+        par_tranche = {tranche: [] for tranche in tranches}
+        for matricule in employes.values_list('matricule', flat=True):
+            tranche = tranche_matricule(matricule, nb_tranches)
+            if tranche in par_tranche:
+                par_tranche[tranche].append(matricule)
+
+        for numero, tranche in enumerate(tranches, 1):
+            ClotureService._cloturer_tranche(annee, mois, par_tranche[tranche], recalculer, resultat)
+            resultat['tranches'].append(tranche)
+            if avancer:
+                avancer(numero, len(tranches), f"Tranche {tranche + 1}/{nb_tranches} clôturée")
+
+        resultat['durees'] = {phase: round(duree, 3) for phase, duree in resultat['durees'].items()}
+        logger.info(
+            "Clôture %02d/%s : %s figé(s), %s déjà figé(s), %s créée(s), %s erreur(s) — %s",
+            mois, annee, resultat['figes'], resultat['deja_figes'], resultat['crees'],
+            resultat['erreurs'],
+            ', '.join(f"{phase} {duree:.2f}s" for phase, duree in resultat['durees'].items())
+        )
+        return resultat
+
+    @staticmethod
+    def _cloturer_tranche(annee, mois, matricules, recalculer, resultat):
+        """Clôture une tranche dans une transaction (chargement, calcul, écriture)."""
+        from absence.models import AcquisitionConges
+        from absence.services.acquisition_service import AcquisitionService
+        from employee.models import ZY00
+
+        if not matricules:
+            return
+
+        cle = f"{mois:02d}"
+        fin_mois = date(annee, mois, calendar.monthrange(annee, mois)[1])
+        durees = resultat['durees']
+
+        with transaction.atomic():
+            # 1. Chargement
+            debut = time.monotonic()
+            employes = list(
+                ZY00.objects.filter(matricule__in=matricules).only(*CHAMPS_EMPLOYE).order_by('matricule')
+            )
+            contrats = {}
+            for employe_id, date_debut in AcquisitionService.contrats_au(fin_mois).filter(
+                employe_id__in=matricules
+            ).values_list('employe_id', 'date_debut'):
+                contrats.setdefault(employe_id, date_debut)
+            acquisitions = {
+                acquisition.employe_id: acquisition
+                for acquisition in AcquisitionConges.objects.select_for_update().filter(
+                    annee_reference=annee,
+                    employe_id__in=matricules
+                ).only('id', 'employe', 'detail_mensuel')
+            }
+            durees['chargement'] += time.monotonic() - debut
+
+            # 2. Calcul
+            debut = time.monotonic()
+            figes = []
+            parametres = {}
+            for employe in employes:
+                resultat['employes'] += 1
+                acquisition = acquisitions.get(employe.matricule)
+                if acquisition and not recalculer and (acquisition.detail_mensuel.get(cle) or {}).get('fige'):
+                    resultat['deja_figes'] += 1
+                    continue
+
+                convention = employe.convention_applicable
+                if not convention:
+                    ClotureService._erreur(resultat, employe, 'Aucune convention applicable')
+                    continue
+                try:
+                    if convention.pk not in parametres:
+                        parametres[convention.pk] = AcquisitionService.parametres_convention(convention)
+                    calcul = AcquisitionService.calculer_acquis(
+                        employe, convention, parametres[convention.pk],
+                        annee, fin_mois, contrats.get(employe.matricule)
+                    )
+                except Exception as e:
+                    ClotureService._erreur(resultat, employe, str(e))
+                    continue
+                figes.append((employe, acquisition, calcul['jours_acquis']))
+            durees['calcul'] += time.monotonic() - debut
+
+            # 3. Écriture
+            debut = time.monotonic()
+            maintenant = timezone.now()
+            creations, mises_a_jour = [], []
+            for employe, acquisition, jours_acquis in figes:
+                if acquisition is None:
+                    creations.append(AcquisitionConges(
+                        employe_id=employe.matricule,
+                        annee_reference=annee,
+                        detail_mensuel={cle: entree_mois(jours_acquis, maintenant)},
+                    ))
+                    continue
+                acquisition.detail_mensuel = {
+                    **acquisition.detail_mensuel,
+                    cle: {**(acquisition.detail_mensuel.get(cle) or {}), **entree_mois(jours_acquis, maintenant)},
+                }
+                acquisition.date_maj = maintenant
+                mises_a_jour.append(acquisition)
+
+            AcquisitionConges.objects.bulk_create(creations, batch_size=500)
+            AcquisitionConges.objects.bulk_update(mises_a_jour, ['detail_mensuel', 'date_maj'], batch_size=500)
+            durees['ecriture'] += time.monotonic() - debut
+
+        resultat['figes'] += len(figes)
+        resultat['crees'] += len(creations)
+        if figes:
+            # bulk_create / bulk_update n'émettent pas de signal
+            invalider_apres_commit(AcquisitionConges, 'absence')
+
+    @staticmethod
+    def _erreur(resultat, employe, message):
+        resultat['erreurs'] += 1
+        resultat['details_erreurs'].append({
+            'matricule': employe.matricule,
+            'employe': f"{employe.nom} {employe.prenoms}",
+            'erreur': message,
+        })
@@ -0,0 +1,436 @@
+# absence/services/import_absences_service.py
+"""
+Service d'import en masse d'absences (reprise d'historique, CSV ou Excel).
+
+Contrairement à la saisie (`creer_absence` : full_clean, calcul jour par
+jour, signaux d'audit et notification à chaque enregistrement), le moteur :
+- lit le fichier en une passe (pandas) et convertit chaque colonne de façon
+  vectorisée ;
+- calcule les jours ouvrables sur toutes les lignes à la fois
+  (numpy.busday_count, mêmes règles que `Absence.calculer_jours` : lundi au
+  vendredi, 0,5 pour une demi-journée) ;
+- contrôle les chevauchements dans le fichier (tri par employé et maximum
+  cumulé des fins) et avec l'existant (`conflits_lot` : une requête) ;
+- contrôle les soldes en une requête : les jours des lignes qui décomptent
+  le solde sont cumulés par employé et par année d'acquisition (N-1) ;
+- écrit absences et traces de validation par bulk_create, décompte les
+  absences validées par `SoldeService.consommer_lot` et envoie les
+  notifications aux managers en un lot, après validation de la transaction.
+
+Les écritures groupées ne passent ni par save() ni par les signaux : une
+entrée d'audit récapitulative est créée et les caches sont invalidés. Le
+justificatif obligatoire n'est pas exigé (les pièces restent dans le
+système d'origine).
+
+Colonnes : Matricule, Type_CODE, Date_debut, Date_fin, Periode
+(JOURNEE_COMPLETE par défaut), Statut (VALIDE par défaut), Motif.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+from django.db import transaction
+from django.utils import timezone
+
+from core.cache import invalider_apres_commit
+from core.chevauchement import conflits_lot
+from employee.services.import_masse_service import FORMATS_DATE, ImportMasseService
+
+logger = logging.getLogger(__name__)
+
+TAILLE_LOT = 1000
+
+COLONNES_OBLIGATOIRES = ('Matricule', 'Type_CODE', 'Date_debut', 'Date_fin')
+
+# Statuts qui bloquent une autre absence sur la même période (AbsenceForm)
+STATUTS_ACTIFS = ('EN_ATTENTE_MANAGER', 'EN_ATTENTE_RH', 'VALIDE')
+
+
+class ImportAbsencesService:
+    """
+    Moteur d'import en masse d'absences.
+
+    Utilisation:
+        service = ImportAbsencesService('historique.xlsx', auteur=employe_rh)
+        resultat = service.executer()
+    """
+
+    def __init__(self, fichier, dry_run=False, auteur=None, utilisateur=None,
+                 controler_solde=True, notifier=True, ecrire=None):
+        """
+        Args:
+            fichier: Chemin ou fichier téléversé (.csv, .xlsx)
+            dry_run: Contrôle le fichier sans rien écrire
+            auteur: Employé qui importe (ZY00) : créateur des absences,
+                validateur RH et auteur des traces des absences validées
+            utilisateur: Utilisateur Django de l'entrée d'audit
+            controler_solde: Rejette les lignes qui dépassent le solde
+            notifier: Notifie les managers des absences en attente
+            ecrire: Fonction d'affichage de la progression
+        """
+        self.fichier = fichier
+        self.dry_run = dry_run
+        self.auteur = auteur
+        self.utilisateur = utilisateur
+        self.controler_solde = controler_solde
+        self.notifier = notifier
+        self.ecrire = ecrire or logger.info
+
+        self.nom_fichier = str(getattr(fichier, 'name', fichier)).rsplit('/', 1)[-1]
+        self.stats = {'lignes': 0, 'creees': 0, 'erreurs': 0, 'par_statut': {}}
+        self.erreurs = []
+        self.durees = {}
+
+    # ------------------------------------------------------------------
+    # Orchestration
+    # ------------------------------------------------------------------
+
+    def executer(self):
+        """
+        Lit, contrôle puis écrit les absences valides.
+
+        Returns:
+            dict: statistiques, lignes rejetées et durées par phase (secondes)
+        """
+        debut = time.monotonic()
+        df = self.lire_fichier()
+        self._charger_referentiels(df)
+        self.stats['lignes'] = len(df)
+        self._chronometrer('lecture', debut)
+
+        debut = time.monotonic()
+        valeurs, erreurs = self._preparer(df)
+        self._controler_chevauchements(valeurs, erreurs)
+        if self.controler_solde:
+            self._controler_soldes(valeurs, erreurs)
+        self._chronometrer('controles', debut)
+
+        for index in erreurs[erreurs != ''].index:
+            self._signaler(valeurs, index, erreurs[index].rstrip('; '))
+
+        valides = valeurs[erreurs == '']
+        self.stats['par_statut'] = {
+            statut: int(nombre) for statut, nombre in valides['statut'].value_counts().items()
+        }
+        if not self.dry_run and not valides.empty:
+            debut = time.monotonic()
+            self._ecrire(valides)
+            self._chronometrer('ecriture', debut)
+
+        self.ecrire(
+            f"  ✅ {self.stats['creees']} absence(s) créée(s), {self.stats['erreurs']} erreur(s) "
+            f"— {self.stats['lignes']} ligne(s)"
+        )
+        return {
+            'stats': self.stats,
+            'erreurs': self.erreurs,
+            'durees': self.durees,
+            'dry_run': self.dry_run,
+        }
+
+    def lire_fichier(self):
+        """Lit la première feuille d'un classeur Excel, ou un CSV (séparateur détecté)"""
+        if self.nom_fichier.lower().endswith('.csv'):
+            df = pd.read_csv(self.fichier, dtype=str, sep=None, engine='python', encoding='utf-8-sig')
+        else:
+            df = pd.read_excel(self.fichier, dtype=str, engine='openpyxl')
+        df.columns = [str(colonne).strip() for colonne in df.columns]
+
+        manquantes = [colonne for colonne in COLONNES_OBLIGATOIRES if colonne not in df.columns]
+        if manquantes:
+            raise ValueError(f"Colonnes manquantes : {', '.join(manquantes)}")
+        return df
+
+    def _charger_referentiels(self, df):
+        """Employés du fichier et types d'absence actifs (deux requêtes)"""
+        from absence.models import TypeAbsence
+        from employee.models import ZY00
+
+        matricules = set(ImportMasseService._texte(df['Matricule']))
+        self.employes = {
+            matricule: f"{nom} {prenoms}"
+            for matricule, nom, prenoms in ZY00.objects.filter(
+                matricule__in=matricules
+            ).values_list('matricule', 'nom', 'prenoms')
+        }
+        self.types = {
+            type_absence.code.upper(): type_absence
+            for type_absence in TypeAbsence.objects.filter(actif=True)
+        }
+
+    # ------------------------------------------------------------------
+    # Conversion et contrôles vectorisés
+    # ------------------------------------------------------------------
+
+    def _preparer(self, df):
+        """
+        Construit le DataFrame des valeurs converties et les motifs de rejet.
+
+        Returns:
+            tuple: (valeurs, erreurs) — erreurs est une série de messages,
+                   vide pour les lignes valides
+        """
+        from absence.models import Absence
+
+        colonne, texte = ImportMasseService._colonne, ImportMasseService._texte
+        erreurs = pd.Series('', index=df.index, dtype=object)
+        valeurs = pd.DataFrame(index=df.index)
+        valeurs['_ligne'] = df.index + 2
+
+        # Employé
+        matricules = texte(colonne(df, 'Matricule'))
+        valeurs['employe_id'] = matricules
+        erreurs[matricules == ''] += 'Matricule manquant; '
+        inconnus = (matricules != '') & ~matricules.isin(self.employes.keys())
+        erreurs[inconnus] += matricules[inconnus].map(lambda m: f"Employé {m} non trouvé; ")
+
+        # Type d'absence
+        codes = texte(colonne(df, 'Type_CODE')).str.upper()
+        valeurs['type_code'] = codes
+        erreurs[codes == ''] += 'Type_CODE manquant; '
+        inconnus = (codes != '') & ~codes.isin(self.types.keys())
+        erreurs[inconnus] += codes[inconnus].map(lambda code: f"Type d'absence {code} non trouvé; ")
+        valeurs['_decompte'] = codes.map(
+            {code: type_absence.decompte_solde for code, type_absence in self.types.items()}
+        ).fillna(False).astype(bool)
+
+        # Période
+        for champ, nom_colonne in (('date_debut', 'Date_debut'), ('date_fin', 'Date_fin')):
+            dates, invalides = self._convertir_date(colonne(df, nom_colonne))
+            valeurs[champ] = dates
+            erreurs[dates.isna() & ~invalides] += f"{nom_colonne} manquante; "
+            erreurs[invalides] += f"{nom_colonne}: valeur invalide; "
+        dates_valides = valeurs['date_debut'].notna() & valeurs['date_fin'].notna()
+        inversees = dates_valides & (valeurs['date_fin'] < valeurs['date_debut'])
+        erreurs[inversees] += "La date de fin ne peut pas être antérieure à la date de début; "
+
+        # Demi-journées uniquement sur un jour : plusieurs jours = journée complète
+        periodes = texte(colonne(df, 'Periode'), 'JOURNEE_COMPLETE').str.upper()
+        autorisees = {cle for cle, _ in Absence.PERIODE_CHOICES}
+        erreurs[~periodes.isin(autorisees)] += 'Periode: valeur non autorisée; '
+        valeurs['periode'] = periodes.mask(
+            dates_valides & (valeurs['date_debut'] != valeurs['date_fin']), 'JOURNEE_COMPLETE'
+        )
+
+        statuts = texte(colonne(df, 'Statut'), 'VALIDE').str.upper()
+        erreurs[~statuts.isin({cle for cle, _ in Absence.STATUT_CHOICES})] += 'Statut: valeur non autorisée; '
+        valeurs['statut'] = statuts
+        valeurs['motif'] = texte(colonne(df, 'Motif'))
+
+        self._calculer_jours(valeurs, dates_valides & ~inversees)
+        return valeurs, erreurs
+
+    @staticmethod
+    def _calculer_jours(valeurs, calculables):
+        """
+        Jours calendaires et ouvrables de toutes les lignes en une opération
+        (mêmes règles qu'Absence.calculer_jours, sans les jours fériés).
+        """
+        valeurs['jours_calendaires'] = 0
+        valeurs['jours_ouvrables'] = 0.0
+        if not calculables.any():
+            return
+
+        debuts = valeurs.loc[calculables, 'date_debut'].to_numpy().astype('datetime64[D]')
+        fins = valeurs.loc[calculables, 'date_fin'].to_numpy().astype('datetime64[D]')
+        ouvres = np.busday_count(debuts, fins + np.timedelta64(1, 'D'))
+        demi_journees = (debuts == fins) & (valeurs.loc[calculables, 'periode'] != 'JOURNEE_COMPLETE').to_numpy()
+
+        valeurs.loc[calculables, 'jours_calendaires'] = (fins - debuts).astype(int) + 1
+        valeurs.loc[calculables, 'jours_ouvrables'] = np.where(demi_journees, ouvres * 0.5, ouvres)
+
+    def _controler_chevauchements(self, valeurs, erreurs):
+        """
+        Chevauchements des absences actives : entre lignes du fichier (tri
+        par employé et début, maximum cumulé des fins précédentes), puis
+        avec les absences existantes (une requête).
+        """
+        from absence.models import Absence
+
+        actives = valeurs[(erreurs == '') & valeurs['statut'].isin(STATUTS_ACTIFS)]
+        if actives.empty:
+            return
+
+        triees = actives.sort_values(['employe_id', 'date_debut'])
+        fins_max = triees.groupby('employe_id')['date_fin'].cummax()
+        precedentes = fins_max.groupby(triees['employe_id']).shift()
+        en_conflit = precedentes.notna() & (precedentes >= triees['date_debut'])
+        erreurs[en_conflit[en_conflit].index] += 'Chevauche une autre ligne du fichier; '
+
+        index = list(actives.index)
+        conflits = conflits_lot(
+            Absence.objects.filter(statut__in=STATUTS_ACTIFS),
+            [
+                ((matricule,), debut.date(), fin.date())
+                for matricule, debut, fin in actives[['employe_id', 'date_debut', 'date_fin']].itertuples(index=False)
+            ]
+        )
+        for position, absence in conflits.items():
+            erreurs[index[position]] += (
+                f"Chevauche l'absence du {absence.date_debut:%d/%m/%Y} au {absence.date_fin:%d/%m/%Y}; "
+            )
+
+    def _controler_soldes(self, valeurs, erreurs):
+        """
+        Soldes en une requête : les jours des lignes actives qui décomptent
+        le solde sont cumulés par employé et année d'acquisition, dans
+        l'ordre des dates ; les lignes au-delà du solde sont rejetées.
+        """
+        from absence.models import AcquisitionConges
+
+        concernees = valeurs[
+            (erreurs == '') & valeurs['_decompte'] & valeurs['statut'].isin(STATUTS_ACTIFS)
+        ].sort_values('date_debut')
+        if concernees.empty:
+            return
+
+        annees = concernees['date_debut'].dt.year - 1
+        soldes = {
+            (employe_id, annee): float(jours_restants)
+            for employe_id, annee, jours_restants in AcquisitionConges.objects.filter(
+                employe_id__in=set(concernees['employe_id']),
+                annee_reference__in=set(annees)
+            ).values_list('employe_id', 'annee_reference', 'jours_restants')
+        }
+
+        cumuls = concernees['jours_ouvrables'].groupby([concernees['employe_id'], annees]).cumsum()
+        disponibles = pd.Series(
+            [soldes.get(cle, 0.0) for cle in zip(concernees['employe_id'], annees)],
+            index=concernees.index
+        )
+        depassements = cumuls > disponibles + 1e-9
+        for index in depassements[depassements].index:
+            erreurs[index] += (
+                f"Solde insuffisant ({disponibles[index]:g} jour(s) disponible(s) "
+                f"sur l'année {annees[index]}); "
+            )
+
+    # ------------------------------------------------------------------
+    # Écriture
+    # ------------------------------------------------------------------
+
+    def _ecrire(self, valides):
+        """Crée absences, traces, mouvements de solde, notifications et audit"""
+        from absence.models import Absence, NotificationAbsence, ValidationAbsence
+        from absence.services.approbation_service import ApprobationService
+        from absence.services.notification_service import NotificationService
+        from absence.services.solde_service import SoldeService
+
+        maintenant = timezone.now()
+        absences = []
+        for ligne in valides.itertuples(index=False):
+            finale = ligne.statut in ('VALIDE', 'REJETE')
+            absences.append(Absence(
+                employe_id=ligne.employe_id,
+                type_absence=self.types[ligne.type_code],
+                date_debut=ligne.date_debut.date(),
+                date_fin=ligne.date_fin.date(),
+                periode=ligne.periode,
+                jours_ouvrables=Decimal(str(ligne.jours_ouvrables)).quantize(Decimal('0.01')),
+                jours_calendaires=int(ligne.jours_calendaires),
+                statut=ligne.statut,
+                motif=ligne.motif,
+                created_by=self.auteur,
+                rh_validateur=self.auteur if finale else None,
+                date_validation_rh=maintenant if finale else None,
+            ))
+
+        with transaction.atomic():
+            Absence.objects.bulk_create(absences, batch_size=TAILLE_LOT)
+            self.stats['creees'] = len(absences)
+
+            # Validateur attendu des absences en attente du manager (une requête)
+            en_attente = [absence for absence in absences if absence.statut == 'EN_ATTENTE_MANAGER']
+            if en_attente:
+                ApprobationService.reaffecter({absence.employe_id for absence in en_attente})
+
+            if self.auteur:
+                ValidationAbsence.objects.bulk_create([
+                    ValidationAbsence(
+                        absence=absence,
+                        etape='RH',
+                        ordre=2,
+                        validateur=self.auteur,
+                        decision='APPROUVE' if absence.statut == 'VALIDE' else 'REJETE',
+                        commentaire=f"Import {self.nom_fichier}",
+                        date_validation=maintenant,
+                    )
+                    for absence in absences if absence.statut in ('VALIDE', 'REJETE')
+                ], batch_size=TAILLE_LOT)
+
+            SoldeService.consommer_lot(
+                [absence for absence in absences if absence.statut == 'VALIDE'], auteur=self.auteur
+            )
+
+            if self.notifier and en_attente:
+                validateurs = dict(Absence.objects.filter(
+                    pk__in=[absence.pk for absence in en_attente]
+                ).values_list('pk', 'validateur_attendu'))
+                NotificationService.envoyer_lot([
+                    NotificationAbsence(
+                        destinataire_id=validateurs.get(absence.pk),
+                        absence=absence,
+                        type_notification=NotificationService.DEMANDE_CREEE,
+                        contexte=NotificationService.CONTEXTE_MANAGER,
+                        message=(
+                            f"{self.employes[absence.employe_id]} a créé une demande d'absence "
+                            f"({absence.type_absence.libelle}) du {absence.date_debut:%d/%m/%Y} "
+                            f"au {absence.date_fin:%d/%m/%Y}"
+                        ),
+                    )
+                    for absence in en_attente
+                ])
+
+            self._journaliser()
+
+        # bulk_create n'émet pas de signal
+        invalider_apres_commit(Absence, ValidationAbsence, 'absence')
+
+    def _journaliser(self):
+        """Crée une entrée d'audit récapitulative de l'import"""
+        from core.models import ZDLOG
+
+        ZDLOG.log_action(
+            table_name='Absence',
+            record_id=f"IMPORT:{self.nom_fichier}"[:100],
+            type_mouvement=ZDLOG.TYPE_CREATION,
+            user=self.utilisateur,
+            nouvelle_valeur=self.stats,
+            description=(
+                f"Import d'absences {self.nom_fichier} : {self.stats['creees']} création(s), "
+                f"{self.stats['erreurs']} erreur(s)"
+            )
+        )
+
+    # ------------------------------------------------------------------
+    # Utilitaires
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _convertir_date(serie):
+        """Essaie successivement chaque format ; retourne (dates, masque des invalides)"""
+        texte = ImportMasseService._texte(serie)
+        renseignees = texte != ''
+        dates = pd.Series(pd.NaT, index=texte.index, dtype='datetime64[ns]')
+        for format_date in FORMATS_DATE:
+            restantes = renseignees & dates.isna()
+            if not restantes.any():
+                break
+            dates[restantes] = pd.to_datetime(texte[restantes], format=format_date, errors='coerce')
+        return dates.dt.normalize(), renseignees & dates.isna()
+
+    def _chronometrer(self, phase, debut):
+        self.durees[phase] = round(time.monotonic() - debut, 3)
+
+    def _signaler(self, valeurs, index, message):
+        """Enregistre une ligne rejetée"""
+        self.stats['erreurs'] += 1
+        self.erreurs.append({
+            'ligne': int(valeurs.at[index, '_ligne']),
+            'matricule': valeurs.at[index, 'employe_id'],
+            'erreur': message,
+        })
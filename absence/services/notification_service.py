@@ -4,6 +4,8 @@ Service de gestion des notifications d'absences.
 """
 import logging
 
+from django.db import transaction
+
 logger = logging.getLogger(__name__)
 
 
@@ -252,6 +254,32 @@ class NotificationService:
         except Exception as e:
             logger.error("Erreur notification annulation: %s", e)
 
+    @staticmethod
+    def envoyer_lot(notifications):
+        """
+        Enregistre un lot de notifications en un seul bulk_create, après
+        validation de la transaction en cours (rien n'est envoyé si elle
+        est annulée).
+
+        Args:
+            notifications: NotificationAbsence non enregistrées ; celles
+                sans destinataire sont ignorées
+        """
+        from absence.models import NotificationAbsence
+
+        notifications = [notification for notification in notifications if notification.destinataire_id]
+        if not notifications:
+            return
+
+        def enregistrer():
+            try:
+                NotificationAbsence.objects.bulk_create(notifications, batch_size=500)
+                logger.info("%s notification(s) d'absence envoyée(s)", len(notifications))
+            except Exception as e:
+                logger.error("Erreur envoi du lot de notifications: %s", e)
+
+        transaction.on_commit(enregistrer)
+
     @staticmethod
     def get_notifications_non_lues(employe):
         """
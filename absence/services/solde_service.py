@@ -0,0 +1,454 @@
+# absence/services/solde_service.py
+"""
+Service du registre des soldes de congés.
+
+Tout mouvement de solde (acquisition, consommation, restitution,
+ajustement du report) est ajouté au registre MouvementConges et appliqué
+à l'AcquisitionConges de l'année par une seule requête UPDATE avec F() :
+pas de verrou explicite ni de lecture-modification-écriture, l'UPDATE
+verrouille la ligne jusqu'à la fin de la transaction. Le solde courant
+se lit sur AcquisitionConges (une ligne par employé et par année), le
+solde à une date donnée sur le dernier mouvement antérieur (index
+employe, annee_reference, date_mouvement).
+"""
+import logging
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F, Q, Sum, Window
+
+from core.cache import invalider_apres_commit
+
+logger = logging.getLogger(__name__)
+
+ZERO = Decimal('0.00')
+
+# Composante d'AcquisitionConges modifiée par chaque type de mouvement,
+# et sens de la variation par rapport au solde
+COMPOSANTES = {
+    'ACQUISITION': ('jours_acquis', 1),
+    'AJUSTEMENT': ('jours_report_anterieur', 1),
+    'CONSOMMATION': ('jours_pris', -1),
+    'RESTITUTION': ('jours_pris', -1),
+}
+
+
+class SoldeService:
+    """Service pour les mouvements et la lecture des soldes de congés."""
+
+    @staticmethod
+    def enregistrer(employe, annee_reference, type_mouvement, jours,
+                    absence=None, libelle='', auteur=None, date_mouvement=None):
+        """
+        Ajoute un mouvement au registre et l'applique au solde de l'année.
+
+        Args:
+            employe: Instance de l'employé (ZY00)
+            annee_reference: Année d'acquisition concernée
+            type_mouvement: ACQUISITION, CONSOMMATION, RESTITUTION ou AJUSTEMENT
+            jours: Variation du solde (négative pour une consommation)
+            absence: Absence à l'origine du mouvement (optionnel)
+            libelle: Libellé du mouvement
+            auteur: Employé à l'origine du mouvement (optionnel)
+            date_mouvement: Date d'effet (par défaut : maintenant)
+
+        Returns:
+            MouvementConges: le mouvement créé, avec le solde après mouvement
+        """
+        from django.utils import timezone
+        from absence.models import AcquisitionConges, MouvementConges
+
+        champ, sens = COMPOSANTES[type_mouvement]
+        jours = Decimal(jours).quantize(Decimal('0.01'))
+        variations = {
+            champ: F(champ) + sens * jours,
+            'jours_restants': F('jours_restants') + jours,
+            'date_maj': timezone.now(),
+        }
+
+        with transaction.atomic():
+            acquisitions = AcquisitionConges.objects.filter(
+                employe=employe,
+                annee_reference=annee_reference
+            )
+            if not acquisitions.update(**variations):
+                AcquisitionConges.objects.get_or_create(employe=employe, annee_reference=annee_reference)
+                acquisitions.update(**variations)
+
+            # La ligne reste verrouillée par l'UPDATE : solde cohérent
+            solde = acquisitions.values_list('jours_restants', flat=True).get()
+
+            mouvement = MouvementConges.objects.create(
+                employe=employe,
+                annee_reference=annee_reference,
+                type_mouvement=type_mouvement,
+                jours=jours,
+                solde_apres=solde,
+                date_mouvement=date_mouvement or timezone.now(),
+                absence=absence,
+                libelle=libelle,
+                auteur=auteur,
+            )
+
+        # update() n'émet pas de signal
+        invalider_apres_commit(AcquisitionConges, 'absence')
+        return mouvement
+
+    @staticmethod
+    def consommer(absence, auteur=None):
+        """
+        Décompte les jours d'une absence du solde de l'année N-1.
+
+        Returns:
+            MouvementConges ou None si le type d'absence ne décompte pas le solde
+        """
+        if not absence.type_absence.decompte_solde:
+            return None
+        return SoldeService.enregistrer(
+            absence.employe,
+            absence.date_debut.year - 1,
+            'CONSOMMATION',
+            -absence.jours_ouvrables,
+            absence=absence,
+            libelle=f"{absence.type_absence.libelle} du {absence.date_debut:%d/%m/%Y}",
+            auteur=auteur,
+        )
+
+    @staticmethod
+    def restituer(absence, auteur=None):
+        """
+        Restitue au solde les jours d'une absence annulée.
+
+        Returns:
+            MouvementConges ou None si le type d'absence ne décompte pas le solde
+        """
+        if not absence.type_absence.decompte_solde:
+            return None
+        return SoldeService.enregistrer(
+            absence.employe,
+            absence.date_debut.year - 1,
+            'RESTITUTION',
+            absence.jours_ouvrables,
+            absence=absence,
+            libelle=f"Annulation {absence.type_absence.libelle} du {absence.date_debut:%d/%m/%Y}",
+            auteur=auteur,
+        )
+
+    @staticmethod
+    def consommer_lot(absences, auteur=None):
+        """
+        Décompte en une passe les jours d'un lot d'absences validées.
+
+        Les acquisitions concernées (employé, année N-1) sont créées si
+        besoin (bulk_create), verrouillées et lues en une requête ; les
+        consommations sont appliquées en mémoire dans l'ordre des dates,
+        puis écrites par un bulk_update et un bulk_create du registre.
+
+        Args:
+            absences: Absences validées (type_absence chargé)
+            auteur: Employé à l'origine des mouvements (optionnel)
+
+        Returns:
+            list[MouvementConges]: un mouvement par absence qui décompte le solde
+        """
+        from django.utils import timezone
+        from absence.models import AcquisitionConges, MouvementConges
+
+        absences = sorted(
+            (absence for absence in absences if absence.type_absence.decompte_solde),
+            key=lambda absence: (absence.date_debut, absence.pk or 0)
+        )
+        if not absences:
+            return []
+
+        cles = {(absence.employe_id, absence.date_debut.year - 1) for absence in absences}
+        filtres = {
+            'employe_id__in': {employe_id for employe_id, _ in cles},
+            'annee_reference__in': {annee for _, annee in cles},
+        }
+        maintenant = timezone.now()
+        mouvements = []
+
+        with transaction.atomic():
+            existantes = set(AcquisitionConges.objects.filter(**filtres).values_list(
+                'employe_id', 'annee_reference'
+            ))
+            AcquisitionConges.objects.bulk_create([
+                AcquisitionConges(employe_id=employe_id, annee_reference=annee)
+                for employe_id, annee in cles - existantes
+            ], ignore_conflicts=True)
+
+            acquisitions = {
+                (acquisition.employe_id, acquisition.annee_reference): acquisition
+                for acquisition in AcquisitionConges.objects.select_for_update().filter(**filtres)
+                if (acquisition.employe_id, acquisition.annee_reference) in cles
+            }
+
+            for absence in absences:
+                acquisition = acquisitions[(absence.employe_id, absence.date_debut.year - 1)]
+                acquisition.jours_pris += absence.jours_ouvrables
+                acquisition.jours_restants -= absence.jours_ouvrables
+                acquisition.date_maj = maintenant
+                mouvements.append(MouvementConges(
+                    employe_id=absence.employe_id,
+                    annee_reference=acquisition.annee_reference,
+                    type_mouvement='CONSOMMATION',
+                    jours=-absence.jours_ouvrables,
+                    solde_apres=acquisition.jours_restants,
+                    date_mouvement=maintenant,
+                    absence=absence,
+                    libelle=f"{absence.type_absence.libelle} du {absence.date_debut:%d/%m/%Y}",
+                    auteur=auteur,
+                ))
+
+            AcquisitionConges.objects.bulk_update(
+                acquisitions.values(), ['jours_pris', 'jours_restants', 'date_maj'], batch_size=500
+            )
+            MouvementConges.objects.bulk_create(mouvements, batch_size=500)
+
+        invalider_apres_commit(AcquisitionConges, MouvementConges, 'absence')
+        return mouvements
+
+    @staticmethod
+    def _fixer(acquisition, type_mouvement, valeur, libelle, auteur):
+        """Porte une composante à une valeur : mouvement de l'écart (si non nul)."""
+        from absence.models import AcquisitionConges
+
+        champ, _ = COMPOSANTES[type_mouvement]
+        valeur = Decimal(valeur).quantize(Decimal('0.01'))
+
+        with transaction.atomic():
+            actuelle = AcquisitionConges.objects.select_for_update().values_list(
+                champ, flat=True
+            ).get(pk=acquisition.pk)
+            mouvement = None
+            if valeur != actuelle:
+                mouvement = SoldeService.enregistrer(
+                    acquisition.employe,
+                    acquisition.annee_reference,
+                    type_mouvement,
+                    valeur - actuelle,
+                    libelle=libelle,
+                    auteur=auteur,
+                )
+
+        acquisition.refresh_from_db(fields=[champ, 'jours_restants', 'date_maj'])
+        return mouvement
+
+    @staticmethod
+    def fixer_acquis(acquisition, jours_acquis, libelle='Calcul des jours acquis', auteur=None):
+        """
+        Porte les jours acquis d'une acquisition à la valeur calculée.
+
+        Returns:
+            MouvementConges ou None si la valeur est inchangée
+        """
+        return SoldeService._fixer(acquisition, 'ACQUISITION', jours_acquis, libelle, auteur)
+
+    @staticmethod
+    def fixer_report(acquisition, jours_report, libelle='Report antérieur', auteur=None):
+        """
+        Porte le report antérieur d'une acquisition à la valeur saisie.
+
+        Returns:
+            MouvementConges ou None si la valeur est inchangée
+        """
+        return SoldeService._fixer(acquisition, 'AJUSTEMENT', jours_report, libelle, auteur)
+
+    @staticmethod
+    def solde(employe, annee_reference, au=None):
+        """
+        Solde de congés d'une année d'acquisition (une requête indexée).
+
+        Args:
+            employe: Instance ou matricule de l'employé
+            annee_reference: Année d'acquisition
+            au: datetime ; si fourni, solde après le dernier mouvement
+                antérieur ou égal à cette date
+
+        Returns:
+            Decimal: 0.00 sans acquisition ni mouvement
+        """
+        from absence.models import AcquisitionConges, MouvementConges
+
+        if au is None:
+            solde = AcquisitionConges.objects.filter(
+                employe=employe,
+                annee_reference=annee_reference
+            ).values_list('jours_restants', flat=True).first()
+        else:
+            solde = MouvementConges.objects.filter(
+                employe=employe,
+                annee_reference=annee_reference,
+                date_mouvement__lte=au
+            ).order_by('-date_mouvement', '-id').values_list('solde_apres', flat=True).first()
+
+        return ZERO if solde is None else solde
+
+    @staticmethod
+    def acquisition_supprimee(sender, instance, origin=None, **kwargs):
+        """
+        Récepteur pre_delete d'AcquisitionConges (connecté dans
+        AbsenceConfig.ready) : le registre n'est jamais effacé, la suppression
+        y est inscrite par des mouvements qui ramènent chaque composante à
+        zéro. Couvre la suppression d'une instance, d'un queryset et l'admin ;
+        la suppression en cascade d'un employé emporte son registre.
+        """
+        from django.db.models import QuerySet
+        from django.utils import timezone
+        from absence.models import MouvementConges
+
+        modele_origine = origin.model if isinstance(origin, QuerySet) else type(origin)
+        if origin is not None and modele_origine is not sender:
+            return
+
+        registre = MouvementConges.objects.filter(
+            employe_id=instance.employe_id,
+            annee_reference=instance.annee_reference
+        ).aggregate(
+            acquis=Sum('jours', filter=Q(type_mouvement='ACQUISITION'), default=ZERO),
+            report=Sum('jours', filter=Q(type_mouvement='AJUSTEMENT'), default=ZERO),
+            pris=Sum('jours', filter=Q(type_mouvement__in=['CONSOMMATION', 'RESTITUTION']), default=ZERO),
+        )
+        solde = registre['acquis'] + registre['report'] + registre['pris']
+        maintenant = timezone.now()
+        mouvements = []
+        for type_mouvement, jours in (
+            ('ACQUISITION', -registre['acquis']),
+            ('AJUSTEMENT', -registre['report']),
+            ('RESTITUTION', -registre['pris']),
+        ):
+            if jours:
+                solde += jours
+                mouvements.append(MouvementConges(
+                    employe_id=instance.employe_id,
+                    annee_reference=instance.annee_reference,
+                    type_mouvement=type_mouvement,
+                    jours=jours,
+                    solde_apres=solde,
+                    date_mouvement=maintenant,
+                    libelle="Suppression de l'acquisition",
+                ))
+
+        if mouvements:
+            MouvementConges.objects.bulk_create(mouvements)
+            invalider_apres_commit(MouvementConges, 'absence')
+
+    @staticmethod
+    def recalculer_annee(annee_reference):
+        """
+        Rapproche en une passe le registre et les acquisitions d'une année.
+
+        1. Totaux du registre par employé et par composante (une requête
+           agrégée) comparés aux AcquisitionConges de l'année (une requête).
+        2. Les écarts (écritures faites hors registre : admin, imports, SQL)
+           sont enregistrés comme mouvements de rapprochement (bulk_create),
+           les acquisitions manquantes sont créées à partir du registre et
+           jours_restants est recalculé (bulk_update).
+        3. Les soldes courants (solde_apres) sont recalculés par une somme
+           fenêtrée par employé, dans l'ordre des mouvements.
+
+        Returns:
+            dict: {'acquisitions', 'mouvements_crees', 'acquisitions_creees',
+                   'acquisitions_corrigees', 'soldes_corriges'}
+        """
+        from django.utils import timezone
+        from absence.models import AcquisitionConges, MouvementConges
+
+        totaux = {
+            ligne['employe']: ligne
+            for ligne in MouvementConges.objects.filter(
+                annee_reference=annee_reference
+            ).values('employe').annotate(
+                acquis=Sum('jours', filter=Q(type_mouvement='ACQUISITION'), default=ZERO),
+                report=Sum('jours', filter=Q(type_mouvement='AJUSTEMENT'), default=ZERO),
+                pris=Sum('jours', filter=Q(type_mouvement__in=['CONSOMMATION', 'RESTITUTION']), default=ZERO),
+            ).order_by()
+        }
+
+        maintenant = timezone.now()
+        mouvements = []
+        a_corriger = []
+        a_creer = []
+
+        with transaction.atomic():
+            acquisitions = list(AcquisitionConges.objects.select_for_update().filter(
+                annee_reference=annee_reference
+            ))
+
+            for acquisition in acquisitions:
+                registre = totaux.pop(acquisition.employe_id, None) or {'acquis': ZERO, 'report': ZERO, 'pris': ZERO}
+                solde = registre['acquis'] + registre['report'] + registre['pris']
+                # Variation du solde qui aligne le registre sur chaque composante
+                # (registre['pris'] est négatif : somme des consommations)
+                ecarts = (
+                    ('ACQUISITION', acquisition.jours_acquis - registre['acquis']),
+                    ('AJUSTEMENT', acquisition.jours_report_anterieur - registre['report']),
+                    ('CONSOMMATION', -(acquisition.jours_pris + registre['pris'])),
+                )
+                for type_mouvement, jours in ecarts:
+                    if jours:
+                        solde += jours
+                        mouvements.append(MouvementConges(
+                            employe_id=acquisition.employe_id,
+                            annee_reference=annee_reference,
+                            type_mouvement=type_mouvement,
+                            jours=jours,
+                            solde_apres=solde,
+                            date_mouvement=maintenant,
+                            libelle='Rapprochement',
+                        ))
+
+                restants = acquisition.jours_acquis + acquisition.jours_report_anterieur - acquisition.jours_pris
+                if acquisition.jours_restants != restants:
+                    acquisition.jours_restants = restants
+                    a_corriger.append(acquisition)
+
+            # Mouvements sans acquisition : l'acquisition est reconstruite du registre
+            for employe_id, registre in totaux.items():
+                if not (registre['acquis'] or registre['report'] or registre['pris']):
+                    # Registre soldé (acquisition supprimée) : rien à reconstruire
+                    continue
+                a_creer.append(AcquisitionConges(
+                    employe_id=employe_id,
+                    annee_reference=annee_reference,
+                    jours_acquis=registre['acquis'],
+                    jours_report_anterieur=registre['report'],
+                    jours_pris=-registre['pris'],
+                    jours_restants=registre['acquis'] + registre['report'] + registre['pris'],
+                ))
+
+            MouvementConges.objects.bulk_create(mouvements, batch_size=500)
+            AcquisitionConges.objects.bulk_create(a_creer, batch_size=500)
+            AcquisitionConges.objects.bulk_update(a_corriger, ['jours_restants'], batch_size=500)
+
+            cumuls = MouvementConges.objects.filter(
+                annee_reference=annee_reference
+            ).annotate(
+                cumul=Window(
+                    Sum('jours'),
+                    partition_by=[F('employe')],
+                    order_by=[F('date_mouvement').asc(), F('id').asc()],
+                )
+            ).values_list('pk', 'solde_apres', 'cumul')
+            soldes = [
+                MouvementConges(pk=pk, solde_apres=cumul)
+                for pk, solde_apres, cumul in cumuls
+                if solde_apres != cumul
+            ]
+            MouvementConges.objects.bulk_update(soldes, ['solde_apres'], batch_size=500)
+
+        if mouvements or a_creer or a_corriger or soldes:
+            invalider_apres_commit(AcquisitionConges, MouvementConges, 'absence')
+            logger.info(
+                "Rapprochement %s : %s mouvement(s), %s acquisition(s) créée(s), %s corrigée(s), %s solde(s)",
+                annee_reference, len(mouvements), len(a_creer), len(a_corriger), len(soldes)
+            )
+
+        return {
+            'acquisitions': len(acquisitions),
+            'mouvements_crees': len(mouvements),
+            'acquisitions_creees': len(a_creer),
+            'acquisitions_corrigees': len(a_corriger),
+            'soldes_corriges': len(soldes),
+        }
@@ -8,6 +8,8 @@ import logging
 
 from django.utils import timezone
 
+from core.chevauchement import filtrer_chevauchements
+
 logger = logging.getLogger(__name__)
 
 
@@ -71,15 +73,12 @@ class ValidationService:
         if exclude_pk:
             qs = qs.exclude(pk=exclude_pk)
 
-        # Vérifier le chevauchement
-        overlapping = qs.filter(
-            date_debut__lte=date_fin,
-            date_fin__gte=date_debut
-        )
+        # Vérifier le chevauchement (une requête, index GiST sous PostgreSQL)
+        overlapping = list(filtrer_chevauchements(qs, date_debut, date_fin))
 
         return {
-            'has_overlap': overlapping.exists(),
-            'overlapping_absences': list(overlapping)
+            'has_overlap': bool(overlapping),
+            'overlapping_absences': overlapping
         }
 
     @staticmethod
@@ -214,35 +213,20 @@ class ValidationService:
         Returns:
             dict: Résultat avec 'can_validate' et 'reason'
         """
-        from departement.models import ZYMA
-
         if absence.statut != 'EN_ATTENTE_MANAGER':
             return {
                 'can_validate': False,
                 'reason': "L'absence n'est pas en attente de validation manager"
             }
 
-        # Vérifier que le manager gère le département de l'employé
-        affectation = absence.employe.affectations.filter(
-            date_fin__isnull=True
-        ).first()
-
-        if not affectation or not affectation.poste:
+        # Validateur attendu : manager actif du département de l'employé (ApprobationService)
+        if absence.validateur_attendu_id is None:
             return {
                 'can_validate': False,
-                'reason': "L'employé n'a pas d'affectation active"
+                'reason': "L'employé n'a pas d'affectation active dans un département avec manager"
             }
 
-        departement = affectation.poste.DEPARTEMENT
-
-        is_manager = ZYMA.objects.filter(
-            employe=manager,
-            departement=departement,
-            actif=True,
-            date_fin__isnull=True
-        ).exists()
-
-        if not is_manager:
+        if absence.validateur_attendu_id != manager.pk:
             return {
                 'can_validate': False,
                 'reason': "Vous n'êtes pas le manager du département de cet employé"
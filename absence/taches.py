@@ -0,0 +1,141 @@
+# absence/taches.py
+"""
+Tâches de fond de l'application absence (voir core.taches).
+"""
+from datetime import date
+from decimal import Decimal
+
+from core.taches import tache
+
+
+@tache('absence.calculer_acquisitions')
+def calculer_acquisitions(job, annee, recalculer=False, date_reference=None,
+                          matricules=None, inactifs_exclus=0):
+    """
+    Calcule les acquisitions de congés d'une année pour les employés actifs.
+
+    Args:
+        annee: année de référence
+        recalculer: recalcule aussi les acquisitions existantes
+        date_reference: date ISO de calcul (défaut : aujourd'hui)
+        matricules: employés sélectionnés (défaut : tous les actifs)
+        inactifs_exclus: nombre d'inactifs écartés de la sélection (message)
+    """
+    from absence.models import AcquisitionConges
+    from absence.services.solde_service import SoldeService
+    from absence.utils import calculer_jours_acquis_au
+    from employee.models import ZY00
+
+    date_reference = date.fromisoformat(date_reference) if date_reference else date.today()
+
+    employes = ZY00.objects.filter(etat='actif', entreprise__isnull=False)
+    if matricules:
+        employes = employes.filter(matricule__in=matricules)
+    employes = list(employes.order_by('matricule'))
+
+    resultats = {
+        'total': 0,
+        'crees': 0,
+        'mis_a_jour': 0,
+        'ignores': 0,
+        'erreurs': 0,
+        'details_erreurs': []
+    }
+
+    for employe in employes:
+        resultats['total'] += 1
+        job.avancer(resultats['total'], len(employes), f"{resultats['total']}/{len(employes)} employé(s) traité(s)")
+
+        try:
+            if not employe.convention_applicable:
+                resultats['erreurs'] += 1
+                resultats['details_erreurs'].append({
+                    'employe': str(employe),
+                    'erreur': 'Aucune convention applicable'
+                })
+                continue
+
+            acquisition, created = AcquisitionConges.objects.get_or_create(
+                employe=employe,
+                annee_reference=annee,
+                defaults={
+                    'jours_acquis': Decimal('0.00'),
+                    'jours_pris': Decimal('0.00'),
+                    'jours_restants': Decimal('0.00'),
+                    'jours_report_anterieur': Decimal('0.00'),
+                    'jours_report_nouveau': Decimal('0.00'),
+                }
+            )
+
+            if created or recalculer:
+                resultat = calculer_jours_acquis_au(employe, annee, date_reference)
+
+                SoldeService.fixer_acquis(acquisition, resultat['jours_acquis'])
+
+                if created:
+                    resultats['crees'] += 1
+                else:
+                    resultats['mis_a_jour'] += 1
+            else:
+                resultats['ignores'] += 1
+
+        except Exception as e:
+            resultats['erreurs'] += 1
+            resultats['details_erreurs'].append({
+                'employe': str(employe),
+                'erreur': str(e)
+            })
+
+    message_parts = [
+        f'{resultats["crees"]} créées',
+        f'{resultats["mis_a_jour"]} mises à jour',
+        f'{resultats["ignores"]} ignorées'
+    ]
+
+    if resultats['erreurs'] > 0:
+        message_parts.append(f'{resultats["erreurs"]} erreurs')
+
+    if inactifs_exclus > 0:
+        message_parts.append(f'{inactifs_exclus} inactif(s) exclu(s)')
+
+    return {
+        'message': ', '.join(message_parts),
+        'resultats': resultats
+    }
+
+
+@tache('absence.cloturer_mois')
+def cloturer_mois(job, annee, mois, nb_tranches=1, tranches=None, recalculer=False):
+    """
+    Fige un mois d'acquisition pour tous les employés actifs (voir
+    absence.services.cloture_service). Relancer la tâche reprend une
+    clôture interrompue : les mois déjà figés sont ignorés.
+
+    Args:
+        annee: année de référence
+        mois: mois à figer (1-12)
+        nb_tranches: nombre de tranches d'employés (une transaction par tranche)
+        tranches: tranches à traiter (défaut : toutes)
+        recalculer: refige aussi les mois déjà figés
+    """
+    from absence.services.cloture_service import ClotureService
+
+    resultat = ClotureService.cloturer_mois(
+        annee, mois,
+        nb_tranches=nb_tranches,
+        tranches=tranches,
+        recalculer=recalculer,
+        avancer=job.avancer
+    )
+
+    message_parts = [
+        f'{resultat["figes"]} figé(s)',
+        f'{resultat["deja_figes"]} déjà figé(s)',
+    ]
+    if resultat['erreurs'] > 0:
+        message_parts.append(f'{resultat["erreurs"]} erreurs')
+
+    return {
+        'message': f'Mois {mois:02d}/{annee} : ' + ', '.join(message_parts),
+        'resultats': resultat
+    }
@@ -6,7 +6,10 @@ from datetime import date, timedelta
 from decimal import Decimal
 from unittest.mock import Mock, patch, MagicMock
 
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from core.tests.base import BaseTestCase
 
 
 class TestValidationService(TestCase):
@@ -275,3 +278,459 @@ class TestServiceIntegration(TestCase):
 
         # Tester que validate_date_range est une méthode statique
         self.assertTrue(callable(ValidationService.validate_date_range))
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class TestApprobationService(BaseTestCase):
+    """Tests pour le validateur attendu des absences (ApprobationService)."""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.create_affectation(self.employe)
+        self.type_absence = self.create_type_absence(code='AUT', decompte_solde=False)
+
+    def soumettre(self):
+        return self.create_absence(type_absence=self.type_absence, statut='EN_ATTENTE_MANAGER')
+
+    def test_validateur_attendu_a_la_soumission(self):
+        """Le manager du département est enregistré ; la boîte de validation tient en une requête."""
+        from absence.services import ApprobationService, ValidationService
+
+        manager, _ = self.create_manager_user()
+        autre = self.create_employee(matricule='AUTRE001')
+        absence = self.soumettre()
+
+        self.assertEqual(absence.validateur_attendu, manager)
+        with self.assertNumQueries(1):
+            self.assertEqual(list(ApprobationService.a_valider_manager(manager)), [absence])
+        self.assertFalse(ApprobationService.a_valider_manager(autre).exists())
+        self.assertTrue(ValidationService.can_manager_validate(absence, manager)['can_validate'])
+        self.assertFalse(ValidationService.can_manager_validate(absence, autre)['can_validate'])
+
+    def test_recalcul_quand_la_hierarchie_change(self):
+        """Une absence soumise sans manager est réaffectée à la nomination du manager."""
+        absence = self.soumettre()
+        self.assertIsNone(absence.validateur_attendu_id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            manager, _ = self.create_manager_user()
+
+        absence.refresh_from_db()
+        self.assertEqual(absence.validateur_attendu, manager)
+
+    def test_compteurs_en_cache_par_valideur(self):
+        """Les compteurs sont relus du cache puis invalidés par les absences."""
+        from absence.services import ApprobationService
+
+        manager, _ = self.create_manager_user()
+        absence = self.soumettre()
+
+        self.assertEqual(ApprobationService.compteurs(manager), {'manager': 1, 'rh': 0})
+        with self.assertNumQueries(0):
+            ApprobationService.compteurs(manager)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            absence.statut = 'EN_ATTENTE_RH'
+            absence.save(update_fields=['statut'])
+        self.assertEqual(ApprobationService.compteurs(manager), {'manager': 0, 'rh': 1})
+
+    def test_compteurs_de_l_en_tete(self):
+        """Les compteurs de l'en-tête ne partagent pas le nom de la liste des vues de validation."""
+        from django.test import RequestFactory
+        from absence.context_processors import notifications_absences
+
+        manager, user = self.create_manager_user()
+        self.soumettre()
+        request = RequestFactory().get('/')
+        request.user = user
+
+        contexte = notifications_absences(request)
+
+        self.assertEqual(contexte['compteurs_validation'], {'manager': 1, 'rh': 0})
+        self.assertNotIn('absences_a_valider', contexte)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class TestSoldeService(BaseTestCase):
+    """Tests pour le registre des soldes de congés (SoldeService)."""
+
+    def setUp(self):
+        super().setUp()
+        from absence.models import AcquisitionConges
+
+        self.annee = date.today().year - 1
+        self.acquisition = AcquisitionConges.objects.create(
+            employe=self.employe,
+            annee_reference=self.annee,
+        )
+
+    def test_mouvements_et_solde_courant(self):
+        """Chaque mouvement met à jour l'acquisition et fige le solde courant."""
+        from absence.services import SoldeService
+
+        SoldeService.fixer_acquis(self.acquisition, Decimal('25.00'))
+        SoldeService.fixer_report(self.acquisition, Decimal('3.00'))
+        # UPDATE F(), lecture du solde, INSERT du mouvement (+ SAVEPOINT / RELEASE)
+        with self.assertNumQueries(5):
+            mouvement = SoldeService.enregistrer(self.employe, self.annee, 'CONSOMMATION', Decimal('-5.00'))
+
+        self.assertEqual(mouvement.solde_apres, Decimal('23.00'))
+        self.acquisition.refresh_from_db()
+        self.assertEqual(self.acquisition.jours_acquis, Decimal('25.00'))
+        self.assertEqual(self.acquisition.jours_report_anterieur, Decimal('3.00'))
+        self.assertEqual(self.acquisition.jours_pris, Decimal('5.00'))
+        self.assertEqual(self.acquisition.jours_restants, Decimal('23.00'))
+        with self.assertNumQueries(1):
+            self.assertEqual(SoldeService.solde(self.employe, self.annee), Decimal('23.00'))
+
+        # Valeur inchangée : pas de mouvement
+        self.assertIsNone(SoldeService.fixer_acquis(self.acquisition, Decimal('25.00')))
+
+    def test_solde_a_une_date(self):
+        """Le solde à une date est celui du dernier mouvement antérieur."""
+        from django.utils import timezone
+        from absence.services import SoldeService
+
+        debut = timezone.now() - timedelta(days=60)
+        SoldeService.enregistrer(self.employe, self.annee, 'ACQUISITION', Decimal('10.00'), date_mouvement=debut)
+        SoldeService.enregistrer(
+            self.employe, self.annee, 'CONSOMMATION', Decimal('-4.00'), date_mouvement=debut + timedelta(days=30)
+        )
+
+        self.assertEqual(SoldeService.solde(self.employe, self.annee, au=debut - timedelta(days=1)), Decimal('0.00'))
+        self.assertEqual(SoldeService.solde(self.employe, self.annee, au=debut + timedelta(days=1)), Decimal('10.00'))
+        self.assertEqual(SoldeService.solde(self.employe, self.annee, au=timezone.now()), Decimal('6.00'))
+
+    def test_validation_et_annulation_d_une_absence(self):
+        """La validation décompte le solde, l'annulation le restitue."""
+        from absence.models import MouvementConges
+        from absence.services import SoldeService
+
+        SoldeService.fixer_acquis(self.acquisition, Decimal('20.00'))
+        absence = self.create_absence(
+            date_debut=date(self.annee + 1, 3, 2),
+            date_fin=date(self.annee + 1, 3, 6),
+            statut='VALIDE',
+        )
+
+        absence.decompter_solde()
+        self.assertEqual(absence.get_solde_disponible(), Decimal('20.00') - absence.jours_ouvrables)
+        absence.restituer_solde()
+        self.assertEqual(absence.get_solde_disponible(), Decimal('20.00'))
+        self.assertEqual(
+            list(absence.mouvements_conges.values_list('type_mouvement', flat=True).order_by('id')),
+            ['CONSOMMATION', 'RESTITUTION']
+        )
+        self.assertEqual(MouvementConges.objects.filter(employe=self.employe).count(), 3)
+
+    def test_recalculer_annee_rapproche_registre_et_acquisitions(self):
+        """Les écritures hors registre sont rapprochées et les soldes courants recalculés."""
+        from absence.models import AcquisitionConges, MouvementConges
+        from absence.services import SoldeService
+
+        SoldeService.fixer_acquis(self.acquisition, Decimal('20.00'))
+        # Écriture directe (admin, SQL) : le registre ignore ces 2 jours pris
+        AcquisitionConges.objects.filter(pk=self.acquisition.pk).update(jours_pris=Decimal('2.00'))
+        # Mouvement d'un employé sans acquisition pour l'année
+        autre = self.create_employee(matricule='AUTRE001')
+        MouvementConges.objects.create(
+            employe=autre, annee_reference=self.annee, type_mouvement='ACQUISITION',
+            jours=Decimal('5.00'), solde_apres=Decimal('0.00'),
+        )
+
+        resultat = SoldeService.recalculer_annee(self.annee)
+
+        self.assertEqual(resultat['mouvements_crees'], 1)
+        self.assertEqual(resultat['acquisitions_creees'], 1)
+        self.assertEqual(resultat['acquisitions_corrigees'], 1)
+        self.assertEqual(resultat['soldes_corriges'], 1)
+        self.assertEqual(SoldeService.solde(self.employe, self.annee), Decimal('18.00'))
+        self.assertEqual(SoldeService.solde(autre, self.annee), Decimal('5.00'))
+        self.assertEqual(
+            MouvementConges.objects.filter(employe=self.employe).latest('date_mouvement', 'id').solde_apres,
+            Decimal('18.00')
+        )
+
+        # Registre et acquisitions alignés : rien à faire au second passage
+        self.assertEqual(SoldeService.recalculer_annee(self.annee)['mouvements_crees'], 0)
+
+    def test_suppression_d_une_acquisition_conserve_le_registre(self):
+        """La suppression (instance ou queryset) est inscrite au registre, jamais effacée."""
+        from absence.models import AcquisitionConges, MouvementConges
+        from absence.services import SoldeService
+
+        SoldeService.fixer_acquis(self.acquisition, Decimal('20.00'))
+        SoldeService.enregistrer(self.employe, self.annee, 'CONSOMMATION', Decimal('-4.00'))
+
+        AcquisitionConges.objects.filter(pk=self.acquisition.pk).delete()
+
+        mouvements = MouvementConges.objects.filter(employe=self.employe, annee_reference=self.annee)
+        self.assertEqual(
+            list(mouvements.values_list('type_mouvement', 'jours', 'solde_apres')),
+            [
+                ('ACQUISITION', Decimal('20.00'), Decimal('20.00')),
+                ('CONSOMMATION', Decimal('-4.00'), Decimal('16.00')),
+                ('ACQUISITION', Decimal('-20.00'), Decimal('-4.00')),
+                ('RESTITUTION', Decimal('4.00'), Decimal('0.00')),
+            ]
+        )
+        # Registre soldé : le rapprochement ne recrée pas l'acquisition
+        self.assertEqual(SoldeService.recalculer_annee(self.annee)['acquisitions_creees'], 0)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class TestClotureService(BaseTestCase):
+    """Tests pour la clôture mensuelle des acquisitions (ClotureService)."""
+
+    def setUp(self):
+        super().setUp()
+        from absence.models import ConfigurationConventionnelle
+        from employee.models import ZYCO
+        from entreprise.models import Entreprise
+
+        cache.clear()
+        self.annee = 2025
+        self.convention = ConfigurationConventionnelle.objects.create(
+            nom='Convention test', code='CONVTEST',
+            annee_reference=self.annee,
+            date_debut=date(self.annee, 1, 1),
+            jours_acquis_par_mois=Decimal('2.50'),
+            periode_prise_debut=date(self.annee, 1, 1),
+            periode_prise_fin=date(self.annee, 12, 31),
+        )
+        entreprise = Entreprise.objects.create(
+            code='ENT001', nom='Entreprise Test', raison_sociale='Entreprise Test SARL',
+            numero_impot='123456789', rccm='RCCM123', adresse='123 Rue Test',
+            ville='Lomé', pays='Togo', configuration_conventionnelle=self.convention,
+        )
+        self.employes = []
+        for numero in range(3):
+            employe = self.create_employee(matricule=f'CLOT{numero:04d}', entreprise=entreprise)
+            ZYCO.objects.create(employe=employe, type_contrat='CDI', date_debut=date(2020, 1, 1))
+            self.employes.append(employe)
+        # Un employé sans convention : erreur signalée, la clôture continue
+        self.create_employee(matricule='SANSCONV', entreprise=Entreprise.objects.create(
+            code='ENT002', nom='Autre', raison_sociale='Autre SARL', numero_impot='987654321',
+            rccm='RCCM987', adresse='1 Rue', ville='Lomé', pays='Togo',
+        ))
+
+    def test_cloture_fige_le_mois_comme_figer_mois(self):
+        """La clôture fige le mois de tous les employés avec le calcul individuel."""
+        from absence.models import AcquisitionConges
+        from absence.services import AcquisitionService, ClotureService
+
+        existante = AcquisitionConges.objects.create(
+            employe=self.employes[0], annee_reference=self.annee,
+            detail_mensuel={'02': {'jours_acquis': '5.00', 'fige': True}},
+        )
+
+        with patch('absence.services.cloture_service.invalider_apres_commit') as invalider:
+            resultat = ClotureService.cloturer_mois(self.annee, 3)
+        # Les écritures en masse invalident aussi le cache de l'application
+        invalider.assert_called_once_with(AcquisitionConges, 'absence')
+
+        self.assertEqual(resultat['figes'], 3)
+        self.assertEqual(resultat['crees'], 2)
+        self.assertEqual(resultat['erreurs'], 1)
+        self.assertEqual(resultat['details_erreurs'][0]['matricule'], 'SANSCONV')
+        self.assertEqual(set(resultat['durees']), {'chargement', 'calcul', 'ecriture'})
+
+        attendu = AcquisitionService.calculer_jours_acquis_au(self.employes[0], self.annee, date(self.annee, 3, 31))
+        for employe in self.employes:
+            acquisition = AcquisitionConges.objects.get(employe=employe, annee_reference=self.annee)
+            self.assertTrue(acquisition.est_mois_fige(3))
+            self.assertEqual(acquisition.get_jours_mois(3)['jours_acquis'], str(attendu['jours_acquis']))
+        existante.refresh_from_db()
+        self.assertTrue(existante.est_mois_fige(2))
+
+    def test_cloture_idempotente_et_par_tranches(self):
+        """Les tranches se complètent ; une seconde clôture ne modifie rien."""
+        from absence.models import AcquisitionConges
+        from absence.services import ClotureService
+
+        premiere = ClotureService.cloturer_mois(self.annee, 3, nb_tranches=2, tranches=[0])
+        seconde = ClotureService.cloturer_mois(self.annee, 3, nb_tranches=2, tranches=[1])
+        self.assertEqual(premiere['figes'] + seconde['figes'], 3)
+        self.assertEqual(AcquisitionConges.objects.filter(annee_reference=self.annee).count(), 3)
+
+        figements = dict(AcquisitionConges.objects.values_list('employe', 'detail_mensuel'))
+        reprise = ClotureService.cloturer_mois(self.annee, 3, nb_tranches=2)
+        self.assertEqual(reprise['figes'], 0)
+        self.assertEqual(reprise['deja_figes'], 3)
+        self.assertEqual(dict(AcquisitionConges.objects.values_list('employe', 'detail_mensuel')), figements)
+
+        self.assertEqual(ClotureService.cloturer_mois(self.annee, 3, recalculer=True)['figes'], 3)
+        with self.assertRaises(ValueError):
+            ClotureService.cloturer_mois(self.annee, 3, nb_tranches=2, tranches=[2])
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class TestImportAbsencesService(BaseTestCase):
+    """Tests pour l'import en masse d'absences (ImportAbsencesService)."""
+
+    def setUp(self):
+        super().setUp()
+        from absence.models import AcquisitionConges
+        from absence.services import SoldeService
+
+        cache.clear()
+        self.create_affectation(self.employe)
+        self.manager, _ = self.create_manager_user()
+        self.conges = self.create_type_absence(code='CPN')
+        self.autorisation = self.create_type_absence(code='AUT', libelle='Autorisation', decompte_solde=False)
+        SoldeService.fixer_acquis(
+            AcquisitionConges.objects.create(employe=self.employe, annee_reference=2025), Decimal('10.00')
+        )
+        self.create_absence(
+            type_absence=self.autorisation, date_debut=date(2026, 2, 2), date_fin=date(2026, 2, 6), statut='VALIDE'
+        )
+
+    def fichier_csv(self, lignes):
+        import os
+        import tempfile
+
+        fichier = tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False, encoding='utf-8')
+        fichier.write('Matricule;Type_CODE;Date_debut;Date_fin;Periode;Statut;Motif\n')
+        fichier.write('\n'.join(lignes) + '\n')
+        fichier.close()
+        self.addCleanup(os.remove, fichier.name)
+        return fichier.name
+
+    def test_import_controle_et_ecrit_par_lot(self):
+        """Jours, chevauchements et soldes contrôlés en bloc ; lignes valides écrites avec traces et solde."""
+        from absence.models import Absence, NotificationAbsence, ValidationAbsence
+        from absence.services import ImportAbsencesService, SoldeService
+
+        fichier = self.fichier_csv([
+            'BASE0001;CPN;2026-03-02;2026-03-06;;VALIDE;Reprise',
+            'BASE0001;cpn;10/03/2026;10/03/2026;matin;EN_ATTENTE_MANAGER;Rendez-vous',
+            'BASE0001;AUT;2026-02-04;2026-02-05;;VALIDE;',
+            'BASE0001;AUT;2026-03-05;2026-03-09;;VALIDE;',
+            'BASE0001;CPN;2026-04-06;2026-04-10;;VALIDE;',
+            'INCONNU;CPN;2026-05-04;2026-05-04;;VALIDE;',
+            'BASE0001;XXX;2026-13-01;2026-05-04;;VALIDE;',
+        ])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            resultat = ImportAbsencesService(fichier, auteur=self.manager).executer()
+
+        self.assertEqual(resultat['stats']['creees'], 2)
+        erreurs = {erreur['ligne']: erreur['erreur'] for erreur in resultat['erreurs']}
+        self.assertEqual(set(erreurs), {4, 5, 6, 7, 8})
+        self.assertIn("Chevauche l'absence du 02/02/2026", erreurs[4])
+        self.assertIn('Chevauche une autre ligne du fichier', erreurs[5])
+        self.assertIn('Solde insuffisant', erreurs[6])
+        self.assertIn('Employé INCONNU non trouvé', erreurs[7])
+        self.assertIn("Type d'absence XXX non trouvé", erreurs[8])
+        self.assertIn('Date_debut: valeur invalide', erreurs[8])
+
+        conges = Absence.objects.get(employe=self.employe, date_debut=date(2026, 3, 2))
+        demande = Absence.objects.get(employe=self.employe, date_debut=date(2026, 3, 10))
+        # Même décompte que la saisie
+        for absence in (conges, demande):
+            saisie = Absence(date_debut=absence.date_debut, date_fin=absence.date_fin, periode=absence.periode)
+            saisie.calculer_jours()
+            self.assertEqual(absence.jours_ouvrables, saisie.jours_ouvrables)
+            self.assertEqual(absence.jours_calendaires, saisie.jours_calendaires)
+        self.assertEqual(demande.jours_ouvrables, Decimal('0.50'))
+
+        self.assertEqual(demande.validateur_attendu, self.manager)
+        self.assertTrue(ValidationAbsence.objects.filter(absence=conges, etape='RH', decision='APPROUVE').exists())
+        self.assertEqual(SoldeService.solde(self.employe, 2025), Decimal('5.00'))
+        self.assertTrue(NotificationAbsence.objects.filter(
+            destinataire=self.manager, absence=demande, type_notification='DEMANDE_CREEE'
+        ).exists())
+
+    def test_simulation_n_ecrit_rien(self):
+        """En simulation, les contrôles sont faits mais rien n'est écrit."""
+        from absence.models import Absence
+        from absence.services import ImportAbsencesService
+
+        fichier = self.fichier_csv(['BASE0001;CPN;2026-03-02;2026-03-06;;VALIDE;'])
+
+        resultat = ImportAbsencesService(fichier, dry_run=True).executer()
+
+        self.assertEqual(resultat['stats']['par_statut'], {'VALIDE': 1})
+        self.assertEqual(resultat['stats']['creees'], 0)
+        self.assertFalse(Absence.objects.filter(date_debut=date(2026, 3, 2)).exists())
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class TestValidationParLot(BaseTestCase):
+    """Tests pour la validation par lot des absences (ApprobationService.valider_lot)."""
+
+    def setUp(self):
+        super().setUp()
+        from absence.models import AcquisitionConges
+        from absence.services import SoldeService
+
+        cache.clear()
+        self.create_affectation(self.employe)
+        self.manager, _ = self.create_manager_user()
+        self.type_absence = self.create_type_absence(code='CPN')
+        SoldeService.fixer_acquis(
+            AcquisitionConges.objects.create(employe=self.employe, annee_reference=2025), Decimal('20.00')
+        )
+        self.absences = [
+            self.create_absence(
+                type_absence=self.type_absence, statut='EN_ATTENTE_MANAGER',
+                date_debut=date(2026, 3, 2 + 7 * semaine), date_fin=date(2026, 3, 3 + 7 * semaine),
+            )
+            for semaine in range(3)
+        ]
+
+    def test_validation_manager_puis_rh(self):
+        """Le manager transmet le lot aux RH, les RH valident et le solde est décompté."""
+        from absence.models import NotificationAbsence, ValidationAbsence
+        from absence.services import ApprobationService, SoldeService
+        from core.cache import versions
+        from employee.models import ZYRO
+
+        autre = self.create_employee(matricule='AUTRE001')
+        ids = [absence.pk for absence in self.absences]
+        version = versions(['absence'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            resultat = ApprobationService.valider_lot(ids + [0], self.manager, commentaire='OK')
+        self.assertEqual(resultat['transmises_rh'], 3)
+        # bulk_update sans signal : les caches de l'application (tableau de bord) sont invalidés
+        self.assertNotEqual(versions(['absence']), version)
+        self.assertEqual([refus['id'] for refus in resultat['refusees']], [0])
+        self.assertEqual(ValidationAbsence.objects.filter(absence_id__in=ids, etape='MANAGER').count(), 3)
+        self.assertEqual(NotificationAbsence.objects.filter(
+            destinataire=self.employe, type_notification='VALIDATION_MANAGER'
+        ).count(), 3)
+
+        # Un employé sans droit RH ne traite rien
+        refus = ApprobationService.valider_lot(ids, autre)
+        self.assertEqual(len(refus['refusees']), 3)
+
+        self.assign_role(autre, ZYRO.objects.create(CODE='RH_VALIDATION', LIBELLE='Validation RH', actif=True))
+        with self.captureOnCommitCallbacks(execute=True):
+            resultat = ApprobationService.valider_lot(ids, autre)
+        self.assertEqual(resultat['validees'], 3)
+        self.assertEqual(SoldeService.solde(self.employe, 2025), Decimal('14.00'))
+        self.assertEqual(
+            list(self.absences[2].mouvements_conges.values_list('solde_apres', flat=True)), [Decimal('14.00')]
+        )
+
+    def test_rejet_par_lot(self):
+        """Un rejet ne décompte pas le solde ; seul le validateur attendu peut décider."""
+        from absence.models import Absence
+        from absence.services import ApprobationService, SoldeService
+
+        autre = self.create_employee(matricule='AUTRE001')
+        self.assertEqual(len(ApprobationService.valider_lot([self.absences[0].pk], autre)['refusees']), 1)
+
+        resultat = ApprobationService.valider_lot(
+            [self.absences[0].pk], self.manager, decision='REJETE', commentaire='Période chargée'
+        )
+
+        self.assertEqual(resultat['rejetees'], 1)
+        absence = Absence.objects.get(pk=self.absences[0].pk)
+        self.assertEqual(absence.statut, 'REJETE')
+        self.assertEqual(absence.commentaire_manager, 'Période chargée')
+        self.assertEqual(SoldeService.solde(self.employe, 2025), Decimal('20.00'))
+        with self.assertRaises(ValueError):
+            ApprobationService.valider_lot([self.absences[1].pk], self.manager, decision='RETOURNE')
@@ -33,6 +33,8 @@ from absence.views_api import (
     api_absence_delete,
     api_absence_annuler,
     api_valider_absence,
+    api_valider_lot,
+    api_import_absences,
     api_historique_validation,
     api_verifier_solde,
     api_mes_absences_calendrier,
@@ -95,6 +97,8 @@ urlpatterns = [
     path('api/absence/<int:id>/annuler/', api_absence_annuler, name='api_absence_annuler'),
     path('api/absence/<int:id>/valider/', api_valider_absence, name='api_valider_absence'),
     path('api/absence/<int:id>/historique/', api_historique_validation, name='api_historique_validation'),
+    path('api/absences/valider-lot/', api_valider_lot, name='api_valider_lot'),
+    path('api/absences/importer/', api_import_absences, name='api_import_absences'),
     path('api/verifier-solde/', api_verifier_solde, name='api_verifier_solde'),
     path('api/acquisition-employe/<str:employe_id>/<int:annee>/', api_acquisition_employe_annee,
          name='api_acquisition_employe_annee'),
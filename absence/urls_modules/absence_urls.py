@@ -21,6 +21,8 @@ urlpatterns = [
     path('api/absence/<int:id>/annuler/', views.api_absence_annuler, name='api_absence_annuler'),
     path('api/absence/<int:id>/valider/', views.api_valider_absence, name='api_valider_absence'),
     path('api/absence/<int:id>/historique/', views.api_historique_validation, name='api_historique_validation'),
+    path('api/absences/valider-lot/', views.api_valider_lot, name='api_valider_lot'),
+    path('api/absences/importer/', views.api_import_absences, name='api_import_absences'),
     path('api/verifier-solde/', views.api_verifier_solde, name='api_verifier_solde'),
     path('api/acquisition-employe/<str:employe_id>/<int:annee>/', views.api_acquisition_employe_annee,
          name='api_acquisition_employe_annee'),
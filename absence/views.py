@@ -111,6 +111,8 @@ from absence.views_api.absence_api import (
     api_absence_delete,
     api_absence_annuler,
     api_valider_absence,
+    api_valider_lot,
+    api_import_absences,
     api_historique_validation,
     api_verifier_solde,
     api_mes_absences_calendrier,
@@ -183,6 +185,8 @@ __all__ = [
     'api_absence_delete',
     'api_absence_annuler',
     'api_valider_absence',
+    'api_valider_lot',
+    'api_import_absences',
     'api_historique_validation',
     'api_verifier_solde',
     'api_mes_absences_calendrier',
@@ -52,6 +52,8 @@ from .absence_api import (
     api_absence_delete,
     api_absence_annuler,
     api_valider_absence,
+    api_valider_lot,
+    api_import_absences,
     api_historique_validation,
     api_verifier_solde,
     api_mes_absences_calendrier,
@@ -105,6 +107,8 @@ __all__ = [
     'api_absence_delete',
     'api_absence_annuler',
     'api_valider_absence',
+    'api_valider_lot',
+    'api_import_absences',
     'api_historique_validation',
     'api_verifier_solde',
     'api_mes_absences_calendrier',
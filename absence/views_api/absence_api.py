@@ -4,7 +4,6 @@ API pour la gestion des absences.
 """
 import logging
 from datetime import timedelta
-from decimal import Decimal
 
 from django.core.exceptions import ValidationError
 from django.db import transaction
@@ -14,11 +13,22 @@ from django.contrib.auth.decorators import login_required
 from django.views.decorators.http import require_http_methods, require_POST
 from django.utils import timezone
 
-from absence.models import Absence, AcquisitionConges, ValidationAbsence
+from absence.decorators import drh_or_admin_required
+from absence.models import Absence, ValidationAbsence
+from absence.services.approbation_service import ApprobationService
+from absence.services.import_absences_service import ImportAbsencesService
+from absence.services.solde_service import SoldeService
+from core.cache import FamilleCache
+from core.flux import reponse_json_en_cache
 from employee.models import ZY00
 
 logger = logging.getLogger(__name__)
 
+# Calendrier personnel des absences : cache par employé et fenêtre
+CACHE_CALENDRIER_ABSENCES = FamilleCache('absence.calendrier_employe', tags=[
+    'absence.absence', 'absence.typeabsence', 'employee.zy00',
+])
+
 
 @require_http_methods(["GET"])
 @login_required
@@ -216,6 +226,106 @@ def api_valider_absence(request, id):
         }, status=500)
 
 
+@require_POST
+@login_required
+def api_valider_lot(request):
+    """Valider ou rejeter un lot d'absences (manager ou RH), chacune à son étape"""
+    try:
+        user_employe = request.user.employe
+        decision = request.POST.get('decision', 'APPROUVE')
+        commentaire = request.POST.get('commentaire', '').strip()
+
+        try:
+            ids = [int(absence_id) for absence_id in request.POST.getlist('ids')]
+        except ValueError:
+            return JsonResponse({
+                'success': False,
+                'error': 'Identifiants d\'absence invalides'
+            }, status=400)
+
+        if not ids:
+            return JsonResponse({
+                'success': False,
+                'error': 'Aucune absence sélectionnée'
+            }, status=400)
+
+        resultat = ApprobationService.valider_lot(ids, user_employe, decision, commentaire)
+
+        return JsonResponse({
+            'success': True,
+            'message': (
+                f"{resultat['validees']} absence(s) validée(s), "
+                f"{resultat['transmises_rh']} transmise(s) aux RH, "
+                f"{resultat['rejetees']} rejetée(s), {len(resultat['refusees'])} non traitée(s)"
+            ),
+            'resultat': resultat
+        })
+
+    except ValueError as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
+
+    except Exception as e:
+        logger.exception("Erreur validation par lot:")
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=500)
+
+
+@require_POST
+@login_required
+@drh_or_admin_required
+def api_import_absences(request):
+    """Importer un fichier d'absences (CSV ou Excel) ; simulation si dry_run=1"""
+    try:
+        fichier = request.FILES.get('fichier')
+        if not fichier:
+            return JsonResponse({
+                'success': False,
+                'error': 'Fichier requis'
+            }, status=400)
+
+        if not fichier.name.lower().endswith(('.csv', '.xlsx')):
+            return JsonResponse({
+                'success': False,
+                'error': 'Format accepté : .csv ou .xlsx'
+            }, status=400)
+
+        service = ImportAbsencesService(
+            fichier,
+            dry_run=request.POST.get('dry_run') in ('1', 'true', 'on'),
+            auteur=getattr(request.user, 'employe', None),
+            utilisateur=request.user,
+            controler_solde=request.POST.get('controler_solde', '1') in ('1', 'true', 'on'),
+        )
+        resultat = service.executer()
+
+        return JsonResponse({
+            'success': True,
+            'message': (
+                f"{resultat['stats']['creees']} absence(s) importée(s), "
+                f"{resultat['stats']['erreurs']} ligne(s) en erreur"
+            ),
+            'resultat': resultat
+        })
+
+    except ValueError as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=400)
+
+    except Exception as e:
+        logger.exception("Erreur import d'absences:")
+        return JsonResponse({
+            'success': False,
+            'error': str(e)
+        }, status=500)
+
+
 @require_http_methods(["GET"])
 @login_required
 def api_historique_validation(request, id):
@@ -279,14 +389,7 @@ def api_verifier_solde(request):
         annee_absence = date_debut.year
         annee_acquisition = annee_absence - 1
 
-        try:
-            acquisition = AcquisitionConges.objects.get(
-                employe=employe,
-                annee_reference=annee_acquisition
-            )
-            solde_disponible = acquisition.jours_restants
-        except AcquisitionConges.DoesNotExist:
-            solde_disponible = Decimal('0.00')
+        solde_disponible = SoldeService.solde(employe, annee_acquisition)
 
         return JsonResponse({
             'success': True,
@@ -324,29 +427,34 @@ def api_mes_absences_calendrier(request):
         else:
             end_date = start_date + timedelta(days=30)
 
-        absences = Absence.objects.filter(
-            employe=user_employe,
-            date_debut__lte=end_date,
-            date_fin__gte=start_date
-        ).select_related('type_absence')
-
-        data = []
-        for abs in absences:
-            data.append({
-                'id': abs.id,
-                'type_absence': abs.type_absence.libelle,
-                'date_debut': abs.date_debut.strftime('%Y-%m-%d'),
-                'date_fin': abs.date_fin.strftime('%Y-%m-%d'),
-                'jours_ouvrables': str(abs.jours_ouvrables),
-                'statut': abs.statut,
-                'couleur': getattr(abs.type_absence, 'couleur', '#1c5d5f'),
-                'employe': str(abs.employe)
-            })
+        nom_employe = str(user_employe)
 
-        return JsonResponse({
-            'success': True,
-            'absences': data
-        })
+        def calculer():
+            absences = Absence.objects.filter(
+                employe=user_employe,
+                date_debut__lte=end_date,
+                date_fin__gte=start_date
+            ).values(
+                'id', 'type_absence__libelle', 'type_absence__couleur',
+                'date_debut', 'date_fin', 'jours_ouvrables', 'statut'
+            )
+            return {
+                'success': True,
+                'absences': [{
+                    'id': a['id'],
+                    'type_absence': a['type_absence__libelle'],
+                    'date_debut': a['date_debut'].strftime('%Y-%m-%d'),
+                    'date_fin': a['date_fin'].strftime('%Y-%m-%d'),
+                    'jours_ouvrables': str(a['jours_ouvrables']),
+                    'statut': a['statut'],
+                    'couleur': a['type_absence__couleur'] or '#1c5d5f',
+                    'employe': nom_employe,
+                } for a in absences]
+            }
+
+        return reponse_json_en_cache(
+            request, CACHE_CALENDRIER_ABSENCES, calculer, user_employe.pk, start_date, end_date
+        )
 
     except Exception as e:
         logger.exception("ERREUR API Calendrier:")
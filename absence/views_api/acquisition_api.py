@@ -10,14 +10,17 @@ from django.db import transaction
 from django.db.models import Q
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.http import require_http_methods, require_POST
 from django.utils import timezone
 
 from absence.decorators import drh_or_admin_required, gestion_app_required
 from absence.models import AcquisitionConges, ConfigurationConventionnelle
+from absence.services.solde_service import SoldeService
 from absence.forms import CalculAcquisitionForm
 from absence.utils import calculer_jours_acquis_au
+from core.taches import lancer
 from employee.models import ZY00
 
 logger = logging.getLogger(__name__)
@@ -67,15 +70,15 @@ def api_acquisition_create(request):
         date_reference = timezone.now().date()
         resultat = calculer_jours_acquis_au(employe, annee, date_reference)
 
+        auteur = getattr(request.user, 'employe', None)
         with transaction.atomic():
             acquisition = AcquisitionConges.objects.create(
                 employe=employe,
                 annee_reference=annee,
-                jours_acquis=resultat['jours_acquis'],
-                jours_pris=Decimal('0.00'),
-                jours_report_anterieur=Decimal(jours_report_anterieur),
-                jours_report_nouveau=Decimal('0.00'),
             )
+            # Acquis et report initiaux : mouvements du registre des congés
+            SoldeService.fixer_acquis(acquisition, resultat['jours_acquis'], auteur=auteur)
+            SoldeService.fixer_report(acquisition, Decimal(jours_report_anterieur), auteur=auteur)
 
         return JsonResponse({
             'success': True,
@@ -139,9 +142,11 @@ def api_acquisition_update(request, id):
         jours_report_anterieur = request.POST.get('jours_report_anterieur')
 
         if jours_report_anterieur is not None:
-            with transaction.atomic():
-                acquisition.jours_report_anterieur = Decimal(jours_report_anterieur)
-                acquisition.save()
+            SoldeService.fixer_report(
+                acquisition,
+                Decimal(jours_report_anterieur),
+                auteur=getattr(request.user, 'employe', None)
+            )
 
             return JsonResponse({
                 'success': True,
@@ -244,6 +249,7 @@ def api_calculer_acquisitions(request):
             }, status=500)
 
         inactifs_exclus = 0
+        matricules = None
 
         if employes_selection is not None and employes_selection.exists():
             inactifs_exclus = employes_selection.exclude(etat='actif').count()
@@ -251,6 +257,7 @@ def api_calculer_acquisitions(request):
                 etat='actif',
                 entreprise__isnull=False
             )
+            matricules = list(employes.values_list('matricule', flat=True))
         else:
             employes = ZY00.objects.filter(
                 etat='actif',
@@ -263,80 +270,21 @@ def api_calculer_acquisitions(request):
                 'error': 'Aucun employé actif à traiter'
             }, status=400)
 
-        resultats = {
-            'total': 0,
-            'crees': 0,
-            'mis_a_jour': 0,
-            'ignores': 0,
-            'erreurs': 0,
-            'details_erreurs': []
-        }
-
-        for employe in employes:
-            resultats['total'] += 1
-
-            try:
-                if not employe.convention_applicable:
-                    resultats['erreurs'] += 1
-                    resultats['details_erreurs'].append({
-                        'employe': str(employe),
-                        'erreur': 'Aucune convention applicable'
-                    })
-                    continue
-
-                acquisition, created = AcquisitionConges.objects.get_or_create(
-                    employe=employe,
-                    annee_reference=annee,
-                    defaults={
-                        'jours_acquis': Decimal('0.00'),
-                        'jours_pris': Decimal('0.00'),
-                        'jours_restants': Decimal('0.00'),
-                        'jours_report_anterieur': Decimal('0.00'),
-                        'jours_report_nouveau': Decimal('0.00'),
-                    }
-                )
-
-                if created or recalculer:
-                    resultat = calculer_jours_acquis_au(
-                        employe,
-                        annee,
-                        date_reference
-                    )
-
-                    acquisition.jours_acquis = resultat['jours_acquis']
-                    acquisition.save()
-
-                    if created:
-                        resultats['crees'] += 1
-                    else:
-                        resultats['mis_a_jour'] += 1
-                else:
-                    resultats['ignores'] += 1
-
-            except Exception as e:
-                resultats['erreurs'] += 1
-                resultats['details_erreurs'].append({
-                    'employe': str(employe),
-                    'erreur': str(e)
-                })
-
-        message_parts = [
-            f'{resultats["crees"]} créées',
-            f'{resultats["mis_a_jour"]} mises à jour',
-            f'{resultats["ignores"]} ignorées'
-        ]
-
-        if resultats['erreurs'] > 0:
-            message_parts.append(f'{resultats["erreurs"]} erreurs')
-
-        if inactifs_exclus > 0:
-            message_parts.append(f'{inactifs_exclus} inactif(s) exclu(s)')
+        # Boucle sur les employés exécutée en tâche de fond (voir absence.taches)
+        job = lancer('absence.calculer_acquisitions', {
+            'annee': annee,
+            'recalculer': recalculer,
+            'date_reference': date_reference,
+            'matricules': matricules,
+            'inactifs_exclus': inactifs_exclus,
+        }, user=request.user, unique=True)
 
         return JsonResponse({
             'success': True,
-            'message': ', '.join(message_parts),
-            'resultats': resultats
-        })
+            'message': 'Calcul des acquisitions lancé',
+            'tache': job.to_dict(),
+            'url_suivi': reverse('core:suivi_tache', kwargs={'uuid': job.UUID}),
+        }, status=202)
 
     except Exception as e:
         logger.exception("Erreur calcul acquisitions")
@@ -363,9 +311,11 @@ def api_recalculer_acquisition(request, id):
             date_reference
         )
 
-        with transaction.atomic():
-            acquisition.jours_acquis = resultat['jours_acquis']
-            acquisition.save()
+        SoldeService.fixer_acquis(
+            acquisition,
+            resultat['jours_acquis'],
+            auteur=getattr(request.user, 'employe', None)
+        )
 
         return JsonResponse({
             'success': True,
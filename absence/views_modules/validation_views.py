@@ -14,6 +14,8 @@ from django.contrib.auth.decorators import login_required
 
 from absence.decorators import drh_or_admin_required, role_required
 from absence.models import Absence, TypeAbsence
+from absence.services.approbation_service import ApprobationService
+from employee.services.recherche_service import RechercheEmployeService
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +24,7 @@ logger = logging.getLogger(__name__)
 def validation_manager(request):
     """
     Liste des absences à valider pour le manager connecté
-    Basé sur ZYMA (managers de départements) et ZYAF (affectations)
+    Absences dont il est le validateur attendu (ApprobationService)
     """
     user_employe = request.user.employe
 
@@ -30,44 +32,24 @@ def validation_manager(request):
         messages.error(request, "Vous n'avez pas les droits de manager")
         return redirect('absence:liste_absences')
 
-    from departement.models import ZYMA, ZDDE
+    from departement.models import ZDDE
     from employee.models import ZYAF
 
-    departements_geres = ZYMA.objects.filter(
-        employe=user_employe,
-        actif=True,
-        date_fin__isnull=True
-    ).select_related('departement')
+    departements = list(ZDDE.objects.filter(
+        managers__employe=user_employe,
+        managers__actif=True,
+        managers__date_fin__isnull=True
+    ).distinct())
 
-    if not departements_geres.exists():
+    if not departements:
         messages.warning(request, "Aucun département sous votre responsabilité")
         return redirect('absence:liste_absences')
 
-    dept_ids = [d.departement.id for d in departements_geres]
-    departements = ZDDE.objects.filter(id__in=dept_ids)
-
-    employes_ids = ZYAF.objects.filter(
-        poste__DEPARTEMENT__in=dept_ids,
-        date_fin__isnull=True,
-        employe__etat='actif'
-    ).values_list('employe', flat=True).distinct()
-
-    absences = Absence.objects.filter(
-        employe__in=employes_ids,
-        statut='EN_ATTENTE_MANAGER'
-    ).select_related(
+    absences = ApprobationService.a_valider_manager(user_employe).select_related(
         'employe',
         'type_absence'
     ).order_by('date_debut')
 
-    for absence in absences:
-        affectation = ZYAF.objects.filter(
-            employe=absence.employe,
-            date_fin__isnull=True
-        ).select_related('poste__DEPARTEMENT').first()
-
-        absence.employe_departement = affectation.poste.DEPARTEMENT.LIBELLE if affectation else "Non affecté"
-
     departement_filter = request.GET.get('departement', '')
     type_filter = request.GET.get('type_absence', '')
     search = request.GET.get('search', '').strip()
@@ -83,19 +65,20 @@ def validation_manager(request):
         absences = absences.filter(type_absence_id=type_filter)
 
     if search:
-        absences = absences.filter(
-            Q(employe__nom__icontains=search) |
-            Q(employe__prenoms__icontains=search) |
-            Q(employe__matricule__icontains=search)
-        )
+        absences = RechercheEmployeService.filtrer_lies(absences, search, champ='employe')
 
+    totaux = absences.order_by().aggregate(
+        total=Count('id'),
+        employes_count=Count('employe', distinct=True),
+        jours_total=Sum('jours_ouvrables'),
+    )
     stats = {
-        'total': absences.count(),
-        'employes_count': absences.values('employe').distinct().count(),
-        'jours_total': absences.aggregate(Sum('jours_ouvrables'))['jours_ouvrables__sum'] or 0,
+        'total': totaux['total'],
+        'employes_count': totaux['employes_count'],
+        'jours_total': totaux['jours_total'] or 0,
     }
 
-    types_absence = TypeAbsence.objects.filter(actif=True).order_by('libelle')
+    types_absence = sorted(TypeAbsence.actifs(), key=lambda t: t.libelle)
 
     context = {
         'user_employe': user_employe,
@@ -139,11 +122,7 @@ def validation_rh(request):
         absences = absences.filter(type_absence_id=type_filter)
 
     if search:
-        absences = absences.filter(
-            Q(employe__nom__icontains=search) |
-            Q(employe__prenoms__icontains=search) |
-            Q(employe__matricule__icontains=search)
-        )
+        absences = RechercheEmployeService.filtrer_lies(absences, search, champ='employe')
 
     stats = {
         'total': absences.count(),
@@ -151,7 +130,7 @@ def validation_rh(request):
         'jours_total': absences.aggregate(Sum('jours_ouvrables'))['jours_ouvrables__sum'] or 0,
     }
 
-    types_absence = TypeAbsence.objects.filter(actif=True).order_by('libelle')
+    types_absence = sorted(TypeAbsence.actifs(), key=lambda t: t.libelle)
 
     context = {
         'user_employe': user_employe,
@@ -180,7 +159,7 @@ def consultation_absences(request):
         'rh_validateur'
     ).order_by('-date_debut')
 
-    types_absence = TypeAbsence.objects.filter(actif=True)
+    types_absence = TypeAbsence.actifs()
 
     search = request.GET.get('search', '')
     type_absence = request.GET.get('type_absence', '')
@@ -189,11 +168,7 @@ def consultation_absences(request):
     date_fin = request.GET.get('date_fin', '')
 
     if search:
-        absences = absences.filter(
-            Q(employe__nom__icontains=search) |
-            Q(employe__prenoms__icontains=search) |
-            Q(employe__matricule__icontains=search)
-        )
+        absences = RechercheEmployeService.filtrer_lies(absences, search, champ='employe')
 
     if type_absence:
         absences = absences.filter(type_absence_id=type_absence)
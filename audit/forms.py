@@ -79,6 +79,20 @@ class FiltresLogsForm(forms.Form):
             'placeholder': 'Nom de la table'
         })
     )
+    record_id = forms.CharField(
+        required=False,
+        widget=forms.TextInput(attrs={
+            'class': 'form-control',
+            'placeholder': "Clé de l'enregistrement"
+        })
+    )
+    champ = forms.CharField(
+        required=False,
+        widget=forms.TextInput(attrs={
+            'class': 'form-control',
+            'placeholder': 'Champ modifié'
+        })
+    )
     type_mouvement = forms.ChoiceField(
         required=False,
         choices=TYPE_CHOICES,
@@ -93,6 +107,13 @@ class FiltresLogsForm(forms.Form):
         widget=forms.DateInput(attrs={'class': 'form-control', 'type': 'date'})
     )
 
+    def clean_champ(self):
+        champ = self.cleaned_data.get('champ', '').strip()
+        # Nom de champ utilisé comme clé JSON
+        if champ and not champ.replace('_', '').isalnum():
+            raise forms.ValidationError("Nom de champ invalide.")
+        return champ
+
 
 class FiltresAlertesForm(forms.Form):
     """Formulaire de filtres pour les alertes."""
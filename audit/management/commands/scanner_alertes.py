@@ -0,0 +1,83 @@
+# audit/management/commands/scanner_alertes.py
+"""
+Commande Django pour exécuter le scanner consolidé des alertes
+(contrats, visites médicales, matériel, délais GAC).
+
+À planifier quotidiennement (cron / systemd timer).
+
+Usage:
+    python manage.py scanner_alertes
+    python manage.py scanner_alertes --regles contrats materiel
+    python manage.py scanner_alertes --workers 1
+    python manage.py scanner_alertes --dry-run
+    python manage.py scanner_alertes --since 2026-01-31
+"""
+import logging
+from django.core.management.base import BaseCommand
+from audit.scanner import ScannerAlertes, parse_since, regles_par_defaut
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Exécute le scanner consolidé des alertes de conformité (en parallèle, avec chronométrage par règle)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--regles',
+            nargs='+',
+            help='Familles de règles à exécuter (contrats, documents, visites_medicales, materiel, achats)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help='Nombre de règles exécutées en parallèle (défaut: AUDIT_SCANNER_WORKERS ou 4)'
+        )
+        parser.add_argument(
+            '--since',
+            type=str,
+            help='Mode incrémental : documents revérifiés uniquement pour les employés modifiés depuis cette date (AAAA-MM-JJ)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Compter les alertes à créer sans les insérer'
+        )
+
+    def handle(self, *args, **options):
+        regles = regles_par_defaut(since=parse_since(options['since']))
+        if options['regles']:
+            regles = [r for r in regles if r.famille in options['regles'] or r.code in options['regles']]
+
+        self.stdout.write(self.style.WARNING(f"\n{'='*70}"))
+        self.stdout.write(self.style.WARNING("🔍 SCANNER D'ALERTES"))
+        self.stdout.write(self.style.WARNING(f"{'='*70}\n"))
+
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING('MODE SIMULATION - Aucune alerte ne sera créée\n'))
+
+        resultats = ScannerAlertes(
+            regles,
+            max_workers=options['workers'],
+            dry_run=options['dry_run']
+        ).executer()
+
+        for resultat in resultats['regles']:
+            ligne = (
+                f"   {resultat['libelle']:<35} {resultat['nb_candidats']:>5} candidat(s) "
+                f"{len(resultat['alertes']):>5} créée(s)  {resultat['duree']:.3f}s"
+            )
+            if resultat['erreur']:
+                self.stdout.write(self.style.ERROR(f"{ligne}  ❌ {resultat['erreur']}"))
+            else:
+                self.stdout.write(ligne)
+
+        self.stdout.write(self.style.SUCCESS(f"\n✅ Total: {resultats['total_alertes']} alerte(s) créée(s)"))
+        self.stdout.write(f"⏱️  Durée: {resultats['duree']:.2f} secondes")
+        self.stdout.write(self.style.WARNING(f"{'='*70}\n"))
+
+        logger.info(
+            f"Scanner d'alertes terminé: {resultats['total_alertes']} alertes créées "
+            f"en {resultats['duree']:.2f}s"
+        )
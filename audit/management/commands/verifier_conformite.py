@@ -7,11 +7,13 @@ Usage:
     python manage.py verifier_conformite --type contrat
     python manage.py verifier_conformite --type document
     python manage.py verifier_conformite --tous
+    python manage.py verifier_conformite --type document --since 2026-01-31
 """
 import logging
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 from audit.services import ConformiteService
+from audit.scanner import parse_since
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +33,11 @@ class Command(BaseCommand):
             action='store_true',
             help='Exécuter toutes les vérifications'
         )
+        parser.add_argument(
+            '--since',
+            type=str,
+            help='Documents : ne revérifier que les employés dont les documents ont changé depuis cette date (AAAA-MM-JJ)'
+        )
         parser.add_argument(
             '--verbeux',
             action='store_true',
@@ -46,6 +53,7 @@ class Command(BaseCommand):
         type_verification = options.get('type')
         tous = options.get('tous')
         verbeux = options.get('verbeux')
+        since = parse_since(options.get('since'))
 
         total_alertes = 0
         resultats = {}
@@ -79,7 +87,7 @@ class Command(BaseCommand):
         if tous or type_verification == 'document':
             self.stdout.write(self.style.HTTP_INFO("\n📄 Vérification des documents manquants..."))
             try:
-                alertes = ConformiteService.verifier_documents_manquants()
+                alertes = ConformiteService.verifier_documents_manquants(since=since)
                 resultats['documents'] = len(alertes)
                 total_alertes += len(alertes)
 
@@ -0,0 +1,633 @@
+# audit/scanner.py
+"""
+Scanner consolidé des alertes de conformité.
+
+Chaque règle de scan produit ses candidats par une requête ensembliste,
+dédoublonnée contre les alertes ouvertes par une anti-jointure (NOT EXISTS),
+puis les nouvelles alertes sont insérées par bulk_create.
+
+Usage:
+    from audit.scanner import ScannerAlertes
+    resultats = ScannerAlertes().executer()
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import CharField, Exists, Max, OuterRef, Q
+from django.db.models.functions import Cast
+from django.utils import timezone
+
+from .models import AUAL, AURC
+
+logger = logging.getLogger(__name__)
+
+STATUTS_OUVERTS = ['NOUVEAU', 'EN_COURS']
+
+# Nombre d'alertes insérées par bulk_create
+TAILLE_LOT = 500
+
+# Sérialise l'allocation des références AUAL entre les règles exécutées en parallèle
+_verrou_insertion = threading.Lock()
+
+
+def _priorite_par_jours(jours_restants):
+    """Priorité d'une échéance en fonction des jours restants."""
+    if jours_restants <= 7:
+        return 'CRITIQUE'
+    if jours_restants <= 14:
+        return 'HAUTE'
+    if jours_restants <= 30:
+        return 'MOYENNE'
+    return 'BASSE'
+
+
+def allouer_references(nombre):
+    """
+    Alloue `nombre` références AUAL consécutives avec une seule requête.
+
+    Reproduit le format de AUAL._generer_reference (ALAAAA00001).
+    """
+    prefix = f"AL{timezone.now().year}"
+    last_ref = AUAL.objects.filter(
+        REFERENCE__startswith=prefix
+    ).aggregate(Max('REFERENCE'))['REFERENCE__max']
+
+    debut = 1
+    if last_ref:
+        try:
+            debut = int(last_ref[-5:]) + 1
+        except ValueError:
+            debut = 1
+
+    return [f"{prefix}{num:05d}" for num in range(debut, debut + nombre)]
+
+
+def parse_since(valeur):
+    """Convertit une date AAAA-MM-JJ (option --since) en datetime aware."""
+    if not valeur:
+        return None
+    from datetime import datetime
+    from django.core.management.base import CommandError
+    try:
+        jour = datetime.strptime(valeur, '%Y-%m-%d')
+    except ValueError:
+        raise CommandError(f"Date --since invalide : {valeur} (format attendu AAAA-MM-JJ)")
+    return timezone.make_aware(jour)
+
+
+class RegleScan:
+    """
+    Règle de scan de base.
+
+    Une sous-classe définit `candidats()` (requête ensembliste) et
+    `construire_alerte()` (instance AUAL non sauvegardée).
+    """
+    code = ''
+    libelle = ''
+    famille = ''
+    type_alerte = 'AUTRE'
+    table_reference = None
+
+    def __init__(self, regle=None):
+        self.regle = regle
+        self.today = timezone.now().date()
+
+    def candidats(self):
+        """Queryset des enregistrements susceptibles de lever une alerte."""
+        raise NotImplementedError
+
+    def construire_alerte(self, obj):
+        """Construit l'alerte (non sauvegardée) pour un candidat."""
+        raise NotImplementedError
+
+    def alertes_ouvertes(self):
+        """Alertes ouvertes de cette règle, utilisées pour le dédoublonnage."""
+        alertes = AUAL.objects.filter(
+            TYPE_ALERTE=self.type_alerte,
+            STATUT__in=STATUTS_OUVERTS
+        )
+        if self.table_reference:
+            alertes = alertes.filter(TABLE_REFERENCE=self.table_reference)
+        if self.regle:
+            alertes = alertes.filter(REGLE=self.regle)
+        return alertes
+
+    def correspondance(self):
+        """Jointure entre une alerte ouverte et le candidat courant."""
+        return {'RECORD_ID': Cast(OuterRef('pk'), output_field=CharField())}
+
+    def nouveaux_candidats(self):
+        """Candidats sans alerte ouverte (anti-jointure NOT EXISTS)."""
+        return self.candidats().filter(
+            ~Exists(self.alertes_ouvertes().filter(**self.correspondance()))
+        )
+
+    def alertes_a_creer(self):
+        """Flux des alertes (non sauvegardées) à créer pour cette règle."""
+        for obj in self.nouveaux_candidats().iterator(chunk_size=TAILLE_LOT):
+            yield self.construire_alerte(obj)
+
+    def apres_creation(self, alertes):
+        """Hook appelé après l'insertion des alertes de la règle."""
+        return None
+
+    def nouvelle_alerte(self, **kwargs):
+        kwargs.setdefault('TYPE_ALERTE', self.type_alerte)
+        kwargs.setdefault('TABLE_REFERENCE', self.table_reference)
+        kwargs.setdefault('REGLE', self.regle)
+        return AUAL(**kwargs)
+
+
+# ============================================================================
+# Règles RH
+# ============================================================================
+
+class ContratsExpirantsRegle(RegleScan):
+    """Contrats actifs arrivant à échéance."""
+    code = 'contrats'
+    famille = 'contrats'
+    libelle = 'Contrats expirants'
+    type_alerte = 'CONTRAT'
+    table_reference = 'ZYCO'
+
+    def __init__(self, regle=None, jours_avant=30):
+        super().__init__(regle)
+        self.jours_avant = regle.JOURS_AVANT_EXPIRATION if regle else jours_avant
+
+    def candidats(self):
+        from employee.models import ZYCO
+
+        return ZYCO.objects.filter(
+            actif=True,
+            date_fin__isnull=False,
+            date_fin__lte=self.today + timedelta(days=self.jours_avant),
+            date_fin__gte=self.today
+        ).select_related('employe')
+
+    def construire_alerte(self, contrat):
+        jours_restants = (contrat.date_fin - self.today).days
+        employe = contrat.employe
+        return self.nouvelle_alerte(
+            TITRE=f"Contrat expirant - {employe.nom} {employe.prenoms}",
+            DESCRIPTION=f"Le contrat {contrat.type_contrat} de {employe.nom} {employe.prenoms} "
+                        f"expire le {contrat.date_fin.strftime('%d/%m/%Y')} ({jours_restants} jours restants).\n\n"
+                        f"Type de contrat: {contrat.type_contrat}\n"
+                        f"Date de début: {contrat.date_debut.strftime('%d/%m/%Y')}\n"
+                        f"Date de fin: {contrat.date_fin.strftime('%d/%m/%Y')}",
+            PRIORITE=_priorite_par_jours(jours_restants),
+            EMPLOYE=employe,
+            RECORD_ID=str(contrat.pk),
+            DATE_ECHEANCE=contrat.date_fin
+        )
+
+    def apres_creation(self, alertes):
+        if not self.regle:
+            return
+        from .services import ConformiteService
+        for alerte in alertes:
+            ConformiteService._envoyer_notifications_alerte(alerte, self.regle)
+
+
+class VisitesMedicalesRegle(RegleScan):
+    """Visites médicales expirées ou à renouveler sous 30 jours."""
+    code = 'visites_medicales'
+    famille = 'visites_medicales'
+    libelle = 'Visites médicales'
+    type_alerte = 'VISITE_MEDICALE'
+
+    def candidats(self):
+        from employee.models import ZY00
+
+        return ZY00.objects.filter(
+            etat='actif',
+            date_visite_medicale__isnull=False,
+            date_visite_medicale__lte=self.today + timedelta(days=30)
+        )
+
+    def correspondance(self):
+        return {'EMPLOYE': OuterRef('pk')}
+
+    def construire_alerte(self, employe):
+        jours = (employe.date_visite_medicale - self.today).days
+        if jours < 0:
+            priorite = 'CRITIQUE'
+            titre = f"Visite médicale expirée - {employe.nom} {employe.prenoms}"
+        else:
+            priorite = 'HAUTE' if jours <= 7 else 'MOYENNE'
+            titre = f"Visite médicale à renouveler - {employe.nom} {employe.prenoms}"
+
+        return self.nouvelle_alerte(
+            TITRE=titre,
+            DESCRIPTION=f"La visite médicale de {employe.nom} {employe.prenoms} "
+                        f"{'a expiré' if jours < 0 else 'expire'} le {employe.date_visite_medicale.strftime('%d/%m/%Y')}.",
+            PRIORITE=priorite,
+            EMPLOYE=employe,
+            DATE_ECHEANCE=employe.date_visite_medicale
+        )
+
+
+class DocumentsManquantsRegle(RegleScan):
+    """
+    Documents obligatoires manquants (employés actifs × types requis).
+
+    Une seule requête sur ZY00 : pour chaque type requis, un EXISTS sur ZYDO
+    (document présent) et un EXISTS sur AUAL (alerte déjà ouverte). Seuls les
+    employés ayant au moins une paire (employé, type) manquante et non
+    signalée sont renvoyés, puis dépliés en flux d'alertes.
+    """
+    code = 'documents'
+    famille = 'documents'
+    libelle = 'Documents manquants'
+    type_alerte = 'DOCUMENT'
+    table_reference = 'ZYDO'
+
+    DOCUMENTS_OBLIGATOIRES = [
+        ('CNI', 'Carte Nationale d\'Identité'),
+        ('CV', 'Curriculum Vitae'),
+        ('DIPLOME', 'Diplôme'),
+        ('RIB', 'Relevé d\'Identité Bancaire'),
+    ]
+
+    def __init__(self, regle=None, since=None):
+        """
+        Args:
+            since: datetime optionnel. Si fourni, seuls les employés dont les
+                   documents ont changé (ou entrés) depuis cette date sont revus.
+        """
+        super().__init__(regle)
+        self.since = since
+
+    def alertes_ouvertes(self):
+        # Les alertes antérieures n'avaient ni table ni enregistrement de référence
+        alertes = AUAL.objects.filter(
+            TYPE_ALERTE=self.type_alerte,
+            STATUT__in=STATUTS_OUVERTS
+        )
+        if self.regle:
+            alertes = alertes.filter(REGLE=self.regle)
+        return alertes
+
+    def candidats(self):
+        from employee.models import ZY00, ZYDO
+
+        employes = ZY00.objects.filter(etat='actif')
+
+        if self.since:
+            modifies = ZYDO.objects.filter(
+                date_modification__gte=self.since
+            ).values('employe_id')
+            employes = employes.filter(
+                Q(matricule__in=modifies) |
+                Q(date_entree_entreprise__gte=self.since.date()) |
+                Q(date_validation_embauche__gte=self.since.date())
+            )
+
+        annotations = {}
+        a_signaler = Q()
+        for code_doc, libelle_doc in self.DOCUMENTS_OBLIGATOIRES:
+            annotations[f'doc_{code_doc}'] = Exists(ZYDO.objects.filter(
+                employe=OuterRef('pk'),
+                type_document=code_doc,
+                actif=True
+            ))
+            annotations[f'alerte_{code_doc}'] = Exists(self.alertes_ouvertes().filter(
+                Q(RECORD_ID=code_doc) | Q(TITRE=f"Document manquant - {libelle_doc}"),
+                EMPLOYE=OuterRef('pk')
+            ))
+            a_signaler |= Q(**{f'doc_{code_doc}': False, f'alerte_{code_doc}': False})
+
+        return employes.annotate(**annotations).filter(a_signaler).order_by('matricule')
+
+    def nouveaux_candidats(self):
+        # Le dédoublonnage est déjà porté par les annotations alerte_<type>
+        return self.candidats()
+
+    def alertes_a_creer(self):
+        for employe in self.nouveaux_candidats().iterator(chunk_size=TAILLE_LOT):
+            for code_doc, libelle_doc in self.DOCUMENTS_OBLIGATOIRES:
+                if getattr(employe, f'doc_{code_doc}') or getattr(employe, f'alerte_{code_doc}'):
+                    continue
+                yield self.nouvelle_alerte(
+                    TITRE=f"Document manquant - {libelle_doc}",
+                    DESCRIPTION=f"Le document '{libelle_doc}' est manquant pour "
+                                f"{employe.nom} {employe.prenoms} ({employe.matricule}).",
+                    PRIORITE='MOYENNE',
+                    EMPLOYE=employe,
+                    RECORD_ID=code_doc
+                )
+
+
+# ============================================================================
+# Règles Matériel
+# ============================================================================
+
+class MaterielPretRetardRegle(RegleScan):
+    """Prêts de matériel non restitués à la date prévue."""
+    code = 'materiel'
+    famille = 'materiel'
+    libelle = 'Prêts de matériel en retard'
+    type_alerte = 'MATERIEL'
+    table_reference = 'MTAF'
+
+    def candidats(self):
+        from materiel.models import MTAF
+
+        return MTAF.objects.filter(
+            TYPE_AFFECTATION='PRET',
+            ACTIF=True,
+            DATE_FIN__isnull=True,
+            DATE_RETOUR_PREVUE__lt=self.today
+        ).select_related('MATERIEL', 'EMPLOYE')
+
+    def construire_alerte(self, affectation):
+        jours_retard = (self.today - affectation.DATE_RETOUR_PREVUE).days
+        return self.nouvelle_alerte(
+            TITRE=f"Prêt matériel en retard - {affectation.MATERIEL.CODE_INTERNE}",
+            DESCRIPTION=f"Le matériel {affectation.MATERIEL.DESIGNATION} prêté à "
+                        f"{affectation.EMPLOYE.nom} {affectation.EMPLOYE.prenoms} devait être retourné "
+                        f"le {affectation.DATE_RETOUR_PREVUE.strftime('%d/%m/%Y')} ({jours_retard} jours de retard).",
+            PRIORITE='HAUTE' if jours_retard > 7 else 'MOYENNE',
+            EMPLOYE=affectation.EMPLOYE,
+            RECORD_ID=str(affectation.pk),
+            DATE_ECHEANCE=affectation.DATE_RETOUR_PREVUE
+        )
+
+
+class MaterielGarantieRegle(RegleScan):
+    """Garanties matériel expirant sous 30 jours."""
+    code = 'materiel_garanties'
+    famille = 'materiel'
+    libelle = 'Garanties matériel expirantes'
+    type_alerte = 'MATERIEL'
+    table_reference = 'MTMT'
+
+    def candidats(self):
+        from materiel.models import MTMT
+
+        return MTMT.objects.filter(
+            DATE_FIN_GARANTIE__lte=self.today + timedelta(days=30),
+            DATE_FIN_GARANTIE__gte=self.today
+        ).exclude(STATUT='REFORME').select_related('AFFECTE_A')
+
+    def construire_alerte(self, materiel):
+        jours_restants = (materiel.DATE_FIN_GARANTIE - self.today).days
+        return self.nouvelle_alerte(
+            TITRE=f"Garantie expirante - {materiel.CODE_INTERNE}",
+            DESCRIPTION=f"La garantie du matériel {materiel.DESIGNATION} ({materiel.CODE_INTERNE}) "
+                        f"expire le {materiel.DATE_FIN_GARANTIE.strftime('%d/%m/%Y')} "
+                        f"({jours_restants} jours restants).",
+            PRIORITE=_priorite_par_jours(jours_restants),
+            EMPLOYE=materiel.AFFECTE_A,
+            RECORD_ID=str(materiel.pk),
+            DATE_ECHEANCE=materiel.DATE_FIN_GARANTIE
+        )
+
+
+class MaterielMaintenanceRetardRegle(RegleScan):
+    """Maintenances planifiées dont la date est dépassée."""
+    code = 'materiel_maintenances'
+    famille = 'materiel'
+    libelle = 'Maintenances en retard'
+    type_alerte = 'MATERIEL'
+    table_reference = 'MTMA'
+
+    def candidats(self):
+        from materiel.models import MTMA
+
+        return MTMA.objects.filter(
+            STATUT='PLANIFIE',
+            DATE_PLANIFIEE__lt=self.today
+        ).select_related('MATERIEL')
+
+    def construire_alerte(self, maintenance):
+        jours_retard = (self.today - maintenance.DATE_PLANIFIEE).days
+        return self.nouvelle_alerte(
+            TITRE=f"Maintenance en retard - {maintenance.MATERIEL.CODE_INTERNE}",
+            DESCRIPTION=f"La maintenance {maintenance.REFERENCE} du matériel "
+                        f"{maintenance.MATERIEL.DESIGNATION} était planifiée le "
+                        f"{maintenance.DATE_PLANIFIEE.strftime('%d/%m/%Y')} ({jours_retard} jours de retard).",
+            PRIORITE='HAUTE' if jours_retard > 7 else 'MOYENNE',
+            RECORD_ID=str(maintenance.pk),
+            DATE_ECHEANCE=maintenance.DATE_PLANIFIEE
+        )
+
+
+# ============================================================================
+# Règles Gestion des achats
+# ============================================================================
+
+class GACLivraisonRetardRegle(RegleScan):
+    """Bons de commande dont la livraison est dépassée ou imminente."""
+    code = 'gac_livraisons'
+    famille = 'achats'
+    libelle = 'Délais de livraison GAC'
+    table_reference = 'GAC_BON_COMMANDE'
+
+    STATUTS_CONCERNES = ['ENVOYE', 'CONFIRME', 'RECU_PARTIEL']
+
+    def __init__(self, regle=None, alerte_jours=2):
+        super().__init__(regle)
+        self.alerte_jours = alerte_jours
+
+    def candidats(self):
+        from gestion_achats.models import GACBonCommande
+
+        return GACBonCommande.objects.filter(
+            statut__in=self.STATUTS_CONCERNES,
+            date_livraison_souhaitee__isnull=False,
+            date_livraison_souhaitee__lte=self.today + timedelta(days=self.alerte_jours)
+        ).select_related('fournisseur', 'acheteur')
+
+    def construire_alerte(self, bc):
+        jours = (bc.date_livraison_souhaitee - self.today).days
+        if jours < 0:
+            titre = f"Livraison en retard - BC {bc.numero}"
+            detail = f"{abs(jours)} jour(s) de retard"
+            priorite = 'HAUTE' if jours < -7 else 'MOYENNE'
+        else:
+            titre = f"Livraison imminente - BC {bc.numero}"
+            detail = f"{jours} jour(s) restant(s)"
+            priorite = 'BASSE'
+
+        return self.nouvelle_alerte(
+            TITRE=titre,
+            DESCRIPTION=f"Le bon de commande {bc.numero} ({bc.fournisseur.raison_sociale}) "
+                        f"devait être livré le {bc.date_livraison_souhaitee.strftime('%d/%m/%Y')} ({detail}).",
+            PRIORITE=priorite,
+            EMPLOYE=bc.acheteur,
+            RECORD_ID=str(bc.pk),
+            DATE_ECHEANCE=bc.date_livraison_souhaitee
+        )
+
+
+class GACValidationRetardRegle(RegleScan):
+    """Demandes d'achat en attente de validation au-delà du délai."""
+    libelle = 'Délais de validation GAC'
+    famille = 'achats'
+    table_reference = 'GAC_DEMANDE_ACHAT'
+
+    NIVEAUX = {
+        'N1': ('SOUMISE', 'date_soumission', 'validateur_n1'),
+        'N2': ('VALIDEE_N1', 'date_validation_n1', 'validateur_n2'),
+    }
+
+    def __init__(self, regle=None, niveau='N1', delai_jours=3):
+        super().__init__(regle)
+        self.niveau = niveau
+        self.delai_jours = delai_jours
+        self.code = f"gac_validations_{niveau.lower()}"
+        self.statut, self.champ_date, self.champ_validateur = self.NIVEAUX[niveau]
+
+    def alertes_ouvertes(self):
+        # Une demande peut être en retard successivement en N1 puis en N2
+        return super().alertes_ouvertes().filter(TITRE__contains=f"validation {self.niveau}")
+
+    def candidats(self):
+        from gestion_achats.models import GACDemandeAchat
+
+        return GACDemandeAchat.objects.filter(**{
+            'statut': self.statut,
+            f'{self.champ_date}__lte': timezone.now() - timedelta(days=self.delai_jours),
+        }).select_related(self.champ_validateur)
+
+    def construire_alerte(self, demande):
+        depuis = getattr(demande, self.champ_date)
+        delai_actuel = (timezone.now() - depuis).days
+        return self.nouvelle_alerte(
+            TITRE=f"Demande {demande.numero} en attente de validation {self.niveau}",
+            DESCRIPTION=f"La demande d'achat {demande.numero} ({demande.objet}) est en attente "
+                        f"de validation {self.niveau} depuis {delai_actuel} jours.",
+            PRIORITE='HAUTE' if delai_actuel > 2 * self.delai_jours else 'MOYENNE',
+            EMPLOYE=getattr(demande, self.champ_validateur),
+            RECORD_ID=str(demande.pk),
+            DATE_ECHEANCE=(depuis + timedelta(days=self.delai_jours)).date()
+        )
+
+
+def regles_contrats(jours_avant=None):
+    """Une règle par AURC CONTRAT active, ou la règle par défaut (30 jours)."""
+    regles = AURC.objects.filter(TYPE_REGLE='CONTRAT', STATUT=True)
+    if not regles.exists():
+        return [ContratsExpirantsRegle(jours_avant=jours_avant or 30)]
+    return [ContratsExpirantsRegle(regle=regle) for regle in regles]
+
+
+def regles_par_defaut(since=None):
+    """
+    Ensemble des règles exécutées par le scan planifié.
+
+    Args:
+        since: datetime optionnel transmis aux règles incrémentales (documents).
+    """
+    return [
+        *regles_contrats(),
+        DocumentsManquantsRegle(since=since),
+        VisitesMedicalesRegle(),
+        MaterielPretRetardRegle(),
+        MaterielGarantieRegle(),
+        MaterielMaintenanceRetardRegle(),
+        GACLivraisonRetardRegle(),
+        GACValidationRetardRegle(niveau='N1', delai_jours=3),
+        GACValidationRetardRegle(niveau='N2', delai_jours=5),
+    ]
+
+
+class ScannerAlertes:
+    """
+    Exécute un ensemble de règles de scan et insère les nouvelles alertes.
+
+    Les règles s'exécutent en parallèle dans un pool de threads (une connexion
+    base de données par thread). Sous SQLite, ou avec max_workers=1, elles
+    s'exécutent séquentiellement.
+    """
+
+    def __init__(self, regles=None, max_workers=None, dry_run=False):
+        self.regles = regles if regles is not None else regles_par_defaut()
+        if max_workers is None:
+            max_workers = getattr(settings, 'AUDIT_SCANNER_WORKERS', 4)
+        self.max_workers = max_workers
+        self.dry_run = dry_run
+
+    def executer(self):
+        """
+        Exécute toutes les règles.
+
+        Returns:
+            dict: {'regles': [résultat par règle], 'total_alertes': int, 'duree': float}
+        """
+        debut = time.perf_counter()
+
+        if self.max_workers > 1 and len(self.regles) > 1 and connection.vendor != 'sqlite':
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                resultats = list(pool.map(self._executer_dans_thread, self.regles))
+        else:
+            resultats = [self.executer_regle(regle) for regle in self.regles]
+
+        return {
+            'regles': resultats,
+            'total_alertes': sum(len(r['alertes']) for r in resultats),
+            'duree': time.perf_counter() - debut,
+        }
+
+    def _executer_dans_thread(self, regle):
+        try:
+            return self.executer_regle(regle)
+        finally:
+            connection.close()
+
+    def executer_regle(self, regle):
+        """Exécute une règle et retourne son résultat chronométré."""
+        resultat = {
+            'code': regle.code,
+            'libelle': regle.libelle,
+            'famille': regle.famille,
+            'nb_candidats': 0,
+            'alertes': [],
+            'duree': 0.0,
+            'erreur': None,
+        }
+        debut = time.perf_counter()
+
+        try:
+            lot = []
+            for alerte in regle.alertes_a_creer():
+                resultat['nb_candidats'] += 1
+                if self.dry_run:
+                    continue
+                lot.append(alerte)
+                if len(lot) >= TAILLE_LOT:
+                    resultat['alertes'].extend(self._traiter_lot(regle, lot))
+                    lot = []
+            if lot:
+                resultat['alertes'].extend(self._traiter_lot(regle, lot))
+        except Exception as e:
+            resultat['erreur'] = str(e)
+            logger.exception(f"Erreur lors du scan '{regle.code}'")
+
+        resultat['duree'] = time.perf_counter() - debut
+        logger.info(
+            f"Scan '{regle.code}': {resultat['nb_candidats']} candidat(s), "
+            f"{len(resultat['alertes'])} alerte(s) créée(s) en {resultat['duree']:.3f}s"
+        )
+        return resultat
+
+    def _traiter_lot(self, regle, alertes):
+        """Insère un lot d'alertes puis déclenche les notifications."""
+        creees = self._inserer(alertes)
+        regle.apres_creation(creees)
+        from .signals import notifier_alertes_creees
+        notifier_alertes_creees(creees)
+        return creees
+
+    @staticmethod
+    def _inserer(alertes):
+        """Alloue les références et insère les alertes en une seule requête."""
+        with _verrou_insertion, transaction.atomic():
+            for alerte, reference in zip(alertes, allouer_references(len(alertes))):
+                alerte.REFERENCE = reference
+            return AUAL.objects.bulk_create(alertes)
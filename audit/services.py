@@ -2,16 +2,20 @@
 """
 Services pour le module Conformité & Audit.
 """
+import hashlib
 import io
 from decimal import Decimal
-from datetime import date, timedelta
+from datetime import date, datetime, time, timedelta
 from django.db.models import Count, Q, F
 from django.utils import timezone
+from django.core.cache import cache
 from django.core.mail import send_mail
 from django.conf import settings
 
-from .models import AUAL, AURA, AURC
+from .models import AUAL, AURA
 from core.models import ZDLOG
+from core.pagination import PaginationCurseur, compter_plafonne, estimer_nombre_lignes
+from core.recherche import filtrer_champ_modifie, filtrer_texte, filtrer_valeurs
 
 
 class ConformiteService:
@@ -30,89 +34,19 @@ class ConformiteService:
         Returns:
             Liste des alertes créées.
         """
-        from employee.models import ZYCO
-
-        alertes_creees = []
+        from .scanner import regles_contrats
+        return ConformiteService._scanner(regles_contrats(jours_avant))
 
-        # Récupérer les règles de conformité actives pour les contrats
-        regles_contrat = AURC.objects.filter(
-            TYPE_REGLE='CONTRAT',
-            STATUT=True
-        )
-
-        # Si aucune règle n'existe, utiliser un comportement par défaut
-        if not regles_contrat.exists():
-            if jours_avant is None:
-                jours_avant = 30  # Valeur par défaut
-            regles_contrat = [None]  # Liste vide pour itérer au moins une fois
-
-        for regle in regles_contrat:
-            # Déterminer le nombre de jours avant expiration
-            if regle:
-                jours_avant_expiration = regle.JOURS_AVANT_EXPIRATION
-                severite = regle.SEVERITE
-            else:
-                jours_avant_expiration = jours_avant
-                severite = 'WARNING'
-
-            date_limite = timezone.now().date() + timedelta(days=jours_avant_expiration)
-
-            contrats_expirants = ZYCO.objects.filter(
-                actif=True,
-                date_fin__isnull=False,
-                date_fin__lte=date_limite,
-                date_fin__gte=timezone.now().date()
-            ).select_related('employe')
-
-            for contrat in contrats_expirants:
-                # Vérifier si une alerte existe déjà pour ce contrat et cette règle
-                alerte_existante = AUAL.objects.filter(
-                    TYPE_ALERTE='CONTRAT',
-                    TABLE_REFERENCE='ZYCO',
-                    RECORD_ID=str(contrat.pk),
-                    STATUT__in=['NOUVEAU', 'EN_COURS']
-                )
+    @staticmethod
+    def _scanner(regles):
+        """Exécute des règles du scanner et retourne les alertes créées."""
+        from .scanner import ScannerAlertes
 
-                # Si une règle existe, vérifier aussi qu'elle correspond à cette règle
-                if regle:
-                    alerte_existante = alerte_existante.filter(REGLE=regle)
-
-                if not alerte_existante.exists():
-                    jours_restants = (contrat.date_fin - timezone.now().date()).days
-
-                    # Déterminer la priorité en fonction des jours restants
-                    if jours_restants <= 7:
-                        priorite = 'CRITIQUE'
-                    elif jours_restants <= 14:
-                        priorite = 'HAUTE'
-                    elif jours_restants <= 30:
-                        priorite = 'MOYENNE'
-                    else:
-                        priorite = 'BASSE'
-
-                    # Créer l'alerte
-                    alerte = AUAL.objects.create(
-                        REGLE=regle,
-                        TYPE_ALERTE='CONTRAT',
-                        TITRE=f"Contrat expirant - {contrat.employe.nom} {contrat.employe.prenoms}",
-                        DESCRIPTION=f"Le contrat {contrat.type_contrat} de {contrat.employe.nom} {contrat.employe.prenoms} "
-                                   f"expire le {contrat.date_fin.strftime('%d/%m/%Y')} ({jours_restants} jours restants).\n\n"
-                                   f"Type de contrat: {contrat.type_contrat}\n"
-                                   f"Date de début: {contrat.date_debut.strftime('%d/%m/%Y')}\n"
-                                   f"Date de fin: {contrat.date_fin.strftime('%d/%m/%Y')}",
-                        PRIORITE=priorite,
-                        EMPLOYE=contrat.employe,
-                        TABLE_REFERENCE='ZYCO',
-                        RECORD_ID=str(contrat.pk),
-                        DATE_ECHEANCE=contrat.date_fin
-                    )
-                    alertes_creees.append(alerte)
-
-                    # Envoyer les notifications si configurées dans la règle
-                    if regle:
-                        ConformiteService._envoyer_notifications_alerte(alerte, regle)
-
-        return alertes_creees
+        resultats = ScannerAlertes(regles).executer()
+        erreurs = [r['erreur'] for r in resultats['regles'] if r['erreur']]
+        if erreurs:
+            raise RuntimeError('; '.join(erreurs))
+        return [alerte for r in resultats['regles'] for alerte in r['alertes']]
 
     @staticmethod
     def _envoyer_notifications_alerte(alerte, regle):
@@ -216,173 +150,57 @@ Le système ONIAN-EasyM
                 logger.error(f"Erreur lors de l'envoi de notification pour l'alerte {alerte.REFERENCE}: {str(e)}")
 
     @staticmethod
-    def verifier_documents_manquants():
+    def verifier_documents_manquants(since=None):
         """
         Vérifie les documents obligatoires manquants.
+
+        Args:
+            since: datetime optionnel pour ne revoir que les employés dont
+                   les documents ont changé depuis cette date.
         """
-        from employee.models import ZY00, ZYDO
-
-        # Liste des documents obligatoires par défaut
-        documents_obligatoires = [
-            ('CNI', 'Carte Nationale d\'Identité'),
-            ('CV', 'Curriculum Vitae'),
-            ('DIPLOME', 'Diplôme'),
-            ('RIB', 'Relevé d\'Identité Bancaire'),
-        ]
-
-        alertes_creees = []
-        employes_actifs = ZY00.objects.filter(etat='actif')
-
-        for employe in employes_actifs:
-            for code_doc, libelle_doc in documents_obligatoires:
-                # Vérifier si le document existe
-                doc_existe = ZYDO.objects.filter(
-                    MATRICULE=employe,
-                    TYPE_DOCUMENT=code_doc,
-                    STATUT=True
-                ).exists()
-
-                if not doc_existe:
-                    # Vérifier si une alerte existe déjà
-                    alerte_existante = AUAL.objects.filter(
-                        TYPE_ALERTE='DOCUMENT',
-                        EMPLOYE=employe,
-                        TITRE__icontains=code_doc,
-                        STATUT__in=['NOUVEAU', 'EN_COURS']
-                    ).exists()
-
-                    if not alerte_existante:
-                        alerte = AUAL.objects.create(
-                            TYPE_ALERTE='DOCUMENT',
-                            TITRE=f"Document manquant - {libelle_doc}",
-                            DESCRIPTION=f"Le document '{libelle_doc}' est manquant pour "
-                                       f"{employe.nom} {employe.prenoms} ({employe.matricule}).",
-                            PRIORITE='MOYENNE',
-                            EMPLOYE=employe
-                        )
-                        alertes_creees.append(alerte)
-
-        return alertes_creees
+        from .scanner import DocumentsManquantsRegle
+        return ConformiteService._scanner([DocumentsManquantsRegle(since=since)])
 
     @staticmethod
     def verifier_visites_medicales():
         """
         Vérifie les visites médicales expirées ou à venir.
         """
-        from employee.models import ZY00
-
-        alertes_creees = []
-        date_limite = timezone.now().date() + timedelta(days=30)
-
-        employes = ZY00.objects.filter(
-            etat='actif',
-            date_visite_medicale__isnull=False,
-            date_visite_medicale__lte=date_limite
-        )
-
-        for employe in employes:
-            alerte_existante = AUAL.objects.filter(
-                TYPE_ALERTE='VISITE_MEDICALE',
-                EMPLOYE=employe,
-                STATUT__in=['NOUVEAU', 'EN_COURS']
-            ).exists()
-
-            if not alerte_existante:
-                jours = (employe.date_visite_medicale - timezone.now().date()).days
-                if jours < 0:
-                    priorite = 'CRITIQUE'
-                    titre = f"Visite médicale expirée - {employe.nom} {employe.prenoms}"
-                else:
-                    priorite = 'HAUTE' if jours <= 7 else 'MOYENNE'
-                    titre = f"Visite médicale à renouveler - {employe.nom} {employe.prenoms}"
-
-                alerte = AUAL.objects.create(
-                    TYPE_ALERTE='VISITE_MEDICALE',
-                    TITRE=titre,
-                    DESCRIPTION=f"La visite médicale de {employe.nom} {employe.prenoms} "
-                               f"{'a expiré' if jours < 0 else 'expire'} le {employe.date_visite_medicale.strftime('%d/%m/%Y')}.",
-                    PRIORITE=priorite,
-                    EMPLOYE=employe,
-                    DATE_ECHEANCE=employe.date_visite_medicale
-                )
-                alertes_creees.append(alerte)
-
-        return alertes_creees
+        from .scanner import VisitesMedicalesRegle
+        return ConformiteService._scanner([VisitesMedicalesRegle()])
 
     @staticmethod
     def verifier_materiel_en_retard():
         """
         Vérifie les prêts de matériel en retard.
         """
-        from materiel.models import MTAF
-
-        alertes_creees = []
-        today = timezone.now().date()
-
-        affectations_retard = MTAF.objects.filter(
-            TYPE_AFFECTATION='PRET',
-            ACTIF=True,
-            DATE_FIN__isnull=True,
-            DATE_RETOUR_PREVUE__lt=today
-        ).select_related('MATERIEL', 'EMPLOYE')
-
-        for affectation in affectations_retard:
-            alerte_existante = AUAL.objects.filter(
-                TYPE_ALERTE='MATERIEL',
-                TABLE_REFERENCE='MTAF',
-                RECORD_ID=str(affectation.pk),
-                STATUT__in=['NOUVEAU', 'EN_COURS']
-            ).exists()
-
-            if not alerte_existante:
-                jours_retard = (today - affectation.DATE_RETOUR_PREVUE).days
-                alerte = AUAL.objects.create(
-                    TYPE_ALERTE='MATERIEL',
-                    TITRE=f"Prêt matériel en retard - {affectation.MATERIEL.CODE_INTERNE}",
-                    DESCRIPTION=f"Le matériel {affectation.MATERIEL.DESIGNATION} prêté à "
-                               f"{affectation.EMPLOYE.nom} {affectation.EMPLOYE.prenoms} devait être retourné "
-                               f"le {affectation.DATE_RETOUR_PREVUE.strftime('%d/%m/%Y')} ({jours_retard} jours de retard).",
-                    PRIORITE='HAUTE' if jours_retard > 7 else 'MOYENNE',
-                    EMPLOYE=affectation.EMPLOYE,
-                    TABLE_REFERENCE='MTAF',
-                    RECORD_ID=str(affectation.pk),
-                    DATE_ECHEANCE=affectation.DATE_RETOUR_PREVUE
-                )
-                alertes_creees.append(alerte)
-
-        return alertes_creees
+        from .scanner import MaterielPretRetardRegle
+        return ConformiteService._scanner([MaterielPretRetardRegle()])
 
     @staticmethod
     def executer_toutes_verifications():
         """
         Exécute toutes les vérifications de conformité.
+
+        Les règles du scanner (contrats, documents, visites médicales,
+        matériel, achats) s'exécutent en parallèle ; chaque famille est regroupée sous sa clé.
         """
+        from .scanner import ScannerAlertes
+
         resultats = {
             'contrats': [],
             'documents': [],
             'visites_medicales': [],
             'materiel': [],
+            'achats': [],
         }
 
-        try:
-            resultats['contrats'] = ConformiteService.verifier_contrats_expirants()
-        except Exception as e:
-            resultats['contrats_erreur'] = str(e)
-
-        try:
-            resultats['documents'] = ConformiteService.verifier_documents_manquants()
-        except Exception as e:
-            resultats['documents_erreur'] = str(e)
-
-        try:
-            resultats['visites_medicales'] = ConformiteService.verifier_visites_medicales()
-        except Exception as e:
-            resultats['visites_medicales_erreur'] = str(e)
-
-        try:
-            resultats['materiel'] = ConformiteService.verifier_materiel_en_retard()
-        except Exception as e:
-            resultats['materiel_erreur'] = str(e)
+        scan = ScannerAlertes().executer()
+        for resultat in scan['regles']:
+            cle = resultat['famille']
+            resultats[cle].extend(resultat['alertes'])
+            if resultat['erreur']:
+                resultats[f'{cle}_erreur'] = resultat['erreur']
 
         return resultats
 
@@ -464,6 +282,9 @@ class AlerteService:
 class LogService:
     """Service de consultation des logs."""
 
+    # Taille d'une page de la liste des logs
+    TAILLE_PAGE = 50
+
     @staticmethod
     def get_logs_recents(limit=100):
         """Retourne les logs les plus récents."""
@@ -472,30 +293,150 @@ class LogService:
     @staticmethod
     def get_logs_par_table(table_name, limit=100):
         """Retourne les logs d'une table spécifique."""
-        return ZDLOG.objects.filter(TABLE_NAME=table_name)[:limit]
+        return LogService.rechercher(table_name=table_name)[:limit]
 
     @staticmethod
     def get_logs_par_utilisateur(user, limit=100):
         """Retourne les logs d'un utilisateur."""
-        return ZDLOG.objects.filter(USER=user)[:limit]
+        return LogService.rechercher(user=user)[:limit]
 
     @staticmethod
     def get_logs_par_periode(date_debut, date_fin):
         """Retourne les logs d'une période."""
-        return ZDLOG.objects.filter(
-            DATE_MODIFICATION__date__gte=date_debut,
-            DATE_MODIFICATION__date__lte=date_fin
+        return LogService.rechercher(date_debut=date_debut, date_fin=date_fin)
+
+    @staticmethod
+    def get_logs_par_enregistrement(table_name, record_id, champ=None, date_debut=None, date_fin=None):
+        """
+        Historique d'un enregistrement : « qui a modifié le champ X de
+        l'enregistrement Y entre deux dates ».
+        """
+        return LogService.rechercher(
+            table_name=table_name, record_id=record_id, champ=champ,
+            date_debut=date_debut, date_fin=date_fin
         )
 
     @staticmethod
-    def get_statistiques_logs(date_debut=None, date_fin=None):
-        """Retourne des statistiques sur les logs."""
-        queryset = ZDLOG.objects.all()
+    def rechercher(texte=None, table_name=None, record_id=None, champ=None, valeurs=None,
+                   type_mouvement=None, user=None, date_debut=None, date_fin=None):
+        """
+        Recherche indexée dans les logs (voir core.recherche).
+
+        Args:
+            texte: mots recherchés dans la description (plein texte)
+            table_name, record_id: enregistrement concerné (égalité stricte)
+            champ: ne garder que les modifications où ce champ a changé
+            valeurs: paires champ/valeur contenues dans la nouvelle valeur
+            type_mouvement, user: filtres simples
+            date_debut, date_fin: période (journées incluses)
 
+        Returns:
+            QuerySet de ZDLOG
+        """
+        logs = ZDLOG.objects.all()
+        if table_name:
+            logs = logs.filter(TABLE_NAME=table_name)
+        if record_id:
+            logs = logs.filter(RECORD_ID=str(record_id))
+        if type_mouvement:
+            logs = logs.filter(TYPE_MOUVEMENT=type_mouvement)
+        if user:
+            logs = logs.filter(USER=user)
+        logs = logs.filter(LogService._filtre_periode(date_debut, date_fin))
+        if champ:
+            logs = filtrer_champ_modifie(logs, champ)
+        logs = filtrer_valeurs(logs, valeurs)
+        return filtrer_texte(logs, texte)
+
+    @staticmethod
+    def _filtre_periode(date_debut=None, date_fin=None):
+        """
+        Filtre sur DATE_MODIFICATION exprimé en bornes datetime
+        (utilise l'index, contrairement à DATE_MODIFICATION__date).
+        """
+        filtre = Q()
         if date_debut:
-            queryset = queryset.filter(DATE_MODIFICATION__date__gte=date_debut)
+            filtre &= Q(DATE_MODIFICATION__gte=timezone.make_aware(datetime.combine(date_debut, time.min)))
         if date_fin:
-            queryset = queryset.filter(DATE_MODIFICATION__date__lte=date_fin)
+            filtre &= Q(DATE_MODIFICATION__lt=timezone.make_aware(
+                datetime.combine(date_fin + timedelta(days=1), time.min)
+            ))
+        return filtre
+
+    @staticmethod
+    def filtrer_logs(filtres):
+        """
+        Applique les filtres de la liste des logs.
+
+        Args:
+            filtres: données nettoyées de FiltresLogsForm
+
+        Returns:
+            QuerySet de ZDLOG
+        """
+        return LogService.rechercher(
+            texte=filtres.get('recherche'),
+            table_name=filtres.get('table_name'),
+            record_id=filtres.get('record_id'),
+            champ=filtres.get('champ'),
+            type_mouvement=filtres.get('type_mouvement'),
+            date_debut=filtres.get('date_debut'),
+            date_fin=filtres.get('date_fin'),
+        )
+
+    @staticmethod
+    def page_logs(logs, apres=None, avant=None):
+        """Retourne une page de logs paginée par curseur (DATE_MODIFICATION, id)."""
+        return PaginationCurseur(logs, 'DATE_MODIFICATION', LogService.TAILLE_PAGE).page(apres=apres, avant=avant)
+
+    @staticmethod
+    def get_stats_liste(logs, filtres=None):
+        """
+        Compteurs de la liste des logs, plafonnés et mis en cache.
+
+        Sans filtre, le total est estimé par PostgreSQL ; les compteurs
+        dépassant PLAFOND_COMPTAGE sont signalés dans `plafonnes`.
+
+        Returns:
+            dict: total, creations, modifications, suppressions,
+                  plafonnes (noms des compteurs plafonnés), estime
+        """
+        filtres = {cle: valeur for cle, valeur in (filtres or {}).items() if valeur}
+        cle_cache = 'audit:stats_logs:' + hashlib.md5(
+            repr(sorted((cle, str(valeur)) for cle, valeur in filtres.items())).encode()
+        ).hexdigest()
+        stats = cache.get(cle_cache)
+        if stats is not None:
+            return stats
+
+        stats = {'plafonnes': [], 'estime': False}
+        estimation = None if filtres else estimer_nombre_lignes(ZDLOG)
+        if estimation is not None:
+            stats['total'], stats['estime'] = estimation, True
+        else:
+            stats['total'], plafonne = compter_plafonne(logs)
+            if plafonne:
+                stats['plafonnes'].append('total')
+
+        for cle, type_mouvement in (
+            ('creations', ZDLOG.TYPE_CREATION),
+            ('modifications', ZDLOG.TYPE_MODIFICATION),
+            ('suppressions', ZDLOG.TYPE_SUPPRESSION),
+        ):
+            if filtres.get('type_mouvement') not in (None, type_mouvement):
+                stats[cle] = 0
+                continue
+            stats[cle], plafonne = compter_plafonne(logs.filter(TYPE_MOUVEMENT=type_mouvement))
+            if plafonne:
+                stats['plafonnes'].append(cle)
+
+        cache.set(cle_cache, stats, getattr(settings, 'CACHE_TTL_DASHBOARD', 300))
+        return stats
+
+    @staticmethod
+    def get_statistiques_logs(date_debut=None, date_fin=None):
+        """Retourne des statistiques sur les logs."""
+        queryset = ZDLOG.objects.filter(LogService._filtre_periode(date_debut, date_fin))
 
         stats = queryset.aggregate(
             total=Count('id'),
@@ -593,26 +534,26 @@ class RapportAuditService:
         )
 
         try:
-            logs = ZDLOG.objects.filter(
-                DATE_MODIFICATION__date__gte=date_debut,
-                DATE_MODIFICATION__date__lte=date_fin
+            filtres = filtres or {}
+            logs = LogService.rechercher(
+                texte=filtres.get('recherche'),
+                table_name=filtres.get('table_name'),
+                record_id=filtres.get('record_id'),
+                champ=filtres.get('champ'),
+                type_mouvement=filtres.get('type_mouvement'),
+                user=filtres.get('user_id'),
+                date_debut=date_debut,
+                date_fin=date_fin,
             )
 
-            if filtres:
-                if filtres.get('table_name'):
-                    logs = logs.filter(TABLE_NAME=filtres['table_name'])
-                if filtres.get('type_mouvement'):
-                    logs = logs.filter(TYPE_MOUVEMENT=filtres['type_mouvement'])
-                if filtres.get('user_id'):
-                    logs = logs.filter(USER_id=filtres['user_id'])
-
+            par_type = list(logs.values('TYPE_MOUVEMENT').annotate(count=Count('id')).order_by())
             resume = {
-                'total_logs': logs.count(),
-                'par_type': list(logs.values('TYPE_MOUVEMENT').annotate(count=Count('id'))),
+                'total_logs': sum(ligne['count'] for ligne in par_type),
+                'par_type': par_type,
                 'par_table': list(logs.values('TABLE_NAME').annotate(count=Count('id')).order_by('-count')[:10]),
             }
 
-            rapport.NB_ENREGISTREMENTS = logs.count()
+            rapport.NB_ENREGISTREMENTS = resume['total_logs']
             rapport.RESUME = resume
             rapport.STATUT = 'TERMINE'
             rapport.save()
@@ -26,64 +26,78 @@ def notifier_alerte_creee(sender, instance, created, **kwargs):
         # Ne notifier que lors de la création, pas lors des mises à jour
         return
 
-    alerte = instance
+    notifier_alertes_creees([instance])
+
+
+def notifier_alertes_creees(alertes):
+    """
+    Notifie les DRH et ASSISTANT_RH pour un lot d'alertes créées.
+
+    Utilisé directement par le scanner (bulk_create ne déclenche pas post_save) :
+    les RH sont résolus une seule fois et les notifications insérées en bloc.
+    """
+    if not alertes:
+        return
 
-    # Récupérer les employés avec le rôle DRH ou ASSISTANT_RH
     try:
         from employee.models import ZY00
 
-        rh_users = ZY00.objects.filter(
+        rh_users = list(ZY00.objects.filter(
             Q(roles_attribues__role__CODE='DRH') | Q(roles_attribues__role__CODE='ASSISTANT_RH'),
             roles_attribues__actif=True,
             etat='actif'
-        ).distinct()
-
-        # Créer une notification dans le système pour chaque RH
-        for rh in rh_users:
-            try:
-                # Préparer le message de notification
-                message_notification = f"📋 {alerte.REFERENCE}\n"
-                message_notification += f"{alerte.TITRE}\n\n"
-
-                message_notification += f"🚨 Priorité : {alerte.get_PRIORITE_display()}\n"
-                message_notification += f"📂 Type : {alerte.get_TYPE_ALERTE_display()}\n"
-
-                if alerte.EMPLOYE:
-                    message_notification += f"👤 Employé : {alerte.EMPLOYE.nom} {alerte.EMPLOYE.prenoms}\n"
-
-                if alerte.DATE_ECHEANCE:
-                    from datetime import date
-                    jours_restants = (alerte.DATE_ECHEANCE - date.today()).days
-                    if jours_restants < 0:
-                        message_notification += f"⚠️ Échéance : {alerte.DATE_ECHEANCE.strftime('%d/%m/%Y')} ({abs(jours_restants)} jours de retard)\n"
-                    elif jours_restants == 0:
-                        message_notification += f"⚠️ Échéance : {alerte.DATE_ECHEANCE.strftime('%d/%m/%Y')} (Aujourd'hui)\n"
-                    else:
-                        message_notification += f"📅 Échéance : {alerte.DATE_ECHEANCE.strftime('%d/%m/%Y')} ({jours_restants} jours restants)\n"
-
-                message_notification += f"\n📝 {alerte.DESCRIPTION[:150]}{'...' if len(alerte.DESCRIPTION) > 150 else ''}\n\n"
-
-                # Ajouter l'URL vers le détail de l'alerte
-                url_alerte = f"{settings.SITE_URL}/audit/alertes/{alerte.uuid}/"
-                message_notification += f"👉 Voir le détail : {url_alerte}"
-
-                NotificationAbsence.objects.create(
+        ).select_related('user').distinct())
+
+        notifications = []
+        for alerte in alertes:
+            message_notification = _message_notification(alerte)
+            for rh in rh_users:
+                notifications.append(NotificationAbsence(
                     destinataire=rh,
                     type_notification='ALERTE_CONFORMITE',
                     contexte='AUDIT',
                     message=message_notification
-                )
-                logger.info(f"Notification créée pour {rh.nom} {rh.prenoms} - Alerte {alerte.REFERENCE}")
-            except Exception as e:
-                logger.error(f"Erreur création notification pour {rh.nom}: {str(e)}")
+                ))
+        NotificationAbsence.objects.bulk_create(notifications)
+        logger.info(f"{len(notifications)} notification(s) créée(s) pour {len(alertes)} alerte(s)")
 
         # Envoyer également un email si configuré
-        _envoyer_email_notification(alerte, rh_users)
+        for alerte in alertes:
+            _envoyer_email_notification(alerte, rh_users)
 
     except Exception as e:
         logger.error(f"Erreur lors de la notification automatique d'alerte: {str(e)}")
 
 
+def _message_notification(alerte):
+    """Construit le message de notification in-app d'une alerte."""
+    message_notification = f"📋 {alerte.REFERENCE}\n"
+    message_notification += f"{alerte.TITRE}\n\n"
+
+    message_notification += f"🚨 Priorité : {alerte.get_PRIORITE_display()}\n"
+    message_notification += f"📂 Type : {alerte.get_TYPE_ALERTE_display()}\n"
+
+    if alerte.EMPLOYE:
+        message_notification += f"👤 Employé : {alerte.EMPLOYE.nom} {alerte.EMPLOYE.prenoms}\n"
+
+    if alerte.DATE_ECHEANCE:
+        from datetime import date
+        jours_restants = (alerte.DATE_ECHEANCE - date.today()).days
+        if jours_restants < 0:
+            message_notification += f"⚠️ Échéance : {alerte.DATE_ECHEANCE.strftime('%d/%m/%Y')} ({abs(jours_restants)} jours de retard)\n"
+        elif jours_restants == 0:
+            message_notification += f"⚠️ Échéance : {alerte.DATE_ECHEANCE.strftime('%d/%m/%Y')} (Aujourd'hui)\n"
+        else:
+            message_notification += f"📅 Échéance : {alerte.DATE_ECHEANCE.strftime('%d/%m/%Y')} ({jours_restants} jours restants)\n"
+
+    message_notification += f"\n📝 {alerte.DESCRIPTION[:150]}{'...' if len(alerte.DESCRIPTION) > 150 else ''}\n\n"
+
+    # Ajouter l'URL vers le détail de l'alerte
+    url_alerte = f"{settings.SITE_URL}/audit/alertes/{alerte.uuid}/"
+    message_notification += f"👉 Voir le détail : {url_alerte}"
+    return message_notification
+
+
 def _envoyer_email_notification(alerte, destinataires_rh):
     """
     Envoie un email de notification aux RH.
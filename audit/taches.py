@@ -0,0 +1,78 @@
+# audit/taches.py
+"""
+Tâches de fond du module Conformité & Audit (voir core.taches).
+"""
+from datetime import date
+
+from core.taches import tache
+
+
+@tache('audit.executer_verifications')
+def executer_verifications(job):
+    """Exécute toutes les vérifications de conformité."""
+    from .services import ConformiteService
+
+    job.avancer(0, message="Vérifications de conformité en cours")
+    resultats = ConformiteService.executer_toutes_verifications()
+
+    par_famille = {cle: len(v) for cle, v in resultats.items() if isinstance(v, list)}
+    erreurs = {cle: v for cle, v in resultats.items() if not isinstance(v, list)}
+    total_alertes = sum(par_famille.values())
+
+    if total_alertes > 0:
+        message = f"{total_alertes} nouvelle(s) alerte(s) créée(s)."
+    else:
+        message = "Aucune nouvelle alerte détectée."
+
+    return {
+        'message': message,
+        'total_alertes': total_alertes,
+        'par_famille': par_famille,
+        'erreurs': erreurs,
+    }
+
+
+@tache('audit.generer_rapport')
+def generer_rapport(job, type_rapport, format_export, date_debut, date_fin, matricule=None):
+    """Génère un rapport d'audit (AURA)."""
+    from employee.models import ZY00
+    from .models import AURA
+    from .services import RapportAuditService
+
+    date_debut = date.fromisoformat(date_debut)
+    date_fin = date.fromisoformat(date_fin)
+    employe = ZY00.objects.filter(matricule=matricule).first() if matricule else None
+
+    job.avancer(0, message="Génération du rapport en cours")
+    if type_rapport == 'CONFORMITE':
+        rapport = RapportAuditService.generer_rapport_conformite(
+            date_debut, date_fin, employe, format_export
+        )
+    elif type_rapport == 'LOGS':
+        rapport = RapportAuditService.generer_rapport_logs(
+            date_debut, date_fin, employe, format_export
+        )
+    elif type_rapport == 'CONTRATS':
+        rapport = RapportAuditService.generer_rapport_contrats(
+            date_debut, date_fin, employe, format_export
+        )
+    else:
+        # Rapport personnalisé ou autre type
+        rapport = AURA.objects.create(
+            TITRE=f"Rapport {type_rapport} du {date_debut} au {date_fin}",
+            TYPE_RAPPORT=type_rapport,
+            FORMAT=format_export,
+            DATE_DEBUT=date_debut,
+            DATE_FIN=date_fin,
+            GENERE_PAR=employe,
+            STATUT='TERMINE'
+        )
+
+    if rapport.STATUT != 'TERMINE':
+        raise RuntimeError(f"Erreur lors de la génération: {rapport.MESSAGE_ERREUR}")
+
+    return {
+        'message': f"Rapport {rapport.REFERENCE} généré avec succès.",
+        'rapport': str(rapport.uuid),
+        'reference': rapport.REFERENCE,
+    }
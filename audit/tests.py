@@ -4,7 +4,7 @@ Tests pour le module Conformité & Audit.
 """
 from datetime import date, timedelta
 from decimal import Decimal
-from django.test import TestCase, Client
+from django.test import TestCase, Client, override_settings
 from django.urls import reverse
 from django.utils import timezone
 from django.contrib.auth import get_user_model
@@ -16,6 +16,7 @@ from audit.forms import (
     FiltresLogsForm, FiltresAlertesForm, GenererRapportForm
 )
 from audit.services import ConformiteService, AlerteService, LogService, RapportAuditService
+from core.models import ZDLOG
 
 User = get_user_model()
 
@@ -344,6 +345,128 @@ class ConformiteServiceTest(TestCase):
         self.assertIsInstance(alertes, list)
 
 
+class ScannerAlertesTest(TestCase):
+    """Tests pour le scanner consolidé des alertes."""
+
+    def setUp(self):
+        from employee.models import ZY00, ZYCO
+
+        self.employe = ZY00.objects.create(
+            matricule='SCAN0001',
+            nom='Scanner',
+            prenoms='Test',
+            date_naissance=date(1990, 1, 1),
+            sexe='M',
+            type_id='CNI',
+            numero_id='IDSCAN0001',
+            date_validite_id=date(2020, 1, 1),
+            date_expiration_id=date(2030, 1, 1),
+            etat='actif'
+        )
+        self.contrat = ZYCO.objects.create(
+            employe=self.employe,
+            type_contrat='CDD',
+            date_debut=date.today() - timedelta(days=300),
+            date_fin=date.today() + timedelta(days=5),
+            actif=True
+        )
+
+    def test_contrat_expirant_cree_alerte(self):
+        """Une alerte est créée en bloc pour un contrat expirant."""
+        from audit.scanner import ScannerAlertes, ContratsExpirantsRegle
+
+        resultats = ScannerAlertes([ContratsExpirantsRegle()], max_workers=1).executer()
+
+        self.assertEqual(resultats['total_alertes'], 1)
+        alerte = AUAL.objects.get(TABLE_REFERENCE='ZYCO', RECORD_ID=str(self.contrat.pk))
+        self.assertEqual(alerte.PRIORITE, 'CRITIQUE')
+        self.assertTrue(alerte.REFERENCE.startswith('AL'))
+
+    def test_dedoublonnage_alerte_ouverte(self):
+        """Un second passage ne recrée pas l'alerte encore ouverte."""
+        from audit.scanner import ScannerAlertes, ContratsExpirantsRegle
+
+        ScannerAlertes([ContratsExpirantsRegle()], max_workers=1).executer()
+        resultats = ScannerAlertes([ContratsExpirantsRegle()], max_workers=1).executer()
+
+        self.assertEqual(resultats['total_alertes'], 0)
+        self.assertEqual(AUAL.objects.filter(TYPE_ALERTE='CONTRAT').count(), 1)
+
+    def test_references_consecutives(self):
+        """Les références allouées en bloc suivent la dernière existante."""
+        from audit.scanner import allouer_references
+
+        existante = AUAL.objects.create(TYPE_ALERTE='AUTRE', TITRE='Existante', DESCRIPTION='-')
+        references = allouer_references(2)
+
+        numero = int(existante.REFERENCE[-5:])
+        self.assertEqual(references, [
+            f"{existante.REFERENCE[:-5]}{numero + 1:05d}",
+            f"{existante.REFERENCE[:-5]}{numero + 2:05d}",
+        ])
+
+    def test_dry_run_ninsere_rien(self):
+        """Le mode simulation compte les candidats sans insérer."""
+        from audit.scanner import ScannerAlertes, ContratsExpirantsRegle
+
+        resultats = ScannerAlertes([ContratsExpirantsRegle()], max_workers=1, dry_run=True).executer()
+
+        self.assertEqual(resultats['regles'][0]['nb_candidats'], 1)
+        self.assertFalse(AUAL.objects.exists())
+
+    def test_documents_manquants_par_paire(self):
+        """Une alerte par type de document obligatoire absent."""
+        import tempfile
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from django.test import override_settings
+        from employee.models import ZYDO
+        from audit.scanner import ScannerAlertes, DocumentsManquantsRegle
+
+        with override_settings(MEDIA_ROOT=tempfile.mkdtemp()):
+            ZYDO.objects.create(
+                employe=self.employe,
+                type_document='CNI',
+                fichier=SimpleUploadedFile('cni.pdf', b'%PDF')
+            )
+            resultats = ScannerAlertes([DocumentsManquantsRegle()], max_workers=1).executer()
+
+        types = set(AUAL.objects.filter(
+            TYPE_ALERTE='DOCUMENT', EMPLOYE=self.employe
+        ).values_list('RECORD_ID', flat=True))
+        self.assertEqual(resultats['total_alertes'], 3)
+        self.assertEqual(types, {'CV', 'DIPLOME', 'RIB'})
+
+        # Second passage : tout est déjà signalé
+        resultats = ScannerAlertes([DocumentsManquantsRegle()], max_workers=1).executer()
+        self.assertEqual(resultats['total_alertes'], 0)
+
+    def test_documents_manquants_incremental(self):
+        """En mode --since, les employés inchangés ne sont pas revus."""
+        from audit.scanner import DocumentsManquantsRegle
+
+        depuis = timezone.now() + timedelta(days=1)
+        regle = DocumentsManquantsRegle(since=depuis)
+
+        self.assertEqual(list(regle.alertes_a_creer()), [])
+
+    def test_erreur_regle_isolee(self):
+        """L'erreur d'une règle est rapportée sans bloquer les autres."""
+        from audit.scanner import ScannerAlertes, ContratsExpirantsRegle, RegleScan
+
+        class RegleEnErreur(RegleScan):
+            code = 'erreur'
+
+            def candidats(self):
+                raise ValueError('boom')
+
+        resultats = ScannerAlertes(
+            [RegleEnErreur(), ContratsExpirantsRegle()], max_workers=1
+        ).executer()
+
+        self.assertEqual(resultats['regles'][0]['erreur'], 'boom')
+        self.assertEqual(len(resultats['regles'][1]['alertes']), 1)
+
+
 class AlerteServiceTest(TestCase):
     """Tests pour AlerteService."""
 
@@ -432,6 +555,72 @@ class LogServiceTest(TestCase):
         self.assertIn('par_table', stats)
 
 
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class LogServiceListeTest(TestCase):
+    """Tests pour le filtrage, la pagination et les compteurs de la liste des logs."""
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        maintenant = timezone.now()
+        ZDLOG.objects.bulk_create([
+            ZDLOG(TABLE_NAME='ZY00', RECORD_ID='1', TYPE_MOUVEMENT='CREATE',
+                  DATE_MODIFICATION=maintenant),
+            ZDLOG(TABLE_NAME='ZY00', RECORD_ID='1', TYPE_MOUVEMENT='UPDATE',
+                  DATE_MODIFICATION=maintenant - timedelta(days=2)),
+            ZDLOG(TABLE_NAME='ZYCO', RECORD_ID='7', TYPE_MOUVEMENT='DELETE',
+                  DATE_MODIFICATION=maintenant - timedelta(days=10)),
+        ])
+        self.aujourd_hui = timezone.localdate(maintenant)
+
+    def test_filtrer_logs_par_periode_et_table(self):
+        """Les bornes de dates incluent les journées entières ; la table est exacte."""
+        logs = LogService.filtrer_logs({
+            'date_debut': self.aujourd_hui - timedelta(days=2),
+            'date_fin': self.aujourd_hui,
+        })
+        self.assertEqual(logs.count(), 2)
+        self.assertEqual(LogService.filtrer_logs({'table_name': 'ZY'}).count(), 0)
+        self.assertEqual(LogService.filtrer_logs({'table_name': 'ZYCO'}).count(), 1)
+
+    def test_stats_liste_plafonnees(self):
+        """Les compteurs sont plafonnés puis servis depuis le cache."""
+        logs = LogService.filtrer_logs({})
+        with patch('core.pagination.PLAFOND_COMPTAGE', 2):
+            stats = LogService.get_stats_liste(logs, {'table_name': ''})
+        self.assertEqual(stats['total'], 2)
+        self.assertIn('total', stats['plafonnes'])
+        self.assertEqual((stats['creations'], stats['modifications'], stats['suppressions']), (1, 1, 1))
+
+        filtres = {'type_mouvement': 'UPDATE'}
+        logs = LogService.filtrer_logs(filtres)
+        stats = LogService.get_stats_liste(logs, filtres)
+        self.assertEqual((stats['total'], stats['creations'], stats['modifications']), (1, 0, 1))
+
+        ZDLOG.objects.filter(TYPE_MOUVEMENT='UPDATE').delete()
+        self.assertEqual(LogService.get_stats_liste(logs, filtres)['total'], 1)
+
+    def test_logs_par_enregistrement(self):
+        """Historique des modifications d'un champ d'un enregistrement."""
+        ZDLOG.objects.filter(TYPE_MOUVEMENT='UPDATE').update(
+            ANCIENNE_VALEUR={'statut': 'BROUILLON'}, NOUVELLE_VALEUR={'statut': 'VALIDE'}
+        )
+        logs = LogService.get_logs_par_enregistrement(
+            'ZY00', 1, champ='statut', date_debut=self.aujourd_hui - timedelta(days=5)
+        )
+        self.assertEqual(list(logs.values_list('TYPE_MOUVEMENT', flat=True)), ['UPDATE'])
+        self.assertFalse(LogService.get_logs_par_enregistrement('ZY00', 1, champ='nom').exists())
+
+    def test_page_logs(self):
+        """La pagination par curseur parcourt les logs du plus récent au plus ancien."""
+        with patch.object(LogService, 'TAILLE_PAGE', 2):
+            page = LogService.page_logs(LogService.filtrer_logs({}))
+            self.assertEqual([log.TYPE_MOUVEMENT for log in page], ['CREATE', 'UPDATE'])
+            page = LogService.page_logs(LogService.filtrer_logs({}), apres=page.curseur_suivant)
+        self.assertEqual([log.TYPE_MOUVEMENT for log in page], ['DELETE'])
+        self.assertFalse(page.has_next)
+
+
 class RapportAuditServiceTest(TestCase):
     """Tests pour RapportAuditService."""
 
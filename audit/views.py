@@ -3,6 +3,7 @@
 Vues pour le module Conformité & Audit.
 """
 from django.shortcuts import render, redirect, get_object_or_404
+from django.urls import reverse
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.http import JsonResponse, HttpResponse
@@ -16,8 +17,9 @@ from .forms import (
     AURCForm, FiltresLogsForm, FiltresAlertesForm,
     GenererRapportForm, ResoudreAlerteForm
 )
-from .services import ConformiteService, AlerteService, LogService, RapportAuditService
-from core.models import ZDLOG
+from .services import AlerteService, LogService, RapportAuditService
+from core.models import ZDJOB, ZDLOG, ZDLOGTable
+from core.taches import lancer, tache_suivie
 
 
 def _peut_acceder_audit(employe):
@@ -111,6 +113,7 @@ def liste_alertes(request):
         'alertes': alertes_page,
         'form': form,
         'stats': AlerteService.get_alertes_dashboard(),
+        'tache_suivie': tache_suivie(request),
     }
 
     return render(request, 'audit/liste_alertes.html', context)
@@ -182,16 +185,18 @@ def executer_verifications(request):
         messages.error(request, "Vous n'avez pas accès à cette fonction.")
         return redirect('audit:dashboard')
 
-    resultats = ConformiteService.executer_toutes_verifications()
+    # Vérifications exécutées en tâche de fond (voir audit.taches)
+    job = lancer('audit.executer_verifications', user=request.user, unique=True)
 
-    total_alertes = sum(len(v) for k, v in resultats.items() if isinstance(v, list))
+    if job.STATUT == ZDJOB.STATUT_TERMINE:
+        messages.success(request, job.MESSAGE)
+        return redirect('audit:liste_alertes')
+    if job.STATUT == ZDJOB.STATUT_ECHEC:
+        messages.error(request, f"Erreur lors des vérifications: {job.ERREUR}")
+        return redirect('audit:liste_alertes')
 
-    if total_alertes > 0:
-        messages.success(request, f"{total_alertes} nouvelle(s) alerte(s) créée(s).")
-    else:
-        messages.info(request, "Aucune nouvelle alerte détectée.")
-
-    return redirect('audit:liste_alertes')
+    messages.info(request, "Vérifications de conformité lancées en arrière-plan.")
+    return redirect(f"{reverse('audit:liste_alertes')}?tache={job.UUID}")
 
 
 # ============================================================================
@@ -207,46 +212,30 @@ def liste_logs(request):
         return redirect('home')
 
     form = FiltresLogsForm(request.GET)
-    logs = ZDLOG.objects.all().select_related('USER')
+    filtres = form.cleaned_data if form.is_valid() else {}
+    logs = LogService.filtrer_logs(filtres)
 
-    if form.is_valid():
-        if form.cleaned_data.get('recherche'):
-            q = form.cleaned_data['recherche']
-            logs = logs.filter(
-                Q(TABLE_NAME__icontains=q) |
-                Q(RECORD_ID__icontains=q) |
-                Q(USER_NAME__icontains=q) |
-                Q(DESCRIPTION__icontains=q)
-            )
-        if form.cleaned_data.get('table_name'):
-            logs = logs.filter(TABLE_NAME__icontains=form.cleaned_data['table_name'])
-        if form.cleaned_data.get('type_mouvement'):
-            logs = logs.filter(TYPE_MOUVEMENT=form.cleaned_data['type_mouvement'])
-        if form.cleaned_data.get('date_debut'):
-            logs = logs.filter(DATE_MODIFICATION__date__gte=form.cleaned_data['date_debut'])
-        if form.cleaned_data.get('date_fin'):
-            logs = logs.filter(DATE_MODIFICATION__date__lte=form.cleaned_data['date_fin'])
-
-    # Statistiques
-    stats = {
-        'total': logs.count(),
-        'creations': logs.filter(TYPE_MOUVEMENT='CREATE').count(),
-        'modifications': logs.filter(TYPE_MOUVEMENT='UPDATE').count(),
-        'suppressions': logs.filter(TYPE_MOUVEMENT='DELETE').count(),
-    }
+    # Compteurs plafonnés / estimés, mis en cache
+    stats = LogService.get_stats_liste(logs, filtres)
 
-    paginator = Paginator(logs, 50)
-    page = request.GET.get('page', 1)
-    logs_page = paginator.get_page(page)
+    # Pagination par curseur : pas de COUNT ni d'OFFSET
+    logs_page = LogService.page_logs(
+        logs,
+        apres=request.GET.get('apres'),
+        avant=request.GET.get('avant')
+    )
 
-    # Tables disponibles pour le filtre
-    tables_disponibles = ZDLOG.objects.values_list('TABLE_NAME', flat=True).distinct()[:50]
+    # Paramètres de filtre conservés dans les liens de pagination
+    parametres = request.GET.copy()
+    for cle in ('apres', 'avant', 'page'):
+        parametres.pop(cle, None)
 
     context = {
         'logs': logs_page,
         'form': form,
         'stats': stats,
-        'tables_disponibles': tables_disponibles,
+        'tables_disponibles': ZDLOGTable.noms(),
+        'parametres': parametres.urlencode(),
     }
 
     return render(request, 'audit/liste_logs.html', context)
@@ -289,6 +278,7 @@ def liste_rapports(request):
 
     context = {
         'rapports': rapports_page,
+        'tache_suivie': tache_suivie(request),
     }
 
     return render(request, 'audit/liste_rapports.html', context)
@@ -310,34 +300,22 @@ def generer_rapport(request):
             date_debut = form.cleaned_data['date_debut']
             date_fin = form.cleaned_data['date_fin']
 
-            if type_rapport == 'CONFORMITE':
-                rapport = RapportAuditService.generer_rapport_conformite(
-                    date_debut, date_fin, employe, format_export
-                )
-            elif type_rapport == 'LOGS':
-                rapport = RapportAuditService.generer_rapport_logs(
-                    date_debut, date_fin, employe, format_export
-                )
-            elif type_rapport == 'CONTRATS':
-                rapport = RapportAuditService.generer_rapport_contrats(
-                    date_debut, date_fin, employe, format_export
-                )
-            else:
-                # Rapport personnalisé ou autre type
-                rapport = AURA.objects.create(
-                    TITRE=f"Rapport {type_rapport} du {date_debut} au {date_fin}",
-                    TYPE_RAPPORT=type_rapport,
-                    FORMAT=format_export,
-                    DATE_DEBUT=date_debut,
-                    DATE_FIN=date_fin,
-                    GENERE_PAR=employe,
-                    STATUT='TERMINE'
-                )
-
-            if rapport.STATUT == 'TERMINE':
-                messages.success(request, f"Rapport {rapport.REFERENCE} généré avec succès.")
+            # Génération exécutée en tâche de fond (voir audit.taches)
+            job = lancer('audit.generer_rapport', {
+                'type_rapport': type_rapport,
+                'format_export': format_export,
+                'date_debut': date_debut,
+                'date_fin': date_fin,
+                'matricule': employe.matricule if employe else None,
+            }, user=request.user)
+
+            if job.STATUT == ZDJOB.STATUT_TERMINE:
+                messages.success(request, job.MESSAGE)
+            elif job.STATUT == ZDJOB.STATUT_ECHEC:
+                messages.error(request, job.ERREUR)
             else:
-                messages.error(request, f"Erreur lors de la génération: {rapport.MESSAGE_ERREUR}")
+                messages.info(request, "Génération du rapport lancée en arrière-plan.")
+                return redirect(f"{reverse('audit:liste_rapports')}?tache={job.UUID}")
 
             return redirect('audit:liste_rapports')
     else:
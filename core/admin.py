@@ -1,18 +1,41 @@
 from django.contrib import admin
-from .models import ZDLOG
+from .models import ZDJOB, ZDLOG, ZDLOGTable
+from .pagination import PaginateurEstime
+from .recherche import filtrer_texte
+
+
+class TableAuditeeFilter(admin.SimpleListFilter):
+    """Filtre par table, alimenté par le référentiel ZDLOGTable (sans DISTINCT sur ZDLOG)"""
+    title = 'Nom de la table'
+    parameter_name = 'TABLE_NAME'
+
+    def lookups(self, request, model_admin):
+        return [(nom, nom) for nom in ZDLOGTable.noms()]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(TABLE_NAME=self.value())
+        return queryset
 
 
 @admin.register(ZDLOG)
 class ZDLOGAdmin(admin.ModelAdmin):
     list_display = (
     'DATE_MODIFICATION', 'TABLE_NAME', 'RECORD_ID', 'TYPE_MOUVEMENT', 'USER_NAME', 'get_description_short')
-    list_filter = ('TABLE_NAME', 'TYPE_MOUVEMENT', 'DATE_MODIFICATION', 'USER')
-    search_fields = ('TABLE_NAME', 'RECORD_ID', 'USER_NAME', 'DESCRIPTION')
+    list_filter = (TableAuditeeFilter, 'TYPE_MOUVEMENT', 'DATE_MODIFICATION')
+    # Recherche indexée (voir get_search_results)
+    search_fields = ('DESCRIPTION', 'TABLE_NAME', 'RECORD_ID', 'USER_NAME')
+    search_help_text = "Recherche plein texte dans la description, table, début de la clé ou de l'utilisateur"
     readonly_fields = ('TABLE_NAME', 'RECORD_ID', 'TYPE_MOUVEMENT', 'DATE_MODIFICATION',
                        'USER', 'USER_NAME', 'ANCIENNE_VALEUR', 'NOUVELLE_VALEUR',
                        'DESCRIPTION', 'IP_ADDRESS')
-    ordering = ('-DATE_MODIFICATION',)
-    date_hierarchy = 'DATE_MODIFICATION'
+    ordering = ('-DATE_MODIFICATION', '-id')
+    # Comptages estimés / plafonnés au lieu de COUNT(*) sur toute la table
+    paginator = PaginateurEstime
+    show_full_result_count = False
+
+    def get_search_results(self, request, queryset, search_term):
+        return filtrer_texte(queryset, search_term), False
 
     def get_description_short(self, obj):
         if len(obj.DESCRIPTION) > 50:
@@ -28,4 +51,20 @@ class ZDLOGAdmin(admin.ModelAdmin):
         return request.user.is_superuser
 
     def has_change_permission(self, request, obj=None):
-        return False
\ No newline at end of file
+        return False
+
+
+@admin.register(ZDJOB)
+class ZDJOBAdmin(admin.ModelAdmin):
+    list_display = ('DATE_CREATION', 'TACHE', 'STATUT', 'PROGRESSION', 'DEMANDE_PAR', 'WORKER', 'TENTATIVES')
+    list_filter = ('STATUT', 'TACHE')
+    readonly_fields = ('UUID', 'TACHE', 'PARAMETRES', 'STATUT', 'PROGRESSION', 'MESSAGE', 'RESULTAT',
+                       'ERREUR', 'DEMANDE_PAR', 'WORKER', 'TENTATIVES', 'DATE_CREATION', 'DATE_DEBUT',
+                       'DATE_FIN', 'DATE_SIGNE_VIE')
+    ordering = ('-DATE_CREATION',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
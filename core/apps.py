@@ -1,4 +1,6 @@
 from django.apps import AppConfig
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.utils.module_loading import autodiscover_modules
 
 
 class CoreConfig(AppConfig):
@@ -7,4 +9,13 @@ class CoreConfig(AppConfig):
     verbose_name = 'Système Central'
 
     def ready(self):
-        import core.signals  # Charger tous les signals
\ No newline at end of file
+        import core.signals  # Charger tous les signals
+        from core import cache
+
+        # Invalidation des caches par tags (core.cache), pour tous les modèles
+        post_save.connect(cache.invalider_modele, dispatch_uid='core.cache.post_save')
+        post_delete.connect(cache.invalider_modele, dispatch_uid='core.cache.post_delete')
+        m2m_changed.connect(cache.invalider_relation, dispatch_uid='core.cache.m2m_changed')
+
+        # Déclaration des tâches de fond (module taches.py de chaque application)
+        autodiscover_modules('taches')
@@ -0,0 +1,345 @@
+"""
+Cache invalidé par dépendances (tags de modèles).
+
+Chaque famille de clés déclare les modèles dont ses données dépendent ;
+une entrée est invalidée dès qu'une de ses sources change, au lieu
+d'attendre l'expiration de son TTL :
+
+    CALENDRIER_REF = FamilleCache('planning.calendrier_ref', tags=[PosteTravail, SiteTravail])
+
+    donnees = CALENDRIER_REF.obtenir(calculer)              # clé unique
+    stats = STATS_FRAIS.obtenir(calculer, matricule, annee)  # clé par paramètres
+    semaines = DISPOS.obtenir_plusieurs(calculer_manquantes, [(perimetre, lundi), ...])  # lecture groupée
+
+Un tag est une classe de modèle, 'app_label.modele' ou 'app_label'
+(tous les modèles de l'application). Chaque tag a une version en cache ;
+la clé d'une entrée contient les versions de ses tags. Tout
+enregistrement ou suppression (post_save, post_delete, m2m_changed)
+renouvelle, après validation de la transaction, la version du modèle et
+de son application : les entrées qui en dépendent ne sont plus relues et
+expirent d'elles-mêmes. Le TTL (CACHE_TTL_TAGUE) n'est qu'un filet de
+sécurité pour les écritures sans signal (update(), bulk_create, SQL) ;
+ces chemins appellent `invalider_tags()`.
+
+Données de référence lues à chaque requête (paramètres, entreprise,
+jours fériés, plafonds...) : `FamilleCache(..., locale=N)` ajoute devant
+le cache partagé un cache mémoire LRU de N entrées par processus. Les
+versions des tags y sont relues une fois par requête
+(CacheLocalMiddleware, une seule lecture groupée) et au plus tous les
+CACHE_LOCAL_DELAI secondes hors requête (worker, commandes) : une lecture
+devient une recherche dans un dictionnaire, et une modification faite
+par un autre processus est vue dès la requête suivante. Les valeurs du
+cache mémoire sont partagées entre threads : elles ne doivent pas être
+modifiées par l'appelant. CACHE_LOCAL_ACTIF=False désactive ce niveau
+(tests : les retours arrière de transaction n'émettent pas de signal).
+
+Les succès et défauts de cache sont comptés par famille (`statistiques()`,
+commande `statistiques_cache`).
+"""
+import hashlib
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+PREFIXE = 'tc'
+
+# Modèles qui n'invalident rien (écritures fréquentes, jamais mis en cache)
+TAGS_EXCLUS_DEFAUT = (
+    'core.zdlog',
+    'core.zdlogtable',
+    'core.zdjob',
+    'sessions.session',
+    'admin.logentry',
+)
+
+# Familles déclarées : nom -> FamilleCache
+_familles = {}
+
+_ABSENT = object()
+
+# Versions des tags vues par le processus (familles avec cache mémoire)
+_versions_processus = {'valeurs': {}, 'lues_a': float('-inf')}
+
+
+def normaliser_tag(tag):
+    """Classe de modèle ou texte -> 'app_label.modele' / 'app_label'"""
+    if isinstance(tag, str):
+        return tag.lower()
+    return tag._meta.label_lower
+
+
+def tags_modele(modele):
+    """Tags renouvelés par une modification du modèle (None si exclu)"""
+    label = modele._meta.label_lower
+    if label in getattr(settings, 'CACHE_TAGS_EXCLUS', TAGS_EXCLUS_DEFAUT):
+        return None
+    return (label, modele._meta.app_label)
+
+
+def _cle_version(tag):
+    return f'{PREFIXE}:v:{tag}'
+
+
+def versions(tags):
+    """Versions courantes des tags (créées au besoin), dans l'ordre des tags"""
+    cles = [_cle_version(tag) for tag in tags]
+    trouvees = cache.get_many(cles)
+    manquantes = {cle: uuid.uuid4().hex[:12] for cle in cles if cle not in trouvees}
+    if manquantes:
+        cache.set_many(manquantes, None)
+        trouvees.update(manquantes)
+    return [trouvees[cle] for cle in cles]
+
+
+def invalider_tags(*tags):
+    """Renouvelle immédiatement la version des tags"""
+    nouvelles = {normaliser_tag(tag): uuid.uuid4().hex[:12] for tag in tags}
+    cache.set_many({_cle_version(tag): version for tag, version in nouvelles.items()}, None)
+    _versions_processus['valeurs'] = {**_versions_processus['valeurs'], **nouvelles}
+
+
+def invalider_apres_commit(*tags, using=None):
+    """
+    Renouvelle la version des tags après validation de la transaction en
+    cours. Le cache mémoire du processus est invalidé tout de suite : il
+    relit ses propres écritures (au pire un défaut de plus si la
+    transaction est annulée).
+    """
+    _oublier_versions_locales(tags)
+    transaction.on_commit(lambda: invalider_tags(*tags), using=using)
+
+
+def cache_local_actif():
+    return getattr(settings, 'CACHE_LOCAL_ACTIF', True)
+
+
+def _tags_locaux():
+    return sorted({tag for famille in _familles.values() if famille.locale for tag in famille.tags})
+
+
+def rafraichir_versions():
+    """Relit en une fois les versions des tags des familles avec cache mémoire"""
+    tags = _tags_locaux()
+    if tags:
+        _versions_processus['valeurs'] = dict(zip(tags, versions(tags)))
+    _versions_processus['lues_a'] = time.monotonic()
+
+
+def _oublier_versions_locales(tags):
+    """Version locale provisoire : les entrées mémoire de ces tags ne sont plus lues"""
+    provisoires = {normaliser_tag(tag): f'local-{uuid.uuid4().hex[:12]}' for tag in tags}
+    _versions_processus['valeurs'] = {**_versions_processus['valeurs'], **provisoires}
+
+
+def versions_locales(tags):
+    """Versions des tags vues par le processus, relues si trop anciennes"""
+    delai = getattr(settings, 'CACHE_LOCAL_DELAI', 5)
+    valeurs = _versions_processus['valeurs']
+    if time.monotonic() - _versions_processus['lues_a'] > delai or any(tag not in valeurs for tag in tags):
+        rafraichir_versions()
+        valeurs = _versions_processus['valeurs']
+    return tuple(valeurs[tag] for tag in tags)
+
+
+class FamilleCache:
+    """Famille de clés de cache invalidée par ses tags"""
+
+    def __init__(self, nom, tags, timeout=None, locale=0):
+        """
+        Args:
+            nom: nom unique de la famille (préfixe des clés)
+            tags: modèles sources (classes, 'app.modele' ou 'app')
+            timeout: TTL de sécurité (défaut : CACHE_TTL_TAGUE)
+            locale: nombre d'entrées du cache mémoire du processus (0 : aucun)
+        """
+        self.nom = nom
+        self.tags = sorted({normaliser_tag(tag) for tag in tags})
+        self._timeout = timeout
+        self.locale = locale
+        self._memoire = OrderedDict()
+        self._verrou = threading.Lock()
+        self._hits_locaux = 0
+        _familles[nom] = self
+
+    def __repr__(self):
+        return f"<FamilleCache {self.nom} {self.tags}>"
+
+    @property
+    def timeout(self):
+        if self._timeout is not None:
+            return self._timeout
+        return getattr(settings, 'CACHE_TTL_TAGUE', 21600)
+
+    def cle(self, *parametres, versions_tags=None):
+        """Clé courante : nom, empreinte des versions des tags, paramètres"""
+        versions_tags = versions_tags or versions(self.tags)
+        empreinte = hashlib.md5('.'.join(versions_tags).encode()).hexdigest()[:16]
+        return ':'.join([PREFIXE, self.nom, empreinte, *(str(p) for p in parametres)])
+
+    def obtenir(self, calcul, *parametres):
+        """
+        Valeur en cache, ou résultat de `calcul()` mis en cache.
+
+        Args:
+            calcul: fonction sans argument calculant la valeur
+            *parametres: compléments de clé (utilisateur, année, date...)
+        """
+        if not (self.locale and cache_local_actif()):
+            return self._obtenir_partage(calcul, parametres)
+
+        versions_tags = versions_locales(self.tags)
+        cle_locale = (versions_tags, parametres)
+        with self._verrou:
+            valeur = self._memoire.get(cle_locale, _ABSENT)
+            if valeur is not _ABSENT:
+                self._memoire.move_to_end(cle_locale)
+                self._hits_locaux += 1
+                return valeur
+
+        valeur = self._obtenir_partage(calcul, parametres, versions_tags)
+        with self._verrou:
+            self._memoire[cle_locale] = valeur
+            while len(self._memoire) > self.locale:
+                self._memoire.popitem(last=False)
+        return valeur
+
+    def obtenir_plusieurs(self, calcul, liste_parametres):
+        """
+        Valeurs de plusieurs clés en une lecture groupée (cache partagé) ;
+        les clés absentes sont calculées ensemble.
+
+        Args:
+            calcul: fonction recevant la liste des tuples de paramètres
+                manquants et renvoyant un dict tuple -> valeur
+            liste_parametres: tuples de paramètres, un par clé
+
+        Returns:
+            list: valeurs, dans l'ordre de liste_parametres
+        """
+        versions_tags = versions(self.tags)
+        cles = {parametres: self.cle(*parametres, versions_tags=versions_tags) for parametres in liste_parametres}
+        trouvees = cache.get_many(cles.values())
+        valeurs = {parametres: trouvees[cle] for parametres, cle in cles.items() if cle in trouvees}
+        manquants = [parametres for parametres in cles if parametres not in valeurs]
+        if valeurs:
+            self._compter('hits', len(valeurs))
+        if manquants:
+            self._compter('misses', len(manquants))
+            calculees = calcul(manquants)
+            cache.set_many({cles[parametres]: calculees[parametres] for parametres in manquants}, self.timeout)
+            valeurs.update(calculees)
+        return [valeurs[parametres] for parametres in liste_parametres]
+
+    def _obtenir_partage(self, calcul, parametres, versions_tags=None):
+        """Cache partagé (Redis) ; calcul en cas de défaut"""
+        cle = self.cle(*parametres, versions_tags=versions_tags)
+        valeur = cache.get(cle, _ABSENT)
+        if valeur is not _ABSENT:
+            self._compter('hits')
+            return valeur
+        self._compter('misses')
+        valeur = calcul()
+        # Une invalidation pendant le calcul change la clé : la valeur
+        # éventuellement périmée est écrite sous l'ancienne et jamais relue
+        cache.set(cle, valeur, self.timeout)
+        return valeur
+
+    def invalider(self):
+        """Invalide toutes les entrées de la famille (et des familles partageant ses tags)"""
+        invalider_tags(*self.tags)
+
+    def vider_memoire(self):
+        """Vide le cache mémoire du processus"""
+        with self._verrou:
+            self._memoire.clear()
+
+    # ------------------------------------------------------------------
+    # Statistiques
+    # ------------------------------------------------------------------
+
+    def _cle_compteur(self, compteur):
+        return f'{PREFIXE}:stats:{self.nom}:{compteur}'
+
+    def _compter(self, compteur, nombre=1):
+        cle = self._cle_compteur(compteur)
+        try:
+            cache.incr(cle, nombre)
+        except ValueError:
+            cache.add(cle, nombre, None)
+
+    def publier_hits_locaux(self):
+        """Reporte dans le cache partagé les succès du cache mémoire (compteur par processus)"""
+        with self._verrou:
+            nombre, self._hits_locaux = self._hits_locaux, 0
+        if nombre:
+            self._compter('hits_locaux', nombre)
+
+    def statistiques(self):
+        """dict: hits (dont hits_locaux), misses, taux (% de succès, None sans lecture)"""
+        self.publier_hits_locaux()
+        cles = {compteur: self._cle_compteur(compteur) for compteur in ('hits', 'hits_locaux', 'misses')}
+        valeurs = cache.get_many(cles.values())
+        hits_locaux = valeurs.get(cles['hits_locaux'], 0)
+        hits = valeurs.get(cles['hits'], 0) + hits_locaux
+        misses = valeurs.get(cles['misses'], 0)
+        total = hits + misses
+        return {
+            'hits': hits,
+            'hits_locaux': hits_locaux,
+            'misses': misses,
+            'taux': round(100 * hits / total, 1) if total else None,
+        }
+
+    def reinitialiser_statistiques(self):
+        cache.delete_many([self._cle_compteur(compteur) for compteur in ('hits', 'hits_locaux', 'misses')])
+
+
+def familles():
+    """Familles déclarées, par nom"""
+    return dict(sorted(_familles.items()))
+
+
+def statistiques():
+    """Statistiques de toutes les familles déclarées : {nom: {hits, hits_locaux, misses, taux}}"""
+    return {nom: famille.statistiques() for nom, famille in familles().items()}
+
+
+def debut_requete():
+    """
+    Début de requête (CacheLocalMiddleware) : relit les versions des tags
+    et publie les succès du cache mémoire, au plus tous les CACHE_LOCAL_DELAI
+    secondes pour les compteurs.
+    """
+    if not cache_local_actif() or not _tags_locaux():
+        return
+    publier = time.monotonic() - _versions_processus['lues_a'] > getattr(settings, 'CACHE_LOCAL_DELAI', 5)
+    rafraichir_versions()
+    if publier:
+        for famille in _familles.values():
+            if famille.locale:
+                famille.publier_hits_locaux()
+
+
+# ----------------------------------------------------------------------
+# Invalidation par signaux (connectés dans CoreConfig.ready)
+# ----------------------------------------------------------------------
+
+def invalider_modele(sender, using=None, **kwargs):
+    """post_save / post_delete : invalide les tags du modèle modifié"""
+    tags = tags_modele(sender)
+    if tags:
+        invalider_apres_commit(*tags, using=using)
+
+
+def invalider_relation(sender, instance, action, using=None, **kwargs):
+    """m2m_changed : invalide le modèle de l'instance et la table de liaison"""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    tags = set(tags_modele(sender) or ()) | set(tags_modele(type(instance)) or ())
+    if tags:
+        invalider_apres_commit(*tags, using=using)
@@ -0,0 +1,182 @@
+"""
+Détection des chevauchements d'intervalles (absences, contrats, affectations
+ZYAF, planning).
+
+Le test d'intersection est fait en SQL et renvoie le premier conflit en une
+requête, au lieu de parcourir les lignes candidates en Python :
+
+- intervalles de dates (bornes incluses, fin nulle = en cours) : sous
+  PostgreSQL, prédicat daterange(...) && daterange(...) servi par les index
+  GiST (employe_id, periode) ; ailleurs,
+  comparaison des bornes ;
+- intervalles horaires (fin exclue) : comparaison stricte des bornes.
+
+L'API par lot (conflits_lot) confronte N intervalles proposés à l'existant en
+une requête puis en mémoire (IndexIntervalles : tri par début et maximum
+cumulé des fins, recherche dichotomique), pour les imports et la génération
+de planning.
+
+Index et contraintes créés par les migrations employee.0005, absence.0022 et
+planning.0007 (PostgreSQL uniquement, extension btree_gist) :
+
+    conflit = premier_conflit(ZYCO.objects.filter(employe=employe), debut, fin)
+"""
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+
+from django.db import connection
+from django.db.models import BooleanField, DateField, F, Field, Func, Q, Value
+from django.db.models.functions import Cast, Coalesce, Least
+
+# Fin absente (intervalle en cours) : plus grande que toute borne
+_INFINI = (1,)
+
+
+class Periode(Func):
+    """daterange(debut, fin, '[]') : bornes incluses, fin nulle = non bornée"""
+    function = 'daterange'
+    template = "%(function)s(%(expressions)s, '[]')"
+    output_field = Field()
+
+
+class Chevauche(Func):
+    """Opérateur && entre deux intervalles PostgreSQL"""
+    arg_joiner = ' && '
+    template = '(%(expressions)s)'
+    output_field = BooleanField()
+
+
+def periode_colonnes(champ_debut, champ_fin):
+    """
+    Periode des colonnes d'un modèle. La borne basse est ramenée à la fin si
+    les dates sont inversées (daterange refuse une borne basse supérieure) :
+    l'expression doit rester identique à celle des index GiST (migrations
+    employee.0005 et absence.0022).
+    """
+    return Periode(Least(F(champ_debut), Coalesce(F(champ_fin), F(champ_debut))), F(champ_fin))
+
+
+def filtrer_chevauchements(queryset, debut, fin, champ_debut='date_debut', champ_fin='date_fin',
+                           bornes_incluses=True):
+    """
+    Lignes du queryset dont l'intervalle [champ_debut, champ_fin] croise
+    [debut, fin].
+
+    Args:
+        queryset: QuerySet des intervalles existants
+        debut, fin: intervalle proposé (fin None = en cours)
+        champ_debut, champ_fin: champs du modèle (champ_fin nul = en cours)
+        bornes_incluses: True pour des dates (fin incluse), False pour des
+            heures (fin exclue : 08:00-12:00 et 12:00-14:00 ne se chevauchent pas)
+    """
+    if bornes_incluses and connection.vendor == 'postgresql':
+        return queryset.filter(Chevauche(
+            periode_colonnes(champ_debut, champ_fin),
+            Periode(Cast(Value(debut), DateField()), Cast(Value(fin), DateField())),
+        ))
+
+    suffixe_debut, suffixe_fin = ('lte', 'gte') if bornes_incluses else ('lt', 'gt')
+    condition = Q(**{f'{champ_fin}__isnull': True}) | Q(**{f'{champ_fin}__{suffixe_fin}': debut})
+    if fin is not None:
+        condition &= Q(**{f'{champ_debut}__{suffixe_debut}': fin})
+    return queryset.filter(condition)
+
+
+def premier_conflit(queryset, debut, fin, champ_debut='date_debut', champ_fin='date_fin',
+                    exclure_pk=None, bornes_incluses=True):
+    """
+    Premier intervalle existant (par date de début) qui croise [debut, fin],
+    ou None. Une requête.
+    """
+    if exclure_pk is not None:
+        queryset = queryset.exclude(pk=exclure_pk)
+    return filtrer_chevauchements(
+        queryset, debut, fin, champ_debut, champ_fin, bornes_incluses
+    ).order_by(champ_debut, 'pk').first()
+
+
+class IndexIntervalles:
+    """
+    Index en mémoire d'intervalles, interrogeable en O(log n).
+
+    Les intervalles sont triés par début ; le maximum cumulé des fins est
+    croissant, ce qui permet de trouver par dichotomie le premier intervalle
+    (par début) qui croise un intervalle donné.
+    """
+
+    def __init__(self, intervalles, bornes_incluses=True):
+        """
+        Args:
+            intervalles: itérable de (debut, fin, objet) ; fin None = en cours
+            bornes_incluses: voir filtrer_chevauchements
+        """
+        self.bornes_incluses = bornes_incluses
+        self._elements = sorted(intervalles, key=lambda e: e[0])
+        self._debuts = [debut for debut, _, _ in self._elements]
+        self._fins_max = []
+        fin_max = None
+        for _, fin, _ in self._elements:
+            borne = _INFINI if fin is None else (0, fin)
+            fin_max = borne if fin_max is None or borne > fin_max else fin_max
+            self._fins_max.append(fin_max)
+
+    def __len__(self):
+        return len(self._elements)
+
+    def premier(self, debut, fin):
+        """Objet du premier intervalle qui croise [debut, fin], ou None"""
+        if fin is None:
+            limite = len(self._debuts)
+        elif self.bornes_incluses:
+            limite = bisect_right(self._debuts, fin)
+        else:
+            limite = bisect_left(self._debuts, fin)
+
+        recherche = bisect_left if self.bornes_incluses else bisect_right
+        index = recherche(self._fins_max, (0, debut), 0, limite)
+        return self._elements[index][2] if index < limite else None
+
+
+def conflits_lot(queryset, intervalles, champs_cle=('employe_id',), champ_debut='date_debut',
+                 champ_fin='date_fin', bornes_incluses=True):
+    """
+    Confronte N intervalles proposés aux intervalles existants, en une requête.
+
+    Args:
+        queryset: QuerySet des intervalles existants (statuts déjà filtrés)
+        intervalles: liste de (cle, debut, fin) ; cle est un tuple de valeurs
+            des champs_cle, par ex. (matricule,) ou (matricule, date)
+        champs_cle: champs qui partitionnent les intervalles (employé, jour...)
+        champ_debut, champ_fin, bornes_incluses: voir filtrer_chevauchements
+
+    Returns:
+        dict: index de l'intervalle proposé -> premier objet existant en conflit
+    """
+    if not intervalles:
+        return {}
+
+    # Fenêtre englobante : une seule requête pour tout le lot
+    debut_min = min(debut for _, debut, _ in intervalles)
+    fins = [fin for _, _, fin in intervalles]
+    fin_max = None if None in fins else max(fins)
+    filtres = {
+        f'{champ}__in': {cle[position] for cle, _, _ in intervalles}
+        for position, champ in enumerate(champs_cle)
+    }
+    existants = filtrer_chevauchements(
+        queryset.filter(**filtres), debut_min, fin_max, champ_debut, champ_fin, bornes_incluses
+    )
+
+    par_cle = defaultdict(list)
+    for objet in existants:
+        cle = tuple(getattr(objet, champ) for champ in champs_cle)
+        par_cle[cle].append((getattr(objet, champ_debut), getattr(objet, champ_fin), objet))
+    index = {cle: IndexIntervalles(elements, bornes_incluses) for cle, elements in par_cle.items()}
+
+    conflits = {}
+    for position, (cle, debut, fin) in enumerate(intervalles):
+        if cle in index:
+            conflit = index[cle].premier(debut, fin)
+            if conflit is not None:
+                conflits[position] = conflit
+    return conflits
@@ -1,27 +1,37 @@
 # core/context_processors.py
 from absence.models import NotificationAbsence
+from core.cache import FamilleCache
 
+# Lu à chaque page : cache mémoire du processus devant Redis
+CACHE_ENTREPRISE = FamilleCache('core.entreprise_context', tags=['entreprise.entreprise'], locale=1)
+
+
+def _charger_entreprise():
+    from entreprise.models import Entreprise
 
-def entreprise_context(request):
-    """
-    Rend l'entreprise et son logo disponibles dans tous les templates.
-    """
     context = {
         'entreprise_logo_url': None,
         'entreprise_nom': '',
     }
+    entreprise = Entreprise.objects.first()
+    if entreprise:
+        context['entreprise_nom'] = entreprise.nom
+        if entreprise.logo:
+            context['entreprise_logo_url'] = entreprise.logo.url
+    return context
 
+
+def entreprise_context(request):
+    """
+    Rend l'entreprise et son logo disponibles dans tous les templates.
+    """
     try:
-        from entreprise.models import Entreprise
-        entreprise = Entreprise.objects.first()
-        if entreprise:
-            context['entreprise_nom'] = entreprise.nom
-            if entreprise.logo:
-                context['entreprise_logo_url'] = entreprise.logo.url
+        return dict(CACHE_ENTREPRISE.obtenir(_charger_entreprise))
     except Exception:
-        pass
-
-    return context
+        return {
+            'entreprise_logo_url': None,
+            'entreprise_nom': '',
+        }
 
 
 def notifications_unifiees(request):
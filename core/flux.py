@@ -0,0 +1,54 @@
+"""
+Flux JSON en cache avec ETag (calendriers FullCalendar).
+
+Le corps JSON est encodé une seule fois (orjson) puis mis en cache avec
+son empreinte dans une famille invalidée par tags (core.cache). Le
+navigateur revalide à chaque navigation (If-None-Match) : tant que les
+données sources n'ont pas changé, la réponse est un 304 sans corps,
+servi sans requête SQL.
+
+    return reponse_json_en_cache(request, CACHE_FLUX, calculer, perimetre, debut, fin)
+"""
+import hashlib
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dépendance de requirements.txt
+    orjson = None
+
+
+def encoder_json(donnees):
+    """Encode en JSON (bytes) ; dates, heures, Decimal et UUID acceptés"""
+    if orjson is not None:
+        return orjson.dumps(donnees, default=str)
+    return json.dumps(donnees, cls=DjangoJSONEncoder, separators=(',', ':')).encode()
+
+
+def reponse_json_en_cache(request, famille, calcul, *parametres):
+    """
+    Réponse JSON servie depuis la famille de cache, ou 304 si le client a
+    déjà la version courante.
+
+    Args:
+        request: requête (en-tête If-None-Match)
+        famille: FamilleCache dont les tags couvrent les données du flux
+        calcul: fonction sans argument renvoyant les données (list / dict)
+        *parametres: compléments de clé (périmètre de visibilité, fenêtre)
+    """
+    def construire():
+        contenu = encoder_json(calcul())
+        return {'etag': f'"{hashlib.md5(contenu).hexdigest()}"', 'contenu': contenu}
+
+    entree = famille.obtenir(construire, *parametres)
+    reponse = get_conditional_response(request, etag=entree['etag'])
+    if reponse is None:
+        reponse = HttpResponse(entree['contenu'], content_type='application/json')
+    reponse['ETag'] = entree['etag']
+    # Données personnelles : pas de cache partagé, revalidation systématique
+    patch_cache_control(reponse, private=True, no_cache=True)
+    return reponse
@@ -0,0 +1,149 @@
+# core/management/commands/executer_taches.py
+"""
+Worker de la file de tâches de fond (ZDJOB).
+
+Plusieurs workers peuvent tourner en parallèle (un par processus) : la
+réservation d'une tâche est atomique, chacune n'est exécutée qu'une fois.
+
+Usage:
+    python manage.py executer_taches
+    python manage.py executer_taches --une-fois
+    python manage.py executer_taches --intervalle 2 --tache audit.generer_rapport
+"""
+import logging
+import signal
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+from django.utils import timezone
+
+from core import taches
+from core.models import ZDJOB
+
+logger = logging.getLogger(__name__)
+
+# Intervalle entre deux signes de vie d'une tâche en cours (secondes)
+INTERVALLE_SIGNE_VIE = 30
+
+# Intervalle entre deux récupérations de tâches bloquées (secondes)
+INTERVALLE_RECUPERATION = 60
+
+
+class Command(BaseCommand):
+    help = 'Exécute les tâches de fond en attente (file ZDJOB)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--intervalle',
+            type=float,
+            default=1.0,
+            help="Attente en secondes quand la file est vide (défaut: 1)"
+        )
+        parser.add_argument(
+            '--une-fois',
+            action='store_true',
+            help="Vide la file puis s'arrête (cron, tests)"
+        )
+        parser.add_argument(
+            '--tache',
+            action='append',
+            dest='taches',
+            help="Limite le worker à cette tâche (option répétable)"
+        )
+        parser.add_argument(
+            '--purger-jours',
+            type=int,
+            default=30,
+            help="Supprime au démarrage les tâches terminées depuis N jours (0 = jamais)"
+        )
+
+    def handle(self, *args, **options):
+        self.arret = False
+        signal.signal(signal.SIGTERM, self._demander_arret)
+        signal.signal(signal.SIGINT, self._demander_arret)
+
+        worker = taches.nom_worker()
+        self._log_header(worker, options)
+
+        if options['purger_jours']:
+            supprimees = taches.purger_taches_terminees(options['purger_jours'])
+            if supprimees:
+                self.stdout.write(f"  {supprimees} tâche(s) terminée(s) purgée(s)")
+
+        executees = 0
+        derniere_recuperation = 0
+        while not self.arret:
+            close_old_connections()
+
+            if time.monotonic() - derniere_recuperation > INTERVALLE_RECUPERATION:
+                remises, echecs = taches.recuperer_taches_bloquees()
+                if remises or echecs:
+                    self.stdout.write(self.style.WARNING(
+                        f"  Tâches bloquées : {remises} remise(s) en file, {echecs} en échec"
+                    ))
+                derniere_recuperation = time.monotonic()
+
+            job = taches.reserver_suivante(worker, options['taches'])
+            if job is None:
+                if options['une_fois']:
+                    break
+                time.sleep(options['intervalle'])
+                continue
+
+            self._executer(job)
+            executees += 1
+
+        self.stdout.write(f"\n  {executees} tâche(s) exécutée(s) par {worker}")
+        self.stdout.write(f"{'='*60}\n")
+
+    def _executer(self, job):
+        """Exécute la tâche en publiant un signe de vie régulier"""
+        debut = time.monotonic()
+        self.stdout.write(f"  -> {job.TACHE} ({job.UUID})")
+
+        fin = threading.Event()
+        signe_vie = threading.Thread(target=self._signe_vie, args=(job.pk, fin), daemon=True)
+        signe_vie.start()
+        try:
+            taches.executer(job)
+        finally:
+            fin.set()
+            signe_vie.join()
+
+        duree = time.monotonic() - debut
+        if job.STATUT == ZDJOB.STATUT_TERMINE:
+            self.stdout.write(self.style.SUCCESS(f"     Terminée en {duree:.1f}s"))
+        else:
+            self.stdout.write(self.style.ERROR(f"     Échec en {duree:.1f}s : {job.ERREUR}"))
+        logger.info("Tâche %s %s : %s en %.1fs", job.TACHE, job.UUID, job.STATUT, duree)
+
+    @staticmethod
+    def _signe_vie(pk, fin):
+        """Tient DATE_SIGNE_VIE à jour pour les tâches qui ne publient pas d'avancement"""
+        try:
+            while not fin.wait(INTERVALLE_SIGNE_VIE):
+                ZDJOB.objects.filter(pk=pk, STATUT=ZDJOB.STATUT_EN_COURS).update(
+                    DATE_SIGNE_VIE=timezone.now()
+                )
+        finally:
+            connection.close()
+
+    def _demander_arret(self, signum, frame):
+        """Termine la tâche en cours puis s'arrête"""
+        self.stdout.write(self.style.WARNING("\n  Arrêt demandé, fin de la tâche en cours..."))
+        self.arret = True
+
+    def _log_header(self, worker, options):
+        """Affiche l'en-tête."""
+        self.stdout.write(f"\n{'='*60}")
+        self.stdout.write(
+            f"  WORKER TACHES DE FOND - {timezone.now().strftime('%d/%m/%Y %H:%M:%S')}"
+        )
+        self.stdout.write(f"{'='*60}")
+        self.stdout.write(f"  Worker   : {worker}")
+        self.stdout.write(f"  Tâches   : {', '.join(options['taches'] or taches.taches_declarees())}")
+        if options['une_fois']:
+            self.stdout.write("  Mode     : une fois (arrêt quand la file est vide)")
+        self.stdout.write("")
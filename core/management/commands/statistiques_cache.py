@@ -0,0 +1,66 @@
+# core/management/commands/statistiques_cache.py
+"""
+Affiche les succès / défauts des familles de cache invalidées par tags
+(core.cache), dont les succès du cache mémoire des processus.
+
+Usage:
+    python manage.py statistiques_cache
+    python manage.py statistiques_cache --reinitialiser
+"""
+from importlib import import_module
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core import cache as cache_tague
+
+
+class Command(BaseCommand):
+    help = 'Statistiques (hits/misses) des familles de cache invalidées par tags'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reinitialiser',
+            action='store_true',
+            help="Remet les compteurs à zéro après affichage"
+        )
+
+    def handle(self, *args, **options):
+        # Les familles sont déclarées dans les modules de vues et de services
+        import_module(settings.ROOT_URLCONF)
+
+        self._log_header()
+        familles = cache_tague.familles()
+        largeur = max((len(nom) for nom in familles), default=10)
+
+        self.stdout.write(
+            f"  {'Famille'.ljust(largeur)}  {'Hits':>8}  {'Mémoire':>8}  {'Misses':>8}  {'Taux':>7}  Tags"
+        )
+        for nom, famille in familles.items():
+            stats = famille.statistiques()
+            taux = f"{stats['taux']:.1f} %" if stats['taux'] is not None else '-'
+            self.stdout.write(
+                f"  {nom.ljust(largeur)}  {stats['hits']:>8}  {stats['hits_locaux']:>8}  "
+                f"{stats['misses']:>8}  {taux:>7}  "
+                f"{', '.join(famille.tags)}"
+            )
+            if options['reinitialiser']:
+                famille.reinitialiser_statistiques()
+
+        if options['reinitialiser']:
+            self.stdout.write(self.style.SUCCESS("\n  Compteurs réinitialisés"))
+        self.stdout.write(f"{'='*60}\n")
+
+    def _log_header(self):
+        """Affiche l'en-tête."""
+        self.stdout.write(f"\n{'='*60}")
+        self.stdout.write(
+            f"  STATISTIQUES DU CACHE - {timezone.now().strftime('%d/%m/%Y %H:%M:%S')}"
+        )
+        self.stdout.write(f"{'='*60}")
+        self.stdout.write(f"  TTL de sécurité : {getattr(settings, 'CACHE_TTL_TAGUE', 21600)} s")
+        self.stdout.write(
+            "  Mémoire : succès du cache par processus, publiés au fil des requêtes "
+            f"(actif : {getattr(settings, 'CACHE_LOCAL_ACTIF', True)})\n"
+        )
@@ -1,3 +1,4 @@
+from .cache import debut_requete
 from .signals import set_current_request
 from django.shortcuts import redirect
 from django.contrib import messages
@@ -17,6 +18,21 @@ class CurrentRequestMiddleware:
         return response
 
 
+class CacheLocalMiddleware:
+    """
+    Relit en début de requête les versions des tags des caches mémoire
+    (core.cache) : une seule lecture groupée, puis les données de
+    référence sont servies sans aller-retour vers Redis.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        debut_requete()
+        return self.get_response(request)
+
+
 # core/middleware.py (ou employee/middleware.py)
 class PermissionDeniedMiddleware:
     """
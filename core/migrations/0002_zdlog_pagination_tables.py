@@ -0,0 +1,56 @@
+# Generated by Django 5.0.6 on 2026-10-19 02:52
+
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def initialiser_tables(apps, schema_editor):
+    """Alimente le référentiel à partir des tables déjà présentes dans ZDLOG."""
+    ZDLOG = apps.get_model('core', 'ZDLOG')
+    ZDLOGTable = apps.get_model('core', 'ZDLOGTable')
+
+    tables = ZDLOG.objects.values('TABLE_NAME').annotate(premier=Min('DATE_MODIFICATION')).order_by()
+    ZDLOGTable.objects.bulk_create(
+        [ZDLOGTable(TABLE_NAME=t['TABLE_NAME'], DATE_PREMIER_LOG=t['premier']) for t in tables],
+        ignore_conflicts=True
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ZDLOGTable',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('TABLE_NAME', models.CharField(max_length=100, unique=True, verbose_name='Nom de la table')),
+                ('DATE_PREMIER_LOG', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Date du premier log')),
+            ],
+            options={
+                'verbose_name': 'Table auditée',
+                'verbose_name_plural': 'Tables auditées',
+                'db_table': 'ZDLOG_TABLE',
+                'ordering': ['TABLE_NAME'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='zdlog',
+            index=models.Index(fields=['DATE_MODIFICATION', 'id'], name='ZDLOG_DATE_MO_a9bd0c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='zdlog',
+            index=models.Index(fields=['TABLE_NAME', 'DATE_MODIFICATION', 'id'], name='ZDLOG_TABLE_N_c8ede3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='zdlog',
+            index=models.Index(fields=['TYPE_MOUVEMENT', 'DATE_MODIFICATION', 'id'], name='ZDLOG_TYPE_MO_6ee01f_idx'),
+        ),
+        migrations.RunPython(initialiser_tables, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.0.6 on 2026-10-19 03:10
+
+from django.db import migrations
+
+# SQL figé ici (et non importé de core.recherche) : la migration ne doit
+# pas changer si le code de recherche évolue.
+SQL_POSTGRESQL = [
+    """CREATE INDEX CONCURRENTLY IF NOT EXISTS "ZDLOG_DESCRIPTION_fts_idx" ON "ZDLOG"
+    USING GIN (to_tsvector('french'::regconfig, COALESCE("DESCRIPTION", '')))""",
+    'CREATE INDEX CONCURRENTLY IF NOT EXISTS "ZDLOG_ANCIENNE_VALEUR_gin_idx" ON "ZDLOG" '
+    'USING GIN ("ANCIENNE_VALEUR" jsonb_path_ops)',
+    'CREATE INDEX CONCURRENTLY IF NOT EXISTS "ZDLOG_NOUVELLE_VALEUR_gin_idx" ON "ZDLOG" '
+    'USING GIN ("NOUVELLE_VALEUR" jsonb_path_ops)',
+]
+
+SQL_POSTGRESQL_INVERSE = [
+    'DROP INDEX CONCURRENTLY IF EXISTS "ZDLOG_DESCRIPTION_fts_idx"',
+    'DROP INDEX CONCURRENTLY IF EXISTS "ZDLOG_ANCIENNE_VALEUR_gin_idx"',
+    'DROP INDEX CONCURRENTLY IF EXISTS "ZDLOG_NOUVELLE_VALEUR_gin_idx"',
+]
+
+SQL_SQLITE = [
+    'CREATE VIRTUAL TABLE IF NOT EXISTS "ZDLOG_FTS" USING fts5('
+    "DESCRIPTION, ANCIENNE_VALEUR, NOUVELLE_VALEUR, content='ZDLOG', content_rowid='id')",
+    'CREATE TRIGGER IF NOT EXISTS "ZDLOG_FTS_ai" AFTER INSERT ON "ZDLOG" BEGIN '
+    'INSERT INTO "ZDLOG_FTS"(rowid, DESCRIPTION, ANCIENNE_VALEUR, NOUVELLE_VALEUR) '
+    'VALUES (new.id, new.DESCRIPTION, new.ANCIENNE_VALEUR, new.NOUVELLE_VALEUR); END',
+    'CREATE TRIGGER IF NOT EXISTS "ZDLOG_FTS_ad" AFTER DELETE ON "ZDLOG" BEGIN '
+    'INSERT INTO "ZDLOG_FTS"("ZDLOG_FTS", rowid, DESCRIPTION, ANCIENNE_VALEUR, NOUVELLE_VALEUR) '
+    "VALUES ('delete', old.id, old.DESCRIPTION, old.ANCIENNE_VALEUR, old.NOUVELLE_VALEUR); END",
+    'CREATE TRIGGER IF NOT EXISTS "ZDLOG_FTS_au" AFTER UPDATE ON "ZDLOG" BEGIN '
+    'INSERT INTO "ZDLOG_FTS"("ZDLOG_FTS", rowid, DESCRIPTION, ANCIENNE_VALEUR, NOUVELLE_VALEUR) '
+    "VALUES ('delete', old.id, old.DESCRIPTION, old.ANCIENNE_VALEUR, old.NOUVELLE_VALEUR); "
+    'INSERT INTO "ZDLOG_FTS"(rowid, DESCRIPTION, ANCIENNE_VALEUR, NOUVELLE_VALEUR) '
+    'VALUES (new.id, new.DESCRIPTION, new.ANCIENNE_VALEUR, new.NOUVELLE_VALEUR); END',
+    # Indexation des logs existants
+    'INSERT INTO "ZDLOG_FTS"("ZDLOG_FTS") VALUES (\'rebuild\')',
+]
+
+SQL_SQLITE_INVERSE = [
+    'DROP TRIGGER IF EXISTS "ZDLOG_FTS_ai"',
+    'DROP TRIGGER IF EXISTS "ZDLOG_FTS_ad"',
+    'DROP TRIGGER IF EXISTS "ZDLOG_FTS_au"',
+    'DROP TABLE IF EXISTS "ZDLOG_FTS"',
+]
+
+
+def executer(instructions):
+    """Exécute les instructions du SGBD courant (aucune pour les autres)"""
+    def operation(apps, schema_editor):
+        for sql in instructions.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY ne peut pas s'exécuter dans une transaction
+    atomic = False
+
+    dependencies = [
+        ('core', '0002_zdlog_pagination_tables'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            executer({'postgresql': SQL_POSTGRESQL, 'sqlite': SQL_SQLITE}),
+            executer({'postgresql': SQL_POSTGRESQL_INVERSE, 'sqlite': SQL_SQLITE_INVERSE}),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.0.6 on 2026-10-19 03:10
+
+import django.core.serializers.json
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_zdlog_recherche'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ZDJOB',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('UUID', models.UUIDField(default=uuid.uuid4, editable=False, unique=True)),
+                ('TACHE', models.CharField(max_length=100, verbose_name='Tâche')),
+                ('PARAMETRES', models.JSONField(blank=True, default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder, verbose_name='Paramètres')),
+                ('STATUT', models.CharField(choices=[('EN_ATTENTE', 'En attente'), ('EN_COURS', 'En cours'), ('TERMINE', 'Terminée'), ('ECHEC', 'Échec')], default='EN_ATTENTE', max_length=20, verbose_name='Statut')),
+                ('PROGRESSION', models.PositiveSmallIntegerField(default=0, verbose_name='Progression (%)')),
+                ('MESSAGE', models.CharField(blank=True, max_length=255, verbose_name='Message')),
+                ('RESULTAT', models.JSONField(blank=True, encoder=django.core.serializers.json.DjangoJSONEncoder, null=True, verbose_name='Résultat')),
+                ('ERREUR', models.TextField(blank=True, verbose_name='Erreur')),
+                ('WORKER', models.CharField(blank=True, max_length=100, verbose_name='Worker')),
+                ('TENTATIVES', models.PositiveSmallIntegerField(default=0, verbose_name='Tentatives')),
+                ('DATE_CREATION', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Date de création')),
+                ('DATE_DEBUT', models.DateTimeField(blank=True, null=True, verbose_name='Date de début')),
+                ('DATE_FIN', models.DateTimeField(blank=True, null=True, verbose_name='Date de fin')),
+                ('DATE_SIGNE_VIE', models.DateTimeField(blank=True, null=True, verbose_name='Dernier signe de vie')),
+                ('DEMANDE_PAR', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL, verbose_name='Demandée par')),
+            ],
+            options={
+                'verbose_name': 'Tâche de fond',
+                'verbose_name_plural': 'Tâches de fond',
+                'db_table': 'ZDJOB',
+                'ordering': ['-DATE_CREATION'],
+                'indexes': [models.Index(fields=['STATUT', 'DATE_CREATION'], name='ZDJOB_STATUT_da6d71_idx'), models.Index(fields=['TACHE', 'STATUT'], name='ZDJOB_TACHE_098e5b_idx')],
+            },
+        ),
+    ]
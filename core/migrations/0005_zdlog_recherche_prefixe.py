@@ -0,0 +1,23 @@
+# Generated by Django 5.0.6 on 2026-10-19 04:38
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_zdjob_taches_fond'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='zdlog',
+            index=models.Index(fields=['RECORD_ID'], name='ZDLOG_RECORD_ID_prefix_idx', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='zdlog',
+            index=models.Index(fields=['USER_NAME'], name='ZDLOG_USER_NAME_prefix_idx', opclasses=['varchar_pattern_ops']),
+        ),
+    ]
@@ -1,3 +1,7 @@
+import time
+import uuid
+
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.utils import timezone
 from django.contrib.auth import get_user_model
@@ -39,6 +43,13 @@ class ZDLOG(models.Model):
             models.Index(fields=['DATE_MODIFICATION']),
             models.Index(fields=['USER']),
             models.Index(fields=['TYPE_MOUVEMENT']),
+            # Pagination par curseur (DATE_MODIFICATION, id), globale ou filtrée
+            models.Index(fields=['DATE_MODIFICATION', 'id']),
+            models.Index(fields=['TABLE_NAME', 'DATE_MODIFICATION', 'id']),
+            models.Index(fields=['TYPE_MOUVEMENT', 'DATE_MODIFICATION', 'id']),
+            # Recherche par préfixe (LIKE 'xxx%') sur la clé et l'utilisateur
+            models.Index(fields=['RECORD_ID'], name='ZDLOG_RECORD_ID_prefix_idx', opclasses=['varchar_pattern_ops']),
+            models.Index(fields=['USER_NAME'], name='ZDLOG_USER_NAME_prefix_idx', opclasses=['varchar_pattern_ops']),
         ]
 
     def __str__(self):
@@ -72,6 +83,157 @@ class ZDLOG(models.Model):
             IP_ADDRESS=ip_address
         )
         log_entry.save()
+        ZDLOGTable.enregistrer(table_name)
         return log_entry
 
 
+class ZDLOGTable(models.Model):
+    """
+    Référentiel des tables auditées.
+
+    Alimente les filtres par table sans parcourir ZDLOG : une ligne est
+    ajoutée la première fois qu'une table est journalisée.
+    """
+
+    CLE_CACHE = 'core:zdlog_tables'
+
+    # Tables déjà enregistrées par ce processus (évite une requête par log)
+    _connues = set()
+
+    TABLE_NAME = models.CharField(max_length=100, unique=True, verbose_name="Nom de la table")
+    DATE_PREMIER_LOG = models.DateTimeField(default=timezone.now, verbose_name="Date du premier log")
+
+    class Meta:
+        db_table = 'ZDLOG_TABLE'
+        verbose_name = "Table auditée"
+        verbose_name_plural = "Tables auditées"
+        ordering = ['TABLE_NAME']
+
+    def __str__(self):
+        return self.TABLE_NAME
+
+    @classmethod
+    def enregistrer(cls, table_name):
+        """Ajoute la table au référentiel si elle n'y est pas encore"""
+        if table_name in cls._connues:
+            return
+        from django.core.cache import cache
+
+        cls.objects.bulk_create([cls(TABLE_NAME=table_name)], ignore_conflicts=True)
+        cls._connues.add(table_name)
+        cache.delete(cls.CLE_CACHE)
+
+    @classmethod
+    def noms(cls):
+        """Retourne la liste (mise en cache) des tables auditées"""
+        from django.conf import settings
+        from django.core.cache import cache
+
+        noms = cache.get(cls.CLE_CACHE)
+        if noms is None:
+            noms = list(cls.objects.values_list('TABLE_NAME', flat=True))
+            cache.set(cls.CLE_CACHE, noms, getattr(settings, 'CACHE_TTL_STATS', 3600))
+        return noms
+
+
+class ZDJOB(models.Model):
+    """
+    Tâche de fond (file d'attente en base).
+
+    Les vues enregistrent la tâche et répondent aussitôt ; la commande
+    `executer_taches` la réserve, l'exécute et publie son avancement,
+    consulté par polling AJAX (voir core.taches).
+    """
+
+    STATUT_EN_ATTENTE = 'EN_ATTENTE'
+    STATUT_EN_COURS = 'EN_COURS'
+    STATUT_TERMINE = 'TERMINE'
+    STATUT_ECHEC = 'ECHEC'
+
+    STATUT_CHOICES = [
+        (STATUT_EN_ATTENTE, 'En attente'),
+        (STATUT_EN_COURS, 'En cours'),
+        (STATUT_TERMINE, 'Terminée'),
+        (STATUT_ECHEC, 'Échec'),
+    ]
+
+    STATUTS_ACTIFS = (STATUT_EN_ATTENTE, STATUT_EN_COURS)
+
+    # Intervalle minimal entre deux écritures d'avancement (secondes)
+    INTERVALLE_AVANCEMENT = 1.0
+
+    UUID = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
+    TACHE = models.CharField(max_length=100, verbose_name="Tâche")
+    PARAMETRES = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder, verbose_name="Paramètres")
+    STATUT = models.CharField(
+        max_length=20, choices=STATUT_CHOICES, default=STATUT_EN_ATTENTE, verbose_name="Statut"
+    )
+    PROGRESSION = models.PositiveSmallIntegerField(default=0, verbose_name="Progression (%)")
+    MESSAGE = models.CharField(max_length=255, blank=True, verbose_name="Message")
+    RESULTAT = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder, verbose_name="Résultat")
+    ERREUR = models.TextField(blank=True, verbose_name="Erreur")
+    DEMANDE_PAR = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, blank=True, verbose_name="Demandée par"
+    )
+    WORKER = models.CharField(max_length=100, blank=True, verbose_name="Worker")
+    TENTATIVES = models.PositiveSmallIntegerField(default=0, verbose_name="Tentatives")
+    DATE_CREATION = models.DateTimeField(default=timezone.now, verbose_name="Date de création")
+    DATE_DEBUT = models.DateTimeField(null=True, blank=True, verbose_name="Date de début")
+    DATE_FIN = models.DateTimeField(null=True, blank=True, verbose_name="Date de fin")
+    DATE_SIGNE_VIE = models.DateTimeField(null=True, blank=True, verbose_name="Dernier signe de vie")
+
+    class Meta:
+        db_table = 'ZDJOB'
+        verbose_name = "Tâche de fond"
+        verbose_name_plural = "Tâches de fond"
+        ordering = ['-DATE_CREATION']
+        indexes = [
+            # Réservation de la prochaine tâche en attente
+            models.Index(fields=['STATUT', 'DATE_CREATION']),
+            models.Index(fields=['TACHE', 'STATUT']),
+        ]
+
+    def __str__(self):
+        return f"{self.TACHE} [{self.get_STATUT_display()}]"
+
+    @property
+    def est_terminee(self):
+        return self.STATUT in (self.STATUT_TERMINE, self.STATUT_ECHEC)
+
+    def avancer(self, fait, total=None, message=None):
+        """
+        Publie l'avancement de la tâche (au plus une écriture par seconde).
+
+        Args:
+            fait: nombre d'éléments traités (ou pourcentage si total est None)
+            total: nombre total d'éléments
+            message: libellé affiché à l'utilisateur
+        """
+        progression = int(fait * 100 / total) if total else int(fait)
+        progression = max(0, min(progression, 100))
+
+        maintenant = time.monotonic()
+        dernier = getattr(self, '_dernier_avancement', None)
+        if dernier is not None and maintenant - dernier < self.INTERVALLE_AVANCEMENT and progression < 100:
+            return
+        self._dernier_avancement = maintenant
+
+        self.PROGRESSION = progression
+        champs = {'PROGRESSION': progression, 'DATE_SIGNE_VIE': timezone.now()}
+        if message is not None:
+            self.MESSAGE = champs['MESSAGE'] = message[:255]
+        type(self).objects.filter(pk=self.pk).update(**champs)
+
+    def to_dict(self):
+        """Représentation JSON pour le suivi AJAX"""
+        return {
+            'id': str(self.UUID),
+            'tache': self.TACHE,
+            'statut': self.STATUT,
+            'statut_libelle': self.get_STATUT_display(),
+            'progression': self.PROGRESSION,
+            'message': self.MESSAGE,
+            'resultat': self.RESULTAT,
+            'erreur': self.ERREUR,
+            'terminee': self.est_terminee,
+        }
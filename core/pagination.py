@@ -0,0 +1,190 @@
+"""
+Pagination des grandes tables (ZDLOG).
+
+- PaginationCurseur : pagination par curseur (keyset) sur (champ de date, id),
+  sans OFFSET ni COUNT : le coût d'une page ne dépend pas de sa position ;
+- compter_plafonne : comptage borné, au-delà du plafond on affiche « N+ » ;
+- estimer_nombre_lignes : estimation PostgreSQL (pg_class.reltuples) pour
+  une table non filtrée ;
+- PaginateurEstime : Paginator Django fondé sur ces comptages (admin).
+"""
+import base64
+import binascii
+from dataclasses import dataclass, field
+from datetime import datetime
+from math import ceil
+
+from django.core.paginator import Paginator
+from django.db import connection
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+# Au-delà, les comptages sont affichés comme « PLAFOND_COMPTAGE+ »
+PLAFOND_COMPTAGE = 10000
+
+
+def estimer_nombre_lignes(modele):
+    """
+    Estime le nombre de lignes d'une table à partir des statistiques PostgreSQL.
+
+    Returns:
+        int ou None si l'estimation n'est pas disponible (autre SGBD, table
+        jamais analysée)
+    """
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)",
+            [connection.ops.quote_name(modele._meta.db_table)]
+        )
+        ligne = cursor.fetchone()
+    if not ligne or ligne[0] is None or ligne[0] < 0:
+        return None
+    return int(ligne[0])
+
+
+def compter_plafonne(queryset, plafond=None):
+    """
+    Compte au plus `plafond` lignes (PLAFOND_COMPTAGE par défaut).
+
+    Returns:
+        tuple: (nombre, plafonne) ; plafonne=True si le résultat réel dépasse le plafond
+    """
+    plafond = plafond or PLAFOND_COMPTAGE
+    nombre = queryset.order_by()[:plafond + 1].count()
+    return min(nombre, plafond), nombre > plafond
+
+
+@dataclass
+class PageCurseur:
+    """Page renvoyée par PaginationCurseur"""
+    objets: list = field(default_factory=list)
+    curseur_suivant: str = None
+    curseur_precedent: str = None
+
+    @property
+    def has_next(self):
+        return self.curseur_suivant is not None
+
+    @property
+    def has_previous(self):
+        return self.curseur_precedent is not None
+
+    @property
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+    def __iter__(self):
+        return iter(self.objets)
+
+    def __len__(self):
+        return len(self.objets)
+
+    def __bool__(self):
+        return bool(self.objets)
+
+
+class PaginationCurseur:
+    """
+    Pagination par curseur, du plus récent au plus ancien, sur (champ, pk).
+
+    Le curseur encode la date et l'identifiant de la dernière (ou première)
+    ligne affichée ; la page suivante est lue par un parcours d'index
+    démarrant juste après.
+
+    Utilisation:
+        page = PaginationCurseur(ZDLOG.objects.all(), 'DATE_MODIFICATION').page(
+            apres=request.GET.get('apres'), avant=request.GET.get('avant')
+        )
+    """
+
+    def __init__(self, queryset, champ, taille=50):
+        self.queryset = queryset
+        self.champ = champ
+        self.taille = taille
+
+    def page(self, apres=None, avant=None):
+        """
+        Retourne la page qui suit le curseur `apres` ou précède le curseur `avant`.
+        Sans curseur (ou curseur invalide), retourne la première page.
+        """
+        position_apres = self.decoder(apres)
+        position_avant = None if position_apres else self.decoder(avant)
+
+        if position_avant:
+            # Page précédente : parcours ascendant puis remise dans l'ordre d'affichage
+            lignes = list(
+                self.queryset.filter(self._seek(position_avant, '>'))
+                .order_by(self.champ, 'pk')[:self.taille + 1]
+            )
+            plus = len(lignes) > self.taille
+            objets = lignes[:self.taille][::-1]
+            return PageCurseur(
+                objets=objets,
+                curseur_suivant=self.encoder(objets[-1]) if objets else None,
+                curseur_precedent=self.encoder(objets[0]) if plus else None,
+            )
+
+        queryset = self.queryset
+        if position_apres:
+            queryset = queryset.filter(self._seek(position_apres, '<'))
+        lignes = list(queryset.order_by(f'-{self.champ}', '-pk')[:self.taille + 1])
+        objets = lignes[:self.taille]
+        return PageCurseur(
+            objets=objets,
+            curseur_suivant=self.encoder(objets[-1]) if len(lignes) > self.taille else None,
+            curseur_precedent=self.encoder(objets[0]) if position_apres and objets else None,
+        )
+
+    def _seek(self, position, operateur):
+        """Condition (champ, pk) < position ou (champ, pk) > position"""
+        valeur, pk = position
+        lookup = 'lt' if operateur == '<' else 'gt'
+        return (
+            Q(**{f'{self.champ}__{lookup}': valeur})
+            | Q(**{self.champ: valeur, f'pk__{lookup}': pk})
+        )
+
+    def encoder(self, objet):
+        """Encode la position d'une ligne dans un curseur opaque"""
+        brut = f"{getattr(objet, self.champ).isoformat()}|{objet.pk}"
+        return base64.urlsafe_b64encode(brut.encode()).decode().rstrip('=')
+
+    @staticmethod
+    def decoder(curseur):
+        """Décode un curseur ; None s'il est absent ou invalide"""
+        if not curseur:
+            return None
+        try:
+            brut = base64.urlsafe_b64decode(curseur + '=' * (-len(curseur) % 4)).decode()
+            valeur, pk = brut.rsplit('|', 1)
+            return datetime.fromisoformat(valeur), int(pk)
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            return None
+
+
+class PaginateurEstime(Paginator):
+    """
+    Paginator dont le nombre total est estimé (table non filtrée) ou plafonné.
+
+    Évite le COUNT(*) complet de l'admin ; les pages au-delà du plafond ne
+    sont pas proposées, il faut alors affiner les filtres.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimation = estimer_nombre_lignes(queryset.model)
+            if estimation is not None:
+                return estimation
+        return compter_plafonne(queryset)[0]
+
+    @cached_property
+    def num_pages(self):
+        if self.count == 0 and not self.allow_empty_first_page:
+            return 0
+        pages = ceil(max(1, self.count - self.orphans) / self.per_page)
+        # Pas de saut vers des pages lointaines (OFFSET coûteux)
+        return min(pages, max(1, PLAFOND_COMPTAGE // self.per_page))
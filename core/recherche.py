@@ -0,0 +1,103 @@
+"""
+Recherche indexée dans les logs d'audit (ZDLOG).
+
+Index créés par la migration core.0003 selon le SGBD :
+- PostgreSQL : index GIN sur to_tsvector('french', DESCRIPTION) et index
+  GIN jsonb_path_ops sur ANCIENNE_VALEUR / NOUVELLE_VALEUR ;
+- SQLite : table virtuelle FTS5 ZDLOG_FTS (contenu externe) sur
+  DESCRIPTION et les valeurs JSON, tenue à jour par triggers.
+
+Sans index disponible (autre SGBD, base de test créée sans migrations),
+la recherche textuelle retombe sur icontains.
+
+La saisie est aussi comparée à la table (égalité), à la clé de
+l'enregistrement et au nom d'utilisateur (préfixe, index
+varchar_pattern_ops sous PostgreSQL) : un matricule, un identifiant ou un
+utilisateur se retrouvent sans passer par la description.
+"""
+from django.db import connection
+from django.db.models import BooleanField, F, Q
+from django.db.models.expressions import RawSQL
+
+from .models import ZDLOG
+
+TABLE_FTS = 'ZDLOG_FTS'
+
+# Configuration de recherche plein texte PostgreSQL
+CONFIG_TEXTE = 'french'
+
+
+def _fts_sqlite_disponible():
+    """Vrai si la table FTS5 existe dans la base courante"""
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [TABLE_FTS])
+        return cursor.fetchone() is not None
+
+
+def _requete_fts5(texte):
+    """Traduit une saisie libre en requête FTS5 : chaque mot, en préfixe, doit apparaître"""
+    mots = [mot.replace('"', '""') for mot in texte.split()]
+    return ' '.join(f'"{mot}"*' for mot in mots)
+
+
+def filtrer_texte(queryset, texte):
+    """
+    Restreint les logs à ceux dont la description (et, sous SQLite, les
+    valeurs JSON) contient les mots recherchés, ou dont la table, la clé
+    de l'enregistrement ou le nom d'utilisateur correspondent à la saisie.
+    """
+    texte = (texte or '').strip()
+    if not texte:
+        return queryset
+
+    colonnes = (
+        Q(TABLE_NAME__in={texte, texte.upper()})
+        | Q(RECORD_ID__startswith=texte)
+        | Q(USER_NAME__startswith=texte)
+    )
+    return queryset.filter(_filtre_plein_texte(texte) | colonnes)
+
+
+def _filtre_plein_texte(texte):
+    """Condition plein texte sur la description selon le SGBD"""
+    if connection.vendor == 'postgresql':
+        return Q(RawSQL(
+            f"""to_tsvector('{CONFIG_TEXTE}'::regconfig, COALESCE("ZDLOG"."DESCRIPTION", ''))"""
+            f""" @@ websearch_to_tsquery('{CONFIG_TEXTE}'::regconfig, %s)""",
+            [texte],
+            output_field=BooleanField()
+        ))
+
+    if connection.vendor == 'sqlite' and _fts_sqlite_disponible():
+        requete = _requete_fts5(texte)
+        if requete:
+            return Q(pk__in=RawSQL(
+                f'SELECT rowid FROM "{TABLE_FTS}" WHERE "{TABLE_FTS}" MATCH %s', [requete]
+            ))
+
+    return Q(DESCRIPTION__icontains=texte)
+
+
+def filtrer_valeurs(queryset, valeurs, colonne='NOUVELLE_VALEUR'):
+    """
+    Restreint les logs dont la valeur JSON contient les paires champ/valeur données.
+
+    Sous PostgreSQL, la requête de contenance (@>) utilise l'index jsonb_path_ops.
+    """
+    if not valeurs:
+        return queryset
+    if connection.features.supports_json_field_contains:
+        return queryset.filter(**{f'{colonne}__contains': valeurs})
+    return queryset.filter(**{f'{colonne}__{champ}': valeur for champ, valeur in valeurs.items()})
+
+
+def filtrer_champ_modifie(queryset, champ):
+    """Restreint aux modifications dont le champ a changé de valeur"""
+    ancien, nouveau = f'ANCIENNE_VALEUR__{champ}', f'NOUVELLE_VALEUR__{champ}'
+    return queryset.filter(
+        TYPE_MOUVEMENT=ZDLOG.TYPE_MODIFICATION
+    ).filter(
+        ~Q(**{ancien: F(nouveau)})
+        | Q(**{f'{ancien}__isnull': True})
+        | Q(**{f'{nouveau}__isnull': True})
+    ).exclude(**{f'{ancien}__isnull': True, f'{nouveau}__isnull': True})
@@ -0,0 +1,225 @@
+"""
+File de tâches de fond en base de données (table ZDJOB).
+
+Les traitements longs (calcul des acquisitions, vérifications de
+conformité, rapports d'audit) ne s'exécutent plus dans la requête HTTP :
+
+1. la vue appelle `lancer()` qui enregistre la tâche et répond aussitôt
+   avec son identifiant ;
+2. un ou plusieurs processus `python manage.py executer_taches` réservent
+   les tâches en attente et les exécutent ;
+3. la page interroge `core:suivi_tache` pour afficher l'avancement.
+
+La réservation est une mise à jour conditionnelle (EN_ATTENTE -> EN_COURS)
+: plusieurs workers se partagent la file sans verrou ni broker externe.
+
+Déclaration d'une tâche, dans le module `taches.py` d'une application
+(chargé automatiquement au démarrage) :
+
+    @tache('absence.calculer_acquisitions')
+    def calculer_acquisitions(job, annee, recalculer=False):
+        ...
+        job.avancer(fait, total, "Calcul en cours")
+        return {'message': '...'}
+
+Sans worker (développement, tests), TACHES_EXECUTION_IMMEDIATE=True
+exécute la tâche dans la requête.
+"""
+import json
+import logging
+import os
+import socket
+import uuid
+from datetime import timedelta
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F
+from django.utils import timezone
+
+from .models import ZDJOB
+
+logger = logging.getLogger(__name__)
+
+# Tâches déclarées : nom -> fonction(job, **parametres)
+_registre = {}
+
+# Nombre de tâches en attente examinées à chaque réservation
+TAILLE_CANDIDATS = 10
+
+
+class TacheInconnue(Exception):
+    """Tâche non déclarée avec @tache"""
+
+
+def tache(nom):
+    """Décorateur : déclare une fonction exécutable en tâche de fond"""
+    def decorateur(fonction):
+        _registre[nom] = fonction
+        return fonction
+    return decorateur
+
+
+def taches_declarees():
+    """Noms des tâches déclarées"""
+    return sorted(_registre)
+
+
+def nom_worker():
+    """Identifiant du processus courant (hôte:pid)"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def lancer(nom, parametres=None, user=None, unique=False):
+    """
+    Met une tâche en file d'attente.
+
+    Args:
+        nom: nom déclaré avec @tache
+        parametres: dict JSON (dates et décimaux acceptés)
+        user: utilisateur à l'origine de la demande (suivi, audit)
+        unique: réutilise une tâche identique encore en attente ou en cours
+
+    Returns:
+        ZDJOB
+    """
+    if nom not in _registre:
+        raise TacheInconnue(nom)
+    # Paramètres tels que la tâche les recevra (dates et décimaux en texte)
+    parametres = json.loads(json.dumps(parametres or {}, cls=DjangoJSONEncoder))
+    user = user if user is not None and user.is_authenticated else None
+
+    if unique:
+        existante = ZDJOB.objects.filter(
+            TACHE=nom, STATUT__in=ZDJOB.STATUTS_ACTIFS
+        ).order_by('DATE_CREATION').first()
+        if existante and existante.PARAMETRES == parametres:
+            return existante
+
+    job = ZDJOB.objects.create(TACHE=nom, PARAMETRES=parametres, DEMANDE_PAR=user)
+
+    if getattr(settings, 'TACHES_EXECUTION_IMMEDIATE', False):
+        if reserver_tache(job, nom_worker()):
+            executer(job)
+        job.refresh_from_db()
+    return job
+
+
+def reserver_tache(job, worker):
+    """Passe la tâche EN_COURS si elle est encore en attente ; False si un autre worker l'a prise"""
+    maintenant = timezone.now()
+    reservee = ZDJOB.objects.filter(pk=job.pk, STATUT=ZDJOB.STATUT_EN_ATTENTE).update(
+        STATUT=ZDJOB.STATUT_EN_COURS,
+        WORKER=worker,
+        TENTATIVES=F('TENTATIVES') + 1,
+        DATE_DEBUT=maintenant,
+        DATE_SIGNE_VIE=maintenant,
+    )
+    return reservee == 1
+
+
+def reserver_suivante(worker, taches=None):
+    """
+    Réserve la plus ancienne tâche en attente.
+
+    Returns:
+        ZDJOB ou None si la file est vide
+    """
+    candidats = ZDJOB.objects.filter(STATUT=ZDJOB.STATUT_EN_ATTENTE)
+    if taches:
+        candidats = candidats.filter(TACHE__in=taches)
+
+    for job in candidats.order_by('DATE_CREATION', 'pk')[:TAILLE_CANDIDATS]:
+        if reserver_tache(job, worker):
+            job.refresh_from_db()
+            return job
+    return None
+
+
+def executer(job):
+    """Exécute une tâche réservée et enregistre son résultat ou son erreur"""
+    from .signals import get_current_request, set_current_request
+
+    fonction = _registre.get(job.TACHE)
+    if fonction is None:
+        _terminer(job, ZDJOB.STATUT_ECHEC, erreur=f"Tâche inconnue : {job.TACHE}")
+        return job
+
+    # Les modifications faites par la tâche sont attribuées au demandeur (ZDLOG)
+    requete = get_current_request()
+    if job.DEMANDE_PAR_id and requete is None:
+        set_current_request(SimpleNamespace(user=job.DEMANDE_PAR, META={}))
+    try:
+        resultat = fonction(job, **job.PARAMETRES)
+    except Exception as e:
+        logger.exception("Échec de la tâche %s (%s)", job.TACHE, job.UUID)
+        _terminer(job, ZDJOB.STATUT_ECHEC, erreur=str(e) or e.__class__.__name__)
+    else:
+        _terminer(job, ZDJOB.STATUT_TERMINE, resultat=resultat)
+    finally:
+        set_current_request(requete)
+    return job
+
+
+def _terminer(job, statut, resultat=None, erreur=''):
+    job.STATUT = statut
+    job.RESULTAT = resultat
+    job.ERREUR = erreur
+    job.DATE_FIN = timezone.now()
+    if statut == ZDJOB.STATUT_TERMINE:
+        job.PROGRESSION = 100
+        if isinstance(resultat, dict) and resultat.get('message'):
+            job.MESSAGE = str(resultat['message'])[:255]
+    job.save(update_fields=['STATUT', 'RESULTAT', 'ERREUR', 'DATE_FIN', 'PROGRESSION', 'MESSAGE'])
+
+
+def recuperer_taches_bloquees():
+    """
+    Remet en file les tâches EN_COURS dont le worker ne donne plus signe
+    de vie (arrêt brutal), ou les passe en échec après TACHES_TENTATIVES_MAX.
+
+    Returns:
+        tuple: (remises en file, en échec)
+    """
+    delai = getattr(settings, 'TACHES_DELAI_BLOCAGE', 600)
+    tentatives_max = getattr(settings, 'TACHES_TENTATIVES_MAX', 3)
+    bloquees = ZDJOB.objects.filter(
+        STATUT=ZDJOB.STATUT_EN_COURS,
+        DATE_SIGNE_VIE__lt=timezone.now() - timedelta(seconds=delai)
+    )
+    echecs = bloquees.filter(TENTATIVES__gte=tentatives_max).update(
+        STATUT=ZDJOB.STATUT_ECHEC,
+        ERREUR="Tâche interrompue (worker arrêté)",
+        DATE_FIN=timezone.now(),
+    )
+    remises = bloquees.filter(TENTATIVES__lt=tentatives_max).update(
+        STATUT=ZDJOB.STATUT_EN_ATTENTE, WORKER=''
+    )
+    return remises, echecs
+
+
+def purger_taches_terminees(jours=30):
+    """Supprime les tâches terminées depuis plus de `jours` jours"""
+    limite = timezone.now() - timedelta(days=jours)
+    supprimees, _ = ZDJOB.objects.filter(
+        STATUT__in=[ZDJOB.STATUT_TERMINE, ZDJOB.STATUT_ECHEC], DATE_FIN__lt=limite
+    ).delete()
+    return supprimees
+
+
+def tache_suivie(request):
+    """
+    Tâche active désignée par le paramètre GET `tache` (bandeau de suivi),
+    si elle appartient à l'utilisateur ; None sinon.
+    """
+    identifiant = request.GET.get('tache')
+    if not identifiant:
+        return None
+    try:
+        identifiant = uuid.UUID(identifiant)
+    except ValueError:
+        return None
+    return ZDJOB.objects.filter(
+        UUID=identifiant, DEMANDE_PAR_id=request.user.pk, STATUT__in=ZDJOB.STATUTS_ACTIFS
+    ).first()
@@ -0,0 +1,180 @@
+# core/tests/test_cache.py
+"""
+Tests pour le cache invalidé par tags (core.cache, cache mémoire par
+processus, commande statistiques_cache).
+"""
+from io import StringIO
+
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from core.cache import FamilleCache, debut_requete, invalider_tags, rafraichir_versions
+from core.models import ZDJOB
+
+CACHE_LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+UTILISATEURS = FamilleCache('tests.utilisateurs', tags=[User])
+GROUPES = FamilleCache('tests.groupes', tags=['auth.group'])
+AUTH = FamilleCache('tests.auth', tags=['auth'])
+LOCALE = FamilleCache('tests.locale', tags=[User], locale=2)
+
+
+@override_settings(CACHES=CACHE_LOCMEM)
+class TestFamilleCache(TestCase):
+    """Mise en cache, invalidation par tags et statistiques."""
+
+    def setUp(self):
+        cache.clear()
+        self.appels = 0
+
+    def calcul(self):
+        self.appels += 1
+        return list(User.objects.values_list('username', flat=True))
+
+    def creer_utilisateur(self, username):
+        with self.captureOnCommitCallbacks(execute=True):
+            return User.objects.create_user(username=username)
+
+    def test_mise_en_cache_et_statistiques(self):
+        """La valeur est calculée une fois ; hits et misses sont comptés."""
+        self.assertEqual(UTILISATEURS.obtenir(self.calcul), [])
+        self.assertEqual(UTILISATEURS.obtenir(self.calcul), [])
+        with self.assertNumQueries(0):
+            UTILISATEURS.obtenir(self.calcul)
+
+        self.assertEqual(self.appels, 1)
+        self.assertEqual(UTILISATEURS.statistiques(), {'hits': 2, 'hits_locaux': 0, 'misses': 1, 'taux': 66.7})
+
+    def test_parametres(self):
+        """Chaque jeu de paramètres a sa propre entrée."""
+        GROUPES.obtenir(lambda: 'a', 1)
+        self.assertEqual(GROUPES.obtenir(lambda: 'b', 2), 'b')
+        self.assertEqual(GROUPES.obtenir(lambda: 'c', 1), 'a')
+
+    def test_lecture_groupee(self):
+        """Les clés absentes d'une lecture groupée sont calculées en un seul appel."""
+        appels = []
+
+        def calculer(manquants):
+            appels.append(manquants)
+            return {parametres: f'semaine {parametres[0]}' for parametres in manquants}
+
+        GROUPES.obtenir(lambda: 'semaine 1 (deja en cache)', 1)
+        valeurs = GROUPES.obtenir_plusieurs(calculer, [(1,), (2,), (3,)])
+        self.assertEqual(valeurs, ['semaine 1 (deja en cache)', 'semaine 2', 'semaine 3'])
+        self.assertEqual(appels, [[(2,), (3,)]])
+        self.assertEqual(GROUPES.obtenir_plusieurs(calculer, [(3,), (2,)]), ['semaine 3', 'semaine 2'])
+        self.assertEqual(len(appels), 1)
+
+    def test_invalidation_par_modele(self):
+        """Un enregistrement invalide les familles de son modèle et de son application."""
+        UTILISATEURS.obtenir(self.calcul)
+        GROUPES.obtenir(lambda: 'groupes')
+        AUTH.obtenir(lambda: 'auth')
+
+        self.creer_utilisateur('alice')
+
+        self.assertEqual(UTILISATEURS.obtenir(self.calcul), ['alice'])
+        self.assertEqual(self.appels, 2)
+        self.assertEqual(GROUPES.obtenir(lambda: 'recalcule'), 'groupes')
+        self.assertEqual(AUTH.obtenir(lambda: 'recalcule'), 'recalcule')
+
+    def test_invalidation_apres_commit(self):
+        """La version n'est renouvelée qu'à la validation de la transaction."""
+        UTILISATEURS.obtenir(self.calcul)
+        with self.captureOnCommitCallbacks() as callbacks:
+            User.objects.create_user(username='bob')
+            self.assertEqual(UTILISATEURS.obtenir(self.calcul), [])
+        for callback in callbacks:
+            callback()
+        self.assertEqual(UTILISATEURS.obtenir(self.calcul), ['bob'])
+
+    def test_relation_et_invalidation_explicite(self):
+        """m2m_changed et invalider_tags() invalident aussi."""
+        utilisateur = self.creer_utilisateur('carol')
+        groupe = Group.objects.create(name='rh')
+        UTILISATEURS.obtenir(self.calcul)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            utilisateur.groups.add(groupe)
+        UTILISATEURS.obtenir(self.calcul)
+        self.assertEqual(self.appels, 2)
+
+        invalider_tags(User)
+        UTILISATEURS.obtenir(self.calcul)
+        self.assertEqual(self.appels, 3)
+
+    def test_modele_exclu(self):
+        """Les écritures des modèles exclus (file de tâches) n'invalident rien."""
+        UTILISATEURS.obtenir(self.calcul)
+        with self.captureOnCommitCallbacks(execute=True):
+            ZDJOB.objects.create(TACHE='tests.somme')
+        with self.assertNumQueries(0):
+            UTILISATEURS.obtenir(self.calcul)
+
+    def test_commande_statistiques(self):
+        """La commande liste les familles et remet les compteurs à zéro."""
+        UTILISATEURS.obtenir(self.calcul)
+        sortie = StringIO()
+        call_command('statistiques_cache', '--reinitialiser', stdout=sortie)
+
+        self.assertIn('tests.utilisateurs', sortie.getvalue())
+        self.assertIn('planning.calendrier_ref', sortie.getvalue())
+        self.assertEqual(UTILISATEURS.statistiques()['misses'], 0)
+
+
+@override_settings(CACHES=CACHE_LOCMEM, CACHE_LOCAL_ACTIF=True)
+class TestCacheLocal(TestCase):
+    """Cache mémoire du processus devant le cache partagé."""
+
+    def setUp(self):
+        LOCALE.vider_memoire()
+        LOCALE.publier_hits_locaux()
+        cache.clear()
+        rafraichir_versions()
+        self.appels = 0
+
+    def calcul(self):
+        self.appels += 1
+        return list(User.objects.values_list('username', flat=True))
+
+    def test_lecture_en_memoire(self):
+        """Le second accès est servi par la mémoire, sans lire le cache partagé."""
+        LOCALE.obtenir(self.calcul)
+        cache.delete_many([LOCALE.cle()])
+
+        self.assertEqual(LOCALE.obtenir(self.calcul), [])
+        self.assertEqual(self.appels, 1)
+        self.assertEqual(LOCALE.statistiques(), {'hits': 1, 'hits_locaux': 1, 'misses': 1, 'taux': 50.0})
+
+    def test_ecriture_du_processus(self):
+        """Une écriture du processus invalide sa mémoire sans attendre la requête suivante."""
+        LOCALE.obtenir(self.calcul)
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.create_user(username='dave')
+
+        self.assertEqual(LOCALE.obtenir(self.calcul), ['dave'])
+        self.assertEqual(self.appels, 2)
+
+    def test_ecriture_d_un_autre_processus(self):
+        """Une invalidation faite ailleurs est vue au début de la requête suivante."""
+        LOCALE.obtenir(self.calcul)
+        # Autre processus : seule la version partagée change
+        cache.set('tc:v:auth.user', 'autre', None)
+        LOCALE.obtenir(self.calcul)
+        self.assertEqual(self.appels, 1)
+
+        debut_requete()
+        LOCALE.obtenir(self.calcul)
+        self.assertEqual(self.appels, 2)
+
+    def test_eviction_lru(self):
+        """Au-delà de la taille, l'entrée la moins récente retombe sur le cache partagé."""
+        for parametre in (1, 2, 1, 3):
+            LOCALE.obtenir(lambda: parametre, parametre)
+
+        self.assertEqual(LOCALE.obtenir(lambda: 'recalcule', 2), 2)
+        stats = LOCALE.statistiques()
+        self.assertEqual((stats['hits'], stats['hits_locaux'], stats['misses']), (2, 1, 3))
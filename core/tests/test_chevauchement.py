@@ -0,0 +1,75 @@
+# core/tests/test_chevauchement.py
+"""
+Tests pour la détection des chevauchements d'intervalles (core.chevauchement).
+"""
+from datetime import date, time
+
+from django.test import SimpleTestCase
+
+from core.chevauchement import IndexIntervalles, conflits_lot, premier_conflit
+from employee.models import ZYCO
+from employee.tests.base import EmployeeTestCase
+
+
+class TestIndexIntervalles(SimpleTestCase):
+    """Recherche en mémoire du premier intervalle en conflit."""
+
+    def test_dates_bornes_incluses(self):
+        """Premier conflit par date de début ; fin nulle = en cours."""
+        index = IndexIntervalles([
+            (date(2024, 9, 1), None, 'c'),
+            (date(2024, 1, 1), date(2024, 6, 30), 'a'),
+            (date(2024, 2, 1), date(2024, 2, 10), 'b'),
+        ])
+        self.assertEqual(index.premier(date(2024, 6, 30), date(2024, 7, 15)), 'a')
+        self.assertEqual(index.premier(date(2024, 2, 5), date(2024, 3, 1)), 'a')
+        self.assertIsNone(index.premier(date(2024, 7, 1), date(2024, 8, 31)))
+        self.assertEqual(index.premier(date(2030, 1, 1), date(2030, 1, 2)), 'c')
+        self.assertEqual(index.premier(date(2024, 8, 1), None), 'c')
+
+    def test_heures_fin_exclue(self):
+        """Des créneaux qui se touchent ne se chevauchent pas."""
+        index = IndexIntervalles([
+            (time(8), time(12), 'matin'),
+            (time(14), time(18), 'apres-midi'),
+        ], bornes_incluses=False)
+        self.assertIsNone(index.premier(time(12), time(14)))
+        self.assertEqual(index.premier(time(11), time(15)), 'matin')
+        self.assertEqual(index.premier(time(13), time(15)), 'apres-midi')
+        self.assertIsNone(IndexIntervalles([]).premier(time(8), time(9)))
+
+
+class TestChevauchementContrats(EmployeeTestCase):
+    """Détection en SQL sur les contrats (ZYCO)."""
+
+    def setUp(self):
+        self.employe = self.create_employee(matricule='CHEV0001')
+        self.autre = self.create_employee(matricule='CHEV0002')
+        self.cdd = self.create_contract(
+            self.employe, type_contrat='CDD', date_debut=date(2024, 1, 1), date_fin=date(2024, 6, 30)
+        )
+        self.cdi = self.create_contract(self.employe, date_debut=date(2024, 9, 1))
+        self.contrat_autre = self.create_contract(self.autre, date_debut=date(2024, 1, 1))
+
+    def test_premier_conflit_une_requete(self):
+        """Le premier contrat en conflit est trouvé en une requête."""
+        contrats = ZYCO.objects.filter(employe=self.employe)
+        with self.assertNumQueries(1):
+            conflit = premier_conflit(contrats, date(2024, 6, 1), None)
+        self.assertEqual(conflit, self.cdd)
+        self.assertIsNone(premier_conflit(contrats, date(2024, 7, 1), date(2024, 8, 31)))
+        self.assertIsNone(premier_conflit(contrats, date(2024, 1, 1), date(2024, 6, 30), exclure_pk=self.cdd.pk))
+        self.assertEqual(premier_conflit(contrats, date(2025, 1, 1), date(2025, 2, 1)), self.cdi)
+
+    def test_conflits_lot(self):
+        """N intervalles proposés confrontés à l'existant en une requête."""
+        intervalles = [
+            ((self.employe.matricule,), date(2024, 7, 1), date(2024, 8, 31)),
+            ((self.employe.matricule,), date(2024, 6, 15), date(2024, 7, 15)),
+            ((self.autre.matricule,), date(2023, 1, 1), date(2023, 12, 31)),
+            ((self.autre.matricule,), date(2025, 1, 1), None),
+            (('INCONNU',), date(2024, 1, 1), None),
+        ]
+        with self.assertNumQueries(1):
+            conflits = conflits_lot(ZYCO.objects.all(), intervalles)
+        self.assertEqual(conflits, {1: self.cdd, 3: self.contrat_autre})
@@ -0,0 +1,108 @@
+# core/tests/test_pagination.py
+"""
+Tests pour la pagination des logs (curseur, comptages plafonnés) et le
+référentiel des tables auditées.
+"""
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from core import pagination
+from core.models import ZDLOG, ZDLOGTable
+from core.pagination import PaginateurEstime, PaginationCurseur, compter_plafonne
+
+
+class TestPaginationCurseur(TestCase):
+    """Tests pour PaginationCurseur."""
+
+    @classmethod
+    def setUpTestData(cls):
+        maintenant = timezone.now()
+        # Deux logs par horodatage pour vérifier le départage par id
+        ZDLOG.objects.bulk_create([
+            ZDLOG(
+                TABLE_NAME='ZY00', RECORD_ID=str(i), TYPE_MOUVEMENT=ZDLOG.TYPE_CREATION,
+                DATE_MODIFICATION=maintenant - timedelta(minutes=i // 2)
+            )
+            for i in range(7)
+        ])
+        cls.ordre = list(ZDLOG.objects.order_by('-DATE_MODIFICATION', '-id').values_list('pk', flat=True))
+
+    def pagination(self):
+        return PaginationCurseur(ZDLOG.objects.all(), 'DATE_MODIFICATION', taille=3)
+
+    def test_parcours_complet_sans_doublon(self):
+        """Les pages suivantes couvrent toutes les lignes dans l'ordre."""
+        pagination = self.pagination()
+        page = pagination.page()
+        vus = [log.pk for log in page]
+        self.assertFalse(page.has_previous)
+        while page.has_next:
+            page = pagination.page(apres=page.curseur_suivant)
+            self.assertTrue(page.has_previous)
+            vus += [log.pk for log in page]
+        self.assertEqual(vus, self.ordre)
+
+    def test_page_precedente(self):
+        """Le curseur `avant` ramène exactement la page précédente."""
+        pagination = self.pagination()
+        premiere = pagination.page()
+        deuxieme = pagination.page(apres=premiere.curseur_suivant)
+
+        retour = pagination.page(avant=deuxieme.curseur_precedent)
+        self.assertEqual([log.pk for log in retour], self.ordre[:3])
+        self.assertFalse(retour.has_previous)
+        self.assertEqual(retour.curseur_suivant, premiere.curseur_suivant)
+
+    def test_curseur_invalide(self):
+        """Un curseur illisible renvoie la première page."""
+        page = self.pagination().page(apres='pas-un-curseur')
+        self.assertEqual([log.pk for log in page], self.ordre[:3])
+
+
+class TestComptages(TestCase):
+    """Tests pour compter_plafonne et PaginateurEstime."""
+
+    @classmethod
+    def setUpTestData(cls):
+        ZDLOG.objects.bulk_create([
+            ZDLOG(TABLE_NAME='ZY00', RECORD_ID=str(i), TYPE_MOUVEMENT=ZDLOG.TYPE_MODIFICATION)
+            for i in range(5)
+        ])
+
+    def test_compter_plafonne(self):
+        """Le comptage s'arrête au plafond et le signale."""
+        self.assertEqual(compter_plafonne(ZDLOG.objects.all(), plafond=3), (3, True))
+        self.assertEqual(compter_plafonne(ZDLOG.objects.all(), plafond=5), (5, False))
+
+    def test_paginateur_estime_limite_les_pages(self):
+        """Le paginateur ne propose pas de pages au-delà du plafond."""
+        plafond = pagination.PLAFOND_COMPTAGE
+        pagination.PLAFOND_COMPTAGE = 4
+        try:
+            paginateur = PaginateurEstime(ZDLOG.objects.filter(TABLE_NAME='ZY00'), 1)
+            self.assertEqual(paginateur.count, 4)
+            self.assertEqual(paginateur.num_pages, 4)
+        finally:
+            pagination.PLAFOND_COMPTAGE = plafond
+
+
+class TestZDLOGTable(TestCase):
+    """Tests pour le référentiel des tables auditées."""
+
+    def setUp(self):
+        ZDLOGTable._connues.clear()
+        cache.delete(ZDLOGTable.CLE_CACHE)
+
+    def test_log_action_enregistre_la_table(self):
+        """Chaque table journalisée apparaît une seule fois dans le référentiel."""
+        self.assertEqual(ZDLOGTable.noms(), [])
+
+        ZDLOG.log_action('ZYCO', '1', ZDLOG.TYPE_CREATION)
+        ZDLOG.log_action('ZYCO', '2', ZDLOG.TYPE_CREATION)
+        ZDLOG.log_action('ZY00', '1', ZDLOG.TYPE_MODIFICATION)
+
+        self.assertEqual(ZDLOGTable.noms(), ['ZY00', 'ZYCO'])
+        self.assertEqual(ZDLOGTable.objects.count(), 2)
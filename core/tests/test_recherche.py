@@ -0,0 +1,104 @@
+# core/tests/test_recherche.py
+"""
+Tests pour la recherche indexée dans ZDLOG.
+"""
+from datetime import timedelta
+from importlib import import_module
+
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from core.models import ZDLOG
+from core.recherche import (
+    filtrer_champ_modifie,
+    filtrer_texte,
+    filtrer_valeurs,
+)
+
+# Index de recherche tels que créés par la migration
+migration_recherche = import_module('core.migrations.0003_zdlog_recherche')
+
+
+class TestRechercheLogs(TestCase):
+    """Tests pour filtrer_texte, filtrer_valeurs et filtrer_champ_modifie."""
+
+    def setUp(self):
+        if connection.vendor == 'sqlite':
+            # Base de test éventuellement créée sans migrations : instructions idempotentes
+            with connection.cursor() as cursor:
+                for instruction in migration_recherche.SQL_SQLITE:
+                    cursor.execute(instruction)
+        self.creation = ZDLOG.log_action(
+            'ZY00', '12', ZDLOG.TYPE_CREATION,
+            nouvelle_valeur={'nom': 'KONAN', 'ville': 'Abidjan'},
+            description="Création de l'employé KONAN Awa"
+        )
+        self.modif_ville = ZDLOG.log_action(
+            'ZY00', '12', ZDLOG.TYPE_MODIFICATION,
+            ancienne_valeur={'nom': 'KONAN', 'ville': 'Abidjan'},
+            nouvelle_valeur={'nom': 'KONAN', 'ville': 'Bouaké'},
+            description="Modification de l'employé KONAN Awa: ville: Abidjan → Bouaké"
+        )
+        self.modif_nom = ZDLOG.log_action(
+            'ZY00', '12', ZDLOG.TYPE_MODIFICATION,
+            ancienne_valeur={'nom': 'KONAN', 'ville': 'Bouaké'},
+            nouvelle_valeur={'nom': 'KOUASSI', 'ville': 'Bouaké', 'email': 'awa@exemple.ci'},
+            description="Modification de l'employé KOUASSI Awa"
+        )
+
+    def ids(self, queryset):
+        return set(queryset.values_list('pk', flat=True))
+
+    def test_recherche_plein_texte(self):
+        """Tous les mots doivent apparaître, en préfixe, dans la description ou les valeurs."""
+        logs = ZDLOG.objects.all()
+        self.assertEqual(self.ids(filtrer_texte(logs, 'awa')), {
+            self.creation.pk, self.modif_ville.pk, self.modif_nom.pk
+        })
+        self.assertEqual(self.ids(filtrer_texte(logs, 'creation KONAN')), {self.creation.pk})
+        self.assertEqual(self.ids(filtrer_texte(logs, 'bouak')), {self.modif_ville.pk, self.modif_nom.pk})
+        self.assertEqual(self.ids(filtrer_texte(logs, 'introuvable')), set())
+        self.assertEqual(filtrer_texte(logs, '  ').count(), 3)
+
+    def test_recherche_table_cle_et_utilisateur(self):
+        """La saisie retrouve aussi une table, un début de clé ou d'utilisateur."""
+        autre = ZDLOG.objects.create(
+            TABLE_NAME='ZYCO', RECORD_ID='MT000042', TYPE_MOUVEMENT=ZDLOG.TYPE_MODIFICATION,
+            USER_NAME='jdupont', DESCRIPTION='Contrat désactivé'
+        )
+        logs = ZDLOG.objects.all()
+        self.assertEqual(self.ids(filtrer_texte(logs, 'zyco')), {autre.pk})
+        self.assertEqual(self.ids(filtrer_texte(logs, 'MT0000')), {autre.pk})
+        self.assertEqual(self.ids(filtrer_texte(logs, 'jdup')), {autre.pk})
+        self.assertEqual(self.ids(filtrer_texte(logs, '12')), {
+            self.creation.pk, self.modif_ville.pk, self.modif_nom.pk
+        })
+        # Et toujours la description
+        self.assertEqual(self.ids(filtrer_texte(logs, 'contrat')), {autre.pk})
+
+    def test_index_suit_les_suppressions(self):
+        """Un log supprimé n'est plus trouvé."""
+        self.modif_nom.delete()
+        self.assertEqual(self.ids(filtrer_texte(ZDLOG.objects.all(), 'kouassi')), set())
+
+    def test_filtrer_valeurs(self):
+        """Les paires champ/valeur sont recherchées dans la valeur JSON."""
+        logs = filtrer_valeurs(ZDLOG.objects.all(), {'ville': 'Bouaké'})
+        self.assertEqual(self.ids(logs), {self.modif_ville.pk, self.modif_nom.pk})
+        logs = filtrer_valeurs(ZDLOG.objects.all(), {'ville': 'Abidjan'}, colonne='ANCIENNE_VALEUR')
+        self.assertEqual(self.ids(logs), {self.modif_ville.pk})
+
+    def test_champ_modifie_entre_deux_dates(self):
+        """Champ X de l'enregistrement Y modifié sur une période."""
+        logs = ZDLOG.objects.filter(TABLE_NAME='ZY00', RECORD_ID='12')
+        self.assertEqual(self.ids(filtrer_champ_modifie(logs, 'ville')), {self.modif_ville.pk})
+        self.assertEqual(self.ids(filtrer_champ_modifie(logs, 'nom')), {self.modif_nom.pk})
+        # Champ apparu dans la nouvelle valeur
+        self.assertEqual(self.ids(filtrer_champ_modifie(logs, 'email')), {self.modif_nom.pk})
+
+        ZDLOG.objects.filter(pk=self.modif_ville.pk).update(
+            DATE_MODIFICATION=timezone.now() - timedelta(days=30)
+        )
+        recents = logs.filter(DATE_MODIFICATION__gte=timezone.now() - timedelta(days=7))
+        self.assertEqual(self.ids(filtrer_champ_modifie(recents, 'ville')), set())
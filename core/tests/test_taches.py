@@ -0,0 +1,138 @@
+# core/tests/test_taches.py
+"""
+Tests pour la file de tâches de fond (core.taches, commande executer_taches).
+"""
+import json
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.http import Http404
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+
+from core import taches
+from core.models import ZDJOB
+from core.views import suivi_tache
+
+
+@taches.tache('tests.somme')
+def somme(job, valeurs):
+    for i, _ in enumerate(valeurs, start=1):
+        job.avancer(i, len(valeurs))
+    return {'message': f"Somme : {sum(valeurs)}", 'somme': sum(valeurs)}
+
+
+@taches.tache('tests.echec')
+def echec(job):
+    raise ValueError("Données invalides")
+
+
+class TestExecutionImmediate(TestCase):
+    """Sans worker, la tâche s'exécute dans la requête."""
+
+    def test_tache_terminee(self):
+        """Le résultat, le message et la progression sont enregistrés."""
+        job = taches.lancer('tests.somme', {'valeurs': [1, 2, 3]})
+        self.assertEqual(job.STATUT, ZDJOB.STATUT_TERMINE)
+        self.assertEqual(job.RESULTAT['somme'], 6)
+        self.assertEqual(job.MESSAGE, "Somme : 6")
+        self.assertEqual(job.PROGRESSION, 100)
+        self.assertEqual(job.TENTATIVES, 1)
+
+    def test_tache_en_echec(self):
+        """Une exception passe la tâche en échec avec son message."""
+        job = taches.lancer('tests.echec')
+        self.assertEqual(job.STATUT, ZDJOB.STATUT_ECHEC)
+        self.assertEqual(job.ERREUR, "Données invalides")
+
+    def test_tache_inconnue(self):
+        """Une tâche non déclarée est refusée."""
+        with self.assertRaises(taches.TacheInconnue):
+            taches.lancer('tests.inconnue')
+
+
+@override_settings(TACHES_EXECUTION_IMMEDIATE=False)
+class TestFileAttente(TestCase):
+    """Réservation et exécution par les workers."""
+
+    def test_reservation_unique(self):
+        """Les tâches sont réservées dans l'ordre, une seule fois."""
+        premiere = taches.lancer('tests.somme', {'valeurs': [1]})
+        seconde = taches.lancer('tests.somme', {'valeurs': [2]})
+        self.assertEqual(premiere.STATUT, ZDJOB.STATUT_EN_ATTENTE)
+
+        job = taches.reserver_suivante('worker-1')
+        self.assertEqual(job.pk, premiere.pk)
+        self.assertEqual((job.STATUT, job.WORKER), (ZDJOB.STATUT_EN_COURS, 'worker-1'))
+        self.assertFalse(taches.reserver_tache(premiere, 'worker-2'))
+
+        self.assertEqual(taches.reserver_suivante('worker-2').pk, seconde.pk)
+        self.assertIsNone(taches.reserver_suivante('worker-3'))
+
+    def test_unique_reutilise_la_tache_active(self):
+        """Une tâche identique encore active n'est pas relancée."""
+        job = taches.lancer('tests.somme', {'valeurs': [1, 2]}, unique=True)
+        self.assertEqual(taches.lancer('tests.somme', {'valeurs': [1, 2]}, unique=True).pk, job.pk)
+        self.assertNotEqual(taches.lancer('tests.somme', {'valeurs': [3]}, unique=True).pk, job.pk)
+
+    def test_recuperation_taches_bloquees(self):
+        """Une tâche sans signe de vie est remise en file, puis abandonnée."""
+        ancienne = timezone.now() - timedelta(hours=1)
+        relancee = ZDJOB.objects.create(
+            TACHE='tests.somme', STATUT=ZDJOB.STATUT_EN_COURS, TENTATIVES=1, DATE_SIGNE_VIE=ancienne
+        )
+        abandonnee = ZDJOB.objects.create(
+            TACHE='tests.somme', STATUT=ZDJOB.STATUT_EN_COURS, TENTATIVES=3, DATE_SIGNE_VIE=ancienne
+        )
+        active = ZDJOB.objects.create(
+            TACHE='tests.somme', STATUT=ZDJOB.STATUT_EN_COURS, TENTATIVES=1, DATE_SIGNE_VIE=timezone.now()
+        )
+
+        self.assertEqual(taches.recuperer_taches_bloquees(), (1, 1))
+        statuts = dict(ZDJOB.objects.values_list('pk', 'STATUT'))
+        self.assertEqual(statuts[relancee.pk], ZDJOB.STATUT_EN_ATTENTE)
+        self.assertEqual(statuts[abandonnee.pk], ZDJOB.STATUT_ECHEC)
+        self.assertEqual(statuts[active.pk], ZDJOB.STATUT_EN_COURS)
+
+    def test_commande_une_fois(self):
+        """Le worker vide la file puis s'arrête."""
+        ok = taches.lancer('tests.somme', {'valeurs': [4, 5]})
+        ko = taches.lancer('tests.echec')
+
+        sortie = StringIO()
+        call_command('executer_taches', '--une-fois', stdout=sortie)
+
+        ok.refresh_from_db()
+        ko.refresh_from_db()
+        self.assertEqual(ok.STATUT, ZDJOB.STATUT_TERMINE)
+        self.assertEqual(ok.RESULTAT['somme'], 9)
+        self.assertEqual(ko.STATUT, ZDJOB.STATUT_ECHEC)
+        self.assertIn("2 tâche(s) exécutée(s)", sortie.getvalue())
+
+
+class TestSuiviTache(TestCase):
+    """Tests pour l'endpoint de suivi."""
+
+    def setUp(self):
+        self.demandeur = User.objects.create_user(username='demandeur', password='x')
+        self.autre = User.objects.create_user(username='autre', password='x')
+        self.job = taches.lancer('tests.somme', {'valeurs': [1]}, user=self.demandeur)
+
+    def suivre(self, user):
+        requete = RequestFactory().get(f'/core/taches/{self.job.UUID}/')
+        requete.user = user
+        return suivi_tache(requete, uuid=self.job.UUID)
+
+    def test_suivi_par_le_demandeur(self):
+        """Le demandeur lit l'état de sa tâche."""
+        donnees = json.loads(self.suivre(self.demandeur).content)
+        self.assertEqual(donnees['statut'], ZDJOB.STATUT_TERMINE)
+        self.assertTrue(donnees['terminee'])
+        self.assertEqual(donnees['resultat']['somme'], 1)
+
+    def test_suivi_refuse_aux_autres(self):
+        """Un autre utilisateur ne voit pas la tâche."""
+        with self.assertRaises(Http404):
+            self.suivre(self.autre)
@@ -0,0 +1,10 @@
+# core/urls.py
+from django.urls import path
+
+from . import views
+
+app_name = 'core'
+
+urlpatterns = [
+    path('taches/<uuid:uuid>/', views.suivi_tache, name='suivi_tache'),
+]
@@ -1,3 +1,21 @@
-from django.shortcuts import render
+from django.contrib.auth.decorators import login_required
+from django.http import Http404, JsonResponse
+from django.views.decorators.http import require_GET
 
-# Create your views here.
+from .models import ZDJOB
+
+
+@login_required
+@require_GET
+def suivi_tache(request, uuid):
+    """État et avancement d'une tâche de fond (polling AJAX)."""
+    try:
+        job = ZDJOB.objects.get(UUID=uuid)
+    except ZDJOB.DoesNotExist:
+        raise Http404("Tâche introuvable")
+
+    # Seul le demandeur (ou un superutilisateur) suit la tâche
+    if job.DEMANDE_PAR_id != request.user.pk and not request.user.is_superuser:
+        raise Http404("Tâche introuvable")
+
+    return JsonResponse(job.to_dict())
@@ -430,12 +430,16 @@ class Command(BaseCommand):
     def _charger_zyaf(self, employe, items, stats, force):
         from employee.models import ZYAF
         from departement.models import ZDPO
+        # Postes préchargés en une requête
+        postes = ZDPO.objects.in_bulk(
+            {item.get('poste_code') for item in items if item.get('poste_code')}, field_name='CODE'
+        )
         for item in items:
             try:
-                poste = ZDPO.objects.filter(CODE=item['poste_code']).first()
+                poste = postes.get(item.get('poste_code'))
                 if not poste:
                     self.stderr.write(self.style.WARNING(
-                        f"    ZYAF: poste {item['poste_code']} introuvable, ignore"
+                        f"    ZYAF: poste {item.get('poste_code')} introuvable, ignore"
                     ))
                     stats['erreurs'] += 1
                     continue
@@ -638,12 +642,16 @@ class Command(BaseCommand):
 
     def _charger_zyre(self, employe, items, stats, force):
         from employee.models import ZYRO, ZYRE
+        # Rôles préchargés en une requête
+        roles = ZYRO.objects.in_bulk(
+            {item.get('role_code') for item in items if item.get('role_code')}, field_name='CODE'
+        )
         for item in items:
             try:
-                role = ZYRO.objects.filter(CODE=item['role_code']).first()
+                role = roles.get(item.get('role_code'))
                 if not role:
                     self.stderr.write(self.style.WARNING(
-                        f"    ZYRE: role {item['role_code']} introuvable, ignore"
+                        f"    ZYRE: role {item.get('role_code')} introuvable, ignore"
                     ))
                     stats['erreurs'] += 1
                     continue
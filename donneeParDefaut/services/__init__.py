@@ -0,0 +1,9 @@
+"""
+Couche services pour l'application donneeParDefaut.
+"""
+
+from .chargement_service import ChargementReferenceService
+
+__all__ = [
+    'ChargementReferenceService',
+]
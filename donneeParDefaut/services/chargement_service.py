@@ -0,0 +1,369 @@
+# donneeParDefaut/services/chargement_service.py
+"""
+Service de chargement idempotent des données de référence.
+
+Chaque table est chargée en un nombre constant de requêtes :
+- une requête lit toutes les clés naturelles existantes et leurs valeurs ;
+- les lignes sont réparties en créations, mises à jour et lignes inchangées ;
+- créations et mises à jour sont appliquées ensemble par
+  bulk_create(update_conflicts=True) sur la clé naturelle.
+
+Les tables sont traitées dans l'ordre des dépendances ; les références
+(département d'un poste, parent d'une catégorie, groupe d'un rôle) sont
+résolues depuis les clés déjà chargées. Les écritures groupées ne
+déclenchent pas les signaux d'audit : une seule entrée ZDLOG récapitule
+chaque table modifiée.
+
+Les fichiers JSON étant extraits d'une base valide (extraire_donnees),
+les méthodes clean() des modèles ne sont pas rejouées : seule la mise en
+majuscules des codes est appliquée.
+"""
+import json
+import logging
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth.models import Group
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(settings.BASE_DIR) / 'donneeParDefaut' / 'data'
+
+# Ordre de chargement (respect des dépendances FK)
+ORDRE_CHARGEMENT = ['ZDDE', 'ZDPO', 'TypeAbsence', 'NFCA', 'ZYRO', 'GACCategorie']
+
+# Description des tables :
+# - modele : 'app.Modele'
+# - cle : clé naturelle (champ unique)
+# - champs : {champ du modèle: (clé JSON, conversion)}
+# - references : {champ FK: (clé JSON, table référencée)}
+# - groupes : {champ FK vers Group: clé JSON du nom de groupe}
+# - conserver_si_vide : champs dont la valeur existante est gardée si le JSON est vide
+TABLES = {
+    'ZDDE': {
+        'modele': 'departement.ZDDE',
+        'cle': 'CODE',
+        'champs': {
+            'CODE': ('CODE', 'code'),
+            'LIBELLE': ('LIBELLE', None),
+            'STATUT': ('STATUT', None),
+            'DATEDEB': ('DATEDEB', 'date'),
+            'DATEFIN': ('DATEFIN', 'date'),
+        },
+        'conserver_si_vide': ['DATEDEB', 'DATEFIN'],
+    },
+    'ZDPO': {
+        'modele': 'departement.ZDPO',
+        'cle': 'CODE',
+        'champs': {
+            'CODE': ('CODE', 'code'),
+            'LIBELLE': ('LIBELLE', None),
+            'STATUT': ('STATUT', None),
+            'DATEDEB': ('DATEDEB', 'date'),
+            'DATEFIN': ('DATEFIN', 'date'),
+        },
+        'references': {
+            'DEPARTEMENT': ('DEPARTEMENT_CODE', 'ZDDE'),
+        },
+        'conserver_si_vide': ['DATEDEB', 'DATEFIN'],
+    },
+    'TypeAbsence': {
+        'modele': 'absence.TypeAbsence',
+        'cle': 'code',
+        'champs': {
+            'code': ('code', 'code'),
+            'libelle': ('libelle', None),
+            'categorie': ('categorie', None),
+            'paye': ('paye', None),
+            'decompte_solde': ('decompte_solde', None),
+            'justificatif_obligatoire': ('justificatif_obligatoire', None),
+            'couleur': ('couleur', None),
+            'ordre': ('ordre', None),
+            'actif': ('actif', None),
+        },
+    },
+    'NFCA': {
+        'modele': 'frais.NFCA',
+        'cle': 'CODE',
+        'champs': {
+            'CODE': ('CODE', 'code'),
+            'LIBELLE': ('LIBELLE', None),
+            'DESCRIPTION': ('DESCRIPTION', None),
+            'JUSTIFICATIF_OBLIGATOIRE': ('JUSTIFICATIF_OBLIGATOIRE', None),
+            'PLAFOND_DEFAUT': ('PLAFOND_DEFAUT', 'decimal'),
+            'ICONE': ('ICONE', None),
+            'STATUT': ('STATUT', None),
+            'ORDRE': ('ORDRE', None),
+        },
+    },
+    'ZYRO': {
+        'modele': 'employee.ZYRO',
+        'cle': 'CODE',
+        'champs': {
+            'CODE': ('CODE', None),
+            'LIBELLE': ('LIBELLE', None),
+            'DESCRIPTION': ('DESCRIPTION', None),
+            'PERMISSIONS_CUSTOM': ('PERMISSIONS_CUSTOM', None),
+            'actif': ('actif', None),
+        },
+        'groupes': {
+            'django_group': 'django_group_name',
+        },
+        'conserver_si_vide': ['django_group'],
+    },
+    'GACCategorie': {
+        'modele': 'gestion_achats.GACCategorie',
+        'cle': 'code',
+        'champs': {
+            'code': ('code', None),
+            'nom': ('nom', None),
+            'description': ('description', None),
+            'ordre': ('ordre', None),
+        },
+        # Auto-référence : les parents sont chargés avant leurs enfants
+        'references': {
+            'parent': ('parent_code', 'GACCategorie'),
+        },
+    },
+}
+
+
+class ChargementReferenceService:
+    """
+    Chargeur idempotent des données de référence par défaut.
+
+    Utilisation:
+        service = ChargementReferenceService(force=True)
+        stats = service.charger_fichiers(['ZDDE', 'ZDPO'])
+    """
+
+    def __init__(self, dry_run=False, force=False, ecrire=None, ecrire_erreur=None):
+        self.dry_run = dry_run
+        self.force = force
+        self.ecrire = ecrire or logger.info
+        self.ecrire_erreur = ecrire_erreur or logger.warning
+        # {table: {clé naturelle: pk}} des lignes présentes en base
+        self.cles = {}
+
+    @staticmethod
+    def stats_vides():
+        """Compteurs d'une table"""
+        return {'crees': 0, 'existants': 0, 'mis_a_jour': 0, 'erreurs': 0}
+
+    def charger_fichiers(self, tables=None, data_dir=DATA_DIR):
+        """
+        Charge les fichiers JSON des tables demandées, dans l'ordre des dépendances.
+        En simulation, tout est écrit puis annulé pour des compteurs exacts.
+
+        Returns:
+            dict: {table: stats} des tables chargées
+        """
+        tables = tables or ORDRE_CHARGEMENT
+        resultats = {}
+
+        with transaction.atomic():
+            for table in [t for t in ORDRE_CHARGEMENT if t in tables]:
+                fichier = Path(data_dir) / f"{table.lower()}.json"
+                if not fichier.exists():
+                    self.ecrire_erreur(f"  {table:20s} : fichier {fichier.name} introuvable, ignore")
+                    continue
+
+                with open(fichier, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if not data:
+                    self.ecrire(f"  {table:20s} : aucune donnee")
+                    continue
+
+                resultats[table] = self.charger(table, data)
+
+            if self.dry_run:
+                transaction.set_rollback(True)
+
+        return resultats
+
+    def charger(self, table, data):
+        """
+        Charge une table à partir de ses éléments JSON.
+
+        Returns:
+            dict: stats (crees, existants, mis_a_jour, erreurs)
+        """
+        spec = TABLES[table]
+        modele = apps.get_model(spec['modele'])
+        stats = self.stats_vides()
+
+        champs = list(spec['champs'])
+        champs += [f"{champ}_id" for champ in spec.get('references', {})]
+        champs += [f"{champ}_id" for champ in spec.get('groupes', {})]
+
+        existants = {
+            ligne[spec['cle']]: ligne
+            for ligne in modele.objects.values('pk', *champs)
+        }
+        self.cles[table] = {cle: ligne['pk'] for cle, ligne in existants.items()}
+        groupes = self._groupes(spec, data)
+
+        lignes = [self._convertir(spec, modele, item, stats) for item in data]
+        lignes = [ligne for ligne in lignes if ligne is not None]
+
+        auto_reference = [
+            champ for champ, (_, cible) in spec.get('references', {}).items() if cible == table
+        ]
+        a_traiter = lignes
+        while a_traiter:
+            # Niveau courant : lignes dont toutes les références sont résolues
+            niveau, restantes = [], []
+            for ligne in a_traiter:
+                (niveau if self._resoudre(spec, ligne, groupes) else restantes).append(ligne)
+            if niveau:
+                self._appliquer(table, spec, modele, niveau, existants, stats)
+            a_traiter = restantes
+            # Sans auto-référence, un seul passage suffit
+            if not niveau or not auto_reference:
+                break
+
+        for ligne in a_traiter:
+            stats['erreurs'] += 1
+            manquantes = ', '.join(
+                f"{cle_json} {ligne['_references'][champ]}"
+                for champ, (cle_json, _) in spec.get('references', {}).items()
+                if ligne['_references'][champ] and f"{champ}_id" not in ligne['valeurs']
+            )
+            self.ecrire_erreur(f"    {table} [{ligne['cle']}]: {manquantes} introuvable, ignore")
+
+        if not self.dry_run:
+            self._journaliser(table, stats)
+        return stats
+
+    # ------------------------------------------------------------------
+    # Préparation
+    # ------------------------------------------------------------------
+
+    def _convertir(self, spec, modele, item, stats):
+        """Convertit un élément JSON en valeurs de champs"""
+        try:
+            valeurs = {}
+            for champ, (cle_json, conversion) in spec['champs'].items():
+                if cle_json in item:
+                    valeur = item[cle_json]
+                else:
+                    field = modele._meta.get_field(champ)
+                    valeur = field.get_default() if field.has_default() else ('' if not field.null else None)
+                if valeur is not None and conversion == 'code':
+                    valeur = str(valeur).upper().strip()
+                elif valeur and conversion == 'date':
+                    valeur = date.fromisoformat(valeur)
+                elif valeur is not None and conversion == 'decimal':
+                    valeur = Decimal(str(valeur)) if valeur != '' else None
+                valeurs[champ] = valeur
+        except (KeyError, ValueError, ArithmeticError) as e:
+            stats['erreurs'] += 1
+            self.ecrire_erreur(f"    Erreur {modele.__name__} [{item.get(spec['cle'])}]: {e}")
+            return None
+
+        return {
+            'cle': valeurs[spec['cle']],
+            'valeurs': valeurs,
+            '_references': {
+                champ: item.get(cle_json) for champ, (cle_json, _) in spec.get('references', {}).items()
+            },
+            '_groupes': {champ: item.get(cle_json) for champ, cle_json in spec.get('groupes', {}).items()},
+        }
+
+    def _resoudre(self, spec, ligne, groupes):
+        """Renseigne les clés étrangères ; False si une référence n'est pas encore chargée"""
+        for champ, (_, cible) in spec.get('references', {}).items():
+            code = ligne['_references'][champ]
+            if not code:
+                ligne['valeurs'][f"{champ}_id"] = None
+                continue
+            pk = self.cles.get(cible, {}).get(code)
+            if pk is None:
+                return False
+            ligne['valeurs'][f"{champ}_id"] = pk
+        for champ, nom in ligne['_groupes'].items():
+            ligne['valeurs'][f"{champ}_id"] = groupes.get(nom) if nom else None
+        return True
+
+    def _groupes(self, spec, data):
+        """Crée en une fois les groupes Django manquants ; retourne {nom: pk}"""
+        noms = {
+            item.get(cle_json)
+            for cle_json in spec.get('groupes', {}).values()
+            for item in data if item.get(cle_json)
+        }
+        if not noms:
+            return {}
+        Group.objects.bulk_create([Group(name=nom) for nom in sorted(noms)], ignore_conflicts=True)
+        return dict(Group.objects.filter(name__in=noms).values_list('name', 'pk'))
+
+    # ------------------------------------------------------------------
+    # Écriture
+    # ------------------------------------------------------------------
+
+    def _appliquer(self, table, spec, modele, lignes, existants, stats):
+        """Répartit les lignes (création / mise à jour / inchangée) puis les écrit en une requête"""
+        a_ecrire = []
+        champs_maj = set()
+        for ligne in {ligne['cle']: ligne for ligne in lignes}.values():
+            valeurs = ligne['valeurs']
+            actuel = existants.get(ligne['cle'])
+
+            if actuel is None:
+                # Valeur vide : laisser le défaut du modèle (ex. DATEDEB = aujourd'hui)
+                a_ecrire.append(modele(**{
+                    champ: valeur for champ, valeur in valeurs.items()
+                    if valeur is not None or not modele._meta.get_field(champ).has_default()
+                }))
+                stats['crees'] += 1
+                continue
+
+            for champ in spec.get('conserver_si_vide', []):
+                attname = modele._meta.get_field(champ).attname
+                if valeurs.get(attname) is None:
+                    valeurs[attname] = actuel[attname]
+
+            modifies = [champ for champ, valeur in valeurs.items() if actuel[champ] != valeur]
+            if not modifies or not self.force:
+                stats['existants'] += 1
+                continue
+            champs_maj.update(modifies)
+            # Sans pk : le conflit porte sur la clé naturelle
+            a_ecrire.append(modele(**valeurs))
+            stats['mis_a_jour'] += 1
+
+        if a_ecrire:
+            horodatage = [
+                f.name for f in modele._meta.concrete_fields if getattr(f, 'auto_now', False)
+            ]
+            champs_maj = [modele._meta.get_field(champ).name for champ in sorted(champs_maj)]
+            modele.objects.bulk_create(
+                a_ecrire,
+                update_conflicts=bool(champs_maj),
+                unique_fields=[spec['cle']] if champs_maj else None,
+                update_fields=(champs_maj + horodatage) if champs_maj else None,
+            )
+
+        # Recharger les clés pour résoudre les références suivantes
+        self.cles[table] = dict(modele.objects.values_list(spec['cle'], 'pk'))
+
+    def _journaliser(self, table, stats):
+        """Crée une entrée d'audit récapitulative pour la table chargée"""
+        from core.models import ZDLOG
+
+        if not stats['crees'] and not stats['mis_a_jour']:
+            return
+        ZDLOG.log_action(
+            table_name=table,
+            record_id='DONNEES_DEFAUT',
+            type_mouvement=ZDLOG.TYPE_CREATION if stats['crees'] else ZDLOG.TYPE_MODIFICATION,
+            nouvelle_valeur=stats,
+            description=(
+                f"Chargement des données par défaut : {stats['crees']} création(s), "
+                f"{stats['mis_a_jour']} mise(s) à jour"
+            )
+        )
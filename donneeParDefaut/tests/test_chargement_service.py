@@ -0,0 +1,111 @@
+# donneeParDefaut/tests/test_chargement_service.py
+"""Tests pour ChargementReferenceService."""
+
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.test import TestCase
+
+from core.models import ZDLOG
+from departement.models import ZDDE, ZDPO
+from donneeParDefaut.services import ChargementReferenceService
+from donneeParDefaut.services.chargement_service import DATA_DIR, ORDRE_CHARGEMENT
+from employee.models import ZYRO
+from gestion_achats.models import GACCategorie
+
+
+class ChargementReferenceServiceTest(TestCase):
+    """Tests du chargement groupé des données de référence."""
+
+    def setUp(self):
+        self.dossier = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.dossier, ignore_errors=True)
+
+    def charger(self, data_dir=DATA_DIR, **options):
+        service = ChargementReferenceService(
+            ecrire=lambda message: None, ecrire_erreur=lambda message: None, **options
+        )
+        return service.charger_fichiers(ORDRE_CHARGEMENT, data_dir)
+
+    def copier_donnees(self):
+        for table in ORDRE_CHARGEMENT:
+            shutil.copy(DATA_DIR / f"{table.lower()}.json", self.dossier)
+
+    def lire(self, table):
+        with open(self.dossier / f"{table.lower()}.json", encoding='utf-8') as f:
+            return json.load(f)
+
+    def ecrire(self, table, data):
+        with open(self.dossier / f"{table.lower()}.json", 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+
+    def test_chargement_initial_puis_relance(self):
+        """Le premier chargement crée tout, une relance ne modifie rien."""
+        stats = self.charger()
+
+        self.assertTrue(all(s['erreurs'] == 0 for s in stats.values()))
+        self.assertEqual(stats['ZDPO']['crees'], ZDPO.objects.count())
+        poste = json.loads((DATA_DIR / 'zdpo.json').read_text(encoding='utf-8'))[0]
+        self.assertEqual(
+            ZDPO.objects.get(CODE=poste['CODE']).DEPARTEMENT.CODE, poste['DEPARTEMENT_CODE']
+        )
+        enfant = GACCategorie.objects.filter(parent__isnull=False).first()
+        self.assertIsNotNone(enfant)
+        self.assertEqual(ZDLOG.objects.filter(TABLE_NAME='ZDPO').count(), 1)
+
+        nb_logs = ZDLOG.objects.count()
+        stats = self.charger(force=True)
+
+        for table, s in stats.items():
+            self.assertEqual((s['crees'], s['mis_a_jour']), (0, 0), table)
+        self.assertEqual(ZDLOG.objects.count(), nb_logs)
+
+    def test_force_met_a_jour_par_cle_naturelle(self):
+        """Avec --force, seules les lignes modifiées sont réécrites."""
+        self.copier_donnees()
+        self.charger(data_dir=self.dossier)
+        nb_postes = ZDPO.objects.count()
+
+        departements = self.lire('ZDDE')
+        departements[0]['LIBELLE'] = 'Libellé modifié'
+        self.ecrire('ZDDE', departements)
+        roles = self.lire('ZYRO')
+        roles[0]['django_group_name'] = 'Groupe importé'
+        self.ecrire('ZYRO', roles)
+
+        stats = self.charger(data_dir=self.dossier)
+        self.assertEqual(stats['ZDDE']['mis_a_jour'], 0)
+        self.assertNotEqual(ZDDE.objects.get(CODE=departements[0]['CODE']).LIBELLE, 'Libellé modifié')
+
+        stats = self.charger(data_dir=self.dossier, force=True)
+        self.assertEqual(stats['ZDDE']['mis_a_jour'], 1)
+        self.assertEqual(stats['ZDDE']['existants'], len(departements) - 1)
+        self.assertEqual(ZDDE.objects.get(CODE=departements[0]['CODE']).LIBELLE, 'Libellé modifié')
+        role = ZYRO.objects.get(CODE=roles[0]['CODE'])
+        self.assertEqual(role.django_group.name, 'Groupe importé')
+        self.assertEqual(ZDPO.objects.count(), nb_postes)
+
+    def test_reference_introuvable_et_simulation(self):
+        """Une référence inconnue est signalée ; la simulation n'écrit rien."""
+        self.ecrire('ZDDE', [{'CODE': 'fin', 'LIBELLE': 'Finance', 'STATUT': True,
+                              'DATEDEB': '2025-01-01', 'DATEFIN': None}])
+        self.ecrire('ZDPO', [
+            {'CODE': 'PSTFIN', 'LIBELLE': 'Comptable', 'DEPARTEMENT_CODE': 'FIN',
+             'STATUT': True, 'DATEDEB': '2025-01-01', 'DATEFIN': None},
+            {'CODE': 'PSTXXX', 'LIBELLE': 'Orphelin', 'DEPARTEMENT_CODE': 'XXX',
+             'STATUT': True, 'DATEDEB': '2025-01-01', 'DATEFIN': None},
+        ])
+
+        stats = self.charger(data_dir=self.dossier, dry_run=True)
+        self.assertEqual(stats['ZDPO']['crees'], 1)
+        self.assertEqual(stats['ZDPO']['erreurs'], 1)
+        self.assertFalse(ZDDE.objects.exists())
+        self.assertFalse(ZDLOG.objects.exists())
+
+        self.charger(data_dir=self.dossier)
+        self.assertEqual(ZDPO.objects.get(CODE='PSTFIN').DEPARTEMENT.CODE, 'FIN')
+        self.assertFalse(ZDPO.objects.filter(CODE='PSTXXX').exists())
@@ -0,0 +1,32 @@
+# donneeParDefaut/tests/test_charger_employe.py
+"""Tests pour la commande charger_employe."""
+
+from io import StringIO
+
+from donneeParDefaut.management.commands.charger_employe import Command
+from employee.models import ZYAF, ZYRE
+from employee.tests.base import EmployeeTestCase
+
+
+class ChargerEmployeTest(EmployeeTestCase):
+    """Tests du chargement des affectations et des rôles d'un employé."""
+
+    def setUp(self):
+        self.employe = self.create_employee(matricule='CHG00001')
+        self.commande = Command(stdout=StringIO(), stderr=StringIO())
+        self.stats = {'crees': 0, 'existants': 0, 'mis_a_jour': 0, 'erreurs': 0}
+
+    def test_code_manquant_compte_en_erreur(self):
+        """Un enregistrement sans code est une erreur ; les autres sont chargés."""
+        self.commande._charger_zyaf(self.employe, [
+            {'date_debut': '2026-01-01', 'actif': True},
+            {'poste_code': self.poste.CODE, 'date_debut': '2026-01-01', 'actif': True},
+        ], self.stats, False)
+        self.commande._charger_zyre(self.employe, [
+            {'role_code': '', 'date_debut': '2026-01-01', 'actif': True},
+            {'role_code': self.role_drh.CODE, 'date_debut': '2026-01-01', 'actif': True},
+        ], self.stats, False)
+
+        self.assertEqual((self.stats['crees'], self.stats['erreurs']), (2, 2))
+        self.assertTrue(ZYAF.objects.filter(employe=self.employe, poste=self.poste).exists())
+        self.assertTrue(ZYRE.objects.filter(employe=self.employe, role=self.role_drh).exists())
@@ -1,6 +1,8 @@
 from django.contrib import admin
 
 from .forms import ZY00Form
+from .services.effectifs_service import EffectifsService
+from .services.recherche_service import RechercheEmployeService
 from .models import ZY00, ZYCO, ZYTE, ZYME, ZYAF, ZYAD, ZYDO, ZYFA, ZYNP, ZYPP, ZYIB, ZYRO, ZYRE
 from django.utils.html import format_html
 from django.urls import reverse
@@ -277,6 +279,7 @@ class ZY00Admin(admin.ModelAdmin):
     def activer_employes(self, request, queryset):
         """Activer les employés sélectionnés"""
         updated = queryset.update(etat='actif')
+        EffectifsService.invalider()
         self.message_user(request, f"{updated} employé(s) activé(s) avec succès.")
 
     activer_employes.short_description = "Activer les employés sélectionnés"
@@ -295,6 +298,7 @@ class ZY00Admin(admin.ModelAdmin):
             return
 
         updated = queryset.update(etat='inactif')
+        EffectifsService.invalider()
         self.message_user(request, f"{updated} employé(s) désactivé(s) avec succès.")
 
     desactiver_employes.short_description = "Désactiver les employés sélectionnés"
@@ -308,6 +312,14 @@ class ZY00Admin(admin.ModelAdmin):
             'user'
         )
 
+    def get_search_results(self, request, queryset, search_term):
+        """Ajoute la recherche indexée (nom, prénoms sans accents) aux search_fields"""
+        resultats, doublons = super().get_search_results(request, queryset, search_term)
+        if search_term:
+            employes = RechercheEmployeService.rechercher(search_term, queryset).order_by().values('pk')
+            resultats = resultats | queryset.filter(pk__in=employes)
+        return resultats, doublons
+
     def save_model(self, request, obj, form, change):
         """Logique supplémentaire lors de la sauvegarde"""
         if not change:  # Nouvel employé
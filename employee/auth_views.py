@@ -15,12 +15,11 @@ from .models import UserSecurity
 from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db.models import Q, Count, Sum
+from django.db.models import Sum
 from django.utils import timezone
-from datetime import timedelta
 from employee.models import ZY00, ZYCO
 from absence.models import Absence, AcquisitionConges
-from departement.models import ZDDE
+from employee.views_modules.dashboard_views import statistiques_dashboard
 
 # Configuration du logger
 logger = logging.getLogger(__name__)
@@ -305,119 +304,8 @@ def dashboard_view(request):
         # ========================================
 
         if est_admin:
-            # Total employés
-            total_employes = ZY00.objects.count()
-
-            # Employés actifs
-            employes_actifs = ZY00.objects.filter(etat='actif').count()
-
-            # Employés en attente
-            employes_attente = ZY00.objects.filter(
-                Q(etat='en_attente') | Q(etat='nouveau')
-            ).count()
-
-            # Contrats actifs (tous les employés)
-            contrats_actifs = ZYCO.objects.filter(
-                Q(date_fin__gte=date_actuelle) | Q(date_fin__isnull=True),
-                actif=True
-            ).count()
-
-            # Nouveaux employés (30 derniers jours)
-            date_limite = date_actuelle - timedelta(days=30)
-
-            embauches_attente = ZY00.objects.filter(
-                etat='en_attente',
-                date_entree_entreprise__gte=date_limite
-            ).select_related('entreprise').order_by('-date_entree_entreprise')[:5]
-
-            dernieres_embauches = ZY00.objects.filter(
-                etat='actif',
-                date_entree_entreprise__gte=date_limite
-            ).select_related('entreprise').order_by('-date_entree_entreprise')[:5]
-
-            # Absences en attente de validation (tous les employés)
-            absences_attente_manager = Absence.objects.filter(
-                statut='EN_ATTENTE_MANAGER'
-            ).count()
-
-            absences_attente_rh = Absence.objects.filter(
-                statut='EN_ATTENTE_RH'
-            ).count()
-
-            absences_total_attente = absences_attente_manager + absences_attente_rh
-
-            # Absences du mois en cours (tous les employés)
-            premier_jour_mois = date_actuelle.replace(day=1)
-            absences_mois = Absence.objects.filter(
-                date_debut__gte=premier_jour_mois,
-                statut='VALIDE'
-            ).count()
-
-            # Départements
-            total_departements = ZDDE.objects.filter(STATUT=True).count()
-
-            try:
-                departements_effectifs = ZDDE.objects.filter(STATUT=True).annotate(
-                    effectif=Count('postes__affectations', filter=Q(
-                        postes__affectations__date_fin__isnull=True,
-                        postes__affectations__employe__etat='actif'
-                    ))
-                ).order_by('-effectif')[:5]
-            except Exception:
-                departements_effectifs = ZDDE.objects.filter(STATUT=True).order_by('CODE')[:5]
-
-            # Anniversaires de travail
-            mois_actuel = date_actuelle.month
-            try:
-                anniversaires = ZY00.objects.filter(
-                    etat='actif',
-                    date_entree_entreprise__month=mois_actuel
-                ).exclude(
-                    date_entree_entreprise__year=date_actuelle.year
-                ).select_related('entreprise').order_by('date_entree_entreprise')[:10]
-            except Exception:
-                anniversaires = []
-
-            # Contrats arrivant à échéance
-            date_limite_contrat = date_actuelle + timedelta(days=60)
-            try:
-                contrats_echeance = ZYCO.objects.filter(
-                    date_fin__gte=date_actuelle,
-                    date_fin__lte=date_limite_contrat,
-                    actif=True
-                ).select_related('employe', 'employe__entreprise').order_by('date_fin')[:5]
-            except Exception:
-                contrats_echeance = []
-
-            # Soldes de congés faibles
-            try:
-                soldes_faibles = AcquisitionConges.objects.filter(
-                    annee_reference=annee_acquisition,
-                    jours_restants__lte=5,
-                    jours_restants__gt=0,
-                    employe__etat='actif'
-                ).select_related('employe').order_by('jours_restants')[:5]
-            except Exception:
-                soldes_faibles = []
-
-            # Ajouter les données admin au context
-            context.update({
-                'total_employes': total_employes,
-                'employes_actifs': employes_actifs,
-                'employes_attente': employes_attente,
-                'contrats_actifs': contrats_actifs,
-                'embauches_attente': embauches_attente,
-                'dernieres_embauches': dernieres_embauches,
-                'absences_total_attente': absences_total_attente,
-                'absences_attente_manager': absences_attente_manager,
-                'absences_attente_rh': absences_attente_rh,
-                'absences_mois': absences_mois,
-                'total_departements': total_departements,
-                'departements_effectifs': departements_effectifs,
-                'anniversaires': anniversaires,
-                'contrats_echeance': contrats_echeance,
-                'soldes_faibles': soldes_faibles,
-            })
+            # Effectifs (instantané invalidé par événements), absences et alertes
+            context.update(statistiques_dashboard(date_actuelle))
 
         return render(request, 'home.html', context)
 
@@ -1,8 +1,20 @@
 # employee/management/commands/check_contrats_expires.py
-
+"""
+Commande Django de désactivation des contrats expirés.
+
+Tous les contrats actifs échus sont désactivés en un seul balayage (voir
+ExpirationContratsService), ainsi que les employés qui n'ont plus de contrat
+en cours ; les notifications sont envoyées en tâche de fond.
+À planifier quotidiennement (cron / systemd timer).
+
+Usage:
+    python manage.py check_contrats_expires
+    python manage.py check_contrats_expires --dry-run
+    python manage.py check_contrats_expires --sans-notification
+"""
 from django.core.management.base import BaseCommand
-from django.utils import timezone
-from employee.models import ZY00, ZYCO
+
+from employee.services.expiration_service import ExpirationContratsService
 
 
 class Command(BaseCommand):
@@ -14,57 +26,46 @@ class Command(BaseCommand):
             action='store_true',
             help='Afficher les employés qui seraient désactivés sans les modifier',
         )
+        parser.add_argument(
+            '--sans-notification',
+            action='store_true',
+            help='Ne pas envoyer les emails de notification',
+        )
 
     def handle(self, *args, **options):
-        date_actuelle = timezone.now().date()
         dry_run = options['dry_run']
 
-        # Récupérer les contrats expirés
-        contrats_expires = ZYCO.objects.filter(
-            date_fin__lt=date_actuelle,
-            actif=True,
-            employe__etat='actif'
-        ).select_related('employe')
-
-        total = contrats_expires.count()
+        resultat = ExpirationContratsService.balayer(
+            dry_run=dry_run,
+            notifier=not options['sans_notification']
+        )
 
-        if total == 0:
+        if not resultat['contrats']:
             self.stdout.write(self.style.SUCCESS('✅ Aucun contrat expiré trouvé'))
             return
 
         if dry_run:
-            self.stdout.write(self.style.WARNING(f'🔍 MODE DRY-RUN : {total} contrat(s) expiré(s) trouvé(s)'))
-
-        desactives = 0
-
-        for contrat in contrats_expires:
-            employe = contrat.employe
+            self.stdout.write(self.style.WARNING(
+                f"🔍 MODE DRY-RUN : {resultat['contrats']} contrat(s) expiré(s) trouvé(s)"
+            ))
 
+        for detail in resultat['details']:
             self.stdout.write(
-                f"⚠️  Contrat expiré : {employe.matricule} - {employe.nom} {employe.prenoms} "
-                f"(Fin: {contrat.date_fin.strftime('%d/%m/%Y')})"
+                f"⚠️  Contrat expiré : {detail['matricule']} - {detail['employe']} "
+                f"(Fin: {detail['date_fin'].strftime('%d/%m/%Y')})"
+                f"{'' if detail['employe_desactive'] else ' — employé maintenu (autre contrat en cours)'}"
             )
 
-            if not dry_run:
-                # Désactiver l'employé
-                employe.etat = 'inactif'
-                employe.save(update_fields=['etat'])
-
-                # Désactiver le contrat
-                contrat.actif = False
-                contrat.save(update_fields=['actif'])
-
-                desactives += 1
-
         if dry_run:
-            self.stdout.write(
-                self.style.WARNING(
-                    f'🔍 DRY-RUN : {total} employé(s) seraient désactivé(s)'
-                )
-            )
+            self.stdout.write(self.style.WARNING(
+                f"🔍 DRY-RUN : {resultat['employes_desactives']} employé(s) seraient désactivé(s), "
+                f"{resultat['emails']} email(s) seraient envoyé(s)"
+            ))
         else:
-            self.stdout.write(
-                self.style.SUCCESS(
-                    f'✅ {desactives} employé(s) désactivé(s) pour cause de contrat expiré'
-                )
-            )
\ No newline at end of file
+            self.stdout.write(self.style.SUCCESS(
+                f"✅ {resultat['contrats']} contrat(s) et {resultat['employes_desactives']} employé(s) "
+                f"désactivé(s) pour cause de contrat expiré, {resultat['emails']} email(s) en file"
+            ))
+        self.stdout.write("  Durées : " + ", ".join(
+            f"{phase} {duree:.2f}s" for phase, duree in resultat['durees'].items()
+        ))
@@ -0,0 +1,82 @@
+# employee/management/commands/generer_miniatures_photos.py
+"""
+Génère les miniatures des photos existantes (photos téléversées avant
+l'introduction des miniatures, ou miniatures supprimées du stockage).
+
+Usage:
+    python manage.py generer_miniatures_photos
+    python manage.py generer_miniatures_photos --dry-run
+    python manage.py generer_miniatures_photos --matricule MT000012
+"""
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from employee.models import ZY00
+from employee.services.photo_service import PhotoService
+
+
+class Command(BaseCommand):
+    help = 'Génère les miniatures (WebP/JPEG) des photos de profil existantes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help="Liste les photos à traiter sans rien écrire"
+        )
+        parser.add_argument(
+            '--matricule',
+            action='append',
+            dest='matricules',
+            help="Limite le traitement à cet employé (option répétable)"
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        self._log_header(dry_run)
+
+        employes = ZY00.objects.exclude(photo='').exclude(photo__isnull=True)
+        if options['matricules']:
+            employes = employes.filter(matricule__in=options['matricules'])
+
+        traitees = manquantes = illisibles = 0
+        for matricule, photo, empreinte in employes.values_list('matricule', 'photo', 'photo_empreinte').iterator():
+            if not default_storage.exists(photo):
+                manquantes += 1
+                self.stdout.write(self.style.WARNING(f"  {matricule} : fichier absent ({photo})"))
+                continue
+
+            if dry_run:
+                self.stdout.write(f"  {matricule} : {photo}")
+                traitees += 1
+                continue
+
+            with default_storage.open(photo, 'rb') as fichier:
+                contenu = fichier.read()
+            nouvelle_empreinte = PhotoService.generer_miniatures(matricule, contenu)
+            if not nouvelle_empreinte:
+                illisibles += 1
+                continue
+
+            if nouvelle_empreinte != empreinte:
+                # update() : pas de save() complet (full_clean, signaux, historique)
+                ZY00.objects.filter(matricule=matricule).update(photo_empreinte=nouvelle_empreinte)
+            PhotoService.nettoyer(matricule)
+            traitees += 1
+
+        self.stdout.write(f"\n  Photos traitées    : {traitees}")
+        self.stdout.write(f"  Fichiers absents   : {manquantes}")
+        self.stdout.write(f"  Photos illisibles  : {illisibles}")
+        self.stdout.write(f"{'='*60}\n")
+
+    def _log_header(self, dry_run):
+        """Affiche l'en-tête."""
+        self.stdout.write(f"\n{'='*60}")
+        self.stdout.write(
+            f"  MINIATURES DES PHOTOS - {timezone.now().strftime('%d/%m/%Y %H:%M:%S')}"
+        )
+        self.stdout.write(f"{'='*60}")
+        if dry_run:
+            self.stdout.write("  Mode     : simulation (aucune écriture)")
+        self.stdout.write("")
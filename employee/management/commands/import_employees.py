@@ -83,6 +83,17 @@ class Command(BaseCommand):
             type=int,
             help='Limite le nombre de lignes à traiter par feuille'
         )
+        parser.add_argument(
+            '--bulk',
+            action='store_true',
+            help='Import en masse (lecture unique, validation vectorisée, écritures groupées)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Taille des lots d\'écriture en mode --bulk (défaut: 1000)'
+        )
 
     def handle(self, *args, **options):
         """Gestion principale de la commande"""
@@ -97,6 +108,8 @@ class Command(BaseCommand):
         self.create_users = options['create_users']
         self.report_file = options.get('report_file')
         self.limit = options.get('limit')
+        self.bulk = options.get('bulk')
+        self.batch_size = options.get('batch_size')
 
         # Initialisation
         self.validation_errors = []
@@ -129,6 +142,10 @@ class Command(BaseCommand):
         self.stdout.write(self.style.HTTP_INFO("IMPORTATION DES DONNÉES EMPLOYÉS - MODE DÉTAILLÉ"))
         self.stdout.write(self.style.HTTP_INFO("=" * 80))
 
+        if self.bulk:
+            self.handle_bulk()
+            return
+
         try:
             # 1. Charger les données
             self.load_excel_data()
@@ -612,6 +629,54 @@ class Command(BaseCommand):
 
         self.stdout.write(f"    ✅ SERAIT IMPORTÉ DANS {model_name}")
 
+    def handle_bulk(self):
+        """Importation en masse via ImportMasseService"""
+        from employee.services import ImportMasseService
+
+        self.stdout.write(self.style.WARNING(
+            f"\n⚡ MODE MASSE - lots de {self.batch_size} ligne(s)"
+            f"{' (simulation, transaction annulée)' if self.dry_run else ''}"
+        ))
+
+        service = ImportMasseService(
+            self.file_path,
+            dry_run=self.dry_run,
+            feuille=self.specific_sheet,
+            ignore_missing=self.ignore_missing,
+            create_users=self.create_users,
+            limit=self.limit,
+            batch_size=self.batch_size,
+            ecrire=self.stdout.write,
+        )
+
+        try:
+            resultat = service.executer()
+        except FileNotFoundError:
+            error_msg = f"Fichier non trouvé: {self.file_path}"
+            self.detailed_report['specific_errors'].append({'error': error_msg, 'type': 'file_not_found'})
+            self.stdout.write(self.style.ERROR(f"❌ {error_msg}"))
+            self.generate_detailed_report()
+            return
+
+        self.import_stats = resultat['stats']
+        self.detailed_report['users_created'] = resultat['utilisateurs_crees']
+        self.detailed_report['warnings'].extend(resultat['avertissements'])
+        self.validation_warnings.extend(resultat['avertissements'])
+        for erreur in resultat['erreurs']:
+            self.detailed_report['specific_errors'].append({
+                'type': 'bulk_skipped' if erreur['skipped'] else 'bulk_validation',
+                'details': erreur,
+            })
+            if not erreur['skipped']:
+                self.validation_errors.append(
+                    f"{erreur['model']} ligne {erreur['line']} ({erreur['identifier']}): {erreur['error']}"
+                )
+
+        self.print_validation_summary()
+        self.stdout.write(f"\n⏱️ Durée: {resultat['duree']:.2f}s")
+        self.print_statistics()
+        self.generate_detailed_report()
+
     def import_sheet_detailed(self, sheet_name: str):
         """Importe une feuille avec détails"""
         df = self.dataframes.get(sheet_name)
@@ -1965,6 +2030,9 @@ class Command(BaseCommand):
 # Voir les données sans limite
 #python manage.py import_employees --dry-run --show-data
 
+# Import en masse (gros volumes)
+#python manage.py import_employees --bulk --batch-size=2000 --report-file="import_masse"
+
 # Une feuille spécifique
 #python manage.py import_employees --sheet="ZYFA_Famille" --report-file="contrats_only"
 
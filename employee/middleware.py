@@ -142,13 +142,18 @@ class ContratExpirationMiddleware:
                 if contrat_actif:
                     # Vérifier si le contrat est expiré
                     if contrat_actif.date_fin and contrat_actif.date_fin < date_actuelle:
-                        # Bloquer l'employé automatiquement
-                        employe.etat = 'inactif'
-                        employe.save(update_fields=['etat'])
-
-                        # Désactiver le contrat
-                        contrat_actif.actif = False
-                        contrat_actif.save(update_fields=['actif'])
+                        # Désactiver les contrats expirés de l'employé (et l'employé
+                        # s'il n'a plus de contrat en cours), comme le balayage quotidien ;
+                        # les notifications restent au balayage quotidien
+                        from employee.services.expiration_service import ExpirationContratsService
+                        resultat = ExpirationContratsService.balayer(
+                            date_reference=date_actuelle,
+                            matricules=[employe.matricule],
+                            notifier=False,
+                            utilisateur=request.user
+                        )
+                        if not resultat['employes_desactives']:
+                            return self.get_response(request)
 
                         # Déconnecter l'utilisateur
                         logout(request)
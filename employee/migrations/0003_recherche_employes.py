@@ -0,0 +1,51 @@
+# Generated by Django 5.0.6 on 2026-10-19 03:40
+
+from django.db import migrations
+
+# Expression identique à employee.services.recherche_service.TexteRecherche
+EXPRESSION = (
+    "immutable_unaccent(lower("
+    "\"matricule\" || ' ' || \"nom\" || ' ' || \"prenoms\" || ' ' || \"username\" || ' ' || \"prenomuser\""
+    "))"
+)
+
+SQL_INSTALLATION = [
+    'CREATE EXTENSION IF NOT EXISTS unaccent',
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    # unaccent() n'est pas IMMUTABLE : enveloppe utilisable dans un index
+    "CREATE OR REPLACE FUNCTION immutable_unaccent(text) RETURNS text AS "
+    "$$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$ "
+    "LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT",
+    f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "ZY00_recherche_trgm_idx" ON "ZY00" '
+    f'USING GIN (({EXPRESSION}) gin_trgm_ops)',
+]
+
+SQL_SUPPRESSION = [
+    'DROP INDEX CONCURRENTLY IF EXISTS "ZY00_recherche_trgm_idx"',
+    'DROP FUNCTION IF EXISTS immutable_unaccent(text)',
+]
+
+
+def executer(instructions):
+    def operation(apps, schema_editor):
+        """Index trigramme de recherche des employés (PostgreSQL uniquement)."""
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        with schema_editor.connection.cursor() as cursor:
+            for sql in instructions:
+                cursor.execute(sql)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY ne peut pas s'exécuter dans une transaction
+    atomic = False
+
+    dependencies = [
+        ('employee', '0002_alter_zyre_unique_together'),
+    ]
+
+    operations = [
+        migrations.RunPython(executer(SQL_INSTALLATION), executer(SQL_SUPPRESSION)),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-19 03:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0003_recherche_employes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='zy00',
+            name='photo_empreinte',
+            field=models.CharField(blank=True, editable=False, max_length=16, verbose_name='Empreinte de la photo'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.0.6 on 2026-10-19 04:05
+
+from django.db import migrations
+
+TABLES = ('ZYCO', 'ZYAF')
+
+# Période d'un contrat ou d'une affectation, identique à core.chevauchement.periode_colonnes
+PERIODE = 'daterange(LEAST("date_debut", COALESCE("date_fin", "date_debut")), "date_fin", \'[]\')'
+
+
+def installer_index(apps, schema_editor):
+    """Index GiST (employé, période) des contrats et affectations (PostgreSQL uniquement)."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        # btree_gist : égalité sur l'employé dans un index GiST
+        cursor.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+        for table in TABLES:
+            cursor.execute(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{table}_periode_gist" ON "{table}" '
+                f'USING GIST ("employe_id", ({PERIODE}))'
+            )
+
+
+def supprimer_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for table in TABLES:
+            cursor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{table}_periode_gist"')
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY ne peut pas s'exécuter dans une transaction
+    atomic = False
+
+    dependencies = [
+        ('employee', '0004_photo_empreinte'),
+    ]
+
+    operations = [
+        migrations.RunPython(installer_index, supprimer_index),
+    ]
@@ -160,6 +160,13 @@ class ZY00(models.Model):
         verbose_name="Photo de profil",
         help_text="Photo de profil de l'employé (formats acceptés: JPG, PNG)"
     )
+    # Empreinte du contenu de la photo : nomme ses miniatures (voir PhotoService)
+    photo_empreinte = models.CharField(
+        max_length=16,
+        blank=True,
+        editable=False,
+        verbose_name="Empreinte de la photo"
+    )
 
     situation_familiale = models.CharField(
         max_length=20,
@@ -298,17 +305,6 @@ class ZY00(models.Model):
 
     def save(self, *args, **kwargs):
         """Générer automatiquement le matricule lors de la création"""
-        # 🆕 SUPPRIMER L'ANCIENNE PHOTO SI UNE NOUVELLE EST UPLOADÉE
-        if self.pk:
-            try:
-                old_instance = ZY00.objects.get(pk=self.pk)
-                if old_instance.photo and old_instance.photo != self.photo:
-                    # Supprimer l'ancien fichier
-                    if os.path.isfile(old_instance.photo.path):
-                        os.remove(old_instance.photo.path)
-            except ZY00.DoesNotExist:
-                pass
-
         if not self.matricule:
             # Récupérer le dernier matricule
             last_employee = ZY00.objects.all().order_by('matricule').last()
@@ -326,8 +322,42 @@ class ZY00(models.Model):
             self.prenomuser = self.prenoms
 
         self.full_clean()
+
+        from employee.services.photo_service import PhotoService
+
+        # Nouvelle photo téléversée : empreinte du contenu pour nommer les miniatures
+        contenu_photo = None
+        if self.photo and not self.photo._committed:
+            contenu_photo = PhotoService.lire(self.photo)
+            self.photo_empreinte = PhotoService.empreinte(contenu_photo)
+        elif not self.photo:
+            self.photo_empreinte = ''
+
         super().save(*args, **kwargs)
 
+        if contenu_photo is not None and not PhotoService.generer_miniatures(
+                self.matricule, contenu_photo, self.photo_empreinte):
+            # Image illisible : pas de miniatures, les gabarits gardent l'URL de la photo
+            self.photo_empreinte = ''
+            ZY00.objects.filter(pk=self.pk).update(photo_empreinte='')
+
+        # Photo remplacée ou retirée : suppression différée de l'ancienne et de ses miniatures
+        photo_initiale = getattr(self, '_photo_initiale', '')
+        if photo_initiale and photo_initiale != self.photo.name:
+            PhotoService.planifier_nettoyage(
+                self.matricule, [photo_initiale], [getattr(self, '_empreinte_initiale', '')]
+            )
+        self._photo_initiale = self.photo.name or ''
+        self._empreinte_initiale = self.photo_empreinte
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Mémorise la photo chargée pour détecter son remplacement sans requête"""
+        instance = super().from_db(db, field_names, values)
+        instance._photo_initiale = instance.__dict__.get('photo') or ''
+        instance._empreinte_initiale = instance.__dict__.get('photo_empreinte') or ''
+        return instance
+
     @property
     def est_actif(self):
         """Calcule dynamiquement si l'employé est actif basé sur les contrats."""
@@ -421,6 +451,16 @@ class ZY00(models.Model):
         from employee.services.hierarchy_service import HierarchyService
         return HierarchyService.get_manager_of_employee(self)
 
+    def get_avatar_url(self):
+        """URL de la miniature de la photo (listes, en-tête) ou de la photo par défaut"""
+        from employee.services.photo_service import PhotoService
+        return PhotoService.url_miniature(self, 'avatar') or self.get_photo_url()
+
+    def get_carte_url(self):
+        """URL de la miniature moyenne (fiches, organigrammes)"""
+        from employee.services.photo_service import PhotoService
+        return PhotoService.url_miniature(self, 'carte') or self.get_photo_url()
+
     def get_photo_url(self):
         """Retourne l'URL de la photo ou une photo par défaut"""
         if self.photo and hasattr(self.photo, 'url'):
@@ -9,6 +9,11 @@ from .hierarchy_service import HierarchyService
 from .status_service import StatusService
 from .validation_service import ValidationService
 from .embauche_service import EmbaucheService
+from .import_masse_service import ImportMasseService
+from .recherche_service import RechercheEmployeService
+from .photo_service import PhotoService
+from .effectifs_service import EffectifsService
+from .expiration_service import ExpirationContratsService
 
 __all__ = [
     'PermissionService',
@@ -16,4 +21,9 @@ __all__ = [
     'StatusService',
     'ValidationService',
     'EmbaucheService',
+    'ImportMasseService',
+    'RechercheEmployeService',
+    'PhotoService',
+    'EffectifsService',
+    'ExpirationContratsService',
 ]
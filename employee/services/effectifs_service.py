@@ -0,0 +1,163 @@
+"""
+Instantané des effectifs pour les tableaux de bord.
+
+L'instantané regroupe les effectifs actifs par département et par poste,
+les embauches en attente et les contrats arrivant à échéance. Il est
+découpé en segments, chacun étant une famille de cache (core.cache)
+invalidée par ses seuls modèles sources :
+
+- 'employes'  : compteurs d'employés, embauches (ZY00) ;
+- 'effectifs' : effectifs par département et par poste (ZY00, ZYAF, ZDDE, ZDPO) ;
+- 'contrats'  : contrats actifs et échéances (ZY00, ZYCO).
+
+La clé contient aussi la date du jour (fenêtres de 30 et 60 jours).
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from core.cache import FamilleCache, invalider_apres_commit
+
+SEGMENTS = {
+    'employes': FamilleCache('employee.effectifs.employes', tags=['employee.zy00']),
+    'effectifs': FamilleCache('employee.effectifs.effectifs', tags=[
+        'employee.zy00', 'employee.zyaf', 'departement.zdde', 'departement.zdpo',
+    ]),
+    'contrats': FamilleCache('employee.effectifs.contrats', tags=['employee.zy00', 'employee.zyco']),
+}
+
+JOURS_EMBAUCHES = 30
+JOURS_ECHEANCE_CONTRATS = 60
+TAILLE_LISTES = 5
+
+
+class EffectifsService:
+    """Service pour l'instantané des effectifs (tableaux de bord)"""
+
+    @staticmethod
+    def invalider():
+        """
+        Invalide l'instantané après validation de la transaction en cours,
+        pour les écritures qui ne déclenchent pas de signal (update(), lots).
+        """
+        invalider_apres_commit('employee.zy00', 'employee.zyaf', 'employee.zyco')
+
+    @staticmethod
+    def instantane(date_actuelle=None):
+        """
+        Instantané complet des effectifs.
+
+        Returns:
+            dict: compteurs, listes (dicts) et effectifs par département/poste
+        """
+        date_actuelle = date_actuelle or timezone.now().date()
+        donnees = {}
+        for segment in SEGMENTS:
+            donnees.update(EffectifsService._segment(segment, date_actuelle))
+        return donnees
+
+    @staticmethod
+    def effectif_poste(poste_id, date_actuelle=None):
+        """Effectif actif d'un poste"""
+        date_actuelle = date_actuelle or timezone.now().date()
+        return EffectifsService._segment('effectifs', date_actuelle)['effectifs_postes'].get(poste_id, 0)
+
+    @staticmethod
+    def _segment(segment, date_actuelle):
+        calcul = getattr(EffectifsService, f'_calculer_{segment}')
+        return SEGMENTS[segment].obtenir(lambda: calcul(date_actuelle), date_actuelle.isoformat())
+
+    # ------------------------------------------------------------------
+    # Calcul des segments
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _embauches(employes):
+        return [
+            {
+                'uuid': e.uuid,
+                'matricule': e.matricule,
+                'nom': e.nom,
+                'prenoms': e.prenoms,
+                'date_entree_entreprise': e.date_entree_entreprise,
+            }
+            for e in employes.only(
+                'uuid', 'matricule', 'nom', 'prenoms', 'date_entree_entreprise'
+            ).order_by('-date_entree_entreprise')[:TAILLE_LISTES]
+        ]
+
+    @staticmethod
+    def _calculer_employes(date_actuelle):
+        from employee.models import ZY00
+
+        compteurs = ZY00.objects.aggregate(
+            total_employes=Count('pk'),
+            employes_actifs=Count('pk', filter=Q(etat='actif')),
+            # Embauches en attente : dossiers de pré-embauche non encore validés
+            employes_attente=Count('pk', filter=Q(type_dossier='PRE')),
+        )
+        date_limite = date_actuelle - timedelta(days=JOURS_EMBAUCHES)
+        return {
+            **compteurs,
+            'embauches_attente': EffectifsService._embauches(ZY00.objects.filter(type_dossier='PRE')),
+            'dernieres_embauches': EffectifsService._embauches(
+                ZY00.objects.filter(type_dossier='SAL', etat='actif', date_entree_entreprise__gte=date_limite)
+            ),
+        }
+
+    @staticmethod
+    def _calculer_effectifs(date_actuelle):
+        from departement.models import ZDDE
+        from employee.models import ZYAF
+
+        effectifs_postes = {}
+        effectifs_departements = defaultdict(int)
+        lignes = ZYAF.objects.filter(
+            date_fin__isnull=True, employe__etat='actif'
+        ).values('poste_id', 'poste__DEPARTEMENT_id').annotate(effectif=Count('pk'))
+        for ligne in lignes:
+            effectifs_postes[ligne['poste_id']] = ligne['effectif']
+            effectifs_departements[ligne['poste__DEPARTEMENT_id']] += ligne['effectif']
+
+        departements = [
+            {**departement, 'effectif': effectifs_departements.get(departement['pk'], 0)}
+            for departement in ZDDE.objects.filter(STATUT=True).values('pk', 'CODE', 'LIBELLE')
+        ]
+        departements.sort(key=lambda d: (-d['effectif'], d['CODE']))
+        return {
+            'total_departements': len(departements),
+            'departements_effectifs': departements,
+            'effectifs_postes': effectifs_postes,
+        }
+
+    @staticmethod
+    def _calculer_contrats(date_actuelle):
+        from employee.models import ZYCO
+
+        date_limite = date_actuelle + timedelta(days=JOURS_ECHEANCE_CONTRATS)
+        compteurs = ZYCO.objects.filter(actif=True).aggregate(
+            contrats_actifs=Count('pk', filter=Q(date_fin__gte=date_actuelle) | Q(date_fin__isnull=True)),
+            contrats_echeance_total=Count('pk', filter=Q(date_fin__gte=date_actuelle, date_fin__lte=date_limite)),
+        )
+        echeances = ZYCO.objects.filter(
+            actif=True, date_fin__gte=date_actuelle, date_fin__lte=date_limite
+        ).select_related('employe').order_by('date_fin')[:TAILLE_LISTES]
+        return {
+            **compteurs,
+            'contrats_echeance': [
+                {
+                    'employe': {
+                        'uuid': contrat.employe.uuid,
+                        'matricule': contrat.employe.matricule,
+                        'nom': contrat.employe.nom,
+                        'prenoms': contrat.employe.prenoms,
+                    },
+                    'type_contrat': contrat.type_contrat,
+                    'type_contrat_libelle': contrat.get_type_contrat_display(),
+                    'date_fin': contrat.date_fin,
+                }
+                for contrat in echeances
+            ],
+        }
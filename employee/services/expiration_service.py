@@ -0,0 +1,234 @@
+# employee/services/expiration_service.py
+"""
+Balayage quotidien des contrats expirés.
+
+Remplace la désactivation employé par employé (save() et signaux d'audit
+pour chaque contrat) de `check_contrats_expires` et du middleware :
+
+1. chargement : tous les contrats actifs dont la date de fin est dépassée,
+   en une requête (avec les employés et leurs adresses email) ;
+2. écriture, dans une transaction : un UPDATE désactive les contrats, un
+   UPDATE passe à 'inactif' les employés concernés qui n'ont plus aucun
+   contrat en cours, hors pré-embauches (StatusService.synchronize_status),
+   puis une entrée d'audit récapitulative ;
+3. notification : les emails (employés désactivés, récapitulatif RH) sont
+   mis en file en une seule tâche de fond après validation de la
+   transaction, envoyés sur une seule connexion SMTP.
+
+Les UPDATE n'émettent pas de signal : les caches des employés et des
+contrats sont invalidés explicitement.
+"""
+import logging
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+PHASES = ('chargement', 'ecriture', 'notification')
+
+
+class ExpirationContratsService:
+    """Service de désactivation en masse des contrats expirés."""
+
+    @staticmethod
+    def contrats_expires(date_reference=None, matricules=None):
+        """
+        Contrats actifs dont la date de fin est antérieure à la date de référence.
+
+        Args:
+            date_reference: Date du balayage (défaut : aujourd'hui)
+            matricules: Employés concernés (défaut : tous)
+
+        Returns:
+            QuerySet[ZYCO]
+        """
+        from employee.models import ZYCO
+
+        contrats = ZYCO.objects.filter(
+            actif=True,
+            date_fin__lt=date_reference or timezone.now().date()
+        )
+        if matricules is not None:
+            contrats = contrats.filter(employe_id__in=matricules)
+        return contrats
+
+    @staticmethod
+    def balayer(date_reference=None, dry_run=False, matricules=None, notifier=True, utilisateur=None):
+        """
+        Désactive les contrats expirés et les employés qui n'ont plus de contrat actif.
+
+        Args:
+            date_reference: Date du balayage (défaut : aujourd'hui)
+            dry_run: Compte sans rien modifier
+            matricules: Employés concernés (défaut : tous)
+            notifier: Met en file les emails de notification
+            utilisateur: Utilisateur Django de l'entrée d'audit
+
+        Returns:
+            dict: compteurs, détail des contrats et durées par phase (secondes)
+        """
+        from core.models import ZDLOG
+        from employee.models import ZY00, ZYCO
+
+        date_reference = date_reference or timezone.now().date()
+        resultat = {
+            'date': date_reference,
+            'dry_run': dry_run,
+            'contrats': 0,
+            'employes_desactives': 0,
+            'emails': 0,
+            'details': [],
+            'durees': dict.fromkeys(PHASES, 0.0),
+        }
+        durees = resultat['durees']
+
+        with transaction.atomic():
+            # 1. Chargement
+            debut = time.monotonic()
+            contrats = list(
+                ExpirationContratsService.contrats_expires(date_reference, matricules)
+                .select_for_update(of=('self',))
+                .order_by('employe_id', 'date_fin')
+                .values(
+                    'pk', 'employe_id', 'type_contrat', 'date_fin', 'employe__nom',
+                    'employe__prenoms', 'employe__user__email',
+                )
+            )
+            employes = {contrat['employe_id'] for contrat in contrats}
+
+            # Employés qui perdent leur dernier contrat en cours (les
+            # pré-embauches restent actifs, comme dans synchronize_status)
+            autre_contrat = ZYCO.objects.filter(
+                Q(date_fin__isnull=True) | Q(date_fin__gte=date_reference),
+                employe=OuterRef('pk'),
+                actif=True,
+            )
+            a_desactiver = ZY00.objects.filter(
+                matricule__in=employes, etat='actif'
+            ).exclude(Exists(autre_contrat)).exclude(type_dossier='PRE')
+            durees['chargement'] = time.monotonic() - debut
+
+            resultat['contrats'] = len(contrats)
+            if not contrats:
+                return ExpirationContratsService._terminer(resultat)
+
+            # 2. Écriture
+            debut = time.monotonic()
+            desactives = set(a_desactiver.values_list('matricule', flat=True))
+            if not dry_run:
+                ZYCO.objects.filter(pk__in=[contrat['pk'] for contrat in contrats]).update(actif=False)
+                ZY00.objects.filter(matricule__in=desactives).update(etat='inactif')
+
+            resultat['employes_desactives'] = len(desactives)
+            resultat['details'] = [
+                {
+                    'contrat': contrat['pk'],
+                    'matricule': contrat['employe_id'],
+                    'employe': f"{contrat['employe__nom']} {contrat['employe__prenoms']}",
+                    'type_contrat': contrat['type_contrat'],
+                    'date_fin': contrat['date_fin'],
+                    'employe_desactive': contrat['employe_id'] in desactives,
+                }
+                for contrat in contrats
+            ]
+
+            if not dry_run:
+                ZDLOG.log_action(
+                    table_name='ZYCO',
+                    record_id=f"EXPIRATION:{date_reference.isoformat()}",
+                    type_mouvement=ZDLOG.TYPE_MODIFICATION,
+                    user=utilisateur,
+                    ancienne_valeur={'actif': True, 'etat': 'actif'},
+                    nouvelle_valeur={
+                        'actif': False,
+                        'contrats': [contrat['pk'] for contrat in contrats],
+                        'employes_desactives': sorted(desactives),
+                    },
+                    description=(
+                        f"Expiration des contrats au {date_reference:%d/%m/%Y} : "
+                        f"{len(contrats)} contrat(s) désactivé(s), {len(desactives)} employé(s) désactivé(s)"
+                    )
+                )
+            durees['ecriture'] = time.monotonic() - debut
+
+            # 3. Notification (file de tâches, après validation de la transaction)
+            debut = time.monotonic()
+            messages = ExpirationContratsService._messages(contrats, desactives) if notifier else []
+            resultat['emails'] = sum(len(destinataires) for _, _, destinataires in messages)
+            if messages and not dry_run:
+                from core.taches import lancer
+                transaction.on_commit(lambda: lancer('employee.envoyer_emails', {'messages': messages}))
+            durees['notification'] = time.monotonic() - debut
+
+        if not dry_run:
+            # update() n'émet pas de signal
+            from employee.services.effectifs_service import EffectifsService
+            from employee.services.recherche_service import RechercheEmployeService
+            EffectifsService.invalider()
+            RechercheEmployeService.invalider()
+
+        return ExpirationContratsService._terminer(resultat)
+
+    @staticmethod
+    def _messages(contrats, desactives):
+        """
+        Emails du balayage : un par employé désactivé disposant d'une adresse,
+        un récapitulatif aux RH (DRH, ASSISTANT_RH).
+
+        Returns:
+            list: [sujet, corps, destinataires] (sérialisable pour la file de tâches)
+        """
+        from employee.models import ZY00
+
+        messages = []
+        for contrat in contrats:
+            email = contrat['employe__user__email']
+            if contrat['employe_id'] not in desactives or not email:
+                continue
+            messages.append([
+                "Expiration de votre contrat",
+                f"Bonjour {contrat['employe__prenoms']},\n\n"
+                f"Votre contrat ({contrat['type_contrat']}) a expiré le {contrat['date_fin']:%d/%m/%Y}. "
+                f"Votre accès à ONIAN-EasyM a été désactivé.\n\n"
+                f"Veuillez contacter le service RH.\n\n"
+                f"Cordialement,\nLe système ONIAN-EasyM",
+                [email],
+            ])
+
+        emails_rh = sorted(set(ZY00.objects.filter(
+            roles_attribues__role__CODE__in=['DRH', 'ASSISTANT_RH'],
+            roles_attribues__actif=True,
+            etat='actif',
+            user__email__gt='',
+        ).values_list('user__email', flat=True)))
+        if emails_rh:
+            lignes = "\n".join(
+                f"- {contrat['employe_id']} {contrat['employe__nom']} {contrat['employe__prenoms']} : "
+                f"{contrat['type_contrat']} échu le {contrat['date_fin']:%d/%m/%Y}"
+                f"{' (employé désactivé)' if contrat['employe_id'] in desactives else ''}"
+                for contrat in contrats
+            )
+            messages.append([
+                f"Contrats expirés : {len(contrats)} contrat(s) désactivé(s)",
+                f"Bonjour,\n\nLes contrats suivants ont expiré et ont été désactivés :\n\n{lignes}\n\n"
+                f"👉 {settings.SITE_URL}/employe/\n\n"
+                f"Cordialement,\nLe système ONIAN-EasyM",
+                emails_rh,
+            ])
+        return messages
+
+    @staticmethod
+    def _terminer(resultat):
+        resultat['durees'] = {phase: round(duree, 3) for phase, duree in resultat['durees'].items()}
+        logger.info(
+            "Balayage des contrats expirés au %s%s : %s contrat(s), %s employé(s) désactivé(s), "
+            "%s email(s) — %s",
+            resultat['date'], ' (simulation)' if resultat['dry_run'] else '', resultat['contrats'],
+            resultat['employes_desactives'], resultat['emails'],
+            ', '.join(f"{phase} {duree:.2f}s" for phase, duree in resultat['durees'].items())
+        )
+        return resultat
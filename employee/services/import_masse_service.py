@@ -0,0 +1,867 @@
+# employee/services/import_masse_service.py
+"""
+Service d'import en masse du classeur Excel des employés.
+
+Utilisé par `import_employees --bulk`. Contrairement à l'import détaillé
+(une requête par ligne), le moteur :
+- lit toutes les feuilles en une seule passe (pandas + openpyxl en lecture seule) ;
+- convertit et valide chaque colonne de façon vectorisée (formats de dates,
+  champs obligatoires, choix et longueurs déduits des modèles) ;
+- résout employés, entreprises, postes et rôles depuis des dictionnaires
+  chargés une fois ;
+- compare les lignes aux données existantes par clé naturelle puis écrit
+  par lots avec bulk_create / bulk_update (les lignes identiques ne sont
+  pas réécrites).
+
+Les écritures groupées ne passent ni par save() ni par les signaux :
+les effets de bord utiles (nom d'usage, état de l'employé, comptes
+utilisateurs, groupes Django, audit) sont appliqués explicitement en fin
+d'import. Les contrôles de chevauchement de périodes des méthodes clean()
+ne sont pas rejoués.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from decimal import Decimal
+
+import pandas as pd
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+TAILLE_LOT = 1000
+
+# Mot de passe initial des comptes créés (identique à l'import détaillé)
+MOT_DE_PASSE_DEFAUT = "Hronian2024!"
+DOMAINE_EMAIL_DEFAUT = "onian-easym.com"
+
+FORMATS_DATE = [
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d',
+    '%d/%m/%Y',
+    '%d-%m-%Y',
+    '%Y/%m/%d',
+]
+
+# Ordre d'import : les employés d'abord, les tables dépendantes ensuite
+ORDRE_FEUILLES = [
+    'ZY00_Employes',
+    'ZYNP_HistoriqueNoms',
+    'ZYCO_Contrats',
+    'ZYTE_Telephones',
+    'ZYME_Emails',
+    'ZYAF_Affectations',
+    'ZYAD_Adresses',
+    'ZYFA_Famille',
+    'ZYPP_PersonnesPrevenir',
+    'ZYIB_IdentiteBancaire',
+    'ZYRE_RolesEmployes',
+]
+
+# Description des feuilles :
+# - champs : {champ: (colonne Excel, conversion, valeur par défaut)}
+# - references : {champ: (colonne Excel, référentiel, action si code inconnu)}
+# - cle : clé naturelle utilisée pour distinguer création et mise à jour
+# - periodes : (début, fin, fin strictement postérieure)
+FEUILLES = {
+    'ZY00_Employes': {
+        'modele': 'ZY00',
+        'champs': {
+            'nom': ('Nom', 'majuscule', ''),
+            'prenoms': ('Prenoms', 'capitalise', ''),
+            'date_naissance': ('Date_naissance', 'date', None),
+            'sexe': ('Sexe', 'majuscule', ''),
+            'ville_naissance': ('Ville_naissance', 'capitalise', ''),
+            'pays_naissance': ('Pays_naissance', 'majuscule', ''),
+            'situation_familiale': ('Situation_familiale', 'texte', ''),
+            'type_id': ('Type_id', 'texte', ''),
+            'numero_id': ('Numero_id', 'texte', ''),
+            'date_validite_id': ('Date_validite_id', 'date', None),
+            'date_expiration_id': ('Date_expiration_id', 'date', None),
+            'type_dossier': ('Type_dossier', 'texte', 'PRE'),
+            'date_validation_embauche': ('Date_validation_embauche', 'date', None),
+            'etat': ('Etat', 'texte', 'actif'),
+            'username': ('Username', 'texte', ''),
+            'prenomuser': ('Prenomuser', 'texte', ''),
+            'date_entree_entreprise': ('Date_entree_entreprise', 'date', None),
+            'coefficient_temps_travail': ('Coefficient_temps_travail', 'decimal', '1'),
+        },
+        'references': {
+            'entreprise_id': ('Entreprise_CODE', 'entreprises', 'erreur'),
+        },
+        'cle': ['matricule'],
+        'periodes': [('date_validite_id', 'date_expiration_id', True)],
+    },
+    'ZYNP_HistoriqueNoms': {
+        'modele': 'ZYNP',
+        'champs': {
+            'nom': ('Nom', 'majuscule', ''),
+            'prenoms': ('Prenoms', 'capitalise', ''),
+            'date_debut_validite': ('Date_debut_validite', 'date', None),
+            'date_fin_validite': ('Date_fin_validite', 'date', None),
+            'actif': ('Actif', 'booleen', 'TRUE'),
+        },
+        'cle': ['employe_id', 'date_debut_validite'],
+        'periodes': [('date_debut_validite', 'date_fin_validite', True)],
+    },
+    'ZYCO_Contrats': {
+        'modele': 'ZYCO',
+        'champs': {
+            'type_contrat': ('Type_contrat', 'texte', ''),
+            'date_debut': ('Date_debut', 'date', None),
+            'date_fin': ('Date_fin', 'date', None),
+            'actif': ('Actif', 'booleen', 'TRUE'),
+        },
+        'cle': ['employe_id', 'type_contrat', 'date_debut'],
+        'periodes': [('date_debut', 'date_fin', False)],
+    },
+    'ZYTE_Telephones': {
+        'modele': 'ZYTE',
+        'champs': {
+            'numero': ('Numero', 'texte', ''),
+            'date_debut_validite': ('Date_debut_validite', 'date', None),
+            'date_fin_validite': ('Date_fin_validite', 'date', None),
+            'actif': ('Actif', 'booleen', 'TRUE'),
+        },
+        'cle': ['employe_id', 'numero', 'date_debut_validite'],
+    },
+    'ZYME_Emails': {
+        'modele': 'ZYME',
+        'champs': {
+            'email': ('Email', 'texte', ''),
+            'date_debut_validite': ('Date_debut_validite', 'date', None),
+            'date_fin_validite': ('Date_fin_validite', 'date', None),
+            'actif': ('Actif', 'booleen', 'TRUE'),
+        },
+        'cle': ['employe_id', 'email', 'date_debut_validite'],
+    },
+    'ZYAF_Affectations': {
+        'modele': 'ZYAF',
+        'champs': {
+            'date_debut': ('Date_debut', 'date', None),
+            'date_fin': ('Date_fin', 'date', None),
+            'actif': ('Actif', 'booleen', 'TRUE'),
+        },
+        'references': {
+            'poste_id': ('Poste_CODE', 'postes', 'ignorer'),
+        },
+        'cle': ['employe_id', 'poste_id', 'date_debut'],
+        'periodes': [('date_debut', 'date_fin', False)],
+    },
+    'ZYAD_Adresses': {
+        'modele': 'ZYAD',
+        'champs': {
+            'type_adresse': ('Type_adresse', 'texte', 'PRINCIPALE'),
+            'rue': ('Rue', 'texte', ''),
+            'complement': ('Complement', 'texte', ''),
+            'ville': ('Ville', 'titre', ''),
+            'pays': ('Pays', 'majuscule', ''),
+            'code_postal': ('Code_postal', 'texte', ''),
+            'date_debut': ('Date_debut', 'date', None),
+            'date_fin': ('Date_fin', 'date', None),
+            'actif': ('Actif', 'booleen', 'TRUE'),
+        },
+        'cle': ['employe_id', 'type_adresse', 'date_debut'],
+        'periodes': [('date_debut', 'date_fin', False)],
+    },
+    'ZYFA_Famille': {
+        'modele': 'ZYFA',
+        'champs': {
+            'personne_charge': ('Personne_charge', 'texte', ''),
+            'nom': ('Nom', 'majuscule', ''),
+            'prenom': ('Prenom', 'texte', ''),
+            'sexe': ('Sexe', 'majuscule', ''),
+            'date_naissance': ('Date_naissance', 'date', None),
+            'date_debut_prise_charge': ('Date_debut_prise_charge', 'date', None),
+            'date_fin_prise_charge': ('Date_fin_prise_charge', 'date', None),
+            'actif': ('Actif', 'booleen', 'TRUE'),
+        },
+        'cle': ['employe_id', 'nom', 'prenom', 'date_naissance'],
+        'periodes': [('date_debut_prise_charge', 'date_fin_prise_charge', True)],
+    },
+    'ZYPP_PersonnesPrevenir': {
+        'modele': 'ZYPP',
+        'champs': {
+            'nom': ('Nom', 'majuscule', ''),
+            'prenom': ('Prenom', 'texte', ''),
+            'lien_parente': ('Lien_parente', 'texte', ''),
+            'telephone_principal': ('Telephone_principal', 'texte', ''),
+            'telephone_secondaire': ('Telephone_secondaire', 'texte', ''),
+            'email': ('Email', 'texte', ''),
+            'adresse': ('Adresse', 'texte', ''),
+            'ordre_priorite': ('Ordre_priorite', 'entier', '1'),
+            'date_debut_validite': ('Date_debut_validite', 'date', None),
+            'date_fin_validite': ('Date_fin_validite', 'date', None),
+            'actif': ('Actif', 'booleen', 'TRUE'),
+        },
+        'cle': ['employe_id', 'nom', 'prenom', 'ordre_priorite'],
+        'periodes': [('date_debut_validite', 'date_fin_validite', True)],
+    },
+    'ZYIB_IdentiteBancaire': {
+        'modele': 'ZYIB',
+        'champs': {
+            'titulaire_compte': ('Titulaire_compte', 'majuscule', ''),
+            'nom_banque': ('Nom_banque', 'majuscule', ''),
+            'code_banque': ('Code_banque', 'texte', ''),
+            'code_guichet': ('Code_guichet', 'texte', ''),
+            'numero_compte': ('Numero_compte', 'texte', ''),
+            'cle_rib': ('Cle_rib', 'texte', ''),
+            'iban': ('IBAN', 'compact', ''),
+            'bic': ('BIC', 'compact', ''),
+            'type_compte': ('Type_compte', 'texte', 'COURANT'),
+            'domiciliation': ('Domiciliation', 'texte', ''),
+            'date_ouverture': ('Date_ouverture', 'date', None),
+            'actif': ('Actif', 'booleen', 'TRUE'),
+        },
+        # Une seule identité bancaire par employé (OneToOne)
+        'cle': ['employe_id'],
+    },
+    'ZYRE_RolesEmployes': {
+        'modele': 'ZYRE',
+        'champs': {
+            'date_debut': ('Date_debut', 'date', None),
+            'date_fin': ('Date_fin', 'date', None),
+            'actif': ('Actif', 'booleen', 'TRUE'),
+            'commentaire': ('Commentaire', 'texte', ''),
+        },
+        'references': {
+            'role_id': ('Role_CODE', 'roles', 'ignorer'),
+        },
+        'cle': ['employe_id', 'role_id', 'date_debut'],
+        'periodes': [('date_debut', 'date_fin', False)],
+    },
+}
+
+
+class ImportMasseService:
+    """
+    Moteur d'import en masse d'un classeur d'employés.
+
+    Utilisation:
+        service = ImportMasseService('salaires_template.xlsx', create_users=True)
+        resultat = service.executer()
+    """
+
+    def __init__(self, fichier, dry_run=False, feuille=None, ignore_missing=False,
+                 create_users=True, limit=None, batch_size=TAILLE_LOT,
+                 utilisateur=None, ecrire=None):
+        self.fichier = fichier
+        self.dry_run = dry_run
+        self.feuille = feuille
+        self.ignore_missing = ignore_missing
+        self.create_users = create_users
+        self.limit = limit
+        self.batch_size = batch_size or TAILLE_LOT
+        self.utilisateur = utilisateur
+        self.ecrire = ecrire or logger.info
+
+        self.stats = {'created': 0, 'updated': 0, 'skipped': 0, 'errors': 0, 'by_model': {}}
+        self.erreurs = []
+        self.avertissements = []
+        self.utilisateurs_crees = []
+        self.duree = 0.0
+
+        # Effets de bord à appliquer après l'écriture des feuilles
+        self._matricules_importes = set()
+        self._employes_contrats = set()
+        self._noms_usage = {}
+        self._roles = []
+
+    # ------------------------------------------------------------------
+    # Orchestration
+    # ------------------------------------------------------------------
+
+    def executer(self):
+        """
+        Lit le classeur, importe les feuilles dans l'ordre puis applique les
+        effets de bord. En simulation, tout est écrit puis annulé.
+
+        Returns:
+            dict: statistiques, erreurs, avertissements, utilisateurs créés et durée
+        """
+        debut = time.monotonic()
+        feuilles = self.lire_classeur()
+        self._charger_referentiels()
+
+        with transaction.atomic():
+            for nom_feuille in ORDRE_FEUILLES:
+                df = feuilles.get(nom_feuille)
+                if df is None or df.empty:
+                    continue
+                if self.limit:
+                    df = df.head(self.limit)
+                self._importer_feuille(nom_feuille, df)
+
+            self._appliquer_noms_usage()
+            self._synchroniser_etats()
+            if self.create_users:
+                self._creer_utilisateurs()
+            self._synchroniser_groupes()
+
+            if self.dry_run:
+                transaction.set_rollback(True)
+            else:
+                self._journaliser()
+
+        if not self.dry_run:
+            # Les insertions groupées ne déclenchent pas les signaux post_save
+            from employee.services.effectifs_service import EffectifsService
+            from employee.services.recherche_service import RechercheEmployeService
+            RechercheEmployeService.invalider()
+            EffectifsService.invalider()
+
+        self.duree = time.monotonic() - debut
+        return {
+            'stats': self.stats,
+            'erreurs': self.erreurs,
+            'avertissements': self.avertissements,
+            'utilisateurs_crees': self.utilisateurs_crees,
+            'duree': self.duree,
+        }
+
+    def lire_classeur(self):
+        """Lit toutes les feuilles connues en une seule ouverture du classeur"""
+        feuilles = pd.read_excel(
+            self.fichier,
+            sheet_name=self.feuille if self.feuille else None,
+            dtype=str,
+            engine='openpyxl'
+        )
+        if self.feuille:
+            feuilles = {self.feuille: feuilles}
+
+        for nom_feuille, df in feuilles.items():
+            df.columns = [str(colonne).strip() for colonne in df.columns]
+            if nom_feuille not in FEUILLES and nom_feuille != 'REGLES_VALIDATION':
+                self.ecrire(f"  ⚠️ Feuille {nom_feuille} non prise en charge en mode masse")
+        return feuilles
+
+    def _charger_referentiels(self):
+        """Charge en mémoire les correspondances code -> identifiant"""
+        from departement.models import ZDPO
+        from employee.models import ZY00, ZYRO
+        from entreprise.models import Entreprise
+
+        self.matricules = set(ZY00.objects.values_list('matricule', flat=True))
+        self.referentiels = {
+            'entreprises': {
+                code.upper(): pk for pk, code in Entreprise.objects.values_list('pk', 'code')
+            },
+            'postes': dict(ZDPO.objects.values_list('CODE', 'pk')),
+            'roles': dict(ZYRO.objects.filter(actif=True).values_list('CODE', 'pk')),
+        }
+
+    # ------------------------------------------------------------------
+    # Import d'une feuille
+    # ------------------------------------------------------------------
+
+    def _importer_feuille(self, nom_feuille, df):
+        """Convertit, valide, compare et écrit une feuille"""
+        from employee import models as employee_models
+
+        spec = FEUILLES.get(nom_feuille)
+        if spec is None:
+            return
+
+        modele = getattr(employee_models, spec['modele'])
+        stats = self.stats['by_model'].setdefault(
+            spec['modele'], {'created': 0, 'updated': 0, 'errors': 0, 'skipped': 0}
+        )
+        debut = time.monotonic()
+        self.ecrire(f"\n📦 IMPORT EN MASSE: {nom_feuille} ({len(df)} ligne(s))")
+
+        valeurs, erreurs, ignores = self._preparer(spec, modele, df)
+
+        for index in ignores[ignores != ''].index:
+            self._signaler(spec['modele'], valeurs, index, ignores[index], ignore=True)
+        for index in erreurs[(erreurs != '') & (ignores == '')].index:
+            self._signaler(spec['modele'], valeurs, index, erreurs[index].rstrip('; '))
+
+        valides = valeurs[(erreurs == '') & (ignores == '')]
+        enregistrements = self._enregistrements(valides)
+
+        # Doublons dans le fichier : la dernière ligne l'emporte
+        par_cle = {tuple(enr[champ] for champ in spec['cle']): enr for enr in enregistrements}
+        champs = [champ for champ in valides.columns if not champ.startswith('_')]
+        existants = self._existants(modele, spec['cle'], champs, {cle[0] for cle in par_cle})
+
+        # Mises à jour regroupées par ensemble de champs réellement modifiés
+        creations, mises_a_jour, inchanges = [], {}, 0
+        for cle, enr in par_cle.items():
+            if cle not in existants:
+                creations.append(modele(**enr))
+                continue
+            pk, actuel = existants[cle]
+            modifies = tuple(champ for champ in champs if actuel[champ] != enr[champ])
+            if modifies:
+                mises_a_jour.setdefault(modifies, []).append(modele(pk=pk, **enr))
+            else:
+                inchanges += 1
+        nb_mises_a_jour = sum(len(instances) for instances in mises_a_jour.values())
+
+        self._ecrire_lots(modele, creations, mises_a_jour)
+        self._apres_ecriture(spec['modele'], list(par_cle.values()))
+
+        stats['created'] += len(creations)
+        stats['updated'] += nb_mises_a_jour
+        self.stats['created'] += len(creations)
+        self.stats['updated'] += nb_mises_a_jour
+
+        duree = time.monotonic() - debut
+        self.ecrire(
+            f"  ✅ {len(creations)} créé(s), {nb_mises_a_jour} mis à jour, {inchanges} inchangé(s), "
+            f"{stats['skipped']} ignoré(s), {stats['errors']} erreur(s) "
+            f"— {len(df)} ligne(s) en {duree:.2f}s ({len(df) / max(duree, 1e-6):.0f} lignes/s)"
+        )
+
+    def _preparer(self, spec, modele, df):
+        """
+        Construit le DataFrame des valeurs converties et les motifs de rejet.
+
+        Returns:
+            tuple: (valeurs, erreurs, ignores) — erreurs et ignores sont des
+                   séries de messages, vides pour les lignes valides
+        """
+        erreurs = pd.Series('', index=df.index, dtype=object)
+        ignores = pd.Series('', index=df.index, dtype=object)
+        valeurs = pd.DataFrame(index=df.index)
+        valeurs['_ligne'] = df.index + 2
+
+        # Employé concerné
+        if spec['modele'] == 'ZY00':
+            matricules = self._texte(self._colonne(df, 'Matricule'))
+            ignores[matricules == ''] = 'Matricule manquant'
+            valeurs['matricule'] = matricules
+        else:
+            matricules = self._texte(self._colonne(df, 'Employe_MATRICULE'))
+            ignores[matricules == ''] = 'Employe_MATRICULE manquant'
+            inconnus = (matricules != '') & ~matricules.isin(self.matricules)
+            message = matricules[inconnus].map(lambda m: f"Employé {m} non trouvé")
+            if self.ignore_missing:
+                ignores[inconnus] = message
+            else:
+                erreurs[inconnus] += message + '; '
+            valeurs['employe_id'] = matricules
+
+        # Colonnes converties
+        for champ, (colonne, conversion, defaut) in spec['champs'].items():
+            serie, invalides = getattr(self, f'_convertir_{conversion}')(self._colonne(df, colonne), defaut)
+            valeurs[champ] = serie
+            if invalides is not None:
+                erreurs[invalides] += f"{colonne}: valeur invalide; "
+
+        # Références (entreprise, poste, rôle)
+        for champ, (colonne, referentiel, si_inconnu) in spec.get('references', {}).items():
+            codes = self._texte(self._colonne(df, colonne))
+            correspondances = self.referentiels[referentiel]
+            if referentiel == 'entreprises':
+                codes = codes.str.upper()
+            valeurs[champ] = pd.Series(
+                [correspondances.get(code) for code in codes], index=codes.index, dtype=object
+            )
+            manquants = codes == ''
+            inconnus = ~manquants & valeurs[champ].isna()
+            if not modele._meta.get_field(champ).null:
+                ignores[manquants & (ignores == '')] = f"{colonne} manquant"
+            message = codes[inconnus].map(lambda code: f"{colonne} {code} non trouvé")
+            if si_inconnu == 'ignorer':
+                ignores[inconnus & (ignores == '')] = message
+            else:
+                erreurs[inconnus] += message + '; '
+
+        regles = getattr(self, f"_regles_{spec['modele'].lower()}", None)
+        if regles:
+            regles(df, valeurs, erreurs)
+
+        self._valider_modele(modele, valeurs, erreurs)
+
+        for champ_debut, champ_fin, strict in spec.get('periodes', []):
+            debut, fin = valeurs[champ_debut], valeurs[champ_fin]
+            incoherents = debut.notna() & fin.notna() & ((fin <= debut) if strict else (fin < debut))
+            erreurs[incoherents] += f"{champ_fin} doit être postérieure à {champ_debut}; "
+
+        return valeurs, erreurs, ignores
+
+    def _valider_modele(self, modele, valeurs, erreurs):
+        """Contrôles vectorisés déduits des champs du modèle (obligatoire, choix, longueur)"""
+        for nom_champ in valeurs.columns:
+            if nom_champ.startswith('_'):
+                continue
+            champ = modele._meta.get_field(nom_champ)
+            serie = valeurs[nom_champ]
+            vides = serie.isna()
+            if serie.dtype == object:
+                vides |= serie.eq('')
+
+            if not champ.blank and not champ.is_relation:
+                erreurs[vides] += f"{nom_champ}: champ obligatoire; "
+
+            if champ.choices:
+                autorises = {cle for cle, _ in champ.flatchoices}
+                erreurs[~vides & ~serie.isin(autorises)] += f"{nom_champ}: valeur non autorisée; "
+
+            if champ.max_length and serie.dtype == object:
+                erreurs[serie.fillna('').astype(str).str.len() > champ.max_length] += (
+                    f"{nom_champ}: plus de {champ.max_length} caractères; "
+                )
+
+    def _regles_zy00(self, df, valeurs, erreurs):
+        """Règles propres aux employés : nom d'usage, unicité des pièces d'identité"""
+        from employee.models import ZY00
+
+        # Nom d'usage : colonnes dédiées, sinon nom et prénoms saisis
+        valeurs['username'] = valeurs['username'].mask(valeurs['username'] == '', self._texte(self._colonne(df, 'Nom')))
+        valeurs['prenomuser'] = valeurs['prenomuser'].mask(valeurs['prenomuser'] == '', valeurs['prenoms'])
+
+        # Numéro d'identité partagé par plusieurs matricules du fichier
+        paires = valeurs.loc[valeurs['numero_id'] != '', ['numero_id', 'matricule']].drop_duplicates()
+        partages = paires['numero_id'][paires['numero_id'].duplicated(keep=False)]
+        erreurs[valeurs['numero_id'].isin(set(partages))] += "Numero_id en double dans le fichier; "
+
+        # Numéro d'identité déjà attribué à un autre employé en base
+        numeros = valeurs['numero_id'][valeurs['numero_id'] != ''].unique().tolist()
+        proprietaires = {}
+        for lot in self._lots(numeros):
+            proprietaires.update(ZY00.objects.filter(numero_id__in=lot).values_list('numero_id', 'matricule'))
+        proprietaire = valeurs['numero_id'].map(proprietaires)
+        erreurs[proprietaire.notna() & (proprietaire != valeurs['matricule'])] += (
+            "Numero_id déjà attribué à un autre employé; "
+        )
+
+        sans_entreprise = (valeurs['type_dossier'] == 'SAL') & valeurs['entreprise_id'].isna()
+        for matricule in valeurs.loc[sans_entreprise, 'matricule']:
+            self.avertissements.append(f"Employé {matricule} de type SAL sans Entreprise_CODE")
+
+    def _regles_zyfa(self, df, valeurs, erreurs):
+        """Règles propres aux personnes à charge"""
+        # Enfant : la prise en charge commence par défaut à la naissance
+        enfants = (valeurs['personne_charge'] == 'ENFANT') & valeurs['date_debut_prise_charge'].isna()
+        valeurs.loc[enfants, 'date_debut_prise_charge'] = valeurs.loc[enfants, 'date_naissance']
+
+        futures = valeurs['date_naissance'] > pd.Timestamp(timezone.now().date())
+        erreurs[futures] += "date_naissance doit être dans le passé; "
+
+    # ------------------------------------------------------------------
+    # Écriture
+    # ------------------------------------------------------------------
+
+    def _existants(self, modele, cle, champs, premiers):
+        """Retourne {clé naturelle: (pk, valeurs actuelles)} des lignes existantes, par lots de requêtes"""
+        existants = {}
+        for lot in self._lots(sorted(premiers)):
+            lignes = modele.objects.filter(**{f'{cle[0]}__in': lot}).values('pk', *champs)
+            for ligne in lignes:
+                existants[tuple(ligne[champ] for champ in cle)] = (ligne.pop('pk'), ligne)
+        return existants
+
+    def _ecrire_lots(self, modele, creations, mises_a_jour):
+        """
+        Écrit créations et mises à jour par lots en affichant la progression.
+
+        Args:
+            creations: instances à créer
+            mises_a_jour: {champs modifiés: instances} — chaque bulk_update
+                ne porte que sur les champs qui ont changé
+        """
+        horodatage = [f.name for f in modele._meta.concrete_fields if getattr(f, 'auto_now', False)]
+        maintenant = timezone.now()
+
+        total = len(creations) + sum(len(instances) for instances in mises_a_jour.values())
+        ecrits = 0
+        for lot in self._lots(creations):
+            modele.objects.bulk_create(lot)
+            ecrits += len(lot)
+            self.ecrire(f"  ⏳ {modele.__name__}: {ecrits}/{total}")
+        for champs, instances in mises_a_jour.items():
+            for instance in instances:
+                for champ in horodatage:
+                    setattr(instance, champ, maintenant)
+            for lot in self._lots(instances):
+                modele.objects.bulk_update(lot, list(champs) + horodatage)
+                ecrits += len(lot)
+                self.ecrire(f"  ⏳ {modele.__name__}: {ecrits}/{total}")
+
+    def _apres_ecriture(self, code_modele, enregistrements):
+        """Mémorise ce qui déclenche un effet de bord en fin d'import"""
+        if code_modele == 'ZY00':
+            matricules = {enr['matricule'] for enr in enregistrements}
+            self._matricules_importes |= matricules
+            self.matricules |= matricules
+        elif code_modele == 'ZYNP':
+            for enr in enregistrements:
+                if enr['actif'] and not enr['date_fin_validite']:
+                    self._noms_usage[enr['employe_id']] = (enr['nom'], enr['prenoms'])
+        elif code_modele == 'ZYCO':
+            self._employes_contrats |= {enr['employe_id'] for enr in enregistrements}
+        elif code_modele == 'ZYRE':
+            self._roles.extend(
+                (enr['employe_id'], enr['role_id'], enr['actif'] and not enr['date_fin'])
+                for enr in enregistrements
+            )
+
+    # ------------------------------------------------------------------
+    # Effets de bord
+    # ------------------------------------------------------------------
+
+    def _appliquer_noms_usage(self):
+        """Reporte le nom d'usage des historiques actifs sur les employés (ZYNP.save)"""
+        from employee.models import ZY00
+
+        employes = [
+            ZY00(matricule=matricule, username=nom, prenomuser=prenoms)
+            for matricule, (nom, prenoms) in self._noms_usage.items()
+        ]
+        for lot in self._lots(employes):
+            ZY00.objects.bulk_update(lot, ['username', 'prenomuser'])
+
+    def _synchroniser_etats(self):
+        """Aligne l'état des employés sur leurs contrats (StatusService.synchronize_status)"""
+        from employee.models import ZY00, ZYCO
+
+        aujourd_hui = timezone.now().date()
+        for lot in self._lots(sorted(self._employes_contrats)):
+            sous_contrat = set(
+                ZYCO.objects.filter(employe_id__in=lot, actif=True).filter(
+                    Q(date_fin__isnull=True) | Q(date_fin__gte=aujourd_hui)
+                ).values_list('employe_id', flat=True)
+            )
+            sans_contrat = set(lot) - sous_contrat
+            ZY00.objects.filter(
+                Q(pk__in=sous_contrat) | Q(pk__in=sans_contrat, type_dossier='PRE')
+            ).exclude(etat='actif').update(etat='actif')
+            ZY00.objects.filter(
+                pk__in=sans_contrat
+            ).exclude(type_dossier='PRE').exclude(etat='inactif').update(etat='inactif')
+
+    def _creer_utilisateurs(self):
+        """
+        Crée les comptes des salariés importés qui n'en ont pas.
+
+        Les identifiants déjà pris sont chargés une fois et le mot de passe
+        n'est haché qu'une seule fois pour tous les comptes.
+        """
+        from employee.models import UserSecurity, ZY00, ZYME
+
+        employes = list(
+            ZY00.objects.filter(
+                pk__in=self._matricules_importes, type_dossier='SAL', user__isnull=True
+            ).values_list('matricule', 'nom', 'prenoms', 'username', 'prenomuser')
+        )
+        if not employes:
+            return
+
+        emails = {}
+        for lot in self._lots([employe[0] for employe in employes]):
+            for matricule, email in ZYME.objects.filter(
+                employe_id__in=lot, actif=True
+            ).order_by('-date_debut_validite').values_list('employe_id', 'email'):
+                emails.setdefault(matricule, email)
+
+        pris = set(User.objects.values_list('username', flat=True))
+        mot_de_passe = make_password(MOT_DE_PASSE_DEFAUT)
+
+        comptes = {}
+        for matricule, nom, prenoms, username, prenomuser in employes:
+            premier_prenom = prenoms.split()[0] if prenoms else ''
+            base = f"{nom.lower()}.{premier_prenom.lower() or 'user'}"[:140]
+            identifiant, compteur = base, 1
+            while identifiant in pris:
+                identifiant = f"{base}{compteur}"
+                compteur += 1
+            pris.add(identifiant)
+
+            email = emails.get(matricule) or f"{identifiant}@{DOMAINE_EMAIL_DEFAUT}"
+            comptes[identifiant] = (matricule, User(
+                username=identifiant,
+                password=mot_de_passe,
+                first_name=(prenomuser or premier_prenom)[:150],
+                last_name=(username or nom)[:150],
+                email=email,
+                is_active=True,
+            ))
+            self.utilisateurs_crees.append({
+                'matricule': matricule,
+                'username': identifiant,
+                'password': MOT_DE_PASSE_DEFAUT,
+                'email': email,
+                'full_name': f"{nom} {prenoms}",
+            })
+
+        identifiants = list(comptes)
+        for lot in self._lots(identifiants):
+            User.objects.bulk_create([comptes[identifiant][1] for identifiant in lot])
+            user_ids = dict(User.objects.filter(username__in=lot).values_list('username', 'pk'))
+            # bulk_create ne déclenche pas le signal qui crée le profil de sécurité
+            UserSecurity.objects.bulk_create([UserSecurity(user_id=pk) for pk in user_ids.values()])
+            ZY00.objects.bulk_update(
+                [ZY00(matricule=comptes[identifiant][0], user_id=pk) for identifiant, pk in user_ids.items()],
+                ['user']
+            )
+        self.ecrire(f"  👤 {len(identifiants)} compte(s) utilisateur créé(s)")
+
+    def _synchroniser_groupes(self):
+        """Ajoute ou retire les groupes Django liés aux rôles importés (ZYRE.save)"""
+        from employee.models import ZY00, ZYRO
+
+        if not self._roles:
+            return
+
+        groupes = dict(
+            ZYRO.objects.filter(django_group__isnull=False).values_list('pk', 'django_group_id')
+        )
+        utilisateurs = {}
+        for lot in self._lots(sorted({employe_id for employe_id, _, _ in self._roles})):
+            utilisateurs.update(
+                ZY00.objects.filter(pk__in=lot, user__isnull=False).values_list('matricule', 'user_id')
+            )
+
+        ajouts, retraits = set(), {}
+        for employe_id, role_id, actif in self._roles:
+            user_id, groupe_id = utilisateurs.get(employe_id), groupes.get(role_id)
+            if user_id is None or groupe_id is None:
+                continue
+            if actif:
+                ajouts.add((user_id, groupe_id))
+            else:
+                retraits.setdefault(groupe_id, set()).add(user_id)
+
+        appartenance = User.groups.through
+        for lot in self._lots(sorted(ajouts)):
+            appartenance.objects.bulk_create(
+                [appartenance(user_id=user_id, group_id=groupe_id) for user_id, groupe_id in lot],
+                ignore_conflicts=True
+            )
+        for groupe_id, user_ids in retraits.items():
+            user_ids -= {user_id for user_id, groupe in ajouts if groupe == groupe_id}
+            appartenance.objects.filter(group_id=groupe_id, user_id__in=user_ids).delete()
+
+    def _journaliser(self):
+        """Crée une entrée d'audit récapitulative par modèle importé"""
+        from core.models import ZDLOG
+
+        nom_fichier = str(self.fichier).rsplit('/', 1)[-1]
+        for code_modele, stats in self.stats['by_model'].items():
+            if not stats['created'] and not stats['updated']:
+                continue
+            ZDLOG.log_action(
+                table_name=code_modele,
+                record_id=f"IMPORT:{nom_fichier}"[:100],
+                type_mouvement=ZDLOG.TYPE_CREATION if stats['created'] else ZDLOG.TYPE_MODIFICATION,
+                user=self.utilisateur,
+                nouvelle_valeur=stats,
+                description=(
+                    f"Import en masse {nom_fichier} : {stats['created']} création(s), "
+                    f"{stats['updated']} mise(s) à jour, {stats['errors']} erreur(s)"
+                )
+            )
+
+    # ------------------------------------------------------------------
+    # Conversions vectorisées : (série convertie, masque des valeurs invalides)
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _colonne(df, colonne):
+        """Retourne une colonne, ou une série vide si elle est absente de la feuille"""
+        if colonne in df.columns:
+            return df[colonne]
+        return pd.Series(index=df.index, dtype=object)
+
+    @staticmethod
+    def _texte(serie, defaut=''):
+        """Nettoie une colonne texte ; les cellules vides prennent la valeur par défaut"""
+        serie = serie.astype(object).where(serie.notna(), '').astype(str).str.strip()
+        return serie.mask(serie == '', defaut)
+
+    def _convertir_texte(self, serie, defaut):
+        return self._texte(serie, defaut), None
+
+    def _convertir_majuscule(self, serie, defaut):
+        return self._texte(serie, defaut).str.upper(), None
+
+    def _convertir_titre(self, serie, defaut):
+        return self._texte(serie, defaut).str.title(), None
+
+    def _convertir_capitalise(self, serie, defaut):
+        texte = self._texte(serie, defaut)
+        return texte.str[:1].str.upper() + texte.str[1:], None
+
+    def _convertir_compact(self, serie, defaut):
+        return self._texte(serie, defaut).str.replace(' ', '', regex=False).str.upper(), None
+
+    def _convertir_booleen(self, serie, defaut):
+        return self._texte(serie, defaut).str.upper() == 'TRUE', None
+
+    def _convertir_entier(self, serie, defaut):
+        texte = self._texte(serie, defaut)
+        nombres = pd.to_numeric(texte, errors='coerce')
+        invalides = (texte != '') & (nombres.isna() | (nombres % 1 != 0))
+        return nombres.where(~invalides).astype('Int64'), invalides
+
+    def _convertir_decimal(self, serie, defaut):
+        texte = self._texte(serie, defaut).str.replace(',', '.', regex=False)
+        nombres = pd.to_numeric(texte, errors='coerce')
+        invalides = (texte != '') & nombres.isna()
+        decimaux = nombres.round(2).map(lambda v: Decimal(str(v)) if pd.notna(v) else None)
+        return decimaux.astype(object), invalides
+
+    def _convertir_date(self, serie, defaut):
+        """Essaie successivement chaque format sur les cellules encore non reconnues"""
+        texte = self._texte(serie, defaut or '')
+        renseignees = texte != ''
+        dates = pd.Series(pd.NaT, index=texte.index, dtype='datetime64[ns]')
+        for format_date in FORMATS_DATE:
+            restantes = renseignees & dates.isna()
+            if not restantes.any():
+                break
+            dates[restantes] = pd.to_datetime(texte[restantes], format=format_date, errors='coerce')
+        restantes = renseignees & dates.isna()
+        if restantes.any():
+            dates[restantes] = pd.to_datetime(texte[restantes], format='mixed', errors='coerce')
+        return dates.dt.normalize(), renseignees & dates.isna()
+
+    # ------------------------------------------------------------------
+    # Utilitaires
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _enregistrements(valeurs):
+        """Convertit un DataFrame en dictionnaires de valeurs Python (date, int, None)"""
+        colonnes = {}
+        for nom_colonne in valeurs.columns:
+            if nom_colonne.startswith('_'):
+                continue
+            serie = valeurs[nom_colonne]
+            if pd.api.types.is_datetime64_any_dtype(serie):
+                serie = serie.dt.date
+            elif isinstance(serie.dtype, pd.Int64Dtype):
+                serie = serie.map(lambda v: int(v) if pd.notna(v) else None, na_action='ignore')
+            elif serie.dtype == bool:
+                serie = serie.map(bool)
+            colonnes[nom_colonne] = serie.astype(object).where(serie.notna(), None)
+        return pd.DataFrame(colonnes, index=valeurs.index).to_dict('records')
+
+    def _lots(self, elements):
+        """Découpe une liste en lots de taille batch_size"""
+        elements = list(elements)
+        for debut in range(0, len(elements), self.batch_size):
+            yield elements[debut:debut + self.batch_size]
+
+    def _signaler(self, code_modele, valeurs, index, message, ignore=False):
+        """Enregistre une ligne rejetée (ignorée ou en erreur)"""
+        stats = self.stats['by_model'][code_modele]
+        cle = 'skipped' if ignore else 'errors'
+        stats[cle] += 1
+        self.stats[cle] += 1
+        identifiant = valeurs.at[index, 'matricule' if code_modele == 'ZY00' else 'employe_id']
+        self.erreurs.append({
+            'model': code_modele,
+            'identifier': identifiant,
+            'line': int(valeurs.at[index, '_ligne']),
+            'error': message,
+            'skipped': ignore,
+        })
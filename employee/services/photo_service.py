@@ -0,0 +1,161 @@
+"""
+Service des photos de profil : miniatures et nettoyage des fichiers.
+
+À chaque nouvelle photo, des miniatures carrées sont générées en WebP
+(affichage) et JPEG (exports, clients sans WebP). Leur nom contient
+l'empreinte du contenu de la photo :
+
+    miniatures/employes/{matricule}/{empreinte}_{taille}.{format}
+
+Une URL de miniature ne désigne donc jamais deux images différentes :
+elle peut être mise en cache indéfiniment (voir deploy/nginx). L'ancienne
+photo et ses miniatures sont supprimées par une tâche de fond
+(employee.nettoyer_photos) après l'enregistrement.
+"""
+import hashlib
+import logging
+import posixpath
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+logger = logging.getLogger(__name__)
+
+# Côté des miniatures en pixels (affichées en 32-40 px et 128 px, écrans haute densité)
+TAILLES = {
+    'avatar': 80,
+    'carte': 256,
+}
+
+FORMATS = {
+    'webp': {'format': 'WEBP', 'quality': 80, 'method': 4},
+    'jpg': {'format': 'JPEG', 'quality': 85, 'optimize': True, 'progressive': True},
+}
+
+DOSSIER_MINIATURES = 'miniatures/employes'
+
+LONGUEUR_EMPREINTE = 16
+
+
+class PhotoService:
+    """Service pour les photos de profil des employés"""
+
+    @staticmethod
+    def empreinte(contenu):
+        """Empreinte SHA-256 (tronquée) du contenu de la photo"""
+        return hashlib.sha256(contenu).hexdigest()[:LONGUEUR_EMPREINTE]
+
+    @staticmethod
+    def dossier(matricule):
+        return posixpath.join(DOSSIER_MINIATURES, matricule)
+
+    @staticmethod
+    def chemin_miniature(matricule, empreinte, taille='avatar', format_image='webp'):
+        """Chemin (stockage) d'une miniature"""
+        return posixpath.join(PhotoService.dossier(matricule), f"{empreinte}_{taille}.{format_image}")
+
+    @staticmethod
+    def url_miniature(employe, taille='avatar', format_image='webp'):
+        """URL de la miniature, ou None si la photo n'en a pas (encore)"""
+        if not employe.photo or not employe.photo_empreinte:
+            return None
+        return default_storage.url(
+            PhotoService.chemin_miniature(employe.matricule, employe.photo_empreinte, taille, format_image)
+        )
+
+    @staticmethod
+    def lire(fichier):
+        """Contenu binaire d'un fichier (téléversé ou stocké)"""
+        fichier.open('rb')
+        try:
+            fichier.seek(0)
+            return fichier.read()
+        finally:
+            fichier.seek(0)
+
+    @staticmethod
+    def generer_miniatures(matricule, contenu, empreinte=None):
+        """
+        Génère les miniatures d'une photo (idempotent : une miniature déjà
+        présente pour cette empreinte n'est pas regénérée).
+
+        Returns:
+            str: empreinte de la photo, ou '' si le contenu n'est pas une image
+        """
+        empreinte = empreinte or PhotoService.empreinte(contenu)
+        try:
+            with Image.open(BytesIO(contenu)) as source:
+                image = ImageOps.exif_transpose(source)
+                image = image.convert('RGB')
+        except (UnidentifiedImageError, OSError) as e:
+            logger.warning("Photo illisible pour %s : %s", matricule, e)
+            return ''
+
+        for taille, cote in TAILLES.items():
+            miniature = None
+            for format_image, options in FORMATS.items():
+                chemin = PhotoService.chemin_miniature(matricule, empreinte, taille, format_image)
+                if default_storage.exists(chemin):
+                    continue
+                if miniature is None:
+                    miniature = ImageOps.fit(image, (cote, cote), Image.Resampling.LANCZOS)
+                tampon = BytesIO()
+                miniature.save(tampon, **options)
+                default_storage.save(chemin, ContentFile(tampon.getvalue()))
+        return empreinte
+
+    @staticmethod
+    def nettoyer(matricule, anciennes_photos=(), empreintes_remplacees=None):
+        """
+        Supprime les photos remplacées et leurs miniatures.
+
+        La photo courante est relue au moment du nettoyage : ni elle ni ses
+        miniatures ne sont supprimées, même si une autre photo a été
+        téléversée depuis la planification. Sans empreintes_remplacees, toutes
+        les miniatures qui ne correspondent pas à la photo courante sont
+        supprimées (rattrapage).
+
+        Returns:
+            int: nombre de fichiers supprimés
+        """
+        from employee.models import ZY00
+
+        courante = ZY00.objects.filter(matricule=matricule).values('photo', 'photo_empreinte').first() or {}
+        photo_courante = courante.get('photo') or ''
+        empreinte_courante = courante.get('photo_empreinte') or ''
+
+        supprimes = 0
+        for nom in anciennes_photos:
+            if nom and nom != photo_courante and default_storage.exists(nom):
+                default_storage.delete(nom)
+                supprimes += 1
+
+        dossier = PhotoService.dossier(matricule)
+        try:
+            _, fichiers = default_storage.listdir(dossier)
+        except FileNotFoundError:
+            return supprimes
+        for fichier in fichiers:
+            empreinte = fichier.split('_', 1)[0]
+            if empreinte_courante and empreinte == empreinte_courante:
+                continue
+            if empreintes_remplacees is not None and empreinte not in empreintes_remplacees:
+                continue
+            default_storage.delete(posixpath.join(dossier, fichier))
+            supprimes += 1
+        return supprimes
+
+    @staticmethod
+    def planifier_nettoyage(matricule, anciennes_photos, empreintes_remplacees):
+        """Nettoyage en tâche de fond, après validation de la transaction"""
+        from django.db import transaction
+        from core.taches import lancer
+
+        parametres = {
+            'matricule': matricule,
+            'anciennes_photos': [nom for nom in anciennes_photos if nom],
+            'empreintes_remplacees': [empreinte for empreinte in empreintes_remplacees if empreinte],
+        }
+        transaction.on_commit(lambda: lancer('employee.nettoyer_photos', parametres))
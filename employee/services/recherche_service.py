@@ -0,0 +1,249 @@
+"""
+Service de recherche d'employés (annuaire, sélecteurs, autocomplétion).
+
+La recherche est insensible à la casse et aux accents, et classe les
+résultats par pertinence :
+- PostgreSQL : index GIN trigramme (pg_trgm) sur l'expression normalisée
+  immutable_unaccent(lower(nom prénoms matricule ...)), créé par la
+  migration employee.0003 ; classement par word_similarity ;
+- autres SGBD (SQLite en développement) : index de préfixes en mémoire,
+  reconstruit quand la version de l'annuaire change ; un mot qui n'est le
+  préfixe d'aucun mot indexé est cherché en sous-chaîne (comme icontains).
+  Seuls les LIMITE_RESULTATS premiers résultats classés sont renvoyés.
+
+La version de l'annuaire (cache) est renouvelée à chaque enregistrement
+ou suppression d'un employé ; elle invalide l'index en mémoire et les
+résultats d'autocomplétion mis en cache.
+"""
+import re
+import unicodedata
+import uuid
+from bisect import bisect_left
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Case, F, FloatField, Func, IntegerField, TextField, Value, When
+
+from employee.models import ZY00
+
+# Champs indexés
+CHAMPS = ('matricule', 'nom', 'prenoms', 'username', 'prenomuser')
+
+# Nombre maximal de résultats classés en mémoire (hors PostgreSQL)
+LIMITE_RESULTATS = 500
+
+LIMITE_AUTOCOMPLETION = 10
+LONGUEUR_MINIMALE = 2
+
+CLE_VERSION = 'employee:recherche:version'
+
+# Index de préfixes du processus courant (hors PostgreSQL)
+_index = {'version': None, 'jetons': [], 'employes': {}}
+
+
+def normaliser(texte):
+    """Minuscules, sans accents ni ponctuation : « Kouassi-Aké » -> « kouassi ake »"""
+    texte = unicodedata.normalize('NFKD', str(texte or ''))
+    texte = ''.join(c for c in texte if not unicodedata.combining(c)).lower()
+    return ' '.join(re.split(r'[^0-9a-z]+', texte)).strip()
+
+
+class TexteRecherche(Func):
+    """
+    Expression normalisée indexée sous PostgreSQL :
+    immutable_unaccent(lower(matricule || ' ' || nom || ...)).
+    Doit rester identique à l'index de la migration employee.0003.
+    """
+    template = 'immutable_unaccent(lower(%(expressions)s))'
+    arg_joiner = " || ' ' || "
+    output_field = TextField()
+
+    def __init__(self):
+        super().__init__(*[F(champ) for champ in CHAMPS])
+
+
+class RechercheEmployeService:
+    """Service pour la recherche classée des employés"""
+
+    @staticmethod
+    def version():
+        """Version courante de l'annuaire (créée au besoin)"""
+        version = cache.get(CLE_VERSION)
+        if version is None:
+            version = uuid.uuid4().hex
+            cache.set(CLE_VERSION, version, None)
+        return version
+
+    @staticmethod
+    def invalider():
+        """Invalide l'index en mémoire et l'autocomplétion (employés modifiés)"""
+        cache.set(CLE_VERSION, uuid.uuid4().hex, None)
+        _index['version'] = None
+
+    @staticmethod
+    def rechercher(texte, queryset=None):
+        """
+        Filtre et classe des employés selon une saisie libre.
+
+        Chaque mot saisi doit apparaître dans le matricule, le nom, les
+        prénoms ou le nom d'usage. Hors PostgreSQL, les préfixes sont
+        cherchés d'abord, puis les sous-chaînes si aucun préfixe ne
+        correspond, et le résultat est limité à LIMITE_RESULTATS employés.
+
+        Args:
+            texte: saisie de l'utilisateur
+            queryset: employés parmi lesquels chercher (défaut : tous)
+
+        Returns:
+            QuerySet de ZY00 trié par pertinence
+        """
+        queryset = ZY00.objects.all() if queryset is None else queryset
+        mots = normaliser(texte).split()
+        if not mots:
+            return queryset
+
+        if connection.vendor == 'postgresql':
+            return RechercheEmployeService._rechercher_postgresql(queryset, texte, mots)
+
+        matricules = RechercheEmployeService._rechercher_en_memoire(mots, texte)
+        if not matricules:
+            return queryset.none()
+        return queryset.filter(pk__in=matricules).order_by(
+            Case(
+                *[When(pk=matricule, then=Value(rang)) for rang, matricule in enumerate(matricules)],
+                output_field=IntegerField()
+            )
+        )
+
+    @staticmethod
+    def filtrer_lies(queryset, texte, champ='employe'):
+        """
+        Filtre des objets liés à un employé (absences, notes de frais...)
+        selon la recherche d'employé.
+        """
+        if not normaliser(texte):
+            return queryset
+        employes = RechercheEmployeService.rechercher(texte).order_by().values('pk')
+        return queryset.filter(**{f'{champ}__in': employes})
+
+    @staticmethod
+    def autocompletion(texte, limite=LIMITE_AUTOCOMPLETION, actifs=True):
+        """
+        Meilleurs résultats pour un sélecteur d'employés, mis en cache.
+
+        Returns:
+            list: dictionnaires id, text, matricule, nom, prenoms
+        """
+        saisie = normaliser(texte)
+        if len(saisie) < LONGUEUR_MINIMALE:
+            return []
+
+        cle = f"employee:autocompletion:{RechercheEmployeService.version()}:{int(actifs)}:{limite}:{saisie}"
+        resultats = cache.get(cle)
+        if resultats is not None:
+            return resultats
+
+        employes = ZY00.objects.all()
+        if actifs:
+            employes = employes.filter(etat='actif')
+        employes = RechercheEmployeService.rechercher(texte, employes).values('matricule', 'nom', 'prenoms')
+
+        resultats = [
+            {
+                'id': employe['matricule'],
+                'text': f"{employe['nom']} {employe['prenoms'] or ''} ({employe['matricule']})",
+                'matricule': employe['matricule'],
+                'nom': employe['nom'],
+                'prenoms': employe['prenoms'] or '',
+            }
+            for employe in employes[:limite]
+        ]
+        cache.set(cle, resultats, getattr(settings, 'CACHE_TTL_DASHBOARD', 300))
+        return resultats
+
+    # ------------------------------------------------------------------
+    # PostgreSQL : trigrammes
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _rechercher_postgresql(queryset, texte, mots):
+        queryset = queryset.alias(_texte_recherche=TexteRecherche())
+        for mot in mots:
+            # LIKE '%mot%' : servi par l'index GIN trigramme
+            queryset = queryset.filter(_texte_recherche__contains=mot)
+        return queryset.annotate(
+            _matricule_exact=Case(
+                When(matricule__iexact=texte.strip(), then=Value(1)),
+                default=Value(0),
+                output_field=IntegerField()
+            ),
+            _pertinence=Func(
+                Value(' '.join(mots)), TexteRecherche(),
+                function='word_similarity', output_field=FloatField()
+            ),
+        ).order_by('-_matricule_exact', '-_pertinence', 'nom', 'prenoms')
+
+    # ------------------------------------------------------------------
+    # Index de préfixes en mémoire
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _charger_index():
+        """Reconstruit l'index si la version de l'annuaire a changé"""
+        version = RechercheEmployeService.version()
+        if _index['version'] == version:
+            return _index
+
+        jetons, employes = [], {}
+        for ligne in ZY00.objects.values_list(*CHAMPS).iterator(chunk_size=2000):
+            matricule, nom, prenoms = ligne[0], ligne[1], ligne[2]
+            mots_employe = set(normaliser(' '.join(v or '' for v in ligne)).split())
+            employes[matricule] = (normaliser(nom), normaliser(prenoms), mots_employe)
+            jetons.extend((mot, matricule) for mot in mots_employe)
+        jetons.sort()
+
+        _index.update(version=version, jetons=jetons, employes=employes)
+        return _index
+
+    @staticmethod
+    def _rechercher_en_memoire(mots, texte):
+        """
+        Matricules dont chaque mot de la saisie est préfixe d'un mot indexé,
+        ou à défaut contenu dans un mot indexé, classés par pertinence.
+        """
+        index = RechercheEmployeService._charger_index()
+        jetons = index['jetons']
+
+        candidats = None
+        for mot in mots:
+            trouves = set()
+            position = bisect_left(jetons, (mot,))
+            while position < len(jetons) and jetons[position][0].startswith(mot):
+                trouves.add(jetons[position][1])
+                position += 1
+            if not trouves:
+                # Aucun préfixe : recherche en sous-chaîne, comme icontains
+                trouves = {
+                    matricule for matricule, (_, _, mots_employe) in index['employes'].items()
+                    if any(mot in mot_employe for mot_employe in mots_employe)
+                }
+            candidats = trouves if candidats is None else candidats & trouves
+            if not candidats:
+                return []
+
+        saisie = texte.strip().upper()
+
+        def score(matricule):
+            nom, prenoms, mots_employe = index['employes'][matricule]
+            points = 100 if matricule.upper() == saisie else 0
+            for mot in mots:
+                if mot in mots_employe:
+                    points += 3
+                if nom.startswith(mot):
+                    points += 2
+                elif prenoms.startswith(mot):
+                    points += 1
+            return (-points, nom, prenoms)
+
+        return sorted(candidats, key=score)[:LIMITE_RESULTATS]
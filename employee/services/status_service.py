@@ -6,16 +6,30 @@ Gère le calcul du statut actif/inactif, l'ancienneté et les conventions.
 from __future__ import annotations
 from typing import TYPE_CHECKING, Optional
 from datetime import date
+import copy
 import logging
 
 from django.db.models import Q
 from django.utils import timezone
 
+from core.cache import FamilleCache
+
 if TYPE_CHECKING:
     from employee.models import ZY00, ZYCO
 
 logger = logging.getLogger(__name__)
 
+# Conventions lues à chaque calcul de congés : cache mémoire du processus
+# devant Redis (core.cache), par convention et entreprise -> convention
+CACHE_CONVENTIONS = FamilleCache(
+    'employee.conventions',
+    tags=['absence.configurationconventionnelle', 'absence.parametrecalculconges'],
+    locale=32
+)
+CACHE_CONVENTIONS_ENTREPRISES = FamilleCache(
+    'employee.conventions_entreprises', tags=['entreprise.entreprise'], locale=1
+)
+
 
 class StatusService:
     """
@@ -109,6 +123,10 @@ class StatusService:
             employee.affectations.filter(actif=True).update(actif=False)
             employee.adresses.filter(actif=True).update(actif=False)
 
+            # update() ne déclenche pas les signaux : contrats et affectations ont changé
+            from employee.services.effectifs_service import EffectifsService
+            EffectifsService.invalider()
+
             logger.info(
                 f"Données associées désactivées pour {employee.matricule}"
             )
@@ -251,13 +269,36 @@ class StatusService:
             employee: Instance de ZY00
 
         Returns:
-            ConfigurationConventionnelle ou None
+            ConfigurationConventionnelle ou None (copie de l'instance en cache)
         """
-        if employee.convention_personnalisee:
-            return employee.convention_personnalisee
-        if employee.entreprise and employee.entreprise.configuration_conventionnelle:
-            return employee.entreprise.configuration_conventionnelle
-        return None
+        convention_id = employee.convention_personnalisee_id
+        if not convention_id and employee.entreprise_id:
+            convention_id = StatusService._conventions_entreprises().get(employee.entreprise_id)
+        if not convention_id:
+            return None
+
+        convention = CACHE_CONVENTIONS.obtenir(
+            lambda: StatusService._charger_convention(convention_id), convention_id
+        )
+        return copy.copy(convention) if convention else None
+
+    @staticmethod
+    def _conventions_entreprises() -> dict:
+        """{id entreprise: id convention} des entreprises ayant une convention"""
+        from entreprise.models import Entreprise
+
+        return CACHE_CONVENTIONS_ENTREPRISES.obtenir(lambda: dict(
+            Entreprise.objects.filter(configuration_conventionnelle__isnull=False)
+            .values_list('pk', 'configuration_conventionnelle_id')
+        ))
+
+    @staticmethod
+    def _charger_convention(convention_id):
+        from absence.models import ConfigurationConventionnelle
+
+        return ConfigurationConventionnelle.objects.select_related(
+            'parametres_calcul'
+        ).filter(pk=convention_id).first()
 
     @staticmethod
     def get_leave_days_per_month(employee: 'ZY00') -> float:
@@ -12,6 +12,8 @@ import re
 from django.db.models import QuerySet, Q
 from django.core.exceptions import ValidationError
 
+from core.chevauchement import premier_conflit
+
 if TYPE_CHECKING:
     from django.db.models import Model
 
@@ -141,6 +143,9 @@ class ValidationService:
         """
         Vérifie s'il y a un chevauchement de dates dans un queryset.
 
+        Le test est fait en SQL (core.chevauchement) : une requête, qui
+        renvoie la période en conflit commençant le plus tôt.
+
         Args:
             queryset: QuerySet à vérifier
             start_date: Date de début de la nouvelle période
@@ -152,37 +157,10 @@ class ValidationService:
         Returns:
             Tuple[bool, Model|None]: (has_overlap, conflicting_instance)
         """
-        if exclude_pk is not None:
-            queryset = queryset.exclude(pk=exclude_pk)
-
-        for existing in queryset:
-            existing_start = getattr(existing, start_field)
-            existing_end = getattr(existing, end_field)
-
-            # Vérifier les chevauchements
-            # Cas 1: La nouvelle période commence pendant une période existante
-            debut_chevauche = (
-                existing_start <= start_date and
-                (existing_end is None or existing_end >= start_date)
-            )
-
-            # Cas 2: La nouvelle période se termine pendant une période existante
-            fin_chevauche = (
-                end_date and
-                existing_start <= end_date and
-                (existing_end is None or existing_end >= end_date)
-            )
-
-            # Cas 3: La nouvelle période encadre une période existante
-            encadrement = (
-                start_date <= existing_start and
-                (end_date is None or end_date >= existing_start)
-            )
-
-            if debut_chevauche or fin_chevauche or encadrement:
-                return True, existing
-
-        return False, None
+        existing = premier_conflit(
+            queryset, start_date, end_date, start_field, end_field, exclude_pk=exclude_pk
+        )
+        return existing is not None, existing
 
     @staticmethod
     def check_overlap_with_message(
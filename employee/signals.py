@@ -4,7 +4,7 @@ from .models import UserSecurity
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.db import transaction
-from .models import ZYCO
+from .models import ZYCO, ZY00
 
 @receiver(post_save, sender=User)
 def create_user_security(sender, instance, created, **kwargs):
@@ -33,4 +33,12 @@ def synchroniser_etat_employe(sender, instance, **kwargs):
         )
     except Exception:
         # Ne pas bloquer l'opération principale en cas d'erreur
-        pass
\ No newline at end of file
+        pass
+
+
+@receiver([post_save, post_delete], sender=ZY00)
+def invalider_recherche_employes(sender, instance, **kwargs):
+    """Renouvelle la version de l'annuaire (index de recherche, autocomplétion)"""
+    from .services.recherche_service import RechercheEmployeService
+    RechercheEmployeService.invalider()
+
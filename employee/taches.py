@@ -0,0 +1,42 @@
+# employee/taches.py
+"""
+Tâches de fond de l'application employee (voir core.taches).
+"""
+from core.taches import tache
+
+
+@tache('employee.nettoyer_photos')
+def nettoyer_photos(job, matricule, anciennes_photos=(), empreintes_remplacees=()):
+    """Supprime les photos remplacées et leurs miniatures."""
+    from employee.services.photo_service import PhotoService
+
+    supprimes = PhotoService.nettoyer(matricule, anciennes_photos, empreintes_remplacees)
+    return {'message': f"{supprimes} fichier(s) supprimé(s)", 'supprimes': supprimes}
+
+
+@tache('employee.envoyer_emails')
+def envoyer_emails(job, messages):
+    """Envoie une série d'emails [sujet, corps, destinataires] sur une seule connexion SMTP."""
+    from django.conf import settings
+    from django.core.mail import send_mass_mail
+
+    envoyes = send_mass_mail(
+        [(sujet, corps, settings.DEFAULT_FROM_EMAIL, destinataires) for sujet, corps, destinataires in messages],
+        fail_silently=False
+    )
+    return {'message': f"{envoyes} email(s) envoyé(s)", 'envoyes': envoyes}
+
+
+@tache('employee.balayer_contrats_expires')
+def balayer_contrats_expires(job, dry_run=False):
+    """Désactive les contrats expirés (voir ExpirationContratsService)."""
+    from employee.services.expiration_service import ExpirationContratsService
+
+    resultat = ExpirationContratsService.balayer(dry_run=dry_run, utilisateur=job.DEMANDE_PAR)
+    return {
+        'message': f"{resultat['contrats']} contrat(s), {resultat['employes_desactives']} employé(s) désactivé(s)",
+        'contrats': resultat['contrats'],
+        'employes_desactives': resultat['employes_desactives'],
+        'emails': resultat['emails'],
+        'durees': resultat['durees'],
+    }
@@ -5,6 +5,7 @@ Tests complets pour LoginRequiredMiddleware et ContratExpirationMiddleware.
 """
 
 from datetime import date, timedelta
+from django.core import mail
 from django.test import TestCase, RequestFactory, override_settings
 from django.contrib.auth.models import User
 from django.contrib.messages.storage.fallback import FallbackStorage
@@ -213,7 +214,8 @@ class ContratExpirationMiddlewareTest(BaseMiddlewareTestCase):
         """Test qu'un employé avec contrat expiré est bloqué."""
         from django.contrib.sessions.backends.db import SessionStore
 
-        # Mettre un contrat expiré
+        # Salarié (une pré-embauche reste active) avec un contrat expiré
+        ZY00.objects.filter(pk=self.employe.pk).update(type_dossier='SAL')
         self.contrat_actif.date_fin = date.today() - timedelta(days=1)
         self.contrat_actif.save()
 
@@ -227,11 +229,15 @@ class ContratExpirationMiddlewareTest(BaseMiddlewareTestCase):
         self._add_messages_to_request(request)
 
         middleware = ContratExpirationMiddleware(self._get_response)
-        response = middleware(request)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = middleware(request)
 
         # Devrait être redirigé vers login
         self.assertEqual(response.status_code, 302)
 
+        # Les notifications sont laissées au balayage quotidien
+        self.assertEqual(mail.outbox, [])
+
         # Vérifier que l'employé est maintenant inactif
         self.employe.refresh_from_db()
         self.assertEqual(self.employe.etat, 'inactif')
@@ -240,6 +246,24 @@ class ContratExpirationMiddlewareTest(BaseMiddlewareTestCase):
         self.contrat_actif.refresh_from_db()
         self.assertFalse(self.contrat_actif.actif)
 
+    def test_pre_embauche_with_expired_contract_passes(self):
+        """Une pré-embauche dont le contrat a expiré reste active (contrat désactivé)."""
+        self.contrat_actif.date_fin = date.today() - timedelta(days=1)
+        self.contrat_actif.save()
+
+        request = self.factory.get('/dashboard/')
+        request.user = self.user
+        self._add_session_to_request(request)
+        self._add_messages_to_request(request)
+
+        response = ContratExpirationMiddleware(self._get_response)(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.employe.refresh_from_db()
+        self.assertEqual(self.employe.etat, 'actif')
+        self.contrat_actif.refresh_from_db()
+        self.assertFalse(self.contrat_actif.actif)
+
     def test_employee_with_expiring_contract_gets_warning(self):
         """Test qu'un employé avec contrat qui expire bientôt reçoit un avertissement."""
         # Contrat qui expire dans 15 jours
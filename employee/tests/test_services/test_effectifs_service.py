@@ -0,0 +1,87 @@
+# employee/tests/test_services/test_effectifs_service.py
+"""
+Tests pour EffectifsService (instantané des effectifs des tableaux de bord).
+"""
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.test import override_settings
+
+from departement.models import ZDDE, ZDPO
+from employee.services.effectifs_service import EffectifsService
+from employee.tests.base import EmployeeTestCase
+
+CACHE_LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=CACHE_LOCMEM)
+class EffectifsServiceTestCase(EmployeeTestCase):
+    """Tests pour l'instantané des effectifs et son invalidation."""
+
+    def setUp(self):
+        cache.clear()
+        self.autre_departement = ZDDE.objects.create(CODE='AUT', LIBELLE='Autre', STATUT=True)
+        self.autre_poste = ZDPO.objects.create(
+            CODE='POST02', LIBELLE='Autre poste', DEPARTEMENT=self.autre_departement, STATUT=True
+        )
+        self.actif = self.create_employee(matricule='MT000001')
+        self.create_affectation(self.actif)
+        self.create_employee(matricule='MT000002', type_dossier='PRE', etat='inactif')
+        self.inactif = self.create_employee(matricule='MT000003', etat='inactif')
+        self.create_affectation(self.inactif, poste=self.autre_poste)
+
+    def modifier(self, fonction, *args, **kwargs):
+        """Exécute une modification et les invalidations différées (on_commit)"""
+        with self.captureOnCommitCallbacks(execute=True):
+            return fonction(*args, **kwargs)
+
+    def test_instantane(self):
+        """Compteurs, embauches en attente et effectifs par département et poste."""
+        instantane = EffectifsService.instantane()
+
+        self.assertEqual(instantane['total_employes'], 3)
+        self.assertEqual(instantane['employes_actifs'], 1)
+        self.assertEqual(instantane['employes_attente'], 1)
+        self.assertEqual(instantane['dernieres_embauches'], [])
+        self.assertEqual([e['matricule'] for e in instantane['embauches_attente']], ['MT000002'])
+        self.assertEqual(instantane['total_departements'], 2)
+        self.assertEqual(
+            [(d['CODE'], d['effectif']) for d in instantane['departements_effectifs']],
+            [('TST', 1), ('AUT', 0)]
+        )
+        self.assertEqual(EffectifsService.effectif_poste(self.poste.pk), 1)
+        self.assertEqual(EffectifsService.effectif_poste(self.autre_poste.pk), 0)
+
+    def test_lecture_en_cache(self):
+        """Une fois calculé, l'instantané est lu sans requête."""
+        EffectifsService.instantane()
+        with self.assertNumQueries(0):
+            EffectifsService.instantane()
+
+    def test_invalidation_par_segment(self):
+        """Une affectation ne recalcule que le segment des effectifs."""
+        EffectifsService.instantane()
+
+        self.modifier(self.create_affectation, self.actif, poste=self.autre_poste)
+
+        # Seul le segment 'effectifs' est recalculé (ZYAF agrégé + ZDDE)
+        with self.assertNumQueries(2):
+            instantane = EffectifsService.instantane()
+        self.assertEqual(EffectifsService.effectif_poste(self.autre_poste.pk), 1)
+        self.assertEqual(instantane['departements_effectifs'][0]['effectif'], 1)
+
+    def test_changement_d_etat_et_contrats(self):
+        """L'état d'un employé et ses contrats sont pris en compte dès la modification."""
+        EffectifsService.instantane()
+
+        self.inactif.etat = 'actif'
+        self.modifier(self.inactif.save)
+        fin = date.today() + timedelta(days=20)
+        self.modifier(self.create_contract, self.actif, type_contrat='CDD', date_fin=fin)
+
+        instantane = EffectifsService.instantane()
+        self.assertEqual(instantane['employes_actifs'], 2)
+        self.assertEqual(EffectifsService.effectif_poste(self.autre_poste.pk), 1)
+        self.assertEqual(instantane['contrats_echeance_total'], 1)
+        echeance = instantane['contrats_echeance'][0]
+        self.assertEqual((echeance['employe']['matricule'], echeance['date_fin']), ('MT000001', fin))
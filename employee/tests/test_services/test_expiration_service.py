@@ -0,0 +1,105 @@
+# employee/tests/test_services/test_expiration_service.py
+"""
+Tests pour ExpirationContratsService (balayage des contrats expirés).
+"""
+from datetime import date, timedelta
+
+from django.core import mail
+from django.core.cache import cache
+from django.test import override_settings
+
+from core.models import ZDLOG
+from employee.models import ZY00, ZYCO
+from employee.services.expiration_service import ExpirationContratsService
+from employee.tests.base import EmployeeTestCase
+
+CACHE_LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=CACHE_LOCMEM)
+class ExpirationContratsServiceTestCase(EmployeeTestCase):
+    """Tests pour le balayage ensembliste des contrats expirés."""
+
+    def setUp(self):
+        cache.clear()
+        hier = date.today() - timedelta(days=1)
+
+        self.expire = self.create_employee(matricule='EXP00001')
+        self.create_user_for_employee(self.expire)
+        self.contrat_expire = self.create_contract(self.expire, type_contrat='CDD', date_fin=hier)
+
+        # Contrat échu mais un autre contrat en cours : l'employé reste actif
+        self.renouvele = self.create_employee(matricule='EXP00002')
+        self.contrat_echu = self.create_contract(self.renouvele, type_contrat='CDD', date_fin=hier)
+        self.create_contract(self.renouvele, date_debut=date.today())
+
+        self.en_cours = self.create_employee(matricule='EXP00004')
+        self.contrat_en_cours = self.create_contract(self.en_cours, type_contrat='CDD', date_fin=date.today())
+
+        self.drh = self.create_employee(matricule='EXP00005')
+        self.create_user_for_employee(self.drh)
+        self.create_contract(self.drh)
+        self.assign_role(self.drh, self.role_drh)
+
+    def etats(self):
+        return dict(ZY00.objects.filter(matricule__startswith='EXP').values_list('matricule', 'etat'))
+
+    def test_balayage(self):
+        """Contrats échus désactivés ; seuls les employés sans autre contrat passent inactifs."""
+        with self.captureOnCommitCallbacks(execute=True):
+            resultat = ExpirationContratsService.balayer()
+
+        self.assertEqual(resultat['contrats'], 2)
+        self.assertEqual(resultat['employes_desactives'], 1)
+        self.assertEqual(set(resultat['durees']), {'chargement', 'ecriture', 'notification'})
+        self.assertEqual(
+            set(ZYCO.objects.filter(actif=False).values_list('pk', flat=True)),
+            {self.contrat_expire.pk, self.contrat_echu.pk}
+        )
+        self.assertEqual(self.etats(), {
+            'EXP00001': 'inactif', 'EXP00002': 'actif', 'EXP00004': 'actif', 'EXP00005': 'actif',
+        })
+
+        # Une seule entrée d'audit pour tout le balayage
+        logs = ZDLOG.objects.filter(TABLE_NAME='ZYCO', RECORD_ID__startswith='EXPIRATION:')
+        self.assertEqual(logs.count(), 1)
+
+        # Emails envoyés par une tâche de fond : l'employé désactivé et le récapitulatif RH
+        self.assertEqual(resultat['emails'], 2)
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox), ['EXP00001@test.com', 'EXP00005@test.com'])
+
+        # Un second balayage ne trouve plus rien
+        self.assertEqual(ExpirationContratsService.balayer()['contrats'], 0)
+
+    def test_pre_embauche_reste_active(self):
+        """Une pré-embauche sans contrat en cours reste active (StatusService.synchronize_status)."""
+        pre_embauche = self.create_employee(matricule='EXP00006', type_dossier='PRE')
+        contrat = self.create_contract(pre_embauche, type_contrat='CDD', date_fin=date.today() - timedelta(days=1))
+
+        resultat = ExpirationContratsService.balayer(matricules=['EXP00006'], notifier=False)
+
+        self.assertEqual((resultat['contrats'], resultat['employes_desactives']), (1, 0))
+        contrat.refresh_from_db()
+        self.assertFalse(contrat.actif)
+        self.assertEqual(self.etats()['EXP00006'], 'actif')
+
+    def test_dry_run(self):
+        """La simulation compte sans rien modifier ni notifier."""
+        with self.captureOnCommitCallbacks(execute=True):
+            resultat = ExpirationContratsService.balayer(dry_run=True)
+
+        self.assertEqual(resultat['contrats'], 2)
+        self.assertEqual(resultat['employes_desactives'], 1)
+        self.assertFalse(ZYCO.objects.filter(actif=False).exists())
+        self.assertEqual(self.etats()['EXP00001'], 'actif')
+        self.assertFalse(ZDLOG.objects.filter(RECORD_ID__startswith='EXPIRATION:').exists())
+        self.assertEqual(mail.outbox, [])
+
+    def test_selection_matricules(self):
+        """Le balayage peut être restreint à certains employés (middleware)."""
+        resultat = ExpirationContratsService.balayer(matricules=['EXP00002'], notifier=False)
+
+        self.assertEqual(resultat['contrats'], 1)
+        self.assertEqual(resultat['employes_desactives'], 0)
+        self.contrat_expire.refresh_from_db()
+        self.assertTrue(self.contrat_expire.actif)
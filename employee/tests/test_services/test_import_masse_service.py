@@ -0,0 +1,154 @@
+"""
+Tests pour ImportMasseService.
+"""
+import os
+import shutil
+import tempfile
+
+import pandas as pd
+from django.contrib.auth.models import User
+
+from employee.models import ZY00, ZYAF, ZYCO, ZYRE, UserSecurity
+from employee.services.import_masse_service import ImportMasseService
+from employee.tests.base import EmployeeTestCase
+
+
+def employe_excel(matricule, nom, prenoms, numero_id, type_dossier='SAL', **colonnes):
+    """Ligne de la feuille ZY00_Employes."""
+    ligne = {
+        'Matricule': matricule,
+        'Nom': nom,
+        'Prenoms': prenoms,
+        'Date_naissance': '1990-05-12 00:00:00',
+        'Sexe': 'm',
+        'Type_id': 'CNI',
+        'Numero_id': numero_id,
+        'Date_validite_id': '01/01/2020',
+        'Date_expiration_id': '2030-01-01',
+        'Type_dossier': type_dossier,
+    }
+    ligne.update(colonnes)
+    return ligne
+
+
+class ImportMasseServiceTestCase(EmployeeTestCase):
+    """Tests pour ImportMasseService."""
+
+    def setUp(self):
+        self.dossier = tempfile.mkdtemp()
+        self.fichier = os.path.join(self.dossier, 'import.xlsx')
+
+    def tearDown(self):
+        shutil.rmtree(self.dossier, ignore_errors=True)
+
+    def ecrire_classeur(self, **feuilles):
+        with pd.ExcelWriter(self.fichier, engine='openpyxl') as writer:
+            for nom_feuille, lignes in feuilles.items():
+                pd.DataFrame(lignes).to_excel(writer, sheet_name=nom_feuille, index=False)
+
+    def importer(self, **options):
+        return ImportMasseService(self.fichier, ecrire=lambda message: None, **options).executer()
+
+    def test_creation_puis_mise_a_jour_par_cle_naturelle(self):
+        """Un second import met à jour les lignes existantes sans les dupliquer."""
+        self.ecrire_classeur(
+            ZY00_Employes=[
+                employe_excel('BLK001', 'Dupont', 'jean marc', 'NUM001'),
+                employe_excel('BLK002', 'Martin', 'Anne', 'NUM002', type_dossier='PRE'),
+            ],
+            ZYCO_Contrats=[
+                {'Employe_MATRICULE': 'BLK001', 'Type_contrat': 'CDI', 'Date_debut': '2024-01-01'},
+            ],
+            ZYAF_Affectations=[
+                {'Employe_MATRICULE': 'BLK001', 'Poste_CODE': 'POST01', 'Date_debut': '2024-01-01'},
+            ],
+            ZYRE_RolesEmployes=[
+                {'Employe_MATRICULE': 'BLK001', 'Role_CODE': 'DRH', 'Date_debut': '2024-01-01'},
+            ],
+        )
+        self.role_drh.sync_to_django_group()
+
+        resultat = self.importer()
+
+        self.assertEqual(resultat['stats']['created'], 5)
+        self.assertEqual(resultat['erreurs'], [])
+        employe = ZY00.objects.get(matricule='BLK001')
+        self.assertEqual((employe.nom, employe.prenoms, employe.sexe), ('DUPONT', 'Jean marc', 'M'))
+        self.assertEqual(employe.etat, 'actif')
+        self.assertEqual(employe.user.username, 'dupont.jean')
+        self.assertTrue(employe.user.check_password('Hronian2024!'))
+        self.assertTrue(UserSecurity.objects.filter(user=employe.user).exists())
+        self.assertTrue(employe.user.groups.filter(pk=self.role_drh.django_group_id).exists())
+        self.assertIsNone(ZY00.objects.get(matricule='BLK002').user)
+
+        self.ecrire_classeur(
+            ZY00_Employes=[employe_excel('BLK001', 'Dupont', 'Jean', 'NUM001', Ville_naissance='abidjan')],
+            ZYCO_Contrats=[
+                {'Employe_MATRICULE': 'BLK001', 'Type_contrat': 'CDI', 'Date_debut': '2024-01-01',
+                 'Date_fin': '2024-06-30'},
+            ],
+        )
+        resultat = self.importer()
+
+        self.assertEqual(resultat['stats']['created'], 0)
+        self.assertEqual(resultat['stats']['updated'], 2)
+        employe.refresh_from_db()
+        self.assertEqual(employe.ville_naissance, 'Abidjan')
+        self.assertEqual(employe.etat, 'inactif')
+        self.assertEqual(ZYCO.objects.filter(employe=employe).count(), 1)
+        self.assertEqual(ZYAF.objects.filter(employe=employe).count(), 1)
+        self.assertEqual(ZYRE.objects.filter(employe=employe).count(), 1)
+        self.assertEqual(User.objects.filter(username__startswith='dupont.jean').count(), 1)
+
+    def test_lignes_invalides_rejetees(self):
+        """Les lignes invalides sont signalées sans bloquer les lignes valides."""
+        self.create_employee(matricule='EXIST01', numero_id='NUMPRIS')
+        self.ecrire_classeur(
+            ZY00_Employes=[
+                employe_excel('BLK010', 'Valide', 'Ligne', 'NUM010'),
+                employe_excel('BLK011', 'Date', 'Invalide', 'NUM011', Date_naissance='31/31/1990'),
+                employe_excel('BLK012', 'Sexe', 'Inconnu', 'NUM012', Sexe='X'),
+                employe_excel('BLK013', 'Identite', 'Prise', 'NUMPRIS'),
+                employe_excel('', 'Sans', 'Matricule', 'NUM014'),
+            ],
+            ZYCO_Contrats=[
+                {'Employe_MATRICULE': 'INCONNU', 'Type_contrat': 'CDI', 'Date_debut': '2024-01-01'},
+                {'Employe_MATRICULE': 'BLK010', 'Type_contrat': 'CDI', 'Date_debut': '2024-02-01',
+                 'Date_fin': '2024-01-01'},
+            ],
+        )
+
+        resultat = self.importer(create_users=False)
+
+        self.assertTrue(ZY00.objects.filter(matricule='BLK010').exists())
+        self.assertFalse(ZY00.objects.filter(matricule__in=['BLK011', 'BLK012', 'BLK013']).exists())
+        self.assertFalse(ZYCO.objects.exists())
+        erreurs = {(e['model'], e['line']): e for e in resultat['erreurs']}
+        self.assertIn('Date_naissance', erreurs[('ZY00', 3)]['error'])
+        self.assertIn('sexe', erreurs[('ZY00', 4)]['error'])
+        self.assertIn('Numero_id', erreurs[('ZY00', 5)]['error'])
+        self.assertTrue(erreurs[('ZY00', 6)]['skipped'])
+        self.assertIn('INCONNU', erreurs[('ZYCO', 2)]['error'])
+        self.assertIn('date_fin', erreurs[('ZYCO', 3)]['error'])
+        self.assertEqual(resultat['stats']['by_model']['ZY00'], {
+            'created': 1, 'updated': 0, 'errors': 3, 'skipped': 1
+        })
+
+    def test_historique_actif_et_simulation(self):
+        """L'historique actif donne le nom d'usage ; la simulation n'écrit rien."""
+        self.ecrire_classeur(
+            ZY00_Employes=[employe_excel('BLK020', 'Kouassi', 'Awa', 'NUM020')],
+            ZYNP_HistoriqueNoms=[
+                {'Employe_MATRICULE': 'BLK020', 'Nom': 'Kone', 'Prenoms': 'awa',
+                 'Date_debut_validite': '2023-01-01'},
+            ],
+        )
+
+        resultat = self.importer(dry_run=True)
+        self.assertEqual(resultat['stats']['created'], 2)
+        self.assertFalse(ZY00.objects.filter(matricule='BLK020').exists())
+        self.assertFalse(User.objects.exists())
+
+        self.importer(create_users=False)
+        employe = ZY00.objects.get(matricule='BLK020')
+        self.assertEqual((employe.username, employe.prenomuser), ('KONE', 'Awa'))
@@ -0,0 +1,144 @@
+# employee/tests/test_services/test_photo_service.py
+"""
+Tests pour PhotoService (miniatures et nettoyage des photos de profil).
+"""
+import os
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import override_settings
+from PIL import Image
+
+from employee.models import ZY00
+from employee.services.photo_service import PhotoService, TAILLES
+from employee.tests.base import EmployeeTestCase
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def image_televersee(couleur='red', taille=(400, 300), nom='photo.jpg'):
+    tampon = BytesIO()
+    Image.new('RGB', taille, couleur).save(tampon, 'JPEG')
+    return SimpleUploadedFile(nom, tampon.getvalue(), content_type='image/jpeg')
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class PhotoServiceTestCase(EmployeeTestCase):
+    """Tests pour les miniatures des photos de profil."""
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        # Fichiers propres à chaque test (le nettoyage ne touche que les photos remplacées)
+        self.addCleanup(shutil.rmtree, os.path.join(MEDIA_ROOT, PhotoService.dossier('MT000001')), ignore_errors=True)
+        self.employe = self.create_employee(matricule='MT000001')
+
+    def changer_photo(self, photo):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.employe.photo = photo
+            self.employe.save()
+
+    def test_miniatures_nommees_par_empreinte(self):
+        """Une nouvelle photo produit ses miniatures WebP et JPEG aux bonnes tailles."""
+        self.changer_photo(image_televersee())
+
+        empreinte = self.employe.photo_empreinte
+        self.assertEqual(len(empreinte), 16)
+        for taille, cote in TAILLES.items():
+            for format_image in ('webp', 'jpg'):
+                chemin = PhotoService.chemin_miniature('MT000001', empreinte, taille, format_image)
+                with default_storage.open(chemin) as fichier, Image.open(fichier) as image:
+                    self.assertEqual(image.size, (cote, cote))
+        self.assertIn(f"{empreinte}_avatar.webp", self.employe.get_avatar_url())
+
+    def test_photo_illisible_sans_empreinte(self):
+        """Sans miniatures (image illisible), l'avatar reste l'URL de la photo."""
+        self.changer_photo(SimpleUploadedFile('photo.jpg', b'pas une image', content_type='image/jpeg'))
+
+        self.assertEqual(self.employe.photo_empreinte, '')
+        self.employe.refresh_from_db()
+        self.assertEqual(self.employe.photo_empreinte, '')
+        self.assertEqual(self.employe.get_avatar_url(), self.employe.photo.url)
+
+    def test_remplacement_nettoie_l_ancienne_photo(self):
+        """L'ancienne photo et ses miniatures sont supprimées après remplacement."""
+        self.changer_photo(image_televersee('red'))
+        ancienne_photo = self.employe.photo.name
+        ancienne_empreinte = self.employe.photo_empreinte
+
+        # Rechargement : la photo initiale est mémorisée sans requête supplémentaire
+        self.employe = ZY00.objects.get(pk=self.employe.pk)
+        self.changer_photo(image_televersee('blue'))
+
+        self.assertNotEqual(self.employe.photo_empreinte, ancienne_empreinte)
+        self.assertFalse(default_storage.exists(ancienne_photo))
+        _, fichiers = default_storage.listdir(PhotoService.dossier('MT000001'))
+        self.assertEqual(len(fichiers), len(TAILLES) * 2)
+        self.assertTrue(all(f.startswith(self.employe.photo_empreinte) for f in fichiers))
+
+    def test_nettoyage_tardif_apres_deux_televersements(self):
+        """Le nettoyage d'un remplacement ne supprime que la photo remplacée, jamais la courante."""
+        from core.taches import lancer
+
+        self.changer_photo(image_televersee('red'))
+        rouge = self.employe.photo_empreinte
+        # Deux remplacements rapprochés : les tâches de nettoyage ne s'exécutent qu'ensuite
+        with self.captureOnCommitCallbacks() as nettoyages:
+            self.employe.photo = image_televersee('green')
+            self.employe.save()
+        vert = self.employe.photo_empreinte
+        with self.captureOnCommitCallbacks() as nettoyages_suivants:
+            self.employe.photo = image_televersee('blue')
+            self.employe.save()
+        bleu = self.employe.photo_empreinte
+
+        # Nettoyage du remplacement rouge -> vert exécuté après le téléversement bleu
+        with self.captureOnCommitCallbacks(execute=True):
+            for nettoyage in nettoyages + nettoyages_suivants:
+                nettoyage()
+
+        _, fichiers = default_storage.listdir(PhotoService.dossier('MT000001'))
+        self.assertEqual({fichier.split('_')[0] for fichier in fichiers}, {bleu})
+        self.assertEqual(len(fichiers), len(TAILLES) * 2)
+        self.assertTrue(default_storage.exists(self.employe.photo.name))
+        self.assertNotIn(rouge, {vert, bleu})
+
+        # Une tâche en retard qui désigne la photo courante ne la supprime pas
+        lancer('employee.nettoyer_photos', {
+            'matricule': 'MT000001', 'anciennes_photos': [self.employe.photo.name], 'empreintes_remplacees': [bleu],
+        })
+        self.assertTrue(default_storage.exists(PhotoService.chemin_miniature('MT000001', bleu)))
+        self.assertTrue(default_storage.exists(self.employe.photo.name))
+
+    def test_suppression_de_la_photo(self):
+        """Sans photo, les URL retombent sur l'avatar par défaut."""
+        self.changer_photo(image_televersee())
+        self.changer_photo(None)
+
+        self.assertEqual(self.employe.photo_empreinte, '')
+        self.assertEqual(self.employe.get_avatar_url(), self.employe.get_photo_url())
+        self.assertIn('default_', self.employe.get_avatar_url())
+        _, fichiers = default_storage.listdir(PhotoService.dossier('MT000001'))
+        self.assertEqual(fichiers, [])
+
+    def test_commande_de_rattrapage(self):
+        """La commande génère les miniatures d'une photo qui n'en a pas."""
+        self.changer_photo(image_televersee())
+        empreinte = self.employe.photo_empreinte
+        dossier = PhotoService.dossier('MT000001')
+        for fichier in default_storage.listdir(dossier)[1]:
+            default_storage.delete(f"{dossier}/{fichier}")
+        ZY00.objects.filter(pk=self.employe.pk).update(photo_empreinte='')
+
+        call_command('generer_miniatures_photos', stdout=StringIO())
+
+        self.employe.refresh_from_db()
+        self.assertEqual(self.employe.photo_empreinte, empreinte)
+        self.assertTrue(default_storage.exists(PhotoService.chemin_miniature('MT000001', empreinte)))
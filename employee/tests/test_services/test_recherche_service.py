@@ -0,0 +1,98 @@
+# employee/tests/test_services/test_recherche_service.py
+"""
+Tests pour RechercheEmployeService.
+"""
+import json
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import RequestFactory, override_settings
+from django.urls import reverse
+
+from employee.models import ZY00
+from employee.services.recherche_service import RechercheEmployeService, normaliser
+from employee.tests.base import EmployeeTestCase
+from employee.views_api.api import api_recherche_employes
+
+CACHE_LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+class RechercheEmployeServiceTestCase(EmployeeTestCase):
+    """Tests pour la recherche classée des employés."""
+
+    def setUp(self):
+        self.kone = self.create_employee(matricule='MT000001', nom='KONÉ', prenoms='Aïcha')
+        self.konan = self.create_employee(matricule='MT000002', nom='KONAN', prenoms='Éric')
+        self.yao = self.create_employee(matricule='MT000003', nom='YAO', prenoms='Konan Paul')
+        self.inactif = self.create_employee(matricule='MT000004', nom='KONATE', prenoms='Ali', etat='inactif')
+
+    def matricules(self, texte, queryset=None):
+        return [e.matricule for e in RechercheEmployeService.rechercher(texte, queryset)]
+
+    def test_normaliser(self):
+        """La normalisation retire accents, casse et ponctuation."""
+        self.assertEqual(normaliser(' Kouassi-Aké '), 'kouassi ake')
+
+    def test_recherche_insensible_aux_accents(self):
+        """« kone aicha » trouve « KONÉ Aïcha »."""
+        self.assertEqual(self.matricules('kone aicha'), ['MT000001'])
+        self.assertEqual(self.matricules('ERIC'), ['MT000002'])
+
+    def test_prefixe_et_classement(self):
+        """Le nom qui commence par la saisie passe avant les prénoms."""
+        resultats = self.matricules('kona')
+        self.assertEqual(set(resultats), {'MT000002', 'MT000003', 'MT000004'})
+        self.assertEqual(resultats[-1], 'MT000003')
+
+    def test_matricule_exact_en_premier(self):
+        """Un matricule saisi en entier est classé premier."""
+        self.assertEqual(self.matricules('mt000003')[0], 'MT000003')
+
+    def test_sous_chaine_sans_prefixe(self):
+        """Un mot qui n'est préfixe d'aucun mot est cherché en sous-chaîne."""
+        self.assertEqual(self.matricules('ich'), ['MT000001'])
+        self.assertEqual(self.matricules('kon aul'), ['MT000003'])
+        self.assertEqual(self.matricules('000002'), ['MT000002'])
+
+    def test_resultats_limites(self):
+        """Hors PostgreSQL, seuls les LIMITE_RESULTATS premiers sont renvoyés."""
+        with patch('employee.services.recherche_service.LIMITE_RESULTATS', 2):
+            self.assertEqual(self.matricules('kon'), ['MT000002', 'MT000004'])
+
+    def test_queryset_restreint(self):
+        """La recherche respecte le queryset fourni."""
+        self.assertNotIn('MT000004', self.matricules('kona', ZY00.objects.filter(etat='actif')))
+        self.assertEqual(self.matricules('inconnu'), [])
+
+    def test_filtrer_lies(self):
+        """filtrer_lies restreint des objets liés par une sous-requête."""
+        self.create_user_for_employee(self.kone)
+        employes = RechercheEmployeService.filtrer_lies(
+            User.objects.filter(employe__isnull=False), 'koné', champ='employe'
+        )
+        self.assertEqual([u.employe.matricule for u in employes], ['MT000001'])
+
+    @override_settings(CACHES=CACHE_LOCMEM)
+    def test_autocompletion_cache_et_invalidation(self):
+        """Les suggestions sont mises en cache puis invalidées à l'enregistrement."""
+        cache.clear()
+        self.assertEqual(RechercheEmployeService.autocompletion('k'), [])
+
+        resultats = RechercheEmployeService.autocompletion('kon')
+        self.assertEqual({r['id'] for r in resultats}, {'MT000001', 'MT000002', 'MT000003'})
+
+        with self.assertNumQueries(0):
+            RechercheEmployeService.autocompletion('kon')
+
+        self.create_employee(matricule='MT000005', nom='KONDO', prenoms='Jean')
+        resultats = RechercheEmployeService.autocompletion('kon')
+        self.assertIn('MT000005', {r['id'] for r in resultats})
+
+    def test_api_recherche_employes(self):
+        """L'API renvoie les suggestions au format des sélecteurs."""
+        requete = RequestFactory().get(reverse('employee:api_recherche_employes'), {'q': 'yao', 'limite': 500})
+        requete.user = User.objects.create_user(username='drh', password='testpass123')
+        reponse = api_recherche_employes(requete)
+        self.assertEqual(reponse.status_code, 200)
+        self.assertEqual(json.loads(reponse.content)['results'][0]['text'], 'YAO Konan Paul (MT000003)')
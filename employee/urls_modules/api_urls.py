@@ -58,6 +58,7 @@ from employee.views_api.api import (
     supprimer_photo_ajax,
     # Helper
     api_postes_by_departement,
+    api_recherche_employes,
 )
 
 urlpatterns = [
@@ -97,6 +98,7 @@ urlpatterns = [
 
     # ===== API Helper =====
     path('api/postes/', api_postes_by_departement, name='api_postes_by_departement'),
+    path('api/employes/recherche/', api_recherche_employes, name='api_recherche_employes'),
 
     # ===== API Famille (ZYFA) =====
     path('api/famille/create/', api_famille_create_modal, name='api_famille_create'),
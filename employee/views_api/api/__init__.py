@@ -98,6 +98,7 @@ from .photo_api import (
 # Helpers
 from .helper_api import (
     api_postes_by_departement,
+    api_recherche_employes,
 )
 
 
@@ -174,4 +175,5 @@ __all__ = [
 
     # Helpers
     'api_postes_by_departement',
+    'api_recherche_employes',
 ]
@@ -6,6 +6,10 @@ from django.http import JsonResponse
 from django.contrib.auth.decorators import login_required
 
 from departement.models import ZDPO
+from employee.services.recherche_service import LIMITE_AUTOCOMPLETION, RechercheEmployeService
+
+# Nombre maximal de suggestions demandées par un sélecteur
+LIMITE_MAX_AUTOCOMPLETION = 50
 
 
 @login_required
@@ -32,3 +36,24 @@ def api_postes_by_departement(request):
         return JsonResponse(data, safe=False)
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=400)
+
+
+@login_required
+def api_recherche_employes(request):
+    """
+    Autocomplétion des sélecteurs d'employés.
+
+    Paramètres GET : q (saisie), limite, actifs (0 pour inclure les inactifs).
+    """
+    try:
+        limite = int(request.GET.get('limite', LIMITE_AUTOCOMPLETION))
+    except ValueError:
+        limite = LIMITE_AUTOCOMPLETION
+    limite = min(max(limite, 1), LIMITE_MAX_AUTOCOMPLETION)
+
+    resultats = RechercheEmployeService.autocompletion(
+        request.GET.get('q', ''),
+        limite=limite,
+        actifs=request.GET.get('actifs', '1') != '0'
+    )
+    return JsonResponse({'results': resultats})
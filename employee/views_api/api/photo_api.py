@@ -3,7 +3,6 @@
 API pour la gestion des photos de profil employé.
 """
 import os
-import time
 import logging
 
 from django.http import JsonResponse
@@ -54,27 +53,18 @@ def modifier_photo_ajax(request):
                 'error': f'Format non autorisé. Formats acceptés: {", ".join(VALID_PHOTO_EXTENSIONS)}'
             })
 
-        # Supprimer l'ancienne photo si elle existe
-        if employe.photo:
-            try:
-                if os.path.isfile(employe.photo.path):
-                    os.remove(employe.photo.path)
-            except Exception:
-                pass  # Ignorer les erreurs de suppression
-
-        # Enregistrer la nouvelle photo
+        # Enregistrer la nouvelle photo : miniatures générées, ancienne photo
+        # supprimée en tâche de fond (ZY00.save)
         employe.photo = photo
         employe.save()
 
-        # Ajouter timestamp à l'URL pour forcer le refresh du cache navigateur
-        timestamp = int(time.time())
-        photo_url_with_timestamp = f"{employe.photo.url}?t={timestamp}"
-
         logger.info(f"Photo modifiée pour {employe.matricule}")
 
         return JsonResponse({
             'success': True,
-            'photo_url': photo_url_with_timestamp,
+            # Noms de fichiers uniques : pas de contournement du cache nécessaire
+            'photo_url': employe.photo.url,
+            'avatar_url': employe.get_avatar_url(),
             **get_active_tab_for_ajax(request)
         })
 
@@ -93,15 +83,8 @@ def supprimer_photo_ajax(request, uuid):
     try:
         employe = get_object_or_404(ZY00, uuid=uuid)
 
-        # Supprimer le fichier photo
-        if employe.photo:
-            try:
-                if os.path.isfile(employe.photo.path):
-                    os.remove(employe.photo.path)
-            except Exception:
-                pass
-
-        # Supprimer la référence dans la base de données
+        # Supprimer la référence ; le fichier et ses miniatures sont
+        # supprimés en tâche de fond (ZY00.save)
         employe.photo = None
         employe.save()
 
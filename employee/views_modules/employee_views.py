@@ -2,7 +2,6 @@
 """
 Vues CRUD pour les employés (ZY00).
 """
-from django.db.models import Q
 from django.views.generic import ListView, CreateView, UpdateView, DeleteView
 from django.urls import reverse, reverse_lazy
 from django.http import Http404
@@ -13,6 +12,7 @@ from django.contrib import messages
 from employee.decorators import DRHOrAdminRequiredMixin
 from employee.models import ZY00
 from employee.forms import ZY00Form
+from employee.services.recherche_service import RechercheEmployeService
 from employee.utils import get_redirect_url_with_tab
 
 
@@ -32,14 +32,10 @@ class EmployeListView(LoginRequiredMixin, DRHOrAdminRequiredMixin, ListView):
         if type_dossier:
             queryset = queryset.filter(type_dossier=type_dossier)
 
-        # Recherche par nom ou matricule
+        # Recherche par nom ou matricule, classée par pertinence
         search = self.request.GET.get('search')
         if search:
-            queryset = queryset.filter(
-                Q(nom__icontains=search) |
-                Q(prenoms__icontains=search) |
-                Q(matricule__icontains=search)
-            )
+            return RechercheEmployeService.rechercher(search, queryset)
 
         return queryset.order_by('-matricule')
 
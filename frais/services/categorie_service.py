@@ -2,6 +2,7 @@
 """
 Service pour la gestion des catégories de frais.
 """
+import copy
 from decimal import Decimal
 from typing import Optional, List
 from django.db import transaction
@@ -9,6 +10,11 @@ from django.db.models import QuerySet
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 
+from core.cache import FamilleCache
+
+# Plafonds actifs : cache mémoire du processus devant Redis
+CACHE_PLAFONDS = FamilleCache('frais.plafonds_actifs', tags=['frais.nfpl'], locale=1)
+
 
 class CategorieService:
     """Service pour les opérations sur les catégories de frais."""
@@ -163,18 +169,14 @@ class CategorieService:
         Returns:
             Instance NFPL ou None
         """
-        from frais.models import NFPL
-        from django.db.models import Q
-
         if date is None:
             date = timezone.now().date()
 
-        # Filtre de base: catégorie, statut actif, période valide
-        base_filter = Q(
-            CATEGORIE=categorie,
-            STATUT=True,
-            DATE_DEBUT__lte=date
-        ) & (Q(DATE_FIN__isnull=True) | Q(DATE_FIN__gte=date))
+        # Plafonds actifs de la catégorie en période valide, du plus récent au plus ancien
+        plafonds = [
+            plafond for plafond in CategorieService._plafonds_actifs().get(categorie.pk, ())
+            if plafond.DATE_DEBUT <= date and (plafond.DATE_FIN is None or plafond.DATE_FIN >= date)
+        ]
 
         # Si employé fourni, chercher un plafond spécifique à son grade
         if employe:
@@ -182,25 +184,37 @@ class CategorieService:
 
             if grade_employe:
                 # Chercher d'abord un plafond spécifique au grade
-                plafond_grade = NFPL.objects.filter(
-                    base_filter,
-                    GRADE__iexact=grade_employe
-                ).order_by('-DATE_DEBUT').first()
+                plafond_grade = next(
+                    (p for p in plafonds if p.GRADE and p.GRADE.lower() == grade_employe.lower()), None
+                )
 
                 if plafond_grade:
-                    return plafond_grade
+                    return copy.copy(plafond_grade)
 
         # Plafond général (sans grade spécifique)
-        plafond_general = NFPL.objects.filter(
-            base_filter,
-            GRADE__isnull=True
-        ).order_by('-DATE_DEBUT').first()
+        plafond_general = next((p for p in plafonds if p.GRADE is None), None)
 
         if plafond_general:
-            return plafond_general
+            return copy.copy(plafond_general)
 
         # Fallback: premier plafond disponible (avec ou sans grade)
-        return NFPL.objects.filter(base_filter).order_by('-DATE_DEBUT').first()
+        return copy.copy(plafonds[0]) if plafonds else None
+
+    @staticmethod
+    def _plafonds_actifs():
+        """
+        Plafonds actifs groupés par catégorie (triés par DATE_DEBUT
+        décroissante), en cache : lus à chaque contrôle de ligne de frais.
+        """
+        from frais.models import NFPL
+
+        def charger():
+            plafonds = {}
+            for plafond in NFPL.objects.filter(STATUT=True).select_related('CATEGORIE').order_by('-DATE_DEBUT'):
+                plafonds.setdefault(plafond.CATEGORIE_id, []).append(plafond)
+            return plafonds
+
+        return CACHE_PLAFONDS.obtenir(charger)
 
     @staticmethod
     def _get_grade_employe(employe):
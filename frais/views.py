@@ -2,19 +2,15 @@
 """
 Vues pour le module Notes de Frais.
 """
-from django.conf import settings
-from django.core.cache import cache
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.http import JsonResponse, HttpResponseForbidden, HttpResponse
 from django.views.decorators.http import require_POST, require_GET
 from django.core.paginator import Paginator
-from django.db.models import Q, Sum
+from django.db.models import Sum
 from django.utils import timezone
 from datetime import datetime
-
-_CACHE_TTL = getattr(settings, 'CACHE_TTL_STATS', 3600)
 import openpyxl
 from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
 from openpyxl.utils import get_column_letter
@@ -30,6 +26,13 @@ from frais.services import (
     NoteFraisService, AvanceService, CategorieService,
     ValidationFraisService, StatistiquesFraisService
 )
+from employee.services.recherche_service import RechercheEmployeService
+from core.cache import FamilleCache
+
+# Statistiques de frais : par (employé, année) et globales par année,
+# invalidées par toute modification des notes, lignes, avances ou catégories
+CACHE_STATS_EMPLOYE = FamilleCache('frais.stats_employe', tags=['frais'])
+CACHE_STATS_GLOBALES = FamilleCache('frais.stats_globales', tags=['frais', 'employee.zy00'])
 
 
 # =============================================================================
@@ -591,7 +594,7 @@ def notes_a_rembourser(request):
 
 @login_required
 def statistiques_frais(request):
-    """Page des statistiques (résultats mis en cache 1 h par employé/année)."""
+    """Page des statistiques (résultats en cache par employé/année, invalidé par tags)."""
     employe = request.user.employe
     annee_courante = timezone.now().year
     annee = int(request.GET.get('annee', annee_courante))
@@ -599,16 +602,12 @@ def statistiques_frais(request):
     annees_disponibles = list(range(2020, annee_courante + 1))
 
     # Statistiques personnelles — cache par (employé, année)
-    user_cache_key = f'frais_stats_user_{employe.matricule}_{annee}'
-    user_stats = cache.get(user_cache_key)
-    if user_stats is None:
-        user_stats = {
-            'mes_stats': StatistiquesFraisService.get_stats_employe(employe, annee),
-            'stats_par_categorie': StatistiquesFraisService.get_stats_par_categorie(
-                annee, employe
-            ),
-        }
-        cache.set(user_cache_key, user_stats, _CACHE_TTL)
+    user_stats = CACHE_STATS_EMPLOYE.obtenir(lambda: {
+        'mes_stats': StatistiquesFraisService.get_stats_employe(employe, annee),
+        'stats_par_categorie': StatistiquesFraisService.get_stats_par_categorie(
+            annee, employe
+        ),
+    }, employe.matricule, annee)
 
     context = {
         'annee': annee,
@@ -618,17 +617,12 @@ def statistiques_frais(request):
 
     if _peut_valider(employe):
         # Statistiques globales — cache partagé par année (tous les valideurs voient la même chose)
-        global_cache_key = f'frais_stats_global_{annee}'
-        global_stats = cache.get(global_cache_key)
-        if global_stats is None:
-            global_stats = {
-                'stats_globales': StatistiquesFraisService.get_stats_globales(annee),
-                'evolution': StatistiquesFraisService.get_evolution_mensuelle(annee),
-                'top_employes': StatistiquesFraisService.get_top_employes(annee),
-                'delais': StatistiquesFraisService.get_delai_moyen_traitement(annee),
-            }
-            cache.set(global_cache_key, global_stats, _CACHE_TTL)
-        context.update(global_stats)
+        context.update(CACHE_STATS_GLOBALES.obtenir(lambda: {
+            'stats_globales': StatistiquesFraisService.get_stats_globales(annee),
+            'evolution': StatistiquesFraisService.get_evolution_mensuelle(annee),
+            'top_employes': StatistiquesFraisService.get_top_employes(annee),
+            'delais': StatistiquesFraisService.get_delai_moyen_traitement(annee),
+        }, annee))
 
     return render(request, 'frais/statistiques.html', context)
 
@@ -825,11 +819,7 @@ def admin_notes_validees(request):
         notes = notes.filter(DATE_VALIDATION__month=int(mois))
 
     if employe_filtre:
-        notes = notes.filter(
-            Q(EMPLOYE__matricule__icontains=employe_filtre) |
-            Q(EMPLOYE__nom__icontains=employe_filtre) |
-            Q(EMPLOYE__prenoms__icontains=employe_filtre)
-        )
+        notes = RechercheEmployeService.filtrer_lies(notes, employe_filtre, champ='EMPLOYE')
 
     # Tri
     notes = notes.order_by(tri)
@@ -899,11 +889,7 @@ def export_notes_validees_excel(request):
         notes = notes.filter(DATE_VALIDATION__month=int(mois))
 
     if employe_filtre:
-        notes = notes.filter(
-            Q(EMPLOYE__matricule__icontains=employe_filtre) |
-            Q(EMPLOYE__nom__icontains=employe_filtre) |
-            Q(EMPLOYE__prenoms__icontains=employe_filtre)
-        )
+        notes = RechercheEmployeService.filtrer_lies(notes, employe_filtre, champ='EMPLOYE')
 
     notes = notes.order_by('-DATE_VALIDATION')
 
@@ -1006,11 +992,7 @@ def admin_avances_approuvees(request):
         avances = avances.filter(DATE_APPROBATION__month=int(mois))
 
     if employe_filtre:
-        avances = avances.filter(
-            Q(EMPLOYE__matricule__icontains=employe_filtre) |
-            Q(EMPLOYE__nom__icontains=employe_filtre) |
-            Q(EMPLOYE__prenoms__icontains=employe_filtre)
-        )
+        avances = RechercheEmployeService.filtrer_lies(avances, employe_filtre, champ='EMPLOYE')
 
     if statut_filtre:
         avances = avances.filter(STATUT=statut_filtre)
@@ -1083,11 +1065,7 @@ def export_avances_approuvees_excel(request):
         avances = avances.filter(DATE_APPROBATION__month=int(mois))
 
     if employe_filtre:
-        avances = avances.filter(
-            Q(EMPLOYE__matricule__icontains=employe_filtre) |
-            Q(EMPLOYE__nom__icontains=employe_filtre) |
-            Q(EMPLOYE__prenoms__icontains=employe_filtre)
-        )
+        avances = RechercheEmployeService.filtrer_lies(avances, employe_filtre, champ='EMPLOYE')
 
     if statut_filtre:
         avances = avances.filter(STATUT=statut_filtre)
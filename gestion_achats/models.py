@@ -2,6 +2,7 @@
 Modèles de données pour le module Gestion des Achats & Commandes (GAC).
 """
 
+import copy
 import uuid
 from decimal import Decimal
 from django.db import models
@@ -10,6 +11,7 @@ from django.core.validators import MinValueValidator, EmailValidator
 from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelation
 from django.contrib.contenttypes.models import ContentType
 
+from core.cache import FamilleCache
 from employee.models import ZY00
 from departement.models import ZDDE
 from project_management.models import JRProject
@@ -2299,6 +2301,10 @@ class GACHistorique(models.Model):
 # MODÈLE: GACParametres (Singleton)
 # ==============================================================================
 
+# Lu à chaque demande d'achat : cache mémoire du processus devant Redis
+CACHE_PARAMETRES = FamilleCache('gestion_achats.parametres', tags=['gestion_achats.gacparametres'], locale=1)
+
+
 class GACParametres(models.Model):
     """
     Modèle singleton pour stocker les paramètres de configuration du module GAC.
@@ -2365,9 +2371,7 @@ class GACParametres(models.Model):
         return f"Paramètres GAC (Seuil N2: {self.seuil_validation_n2} FCFA)"
     
     def save(self, *args, **kwargs):
-        """Surcharge save pour implémenter le pattern singleton et invalider le cache."""
-        from django.core.cache import cache
-        
+        """Surcharge save pour implémenter le pattern singleton."""
         # Pattern singleton : une seule instance autorisée
         if not self.pk and GACParametres.objects.exists():
             # Si on essaie de créer une nouvelle instance alors qu'une existe déjà
@@ -2375,26 +2379,18 @@ class GACParametres(models.Model):
             existing = GACParametres.objects.first()
             self.pk = existing.pk
         
+        # Le cache (CACHE_PARAMETRES) est invalidé par le signal post_save
         super().save(*args, **kwargs)
-        
-        # Invalider le cache après modification
-        cache.delete('gac_parametres')
     
     @classmethod
     def get_parametres(cls):
         """
-        Récupère les paramètres (avec cache).
+        Récupère les paramètres (cache mémoire du processus, puis Redis).
         
         Returns:
-            GACParametres: L'instance unique des paramètres
+            GACParametres: L'instance unique des paramètres (copie modifiable)
         """
-        from django.core.cache import cache
-        
-        # Essayer de récupérer depuis le cache
-        parametres = cache.get('gac_parametres')
-        
-        if parametres is None:
-            # Si pas en cache, récupérer depuis la DB
+        def charger():
             parametres, created = cls.objects.get_or_create(
                 pk=1,
                 defaults={
@@ -2404,11 +2400,10 @@ class GACParametres(models.Model):
                     'notifier_validateurs': True,
                 }
             )
-            
-            # Mettre en cache pour 1 heure
-            cache.set('gac_parametres', parametres, 3600)
+            return parametres
         
-        return parametres
+        # L'instance en cache est partagée : les formulaires reçoivent une copie
+        return copy.copy(CACHE_PARAMETRES.obtenir(charger))
     
     @classmethod
     def get_seuil_validation_n2(cls):
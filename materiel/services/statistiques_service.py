@@ -274,15 +274,12 @@ class StatistiquesMaterielService:
             ETAT__in=['DEFAILLANT', 'HORS_SERVICE']
         ).exclude(STATUT='REFORME')
 
-        return {
+        alertes = {
             'garanties_expirant': list(garanties_expirant),
             'prets_retard': list(prets_retard),
             'maintenances_retard': list(maintenances_retard),
             'materiel_defaillant': list(materiel_defaillant),
-            'nb_alertes': (
-                garanties_expirant.count() +
-                prets_retard.count() +
-                maintenances_retard.count() +
-                materiel_defaillant.count()
-            ),
         }
+        # Listes déjà évaluées : pas de COUNT supplémentaire
+        alertes['nb_alertes'] = sum(len(liste) for liste in alertes.values())
+        return alertes
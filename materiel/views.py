@@ -3,8 +3,6 @@
 Vues pour le module Suivi du Matériel & Parc.
 """
 from decimal import Decimal
-from django.conf import settings
-from django.core.cache import cache
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
@@ -16,8 +14,7 @@ from django.views.decorators.http import require_POST, require_GET
 import openpyxl
 from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
 
-_CACHE_TTL = getattr(settings, 'CACHE_TTL_DASHBOARD', 300)
-
+from core.cache import FamilleCache
 from materiel.models import MTCA, MTFO, MTMT, MTAF, MTMV, MTMA
 from materiel.forms import (
     MTCAForm, MTFOForm, MTMTForm, MTMTEditForm,
@@ -26,6 +23,10 @@ from materiel.forms import (
 )
 from materiel.services import MaterielService, StatistiquesMaterielService
 from employee.models import ZY00
+from employee.services.recherche_service import RechercheEmployeService
+
+# Statistiques du dashboard : invalidées par toute modification du parc
+CACHE_DASHBOARD = FamilleCache('materiel.dashboard', tags=['materiel', 'employee.zy00'])
 
 
 def _peut_gerer_materiel(employe):
@@ -48,31 +49,29 @@ def _peut_affecter_materiel(employe):
 
 @login_required
 def dashboard(request):
-    """Dashboard du module matériel (statistiques mises en cache Redis 5 min)."""
+    """Dashboard du module matériel (statistiques en cache, invalidé par tags)."""
     employe = getattr(request.user, 'employe', None)
     if not _peut_gerer_materiel(employe) and not _peut_affecter_materiel(employe):
         messages.error(request, "Vous n'avez pas accès à ce module.")
         return redirect('home')
 
-    # Statistiques globales : cachées (calculs coûteux, données stables)
-    stats_cache_key = 'materiel_dashboard_stats'
-    cached = cache.get(stats_cache_key)
-    if cached is None:
-        cached = {
-            'stats': StatistiquesMaterielService.get_stats_globales(),
-            'stats_categories': StatistiquesMaterielService.get_stats_par_categorie(),
-            'alertes': StatistiquesMaterielService.get_alertes(),
-            'valeur_parc': StatistiquesMaterielService.get_valeur_parc(),
-            'dernieres_acquisitions': list(
-                MTMT.objects.exclude(STATUT='REFORME').order_by('-DATE_ACQUISITION')[:5]
-            ),
-            'maintenances_a_venir': list(
-                MTMA.objects.filter(
-                    STATUT='PLANIFIE', DATE_PLANIFIEE__gte=timezone.now().date()
-                ).order_by('DATE_PLANIFIEE')[:5]
-            ),
-        }
-        cache.set(stats_cache_key, cached, _CACHE_TTL)
+    # Statistiques globales : cachées (calculs coûteux), invalidées à chaque
+    # modification du parc ; la date borne les alertes et maintenances à venir
+    aujourd_hui = timezone.now().date()
+    cached = CACHE_DASHBOARD.obtenir(lambda: {
+        'stats': StatistiquesMaterielService.get_stats_globales(),
+        'stats_categories': StatistiquesMaterielService.get_stats_par_categorie(),
+        'alertes': StatistiquesMaterielService.get_alertes(),
+        'valeur_parc': StatistiquesMaterielService.get_valeur_parc(),
+        'dernieres_acquisitions': list(
+            MTMT.objects.exclude(STATUT='REFORME').order_by('-DATE_ACQUISITION')[:5]
+        ),
+        'maintenances_a_venir': list(
+            MTMA.objects.filter(
+                STATUT='PLANIFIE', DATE_PLANIFIEE__gte=aujourd_hui
+            ).order_by('DATE_PLANIFIEE')[:5]
+        ),
+    }, aujourd_hui.isoformat())
 
     context = {**cached, 'peut_gerer': _peut_gerer_materiel(employe)}
     return render(request, 'materiel/dashboard.html', context)
@@ -758,27 +757,7 @@ def export_materiels_excel(request):
 @require_GET
 def api_search_employes(request):
     """Recherche d'employés pour autocomplete."""
-    query = request.GET.get('q', '').strip()
-    if len(query) < 2:
-        return JsonResponse({'results': []})
-
-    employes = ZY00.objects.filter(
-        Q(nom__icontains=query) |
-        Q(prenoms__icontains=query) |
-        Q(matricule__icontains=query)
-    ).filter(etat='actif')[:10]
-
-    results = [
-        {
-            'id': emp.matricule,
-            'text': f"{emp.nom} {emp.prenoms} ({emp.matricule})",
-            'matricule': emp.matricule,
-            'nom': emp.nom,
-            'prenoms': emp.prenoms,
-        }
-        for emp in employes
-    ]
-
+    results = RechercheEmployeService.autocompletion(request.GET.get('q', ''))
     return JsonResponse({'results': results})
 
 
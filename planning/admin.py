@@ -2,7 +2,10 @@
 Admin pour le module Planning simplifié.
 """
 from django.contrib import admin
-from .models import SiteTravail, PosteTravail, Planning, Affectation, Evenement
+from .models import (
+    SiteTravail, PosteTravail, Planning, Affectation, Evenement,
+    ModeleRotation, MembreRotation, CreneauRotation,
+)
 
 
 @admin.register(SiteTravail)
@@ -66,3 +69,33 @@ class EvenementAdmin(admin.ModelAdmin):
 
     def get_queryset(self, request):
         return super().get_queryset(request).select_related('created_by')
+
+
+class MembreRotationInline(admin.TabularInline):
+    model = MembreRotation
+    extra = 1
+    autocomplete_fields = ['employe']
+
+
+class CreneauRotationInline(admin.TabularInline):
+    model = CreneauRotation
+    extra = 1
+
+
+@admin.register(ModeleRotation)
+class ModeleRotationAdmin(admin.ModelAdmin):
+    """Admin pour les modeles de rotation (generation des affectations)."""
+    list_display = ['nom', 'poste', 'nombre_semaines', 'decalage', 'date_reference', 'is_active']
+    list_filter = ['is_active', 'poste__site']
+    search_fields = ['nom', 'poste__nom']
+    ordering = ['poste', 'nom']
+    readonly_fields = ['uuid', 'created_at', 'updated_at']
+    inlines = [MembreRotationInline, CreneauRotationInline]
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('poste', 'poste__site')
+
+    def save_model(self, request, obj, form, change):
+        if not change:
+            obj.created_by = request.user
+        super().save_model(request, obj, form, change)
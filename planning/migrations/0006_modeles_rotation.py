@@ -0,0 +1,82 @@
+# Generated by Django 5.0.6 on 2026-10-19 03:38
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0004_photo_empreinte'),
+        ('planning', '0005_planning_departement'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MembreRotation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ordre', models.PositiveSmallIntegerField(default=0, verbose_name='Rang')),
+                ('employe', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rotations_planning', to='employee.zy00', verbose_name='Employe')),
+            ],
+            options={
+                'verbose_name': 'Membre de rotation',
+                'verbose_name_plural': 'Membres de rotation',
+                'db_table': 'planning_membre_rotation',
+                'ordering': ['ordre'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ModeleRotation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('uuid', models.UUIDField(default=uuid.uuid4, editable=False, unique=True)),
+                ('nom', models.CharField(max_length=100, verbose_name='Nom du modele')),
+                ('nombre_semaines', models.PositiveSmallIntegerField(default=1, help_text='Nombre de semaines avant que les creneaux se repetent', verbose_name='Cycle (semaines)')),
+                ('decalage', models.PositiveSmallIntegerField(default=1, help_text='Rangs de decalage des membres a chaque semaine (0 : pas de rotation)', verbose_name='Decalage de rotation')),
+                ('date_reference', models.DateField(help_text='Une date de la premiere semaine du cycle', verbose_name='Debut du cycle')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Actif')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='modeles_rotation_crees', to=settings.AUTH_USER_MODEL, verbose_name='Cree par')),
+                ('employes', models.ManyToManyField(related_name='modeles_rotation', through='planning.MembreRotation', to='employee.zy00', verbose_name='Membres de la rotation')),
+                ('poste', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='modeles_rotation', to='planning.postetravail', verbose_name='Poste de travail')),
+            ],
+            options={
+                'verbose_name': 'Modele de rotation',
+                'verbose_name_plural': 'Modeles de rotation',
+                'db_table': 'planning_modele_rotation',
+                'ordering': ['poste', 'nom'],
+            },
+        ),
+        migrations.AddField(
+            model_name='membrerotation',
+            name='modele',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='membres', to='planning.modelerotation', verbose_name='Modele'),
+        ),
+        migrations.CreateModel(
+            name='CreneauRotation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('semaine', models.PositiveSmallIntegerField(blank=True, help_text='1 a N ; vide : toutes les semaines', null=True, verbose_name='Semaine du cycle')),
+                ('jour_semaine', models.PositiveSmallIntegerField(choices=[(0, 'Lundi'), (1, 'Mardi'), (2, 'Mercredi'), (3, 'Jeudi'), (4, 'Vendredi'), (5, 'Samedi'), (6, 'Dimanche')], verbose_name='Jour')),
+                ('rang', models.PositiveSmallIntegerField(default=0, help_text='Membre de la rotation occupant le creneau la premiere semaine', verbose_name='Rang')),
+                ('heure_debut', models.TimeField(blank=True, help_text='Vide : horaires du poste', null=True, verbose_name='Heure de debut')),
+                ('heure_fin', models.TimeField(blank=True, null=True, verbose_name='Heure de fin')),
+                ('modele', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='creneaux', to='planning.modelerotation', verbose_name='Modele')),
+            ],
+            options={
+                'verbose_name': 'Creneau de rotation',
+                'verbose_name_plural': 'Creneaux de rotation',
+                'db_table': 'planning_creneau_rotation',
+                'ordering': ['semaine', 'jour_semaine', 'heure_debut'],
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='membrerotation',
+            unique_together={('modele', 'employe')},
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.0.6 on 2026-10-19 04:05
+
+from django.db import migrations
+
+# Creneau d'une affectation ; les postes de nuit (fin <= debut) sont hors contrainte
+CRENEAU = 'tsrange("date" + "heure_debut", "date" + "heure_fin")'
+CONDITION = '"statut" <> \'ANNULE\' AND "heure_fin" > "heure_debut"'
+
+SQL_CHEVAUCHEMENTS_EXISTANTS = (
+    'SELECT EXISTS (SELECT 1 FROM "planning_affectation" a '
+    'JOIN "planning_affectation" b ON a."employe_id" = b."employe_id" AND a."date" = b."date" '
+    'AND a."id" < b."id" '
+    'WHERE a."statut" <> \'ANNULE\' AND b."statut" <> \'ANNULE\' '
+    'AND a."heure_fin" > a."heure_debut" AND b."heure_fin" > b."heure_debut" '
+    'AND a."heure_debut" < b."heure_fin" AND b."heure_debut" < a."heure_fin")'
+)
+
+SQL_CONTRAINTE = (
+    'ALTER TABLE "planning_affectation" ADD CONSTRAINT "planning_affectation_sans_chevauchement" '
+    f'EXCLUDE USING GIST ("employe_id" WITH =, ({CRENEAU}) WITH &&) WHERE ({CONDITION})'
+)
+
+SQL_INDEX = (
+    'CREATE INDEX IF NOT EXISTS "planning_affectation_creneau_gist" ON "planning_affectation" '
+    f'USING GIST ("employe_id", ({CRENEAU})) WHERE ({CONDITION})'
+)
+
+SQL_SUPPRESSION = [
+    'ALTER TABLE "planning_affectation" DROP CONSTRAINT IF EXISTS "planning_affectation_sans_chevauchement"',
+    'DROP INDEX IF EXISTS "planning_affectation_creneau_gist"',
+]
+
+
+def installer(apps, schema_editor):
+    """
+    Contrainte d'exclusion GiST : pas deux affectations actives d'un meme
+    employe sur des creneaux qui se chevauchent (PostgreSQL uniquement).
+    Si la table contient deja des chevauchements, seul l'index est cree ; la
+    contrainte pourra etre posee apres correction des donnees.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+        cursor.execute(SQL_CHEVAUCHEMENTS_EXISTANTS)
+        cursor.execute(SQL_INDEX if cursor.fetchone()[0] else SQL_CONTRAINTE)
+
+
+def supprimer(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for sql in SQL_SUPPRESSION:
+            cursor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planning', '0006_modeles_rotation'),
+    ]
+
+    operations = [
+        migrations.RunPython(installer, supprimer),
+    ]
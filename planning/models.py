@@ -368,3 +368,139 @@ class Evenement(models.Model):
 
     def __str__(self):
         return f"{self.titre} ({self.get_type_evenement_display()})"
+
+
+class ModeleRotation(models.Model):
+    """
+    Modele hebdomadaire de rotation d'un poste de travail.
+
+    Les creneaux (jour, heures, rang) sont repetes chaque semaine du
+    cycle ; le rang d'un creneau designe un membre de la rotation, decale
+    de `decalage` rangs a chaque semaine (0 : affectation fixe).
+    """
+
+    uuid = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
+    nom = models.CharField(max_length=100, verbose_name="Nom du modele")
+    poste = models.ForeignKey(
+        PosteTravail,
+        on_delete=models.CASCADE,
+        related_name='modeles_rotation',
+        verbose_name="Poste de travail"
+    )
+    nombre_semaines = models.PositiveSmallIntegerField(
+        default=1,
+        verbose_name="Cycle (semaines)",
+        help_text="Nombre de semaines avant que les creneaux se repetent"
+    )
+    decalage = models.PositiveSmallIntegerField(
+        default=1,
+        verbose_name="Decalage de rotation",
+        help_text="Rangs de decalage des membres a chaque semaine (0 : pas de rotation)"
+    )
+    date_reference = models.DateField(
+        verbose_name="Debut du cycle",
+        help_text="Une date de la premiere semaine du cycle"
+    )
+    employes = models.ManyToManyField(
+        'employee.ZY00',
+        through='MembreRotation',
+        related_name='modeles_rotation',
+        verbose_name="Membres de la rotation"
+    )
+    is_active = models.BooleanField(default=True, verbose_name="Actif")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    created_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='modeles_rotation_crees',
+        verbose_name="Cree par"
+    )
+
+    class Meta:
+        db_table = 'planning_modele_rotation'
+        verbose_name = "Modele de rotation"
+        verbose_name_plural = "Modeles de rotation"
+        ordering = ['poste', 'nom']
+
+    def __str__(self):
+        return f"{self.nom} ({self.poste.nom})"
+
+
+class MembreRotation(models.Model):
+    """Membre d'un modele de rotation, a son rang."""
+
+    modele = models.ForeignKey(
+        ModeleRotation,
+        on_delete=models.CASCADE,
+        related_name='membres',
+        verbose_name="Modele"
+    )
+    employe = models.ForeignKey(
+        'employee.ZY00',
+        on_delete=models.CASCADE,
+        related_name='rotations_planning',
+        verbose_name="Employe"
+    )
+    ordre = models.PositiveSmallIntegerField(default=0, verbose_name="Rang")
+
+    class Meta:
+        db_table = 'planning_membre_rotation'
+        verbose_name = "Membre de rotation"
+        verbose_name_plural = "Membres de rotation"
+        ordering = ['ordre']
+        unique_together = ['modele', 'employe']
+
+    def __str__(self):
+        return f"{self.modele.nom} #{self.ordre} - {self.employe}"
+
+
+class CreneauRotation(models.Model):
+    """Creneau hebdomadaire d'un modele de rotation."""
+
+    JOUR_CHOICES = [
+        (0, 'Lundi'),
+        (1, 'Mardi'),
+        (2, 'Mercredi'),
+        (3, 'Jeudi'),
+        (4, 'Vendredi'),
+        (5, 'Samedi'),
+        (6, 'Dimanche'),
+    ]
+
+    modele = models.ForeignKey(
+        ModeleRotation,
+        on_delete=models.CASCADE,
+        related_name='creneaux',
+        verbose_name="Modele"
+    )
+    semaine = models.PositiveSmallIntegerField(
+        null=True,
+        blank=True,
+        verbose_name="Semaine du cycle",
+        help_text="1 a N ; vide : toutes les semaines"
+    )
+    jour_semaine = models.PositiveSmallIntegerField(choices=JOUR_CHOICES, verbose_name="Jour")
+    rang = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name="Rang",
+        help_text="Membre de la rotation occupant le creneau la premiere semaine"
+    )
+    heure_debut = models.TimeField(
+        null=True,
+        blank=True,
+        verbose_name="Heure de debut",
+        help_text="Vide : horaires du poste"
+    )
+    heure_fin = models.TimeField(null=True, blank=True, verbose_name="Heure de fin")
+
+    class Meta:
+        db_table = 'planning_creneau_rotation'
+        verbose_name = "Creneau de rotation"
+        verbose_name_plural = "Creneaux de rotation"
+        ordering = ['semaine', 'jour_semaine', 'heure_debut']
+
+    def __str__(self):
+        return f"{self.modele.nom} - {self.get_jour_semaine_display()} (rang {self.rang})"
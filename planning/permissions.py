@@ -1,37 +1,144 @@
-"""Utilitaires de permissions pour le module Planning."""
+"""
+Utilitaires de permissions pour le module Planning.
+
+Le role et le perimetre de visibilite (employes et departements visibles)
+d'un utilisateur sont resolus une seule fois par `resoudre_perimetre` :
+quelques requetes au premier appel, puis cache par utilisateur (invalide
+par les modeles de la hierarchie : employes, affectations, roles,
+managers, postes) et memorise sur l'objet utilisateur pour le reste de
+la requete. Les lignes User ne sont pas suivies (chaque connexion
+enregistre last_login) : seul is_superuser compte, il fait partie de la cle. Les flux filtrent ensuite sur une liste de matricules
+(`IN` simple) au lieu d'une sous-requete d'union.
+"""
+import hashlib
+
 from django.db import models
 
+from core.cache import FamilleCache
 
-def get_planning_role(user):
-    """
-    Determine le role de l'utilisateur dans le module planning.
+ROLES_ADMIN = ('DRH', 'GESTION_APP', 'DIRECTEUR', 'PDG')
 
-    Returns:
-        str ou None: 'admin', 'manager', 'employee', ou None
+# Perimetre par utilisateur ; aussi en memoire du processus (lu a chaque requete)
+CACHE_PERIMETRES = FamilleCache('planning.perimetres', tags=[
+    'employee.zy00', 'employee.zyaf', 'employee.zyre', 'employee.zyro', 'departement',
+], locale=256)
+
+
+class PerimetrePlanning:
     """
-    if not user.is_authenticated:
-        return None
+    Role et perimetre de visibilite d'un utilisateur (valeur immuable,
+    partagee par le cache memoire).
+
+    Attributs:
+        role: 'admin', 'manager', 'employee' ou None
+        matricule: matricule de l'employe lie (None pour un superutilisateur sans fiche)
+        employes: frozenset des matricules visibles ; None pour un admin
+            (tous les employes actifs, non materialises)
+        departements: departements dont les plannings sont visibles ;
+            None pour un admin
+        cle: cle de cache du perimetre, identique pour deux utilisateurs
+            qui voient les memes employes
+    """
+
+    __slots__ = ('role', 'matricule', 'employes', 'departements', 'cle')
+
+    def __init__(self, role=None, matricule=None, employes=frozenset(), departements=()):
+        self.role = role
+        self.matricule = matricule
+        self.employes = None if role == 'admin' else frozenset(employes)
+        self.departements = None if role == 'admin' else tuple(sorted(departements))
+        if role == 'admin':
+            self.cle = 'admin'
+        else:
+            empreinte = hashlib.md5(','.join(sorted(self.employes)).encode()).hexdigest()[:16]
+            self.cle = f'{role}-{empreinte}'
+
+    def __repr__(self):
+        taille = 'tous' if self.employes is None else len(self.employes)
+        return f'<PerimetrePlanning {self.role} ({taille})>'
+
+
+def _calculer_perimetre(user):
+    """Role et perimetre (2 a 4 requetes selon le role)."""
+    from departement.models import ZYMA
+    from employee.models import ZYAF
+    from employee.services.permission_service import PermissionService
 
     if user.is_superuser:
-        return 'admin'
+        return PerimetrePlanning('admin')
 
     employe = getattr(user, 'employe', None)
     if not employe:
-        return None
+        return PerimetrePlanning()
+
+    codes = set(PermissionService.get_role_codes(employe))
+    if codes.intersection(ROLES_ADMIN):
+        return PerimetrePlanning('admin', employe.matricule)
+
+    affectations_actives = ZYAF.objects.filter(date_fin__isnull=True, employe__etat='actif')
+
+    # Manager : departement gere (ZYMA actif) ou role MANAGER
+    departements = list(ZYMA.objects.filter(
+        employe=employe, actif=True, date_fin__isnull=True
+    ).values_list('departement_id', flat=True))
+    if departements or 'MANAGER' in codes:
+        subordonnes = affectations_actives.filter(
+            poste__DEPARTEMENT__in=departements
+        ).values_list('employe_id', flat=True) if departements else []
+        return PerimetrePlanning(
+            'manager', employe.matricule, {employe.matricule, *subordonnes}, departements
+        )
+
+    if employe.etat != 'actif':
+        return PerimetrePlanning(matricule=employe.matricule)
+
+    # Employe : collegues du departement de son affectation active
+    departement = ZYAF.objects.filter(
+        employe=employe, date_fin__isnull=True
+    ).values_list('poste__DEPARTEMENT_id', flat=True).first()
+    collegues = affectations_actives.filter(
+        poste__DEPARTEMENT=departement
+    ).values_list('employe_id', flat=True) if departement else []
+    return PerimetrePlanning(
+        'employee', employe.matricule, {employe.matricule, *collegues},
+        [departement] if departement else []
+    )
+
+
+def resoudre_perimetre(user):
+    """
+    Retourne le PerimetrePlanning de l'utilisateur : memorise sur l'objet
+    utilisateur (une resolution par requete), en cache entre les requetes.
+    """
+    perimetre = getattr(user, '_perimetre_planning', None)
+    if perimetre is None:
+        if not user.is_authenticated:
+            perimetre = PerimetrePlanning()
+        else:
+            perimetre = CACHE_PERIMETRES.obtenir(
+                lambda: _calculer_perimetre(user), user.pk, user.is_superuser
+            )
+        user._perimetre_planning = perimetre
+    return perimetre
+
 
-    if (employe.has_role('DRH')
-            or employe.has_role('GESTION_APP')
-            or employe.has_role('DIRECTEUR')
-            or employe.has_role('PDG')):
-        return 'admin'
+def get_planning_role(user):
+    """
+    Determine le role de l'utilisateur dans le module planning.
 
-    if employe.est_manager_departement():
-        return 'manager'
+    Returns:
+        str ou None: 'admin', 'manager', 'employee', ou None
+    """
+    return resoudre_perimetre(user).role
 
-    if employe.etat == 'actif':
-        return 'employee'
 
-    return None
+def cle_perimetre(user):
+    """
+    Cle du perimetre de visibilite, pour les caches : partagee par tous les
+    administrateurs, et par les utilisateurs de meme role qui voient les
+    memes employes (collegues d'un meme departement).
+    """
+    return resoudre_perimetre(user).cle
 
 
 def get_visible_employees(user):
@@ -43,23 +150,36 @@ def get_visible_employees(user):
     - employee : collegues du meme departement + soi-meme
     """
     from employee.models import ZY00
-    from employee.services.hierarchy_service import HierarchyService
-
-    role = get_planning_role(user)
-    employe = getattr(user, 'employe', None)
 
-    if role == 'admin':
+    perimetre = resoudre_perimetre(user)
+    if perimetre.role == 'admin':
         return ZY00.objects.filter(etat='actif')
+    if not perimetre.employes:
+        return ZY00.objects.none()
+    return ZY00.objects.filter(matricule__in=sorted(perimetre.employes))
 
-    if role == 'manager' and employe:
-        subordinates = HierarchyService.get_subordinates(employe)
-        return (subordinates | ZY00.objects.filter(pk=employe.pk)).distinct()
 
-    if role == 'employee' and employe:
-        colleagues = HierarchyService.get_colleagues_same_department(employe)
-        return (colleagues | ZY00.objects.filter(pk=employe.pk)).distinct()
+def filtrer_par_perimetre(queryset, user, champ='employe'):
+    """
+    Restreint un QuerySet aux lignes dont `champ` (cle etrangere ou
+    relation multiple vers ZY00) designe un employe visible : liste de
+    matricules pour un manager ou un employe, sans sous-requete.
+    """
+    perimetre = resoudre_perimetre(user)
+    if perimetre.role == 'admin':
+        return queryset.filter(**{f'{champ}__etat': 'actif'})
+    if not perimetre.employes:
+        return queryset.none()
+    return queryset.filter(**{f'{champ}__in': sorted(perimetre.employes)})
+
 
-    return ZY00.objects.none()
+def peut_voir_employe(user, matricule):
+    """True si l'employe est dans le perimetre (sans requete, sauf pour un admin)."""
+    perimetre = resoudre_perimetre(user)
+    if perimetre.role == 'admin':
+        from employee.models import ZY00
+        return ZY00.objects.filter(matricule=matricule, etat='actif').exists()
+    return bool(matricule) and matricule in perimetre.employes
 
 
 def get_visible_plannings(user):
@@ -71,27 +191,21 @@ def get_visible_plannings(user):
     - employee : plannings de son departement + plannings globaux
     """
     from .models import Planning
-    from employee.services.hierarchy_service import HierarchyService
 
-    role = get_planning_role(user)
-    employe = getattr(user, 'employe', None)
+    perimetre = resoudre_perimetre(user)
 
-    if role == 'admin':
+    if perimetre.role == 'admin':
         return Planning.objects.all()
 
-    if role == 'manager' and employe:
-        dept_ids = HierarchyService.get_managed_departments(employe)
+    if perimetre.role == 'manager':
         return Planning.objects.filter(
-            models.Q(departement_id__in=dept_ids) | models.Q(departement__isnull=True)
+            models.Q(departement_id__in=perimetre.departements) | models.Q(departement__isnull=True)
         )
 
-    if role == 'employee' and employe:
-        dept = HierarchyService.get_current_department(employe)
-        if dept:
-            return Planning.objects.filter(
-                models.Q(departement=dept) | models.Q(departement__isnull=True)
-            )
-        return Planning.objects.none()
+    if perimetre.role == 'employee' and perimetre.departements:
+        return Planning.objects.filter(
+            models.Q(departement_id__in=perimetre.departements) | models.Q(departement__isnull=True)
+        )
 
     return Planning.objects.none()
 
@@ -0,0 +1,13 @@
+# planning/services/__init__.py
+"""
+Couche services pour l'application planning.
+"""
+
+from .disponibilite_service import DisponibiliteService, MatriceDisponibilite
+from .generation_service import GenerationService
+
+__all__ = [
+    'DisponibiliteService',
+    'MatriceDisponibilite',
+    'GenerationService',
+]
@@ -0,0 +1,306 @@
+# planning/services/disponibilite_service.py
+"""
+Matrice de disponibilite d'une equipe : employes x jours.
+
+Pour un perimetre de visibilite et une periode, chaque case indique l'etat
+de l'employe ce jour-la (disponible, en poste, absence en attente ou
+validee, jour ferie, repos), le type d'absence et le poste occupe. Les
+tableaux sont des matrices NumPy denses ; elles sont calculees en trois
+requetes sur la periode (absences, affectations, jours feries) et mises en
+cache par perimetre et par semaine :
+
+    matrice = DisponibiliteService.matrice(request.user, debut, fin)
+    presents = matrice.presents()                              # par jour
+    apres = matrice.presents_si_absent(matricule, debut, fin)  # impact d'une demande
+"""
+from datetime import date, timedelta
+
+import numpy as np
+
+from core.cache import FamilleCache
+from core.chevauchement import filtrer_chevauchements
+
+from ..models import Affectation
+from ..permissions import cle_perimetre, get_planning_role, get_visible_employees
+
+# Periode maximale d'une matrice (jours)
+DISPONIBILITE_JOURS_MAX = 62
+
+# Le perimetre depend des employes, affectations, roles et managers
+CACHE_DISPONIBILITES = FamilleCache(
+    'planning.disponibilites',
+    tags=['planning', 'employee', 'departement.zyma', 'absence.absence', 'absence.jourferie'],
+)
+
+STATUTS_EN_ATTENTE = ('EN_ATTENTE_MANAGER', 'EN_ATTENTE_RH')
+
+
+class MatriceDisponibilite:
+    """
+    Matrice employes x jours.
+
+    Attributs:
+        matricules, noms: lignes (employes du perimetre, par nom)
+        jours: colonnes (dates consecutives)
+        etats: int8, code ETAT_* de chaque case
+        absences: int32, id du TypeAbsence (0 : aucun)
+        postes: int32, id du PosteTravail (0 : aucun)
+        types_absence: id -> (libelle, couleur)
+        postes_travail: id -> nom
+        feries: date -> nom du jour ferie
+    """
+
+    ETAT_DISPONIBLE = 0
+    ETAT_EN_POSTE = 1
+    ETAT_EN_ATTENTE = 2
+    ETAT_ABSENT = 3
+    ETAT_FERIE = 4
+    ETAT_REPOS = 5
+
+    LIBELLES_ETATS = {
+        ETAT_DISPONIBLE: 'Disponible',
+        ETAT_EN_POSTE: 'En poste',
+        ETAT_EN_ATTENTE: 'Absence en attente',
+        ETAT_ABSENT: 'Absent',
+        ETAT_FERIE: 'Jour ferie',
+        ETAT_REPOS: 'Repos',
+    }
+
+    def __init__(self, matricules, noms, jours, etats, absences, postes,
+                 types_absence=None, postes_travail=None, feries=None):
+        self.matricules = list(matricules)
+        self.noms = list(noms)
+        self.jours = list(jours)
+        self.etats = etats
+        self.absences = absences
+        self.postes = postes
+        self.types_absence = types_absence or {}
+        self.postes_travail = postes_travail or {}
+        self.feries = feries or {}
+
+    def __len__(self):
+        return len(self.matricules)
+
+    @classmethod
+    def vide(cls, matricules, noms, date_debut, date_fin):
+        """Matrice sans evenement : disponible en semaine, repos le week-end"""
+        nombre = (date_fin - date_debut).days + 1
+        jours = [date_debut + timedelta(days=i) for i in range(nombre)]
+        forme = (len(matricules), nombre)
+        etats = np.full(forme, cls.ETAT_DISPONIBLE, dtype=np.int8)
+        etats[:, [i for i, jour in enumerate(jours) if jour.weekday() >= 5]] = cls.ETAT_REPOS
+        return cls(
+            matricules, noms, jours, etats,
+            np.zeros(forme, dtype=np.int32), np.zeros(forme, dtype=np.int32),
+        )
+
+    # ------------------------------------------------------------------
+    # Decoupage et assemblage
+    # ------------------------------------------------------------------
+
+    def extraire(self, date_debut, date_fin):
+        """Sous-matrice des colonnes [date_debut, date_fin]"""
+        debut = max((date_debut - self.jours[0]).days, 0)
+        fin = (date_fin - self.jours[0]).days + 1
+        jours = self.jours[debut:fin]
+        retenus = set(jours)
+        return MatriceDisponibilite(
+            self.matricules, self.noms, jours,
+            self.etats[:, debut:fin], self.absences[:, debut:fin], self.postes[:, debut:fin],
+            self.types_absence, self.postes_travail,
+            {jour: nom for jour, nom in self.feries.items() if jour in retenus},
+        )
+
+    @classmethod
+    def assembler(cls, matrices):
+        """Matrices consecutives d'un meme perimetre -> une matrice"""
+        premiere = matrices[0]
+        return cls(
+            premiere.matricules, premiere.noms,
+            [jour for matrice in matrices for jour in matrice.jours],
+            np.hstack([matrice.etats for matrice in matrices]),
+            np.hstack([matrice.absences for matrice in matrices]),
+            np.hstack([matrice.postes for matrice in matrices]),
+            {k: v for matrice in matrices for k, v in matrice.types_absence.items()},
+            {k: v for matrice in matrices for k, v in matrice.postes_travail.items()},
+            {k: v for matrice in matrices for k, v in matrice.feries.items()},
+        )
+
+    # ------------------------------------------------------------------
+    # Couverture
+    # ------------------------------------------------------------------
+
+    def disponibles(self):
+        """
+        Masque booleen des cases ou l'employe peut travailler ; une absence
+        en attente ne compte pas encore (c'est l'impact de sa validation).
+        """
+        return self.etats <= self.ETAT_EN_ATTENTE
+
+    def presents(self):
+        """Nombre d'employes disponibles par jour"""
+        return np.count_nonzero(self.disponibles(), axis=0)
+
+    def presents_si_absent(self, matricule, date_debut, date_fin):
+        """Presents par jour si l'employe etait absent sur la periode (impact d'une demande)"""
+        disponibles = self.disponibles()
+        if matricule in self.matricules and self.jours:
+            debut = max((date_debut - self.jours[0]).days, 0)
+            fin = max((date_fin - self.jours[0]).days + 1, 0)
+            disponibles[self.matricules.index(matricule), debut:fin] = False
+        return np.count_nonzero(disponibles, axis=0)
+
+    def en_json(self, masquer_types=False):
+        """
+        Donnees du composant de disponibilite.
+
+        Args:
+            masquer_types: True pour ne pas exposer le type d'absence
+                (perimetre d'un employe : ses collegues)
+        """
+        absences = np.zeros_like(self.absences) if masquer_types else self.absences
+        types_absence = {} if masquer_types else self.types_absence
+        return {
+            'jours': [jour.isoformat() for jour in self.jours],
+            'employes': [
+                {'matricule': matricule, 'nom': nom} for matricule, nom in zip(self.matricules, self.noms)
+            ],
+            'etats': self.etats.tolist(),
+            'absences': absences.tolist(),
+            'postes': self.postes.tolist(),
+            'presents': self.presents().tolist(),
+            'effectif': len(self.matricules),
+            'types_absence': {
+                str(pk): {'libelle': libelle, 'couleur': couleur}
+                for pk, (libelle, couleur) in types_absence.items()
+            },
+            'postes_travail': {str(pk): nom for pk, nom in self.postes_travail.items()},
+            'feries': {jour.isoformat(): nom for jour, nom in self.feries.items()},
+            'legende': {str(code): libelle for code, libelle in self.LIBELLES_ETATS.items()},
+        }
+
+
+class DisponibiliteService:
+    """Service de calcul des matrices de disponibilite"""
+
+    @staticmethod
+    def calculer(employes, date_debut, date_fin):
+        """
+        Matrice des employes sur la periode : trois requetes (absences,
+        affectations, jours feries), remplissage vectorise.
+
+        Args:
+            employes: QuerySet de ZY00 (ordonne)
+            date_debut, date_fin: periode (bornes incluses)
+
+        Returns:
+            MatriceDisponibilite
+        """
+        from absence.models import Absence, JourFerie
+
+        lignes = list(employes.values_list('matricule', 'nom', 'prenoms'))
+        matrice = MatriceDisponibilite.vide(
+            [matricule for matricule, _, _ in lignes],
+            [f'{nom} {prenoms}' for _, nom, prenoms in lignes],
+            date_debut, date_fin,
+        )
+        if not lignes:
+            return matrice
+
+        index = {matricule: i for i, matricule in enumerate(matrice.matricules)}
+        perimetre = employes.values('matricule')
+        nombre_jours = len(matrice.jours)
+
+        def colonne(jour):
+            return (jour - date_debut).days
+
+        # 1. Jours feries : colonnes entieres
+        for jour, nom in JourFerie.objects.filter(
+            actif=True, date__range=(date_debut, date_fin)
+        ).values_list('date', 'nom').order_by():
+            matrice.etats[:, colonne(jour)] = MatriceDisponibilite.ETAT_FERIE
+            matrice.feries[jour] = nom
+
+        # 2. Affectations : un shift prime sur le repos et le jour ferie
+        affectations = list(
+            Affectation.objects.filter(
+                employe_id__in=perimetre, date__range=(date_debut, date_fin)
+            ).exclude(statut='ANNULE').values_list('employe_id', 'date', 'poste_id', 'poste__nom').order_by()
+        )
+        if affectations:
+            rangs = np.fromiter((index[a[0]] for a in affectations), dtype=np.intp, count=len(affectations))
+            colonnes = np.fromiter((colonne(a[1]) for a in affectations), dtype=np.intp, count=len(affectations))
+            matrice.etats[rangs, colonnes] = MatriceDisponibilite.ETAT_EN_POSTE
+            matrice.postes[rangs, colonnes] = [a[2] for a in affectations]
+            matrice.postes_travail.update({a[2]: a[3] for a in affectations})
+
+        # 3. Absences en attente puis validees ('EN_ATTENTE_*' < 'VALIDE' : les validees l'emportent)
+        absences = filtrer_chevauchements(
+            Absence.objects.filter(
+                employe_id__in=perimetre, statut__in=(*STATUTS_EN_ATTENTE, 'VALIDE')
+            ),
+            date_debut, date_fin,
+        ).values_list(
+            'employe_id', 'date_debut', 'date_fin', 'statut',
+            'type_absence_id', 'type_absence__libelle', 'type_absence__couleur',
+        ).order_by('statut')
+        for employe_id, debut, fin, statut, type_id, libelle, couleur in absences:
+            rang = index[employe_id]
+            tranche = slice(max(colonne(debut), 0), min(colonne(fin) + 1, nombre_jours))
+            matrice.etats[rang, tranche] = (
+                MatriceDisponibilite.ETAT_ABSENT if statut == 'VALIDE' else MatriceDisponibilite.ETAT_EN_ATTENTE
+            )
+            matrice.absences[rang, tranche] = type_id
+            matrice.types_absence[type_id] = (libelle, couleur)
+
+        return matrice
+
+    @staticmethod
+    def matrice(user, date_debut, date_fin):
+        """
+        Matrice du perimetre de l'utilisateur, assemblee depuis le cache par
+        semaine ; les semaines manquantes sont calculees ensemble.
+        """
+        perimetre = cle_perimetre(user)
+        premier_lundi = date_debut - timedelta(days=date_debut.weekday())
+        lundis = [
+            premier_lundi + timedelta(weeks=i)
+            for i in range((date_fin - premier_lundi).days // 7 + 1)
+        ]
+
+        def calculer_semaines(manquantes):
+            debut = min(lundi for _, lundi in manquantes)
+            fin = max(lundi for _, lundi in manquantes) + timedelta(days=6)
+            employes = get_visible_employees(user).order_by('nom', 'prenoms', 'matricule')
+            matrice = DisponibiliteService.calculer(employes, debut, fin)
+            return {
+                (perimetre, lundi): matrice.extraire(lundi, lundi + timedelta(days=6))
+                for _, lundi in manquantes
+            }
+
+        semaines = CACHE_DISPONIBILITES.obtenir_plusieurs(
+            calculer_semaines, [(perimetre, lundi) for lundi in lundis]
+        )
+        return MatriceDisponibilite.assembler(semaines).extraire(date_debut, date_fin)
+
+    @staticmethod
+    def donnees(user, date_debut, date_fin):
+        """Donnees JSON de la matrice ; types d'absence masques hors admin/manager"""
+        matrice = DisponibiliteService.matrice(user, date_debut, date_fin)
+        donnees = matrice.en_json(masquer_types=get_planning_role(user) not in ('admin', 'manager'))
+        donnees.update({'debut': date_debut.isoformat(), 'fin': date_fin.isoformat()})
+        return donnees
+
+    @staticmethod
+    def periode(debut, fin):
+        """
+        Periode demandee (textes AAAA-MM-JJ), bornee a DISPONIBILITE_JOURS_MAX.
+
+        Raises:
+            ValueError: dates invalides ou inversees
+        """
+        date_debut = date.fromisoformat(debut[:10])
+        date_fin = date.fromisoformat(fin[:10]) if fin else date_debut + timedelta(days=13)
+        if date_fin < date_debut:
+            raise ValueError("La date de fin precede la date de debut")
+        return date_debut, min(date_fin, date_debut + timedelta(days=DISPONIBILITE_JOURS_MAX - 1))
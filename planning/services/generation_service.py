@@ -0,0 +1,335 @@
+# planning/services/generation_service.py
+"""
+Generation en masse des affectations a partir des modeles de rotation.
+
+Un modele de rotation (ModeleRotation) decrit une semaine type d'un poste :
+des creneaux (jour, heures, rang) occupes par les membres de la rotation,
+decales de `decalage` rangs chaque semaine. La generation :
+
+1. developpe les modeles en affectations sur la periode, en memoire ;
+2. charge en une requete (UNION) tout ce qui peut entrer en conflit sur la
+   periode pour les employes concernes : affectations existantes, absences
+   validees, jours feries. Les affectations annulees ne bloquent que leur
+   heure de debut (unicite employe / date / heure de debut) ;
+3. confronte les creneaux a ces intervalles en memoire (IndexIntervalles
+   par employe et par jour), ainsi qu'entre eux ;
+4. enregistre les affectations sans conflit en un seul bulk_create.
+
+Le rapport de conflits est le meme en apercu (rien n'est enregistre).
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Case, CharField, F, TimeField, Value, When
+
+from core.cache import invalider_apres_commit
+from core.chevauchement import IndexIntervalles
+
+from ..models import Affectation, ModeleRotation
+
+# Periode maximale d'une generation (jours)
+GENERATION_JOURS_MAX = 93
+
+TAILLE_LOT = 500
+
+
+class GenerationService:
+    """Service de generation des affectations depuis les modeles de rotation"""
+
+    CONFLIT_AFFECTATION = 'AFFECTATION'
+    CONFLIT_ABSENCE = 'ABSENCE'
+    CONFLIT_JOUR_FERIE = 'JOUR_FERIE'
+    CONFLIT_DOUBLON = 'DOUBLON'
+    CONFLIT_NON_AUTORISE = 'NON_AUTORISE'
+
+    # Source interne : affectation annulee (occupe seulement son heure de debut)
+    SOURCE_ANNULEE = 'ANNULEE'
+
+    # ------------------------------------------------------------------
+    # Developpement des modeles
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def charger_modeles(modele_ids):
+        """Modeles actifs avec poste, membres (par rang) et creneaux : 3 requetes"""
+        return list(
+            ModeleRotation.objects.filter(pk__in=modele_ids, is_active=True)
+            .select_related('poste')
+            .prefetch_related('membres__employe', 'creneaux')
+        )
+
+    @staticmethod
+    def developper(modeles, planning, date_debut, date_fin, user=None):
+        """
+        Affectations (non enregistrees) decrites par les modeles sur la periode.
+
+        Args:
+            modeles: ModeleRotation avec membres et creneaux precharges
+            planning: Planning de rattachement
+            date_debut, date_fin: periode (bornes incluses)
+            user: auteur (created_by)
+
+        Returns:
+            list[Affectation]
+        """
+        affectations = []
+        for modele in modeles:
+            membres = [membre.employe for membre in sorted(modele.membres.all(), key=lambda m: m.ordre)]
+            if not membres:
+                continue
+
+            creneaux_par_jour = defaultdict(list)
+            for creneau in modele.creneaux.all():
+                creneaux_par_jour[creneau.jour_semaine].append(creneau)
+
+            # Semaines numerotees depuis le lundi de la semaine de reference
+            lundi_reference = modele.date_reference - timedelta(days=modele.date_reference.weekday())
+            cycle = max(modele.nombre_semaines, 1)
+
+            jour = date_debut
+            while jour <= date_fin:
+                numero_semaine = (jour - lundi_reference).days // 7
+                semaine_cycle = numero_semaine % cycle + 1
+                for creneau in creneaux_par_jour.get(jour.weekday(), ()):
+                    if creneau.semaine and creneau.semaine != semaine_cycle:
+                        continue
+                    employe = membres[(creneau.rang + numero_semaine * modele.decalage) % len(membres)]
+                    affectations.append(Affectation(
+                        planning=planning,
+                        employe=employe,
+                        poste=modele.poste,
+                        date=jour,
+                        heure_debut=creneau.heure_debut or modele.poste.heure_debut,
+                        heure_fin=creneau.heure_fin or modele.poste.heure_fin,
+                        notes=f"Rotation : {modele.nom}",
+                        created_by=user,
+                    ))
+                jour += timedelta(days=1)
+
+        affectations.sort(key=lambda a: (a.employe_id, a.date, a.heure_debut))
+        return affectations
+
+    # ------------------------------------------------------------------
+    # Detection des conflits
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _intervalles_occupes(employe_ids, date_debut, date_fin):
+        """
+        Affectations (annulees comprises), absences validees et jours feries de
+        la periode, en une requete : tuples (source, employe_id, jour_debut,
+        jour_fin, h_debut, h_fin, libelle) ; employe_id est None pour un jour
+        ferie.
+        """
+        from absence.models import Absence, JourFerie
+
+        colonnes = ('source', 'employe_ref', 'jour_debut', 'jour_fin', 'h_debut', 'h_fin', 'libelle')
+
+        affectations = Affectation.objects.filter(
+            employe_id__in=employe_ids, date__range=(date_debut, date_fin)
+        ).annotate(
+            source=Case(
+                When(statut='ANNULE', then=Value(GenerationService.SOURCE_ANNULEE)),
+                default=Value(GenerationService.CONFLIT_AFFECTATION),
+                output_field=CharField(),
+            ),
+            employe_ref=F('employe_id'),
+            jour_debut=F('date'),
+            jour_fin=F('date'),
+            h_debut=F('heure_debut'),
+            h_fin=F('heure_fin'),
+            libelle=F('poste__nom'),
+        ).values_list(*colonnes).order_by()
+
+        absences = Absence.objects.filter(
+            employe_id__in=employe_ids, statut='VALIDE',
+            date_debut__lte=date_fin, date_fin__gte=date_debut,
+        ).annotate(
+            source=Value(GenerationService.CONFLIT_ABSENCE, output_field=CharField()),
+            employe_ref=F('employe_id'),
+            jour_debut=F('date_debut'),
+            jour_fin=F('date_fin'),
+            h_debut=Value(None, output_field=TimeField()),
+            h_fin=Value(None, output_field=TimeField()),
+            libelle=F('type_absence__libelle'),
+        ).values_list(*colonnes).order_by()
+
+        jours_feries = JourFerie.objects.filter(
+            actif=True, date__range=(date_debut, date_fin)
+        ).annotate(
+            source=Value(GenerationService.CONFLIT_JOUR_FERIE, output_field=CharField()),
+            employe_ref=Value(None, output_field=CharField()),
+            jour_debut=F('date'),
+            jour_fin=F('date'),
+            h_debut=Value(None, output_field=TimeField()),
+            h_fin=Value(None, output_field=TimeField()),
+            libelle=F('nom'),
+        ).values_list(*colonnes).order_by()
+
+        return list(affectations.union(absences, jours_feries, all=True))
+
+    @staticmethod
+    def detecter_conflits(affectations, employes_autorises=None):
+        """
+        Conflits des affectations proposees.
+
+        Args:
+            affectations: Affectation non enregistrees, triees par employe/date/heure
+            employes_autorises: matricules autorises (None : pas de controle)
+
+        Returns:
+            dict: index de l'affectation -> (motif, detail)
+        """
+        if not affectations:
+            return {}
+
+        employe_ids = {a.employe_id for a in affectations}
+        date_debut = min(a.date for a in affectations)
+        date_fin = max(a.date for a in affectations)
+
+        feries = {}
+        absences = defaultdict(list)
+        existantes = defaultdict(list)
+        annulees = {}
+        for source, employe_id, jour_debut, jour_fin, h_debut, h_fin, libelle in \
+                GenerationService._intervalles_occupes(employe_ids, date_debut, date_fin):
+            if source == GenerationService.CONFLIT_JOUR_FERIE:
+                feries[jour_debut] = libelle
+            elif source == GenerationService.CONFLIT_ABSENCE:
+                absences[employe_id].append((jour_debut, jour_fin, (jour_debut, jour_fin, libelle)))
+            elif source == GenerationService.SOURCE_ANNULEE:
+                annulees[(employe_id, jour_debut, h_debut)] = (h_debut, h_fin, libelle)
+            else:
+                existantes[(employe_id, jour_debut)].append((h_debut, h_fin, (h_debut, h_fin, libelle)))
+        index_absences = {cle: IndexIntervalles(elements) for cle, elements in absences.items()}
+        index_existantes = {
+            cle: IndexIntervalles(elements, bornes_incluses=False) for cle, elements in existantes.items()
+        }
+
+        conflits = {}
+        precedente = None
+        for index, aff in enumerate(affectations):
+            conflit = None
+            if employes_autorises is not None and aff.employe_id not in employes_autorises:
+                conflit = (GenerationService.CONFLIT_NON_AUTORISE, "Employe hors de votre perimetre")
+            elif aff.date in feries:
+                conflit = (GenerationService.CONFLIT_JOUR_FERIE, f"Jour ferie : {feries[aff.date]}")
+            else:
+                absence = (
+                    index_absences[aff.employe_id].premier(aff.date, aff.date)
+                    if aff.employe_id in index_absences else None
+                )
+                existante = (
+                    index_existantes[(aff.employe_id, aff.date)].premier(aff.heure_debut, aff.heure_fin)
+                    if (aff.employe_id, aff.date) in index_existantes else None
+                )
+                annulee = annulees.get((aff.employe_id, aff.date, aff.heure_debut))
+                if absence:
+                    conflit = (
+                        GenerationService.CONFLIT_ABSENCE,
+                        f"{absence[2]} du {absence[0]:%d/%m/%Y} au {absence[1]:%d/%m/%Y}"
+                    )
+                elif existante:
+                    conflit = (
+                        GenerationService.CONFLIT_AFFECTATION,
+                        f"Deja affecte de {existante[0]:%H:%M} a {existante[1]:%H:%M} "
+                        f"sur le poste \"{existante[2]}\""
+                    )
+                elif annulee:
+                    conflit = (
+                        GenerationService.CONFLIT_AFFECTATION,
+                        f"Affectation annulee de {annulee[0]:%H:%M} a {annulee[1]:%H:%M} "
+                        f"sur le poste \"{annulee[2]}\" (meme heure de debut)"
+                    )
+                elif (precedente and precedente.employe_id == aff.employe_id
+                        and precedente.date == aff.date and precedente.heure_fin > aff.heure_debut):
+                    conflit = (
+                        GenerationService.CONFLIT_DOUBLON,
+                        f"Chevauche le creneau genere de {precedente.heure_debut:%H:%M} "
+                        f"a {precedente.heure_fin:%H:%M} ({precedente.poste.nom})"
+                    )
+
+            if conflit:
+                conflits[index] = conflit
+            else:
+                precedente = aff
+        return conflits
+
+    # ------------------------------------------------------------------
+    # Generation
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def generer(modeles, planning, date_debut, date_fin, user=None, employes_autorises=None, apercu=False):
+        """
+        Genere les affectations des modeles sur la periode ; les creneaux en
+        conflit sont ecartes et rapportes.
+
+        Args:
+            modeles: ModeleRotation precharges (charger_modeles)
+            planning: Planning de rattachement
+            date_debut, date_fin: periode (bornes incluses)
+            user: auteur
+            employes_autorises: matricules que l'utilisateur peut affecter
+            apercu: True pour ne rien enregistrer
+
+        Returns:
+            dict: prevues, creees, conflits (liste de dicts), apercu
+        """
+        affectations = GenerationService.developper(modeles, planning, date_debut, date_fin, user)
+        conflits = GenerationService.detecter_conflits(affectations, employes_autorises)
+        retenues = [a for index, a in enumerate(affectations) if index not in conflits]
+
+        if retenues and not apercu:
+            with transaction.atomic():
+                Affectation.objects.bulk_create(retenues, batch_size=TAILLE_LOT)
+                # bulk_create n'emet pas de signal : caches et audit explicites
+                invalider_apres_commit(Affectation, 'planning')
+                GenerationService._journaliser(planning, modeles, retenues, date_debut, date_fin, user)
+
+        return {
+            'apercu': apercu,
+            'prevues': len(affectations),
+            'creees': 0 if apercu else len(retenues),
+            'conflits': [
+                GenerationService._conflit_dict(affectations[index], motif, detail)
+                for index, (motif, detail) in sorted(conflits.items())
+            ],
+        }
+
+    @staticmethod
+    def _conflit_dict(affectation, motif, detail):
+        employe = affectation.employe
+        return {
+            'employe_matricule': employe.matricule,
+            'employe_nom': f'{employe.nom} {employe.prenoms}',
+            'poste_nom': affectation.poste.nom,
+            'date': str(affectation.date),
+            'heure_debut': f'{affectation.heure_debut:%H:%M}',
+            'heure_fin': f'{affectation.heure_fin:%H:%M}',
+            'motif': motif,
+            'detail': detail,
+        }
+
+    @staticmethod
+    def _journaliser(planning, modeles, affectations, date_debut, date_fin, user):
+        """Entree d'audit recapitulative (bulk_create ne passe pas par les signaux d'audit)"""
+        from core.models import ZDLOG
+
+        ZDLOG.log_action(
+            table_name='Affectation',
+            record_id=f"GENERATION:{planning.REFERENCE}"[:100],
+            type_mouvement=ZDLOG.TYPE_CREATION,
+            user=user,
+            nouvelle_valeur={
+                'modeles': [modele.nom for modele in modeles],
+                'date_debut': str(date_debut),
+                'date_fin': str(date_fin),
+                'affectations': len(affectations),
+            },
+            description=(
+                f"Generation de {len(affectations)} affectation(s) du {date_debut:%d/%m/%Y} "
+                f"au {date_fin:%d/%m/%Y} dans le planning {planning.REFERENCE}"
+            )
+        )
@@ -3,17 +3,25 @@ Tests pour le module Planning.
 Couvre: modeles, formulaires, permissions et vues.
 """
 from datetime import date, time, timedelta
-from django.test import TestCase, RequestFactory
+from django.core.cache import cache
+from django.test import TestCase, RequestFactory, override_settings
 from django.contrib.auth.models import User
 from django.utils import timezone
 
 from employee.tests.base import EmployeeTestCase
-from planning.models import Planning, SiteTravail, PosteTravail, Affectation, Evenement
+from planning.models import (
+    Planning, SiteTravail, PosteTravail, Affectation, Evenement,
+    ModeleRotation, MembreRotation, CreneauRotation,
+)
 from planning.forms import (
     SiteTravailForm, PosteTravailForm, PlanningForm,
     AffectationForm, EvenementForm
 )
-from planning.permissions import get_planning_role, can_edit_planning
+from planning.permissions import (
+    get_planning_role, can_edit_planning, cle_perimetre, get_visible_employees, peut_voir_employe,
+    resoudre_perimetre,
+)
+from planning.services import GenerationService
 
 
 # ============================================================
@@ -401,6 +409,71 @@ class PermissionsTest(EmployeeTestCase):
         self.assertFalse(can_edit_planning(anon))
 
 
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class PerimetreTest(EmployeeTestCase):
+    """Tests pour la resolution du perimetre de visibilite (une fois par requete, en cache)."""
+
+    def setUp(self):
+        cache.clear()
+        self.manager = self.create_employee(matricule='PMGR01', nom='Manager')
+        self.manager_user = self.create_user_for_employee(self.manager)
+        self.assign_as_manager(self.manager)
+        self.employe = self.create_employee(matricule='PEMP01')
+        self.collegue = self.create_employee(matricule='PEMP02')
+        self.employe_user = self.create_user_for_employee(self.employe)
+        self.collegue_user = self.create_user_for_employee(self.collegue)
+        for employe in (self.manager, self.employe, self.collegue):
+            self.create_affectation(employe)
+
+    def test_resolution_unique_par_requete(self):
+        """Role, employes et plannings visibles sans nouvelle requete."""
+        perimetre = resoudre_perimetre(self.manager_user)
+        self.assertEqual(perimetre.employes, {'PMGR01', 'PEMP01', 'PEMP02'})
+        with self.assertNumQueries(0):
+            self.assertEqual(get_planning_role(self.manager_user), 'manager')
+            self.assertTrue(peut_voir_employe(self.manager_user, 'PEMP01'))
+            self.assertFalse(peut_voir_employe(self.manager_user, 'INCONNU'))
+            cle_perimetre(self.manager_user)
+
+        # Requete suivante (nouvel objet utilisateur) : lu depuis le cache
+        utilisateur = User.objects.get(pk=self.manager_user.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_planning_role(utilisateur), 'manager')
+
+    def test_cle_partagee_entre_collegues(self):
+        """Deux collegues du meme departement partagent la cle de cache des flux."""
+        self.assertEqual(cle_perimetre(self.employe_user), cle_perimetre(self.collegue_user))
+        self.assertNotEqual(cle_perimetre(self.employe_user), cle_perimetre(self.manager_user))
+
+    def test_connexion_ne_vide_pas_le_cache(self):
+        """Une connexion (last_login) garde le perimetre en cache ; is_superuser change la cle."""
+        resoudre_perimetre(self.employe_user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.employe_user.last_login = timezone.now()
+            self.employe_user.save(update_fields=['last_login'])
+
+        utilisateur = User.objects.get(pk=self.employe_user.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_planning_role(utilisateur), 'employee')
+
+        User.objects.filter(pk=self.employe_user.pk).update(is_superuser=True)
+        self.assertEqual(get_planning_role(User.objects.get(pk=self.employe_user.pk)), 'admin')
+
+    def test_invalidation_par_la_hierarchie(self):
+        """Une nouvelle affectation dans le departement elargit le perimetre."""
+        resoudre_perimetre(self.manager_user)
+        with self.captureOnCommitCallbacks(execute=True):
+            nouveau = self.create_employee(matricule='PEMP03')
+            self.create_affectation(nouveau)
+
+        utilisateur = User.objects.get(pk=self.manager_user.pk)
+        self.assertIn('PEMP03', resoudre_perimetre(utilisateur).employes)
+        self.assertEqual(
+            set(get_visible_employees(utilisateur).values_list('matricule', flat=True)),
+            {'PMGR01', 'PEMP01', 'PEMP02', 'PEMP03'}
+        )
+
+
 # ============================================================
 # TESTS VUES
 # ============================================================
@@ -693,3 +766,322 @@ class CalendarViewsTest(EmployeeTestCase):
         response = self.client.get('/planning/')
         self.assertEqual(response.status_code, 302)
         self.assertIn('login', response.url)
+
+
+# ============================================================
+# TESTS GENERATION DEPUIS LES MODELES DE ROTATION
+# ============================================================
+
+class GenerationServiceTest(EmployeeTestCase):
+    """Tests pour le developpement des modeles et la detection des conflits."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        site = SiteTravail.objects.create(nom='Site Rotation')
+        cls.poste_rotation = PosteTravail.objects.create(
+            nom='Accueil', site=site, heure_debut=time(8, 0), heure_fin=time(16, 0),
+            pause_dejeune=timedelta(minutes=30)
+        )
+        cls.planning = Planning.objects.create(
+            titre='Planning Mars', date_debut=date(2026, 3, 1), date_fin=date(2026, 3, 31)
+        )
+        cls.employes = [cls().create_employee(matricule=f'ROT00{i}', nom=f'Rot{i}') for i in range(1, 4)]
+
+        # Semaine type : le lundi et le mercredi, rangs 0 et 1, decales d'un rang par semaine
+        cls.modele = ModeleRotation.objects.create(
+            nom='Accueil semaine', poste=cls.poste_rotation, decalage=1, date_reference=date(2026, 3, 2)
+        )
+        for ordre, employe in enumerate(cls.employes):
+            MembreRotation.objects.create(modele=cls.modele, employe=employe, ordre=ordre)
+        CreneauRotation.objects.create(modele=cls.modele, jour_semaine=0, rang=0)
+        CreneauRotation.objects.create(
+            modele=cls.modele, jour_semaine=2, rang=1, heure_debut=time(12, 0), heure_fin=time(20, 0)
+        )
+
+    def generer(self, date_debut, date_fin, **kwargs):
+        modeles = GenerationService.charger_modeles([self.modele.pk])
+        return GenerationService.generer(modeles, self.planning, date_debut, date_fin, **kwargs)
+
+    def test_developpement_et_rotation(self):
+        """Les creneaux sont repetes chaque semaine, decales d'un membre."""
+        modeles = GenerationService.charger_modeles([self.modele.pk])
+        affectations = GenerationService.developper(modeles, self.planning, date(2026, 3, 2), date(2026, 3, 15))
+
+        lundis = sorted((a.date, a.employe_id) for a in affectations if a.date.weekday() == 0)
+        self.assertEqual(lundis, [(date(2026, 3, 2), 'ROT001'), (date(2026, 3, 9), 'ROT002')])
+        mercredi = next(a for a in affectations if a.date == date(2026, 3, 4))
+        self.assertEqual((mercredi.employe_id, mercredi.heure_debut), ('ROT002', time(12, 0)))
+        lundi = next(a for a in affectations if a.date == date(2026, 3, 2))
+        self.assertEqual((lundi.heure_debut, lundi.heure_fin), (time(8, 0), time(16, 0)))
+
+    def test_conflits_en_une_requete_et_bulk_create(self):
+        """Affectations existantes, absences validees et jours feries sont ecartes."""
+        from absence.models import Absence, JourFerie, TypeAbsence
+
+        Affectation.objects.create(
+            planning=self.planning, employe=self.employes[0], poste=self.poste_rotation,
+            date=date(2026, 3, 2), heure_debut=time(15, 0), heure_fin=time(18, 0)
+        )
+        type_conge = TypeAbsence.objects.create(
+            code='CGR', libelle='Conges', categorie='CONGES_PAYES',
+            decompte_solde=False, justificatif_obligatoire=False
+        )
+        Absence.objects.create(
+            employe=self.employes[1], type_absence=type_conge, statut='VALIDE',
+            date_debut=date(2026, 3, 4), date_fin=date(2026, 3, 4), created_by=self.employes[1]
+        )
+        JourFerie.objects.create(nom='Ferie test', date=date(2026, 3, 9))
+
+        # Modeles, membres, employes, creneaux ; conflits (UNION) ; savepoint,
+        # lot d'affectations, audit, savepoint
+        with self.assertNumQueries(9):
+            rapport = self.generer(date(2026, 3, 2), date(2026, 3, 15))
+
+        motifs = {(c['date'], c['motif']) for c in rapport['conflits']}
+        self.assertEqual(motifs, {
+            ('2026-03-02', 'AFFECTATION'), ('2026-03-04', 'ABSENCE'), ('2026-03-09', 'JOUR_FERIE'),
+        })
+        self.assertEqual((rapport['prevues'], rapport['creees']), (4, 1))
+        self.assertTrue(Affectation.objects.filter(date=date(2026, 3, 11), employe_id='ROT003').exists())
+
+    def test_affectation_annulee_meme_heure_de_debut(self):
+        """Une affectation annulee a la meme heure de debut est un conflit (unicite), pas une erreur SQL."""
+        Affectation.objects.create(
+            planning=self.planning, employe=self.employes[0], poste=self.poste_rotation, statut='ANNULE',
+            date=date(2026, 3, 2), heure_debut=time(8, 0), heure_fin=time(12, 0)
+        )
+        # Annulee a une autre heure : n'empeche rien
+        Affectation.objects.create(
+            planning=self.planning, employe=self.employes[1], poste=self.poste_rotation, statut='ANNULE',
+            date=date(2026, 3, 4), heure_debut=time(13, 0), heure_fin=time(20, 0)
+        )
+        rapport = self.generer(date(2026, 3, 2), date(2026, 3, 8))
+
+        self.assertEqual(
+            [(c['date'], c['motif']) for c in rapport['conflits']], [('2026-03-02', 'AFFECTATION')]
+        )
+        self.assertEqual(rapport['creees'], 1)
+        self.assertTrue(Affectation.objects.filter(
+            date=date(2026, 3, 4), employe_id='ROT002', statut='PLANIFIE'
+        ).exists())
+
+    def test_apercu_et_perimetre(self):
+        """L'apercu n'enregistre rien ; les employes hors perimetre sont signales."""
+        rapport = self.generer(
+            date(2026, 3, 2), date(2026, 3, 8), apercu=True, employes_autorises={'ROT001'}
+        )
+
+        self.assertEqual(rapport['creees'], 0)
+        self.assertEqual([c['motif'] for c in rapport['conflits']], ['NON_AUTORISE'])
+        self.assertFalse(Affectation.objects.filter(planning=self.planning).exists())
+
+    def test_doublons_entre_creneaux(self):
+        """Deux creneaux generes qui se chevauchent pour un employe : le second est ecarte."""
+        CreneauRotation.objects.create(
+            modele=self.modele, jour_semaine=0, rang=0, heure_debut=time(10, 0), heure_fin=time(12, 0)
+        )
+        rapport = self.generer(date(2026, 3, 2), date(2026, 3, 2))
+
+        self.assertEqual([c['motif'] for c in rapport['conflits']], ['DOUBLON'])
+        self.assertEqual(rapport['creees'], 1)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class FluxCalendrierTest(EmployeeTestCase):
+    """Tests pour les flux FullCalendar (projection, cache, ETag)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.admin_user = User.objects.create_superuser('fluxadmin', 'flux@test.com', 'x')
+        site = SiteTravail.objects.create(nom='Site Flux')
+        cls.poste_flux = PosteTravail.objects.create(nom='Caisse', site=site, pause_dejeune=timedelta(0))
+        cls.planning = Planning.objects.create(
+            titre='Planning Flux', date_debut=date(2026, 4, 1), date_fin=date(2026, 4, 30)
+        )
+        cls.employes = [cls().create_employee(matricule=f'FLX00{i}', nom=f'Flux{i}') for i in range(1, 4)]
+        for jour, employe in enumerate(cls.employes, start=6):
+            Affectation.objects.create(
+                planning=cls.planning, employe=employe, poste=cls.poste_flux,
+                date=date(2026, 4, jour), heure_debut=time(9, 0), heure_fin=time(17, 0)
+            )
+        debut = timezone.make_aware(timezone.datetime(2026, 4, 8, 10, 0))
+        for titre in ('Reunion', 'Formation'):
+            evenement = Evenement.objects.create(
+                titre=titre, date_debut=debut, date_fin=debut + timedelta(hours=1)
+            )
+            evenement.employes.set(cls.employes)
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+
+    def get(self, vue, **entetes):
+        from planning import views_api
+        request = self.factory.get('/', {'start': '2026-04-01T00:00:00', 'end': '2026-05-01T00:00:00'}, **entetes)
+        request.user = self.admin_user
+        return getattr(views_api, vue)(request)
+
+    def test_affectations_projection_et_etag(self):
+        """Une requete au premier appel (perimetre admin sans requete), 304 sans requete ensuite ; invalidation."""
+        import json
+
+        with self.assertNumQueries(1):
+            reponse = self.get('api_affectations')
+        events = json.loads(reponse.content)
+        self.assertEqual(len(events), 3)
+        self.assertEqual(events[0]['start'], '2026-04-06T09:00:00')
+        self.assertEqual(events[0]['extendedProps']['site_nom'], 'Site Flux')
+
+        with self.assertNumQueries(0):
+            reponse_304 = self.get('api_affectations', HTTP_IF_NONE_MATCH=reponse['ETag'])
+        self.assertEqual(reponse_304.status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Affectation.objects.filter(employe=self.employes[0]).first().delete()
+        reponse = self.get('api_affectations', HTTP_IF_NONE_MATCH=reponse['ETag'])
+        self.assertEqual((reponse.status_code, len(json.loads(reponse.content))), (200, 2))
+
+    def test_evenements_sans_n_plus_1(self):
+        """Les participants de tous les evenements sont lus en une seule requete."""
+        import json
+
+        # Evenements, participants
+        with self.assertNumQueries(2):
+            events = json.loads(self.get('api_evenements').content)
+        self.assertEqual(len(events), 2)
+        self.assertEqual(sorted(events[0]['extendedProps']['participants']), ['FLX001', 'FLX002', 'FLX003'])
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class AffectationApiTest(EmployeeTestCase):
+    """Tests pour la creation d'affectations par l'API (detection des chevauchements)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.admin_user = User.objects.create_superuser('affadmin', 'aff@test.com', 'x')
+        site = SiteTravail.objects.create(nom='Site API')
+        cls.poste_api = PosteTravail.objects.create(nom='Caisse', site=site, pause_dejeune=timedelta(0))
+        cls.planning = Planning.objects.create(
+            titre='Planning API', date_debut=date(2026, 5, 1), date_fin=date(2026, 5, 31)
+        )
+        cls.employe = cls().create_employee(matricule='API001', nom='Api')
+        Affectation.objects.create(
+            planning=cls.planning, employe=cls.employe, poste=cls.poste_api, statut='ANNULE',
+            date=date(2026, 5, 4), heure_debut=time(9, 0), heure_fin=time(17, 0)
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def creer(self, heure_debut, heure_fin):
+        from planning import views_api
+        request = RequestFactory().post('/', {
+            'employe': self.employe.matricule, 'planning': self.planning.pk, 'poste': self.poste_api.pk,
+            'date': '2026-05-04', 'heure_debut': heure_debut, 'heure_fin': heure_fin,
+        })
+        request.user = self.admin_user
+        return views_api.api_affectation_create(request)
+
+    def test_affectation_annulee_meme_heure_de_debut(self):
+        """Une affectation annulee a la meme heure de debut : 409, pas d'erreur d'unicite."""
+        from planning import views_api
+
+        reponse = self.creer('09:00', '12:00')
+        self.assertEqual(reponse.status_code, 409)
+        self.assertIn('Chevauchement', reponse.content.decode())
+
+        # Une autre heure de debut sur le creneau annule reste possible
+        self.assertIsNone(views_api._affectation_en_conflit(
+            self.employe, date(2026, 5, 4), time(10, 0), time(12, 0)
+        ))
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class DisponibiliteServiceTest(EmployeeTestCase):
+    """Tests pour la matrice de disponibilite (employes x jours)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        from absence.models import Absence, JourFerie, TypeAbsence
+
+        cls.admin_user = User.objects.create_superuser('dispoadmin', 'dispo@test.com', 'x')
+        site = SiteTravail.objects.create(nom='Site Dispo')
+        cls.poste_dispo = PosteTravail.objects.create(nom='Accueil', site=site, pause_dejeune=timedelta(0))
+        planning = Planning.objects.create(
+            titre='Planning Dispo', date_debut=date(2026, 4, 1), date_fin=date(2026, 4, 30)
+        )
+        cls.employes = [cls().create_employee(matricule=f'DSP00{i}', nom=f'Dispo{i}') for i in range(1, 4)]
+        Affectation.objects.create(
+            planning=planning, employe=cls.employes[0], poste=cls.poste_dispo,
+            date=date(2026, 4, 7), heure_debut=time(9, 0), heure_fin=time(17, 0)
+        )
+        cls.type_conge = TypeAbsence.objects.create(
+            code='CGD', libelle='Conges', categorie='CONGES_PAYES',
+            decompte_solde=False, justificatif_obligatoire=False
+        )
+        for employe, statut, debut, fin in (
+            (cls.employes[1], 'VALIDE', date(2026, 4, 7), date(2026, 4, 8)),
+            (cls.employes[2], 'EN_ATTENTE_MANAGER', date(2026, 4, 8), date(2026, 4, 9)),
+        ):
+            Absence.objects.create(
+                employe=employe, type_absence=cls.type_conge, statut=statut,
+                date_debut=debut, date_fin=fin, created_by=employe
+            )
+        JourFerie.objects.create(nom='Ferie dispo', date=date(2026, 4, 10))
+
+    def setUp(self):
+        cache.clear()
+
+    def test_matrice_trois_requetes_et_cache_par_semaine(self):
+        """Perimetre et trois requetes de periode, puis semaines servies par le cache."""
+        from planning.services import DisponibiliteService, MatriceDisponibilite as M
+
+        with self.assertNumQueries(4):
+            matrice = DisponibiliteService.matrice(self.admin_user, date(2026, 4, 6), date(2026, 4, 19))
+
+        self.assertEqual(matrice.matricules, ['DSP001', 'DSP002', 'DSP003'])
+        self.assertEqual(matrice.etats.shape, (3, 14))
+        # Mardi 7 : en poste, absent, disponible ; samedi 11 : repos ; vendredi 10 : ferie
+        self.assertEqual(matrice.etats[:, 1].tolist(), [M.ETAT_EN_POSTE, M.ETAT_ABSENT, M.ETAT_DISPONIBLE])
+        self.assertEqual(matrice.etats[2, 2:4].tolist(), [M.ETAT_EN_ATTENTE, M.ETAT_EN_ATTENTE])
+        self.assertEqual(matrice.etats[:, 4].tolist(), [M.ETAT_FERIE] * 3)
+        self.assertEqual(matrice.etats[0, 5], M.ETAT_REPOS)
+        self.assertEqual(matrice.postes[0, 1], self.poste_dispo.pk)
+        self.assertEqual(matrice.absences[1, 1], self.type_conge.pk)
+
+        # La demande en attente compte encore ; sa validation retire DSP003 le 8 et le 9
+        self.assertEqual(matrice.presents()[:4].tolist(), [3, 2, 2, 3])
+        self.assertEqual(matrice.presents_si_absent('DSP003', date(2026, 4, 8), date(2026, 4, 9))[:4].tolist(),
+                         [3, 2, 1, 2])
+
+        with self.assertNumQueries(0):
+            semaine = DisponibiliteService.matrice(self.admin_user, date(2026, 4, 13), date(2026, 4, 15))
+        self.assertEqual(semaine.jours, [date(2026, 4, 13), date(2026, 4, 14), date(2026, 4, 15)])
+
+    def test_api_et_types_masques(self):
+        """L'API renvoie la matrice ; le type d'absence est masque pour un simple employe."""
+        import json
+        from planning import views_api
+
+        factory = RequestFactory()
+        request = factory.get('/', {'start': '2026-04-06', 'end': '2026-04-12'})
+        request.user = self.admin_user
+        donnees = json.loads(views_api.api_disponibilites(request).content)
+        self.assertEqual((len(donnees['jours']), donnees['effectif']), (7, 3))
+        self.assertEqual(donnees['types_absence'][str(self.type_conge.pk)]['libelle'], 'Conges')
+        self.assertEqual(donnees['feries'], {'2026-04-10': 'Ferie dispo'})
+
+        request = factory.get('/', {'start': '2026-04-12', 'end': '2026-04-06'})
+        request.user = self.admin_user
+        self.assertEqual(views_api.api_disponibilites(request).status_code, 400)
+
+        from planning.services import MatriceDisponibilite
+        matrice = MatriceDisponibilite.vide(['A'], ['A a'], date(2026, 4, 6), date(2026, 4, 7))
+        matrice.absences[0, 0] = self.type_conge.pk
+        matrice.types_absence[self.type_conge.pk] = ('Conges', '#fff')
+        masquee = matrice.en_json(masquer_types=True)
+        self.assertEqual((masquee['absences'], masquee['types_absence']), ([[0, 0]], {}))
@@ -16,6 +16,13 @@ urlpatterns = [
     path('api/affectation/<int:pk>/update/', views_api.api_affectation_update, name='api_affectation_update'),
     path('api/affectation/<int:pk>/delete/', views_api.api_affectation_delete, name='api_affectation_delete'),
 
+    # API Generation depuis les modeles de rotation
+    path('api/generation/apercu/', views_api.api_generation_apercu, name='api_generation_apercu'),
+    path('api/generation/', views_api.api_generation, name='api_generation'),
+
+    # API Disponibilites (matrice employes x jours)
+    path('api/disponibilites/', views_api.api_disponibilites, name='api_disponibilites'),
+
     # API Evenements
     path('api/evenements/', views_api.api_evenements, name='api_evenements'),
     path('api/evenement/create/', views_api.api_evenement_create, name='api_evenement_create'),
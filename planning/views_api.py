@@ -1,19 +1,35 @@
 """API views pour le module Planning."""
 import logging
-from datetime import datetime
+from collections import defaultdict
+from datetime import date, datetime
 
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.http import require_http_methods, require_POST
 from django.db import transaction
+from django.db.models import Q
 
+from core.cache import FamilleCache
+from core.chevauchement import premier_conflit
+from core.flux import encoder_json, reponse_json_en_cache
 from .models import Affectation, Evenement, PosteTravail, Planning
-from .permissions import get_planning_role, get_visible_employees, get_visible_plannings, can_edit_planning
+from .permissions import (
+    cle_perimetre, filtrer_par_perimetre, get_planning_role, get_visible_employees, get_visible_plannings,
+    can_edit_planning, peut_voir_employe, resoudre_perimetre,
+)
+from .services.disponibilite_service import DisponibiliteService
+from .services.generation_service import GENERATION_JOURS_MAX, GenerationService
 from employee.models import ZY00
 
 logger = logging.getLogger(__name__)
 
+# Flux du calendrier : cache par perimetre de visibilite et fenetre, invalide
+# par les modeles du planning et ceux qui determinent la visibilite
+CACHE_FLUX_CALENDRIER = FamilleCache('planning.flux_calendrier', tags=[
+    'planning', 'employee.zy00', 'employee.zyaf', 'employee.zyre', 'departement.zyma',
+])
+
 # Couleurs par statut/type pour FullCalendar
 COULEURS_AFFECTATION = {
     'PLANIFIE': '#17a2b8',
@@ -33,55 +49,79 @@ COULEURS_EVENEMENT = {
 
 # ===== AFFECTATIONS =====
 
+def _fenetre(request):
+    """Fenetre FullCalendar (dates AAAA-MM-JJ, vides si absentes)."""
+    return request.GET.get('start', '')[:10], request.GET.get('end', '')[:10]
+
+
 @require_http_methods(["GET"])
 @login_required
 def api_affectations(request):
-    """Liste des affectations au format FullCalendar."""
+    """Liste des affectations au format FullCalendar (en cache par perimetre et fenetre)."""
     try:
-        start = request.GET.get('start', '')
-        end = request.GET.get('end', '')
-
-        visible = get_visible_employees(request.user)
-        qs = Affectation.objects.filter(
-            employe__in=visible
-        ).select_related('employe', 'poste', 'poste__site', 'planning')
-
-        if start:
-            qs = qs.filter(date__gte=start[:10])
-        if end:
-            qs = qs.filter(date__lte=end[:10])
-
-        events = []
-        for a in qs:
-            events.append({
-                'id': f'aff-{a.id}',
-                'title': f'{a.employe.nom} {a.employe.prenoms} - {a.poste.nom}',
-                'start': f'{a.date}T{a.heure_debut}',
-                'end': f'{a.date}T{a.heure_fin}',
-                'backgroundColor': COULEURS_AFFECTATION.get(a.statut, '#17a2b8'),
-                'borderColor': COULEURS_AFFECTATION.get(a.statut, '#17a2b8'),
-                'extendedProps': {
-                    'type': 'affectation',
-                    'pk': a.id,
-                    'employe_matricule': a.employe.matricule,
-                    'employe_nom': f'{a.employe.nom} {a.employe.prenoms}',
-                    'poste_id': a.poste.id,
-                    'poste_nom': a.poste.nom,
-                    'site_nom': a.poste.site.nom,
-                    'planning_id': a.planning.id,
-                    'planning_titre': a.planning.titre,
-                    'statut': a.statut,
-                    'notes': a.notes,
-                }
-            })
-
-        return JsonResponse(events, safe=False)
+        start, end = _fenetre(request)
+
+        def calculer():
+            qs = filtrer_par_perimetre(Affectation.objects.all(), request.user)
+            if start:
+                qs = qs.filter(date__gte=start)
+            if end:
+                qs = qs.filter(date__lte=end)
+
+            events = []
+            for a in qs.values(
+                'id', 'date', 'heure_debut', 'heure_fin', 'statut', 'notes',
+                'employe_id', 'employe__nom', 'employe__prenoms',
+                'poste_id', 'poste__nom', 'poste__site__nom', 'planning_id', 'planning__titre',
+            ):
+                nom = f"{a['employe__nom']} {a['employe__prenoms']}"
+                couleur = COULEURS_AFFECTATION.get(a['statut'], '#17a2b8')
+                events.append({
+                    'id': f"aff-{a['id']}",
+                    'title': f"{nom} - {a['poste__nom']}",
+                    'start': f"{a['date']}T{a['heure_debut']}",
+                    'end': f"{a['date']}T{a['heure_fin']}",
+                    'backgroundColor': couleur,
+                    'borderColor': couleur,
+                    'extendedProps': {
+                        'type': 'affectation',
+                        'pk': a['id'],
+                        'employe_matricule': a['employe_id'],
+                        'employe_nom': nom,
+                        'poste_id': a['poste_id'],
+                        'poste_nom': a['poste__nom'],
+                        'site_nom': a['poste__site__nom'],
+                        'planning_id': a['planning_id'],
+                        'planning_titre': a['planning__titre'],
+                        'statut': a['statut'],
+                        'notes': a['notes'],
+                    }
+                })
+            return events
+
+        return reponse_json_en_cache(
+            request, CACHE_FLUX_CALENDRIER, calculer, 'affectations', cle_perimetre(request.user), start, end
+        )
 
     except Exception as e:
         logger.exception("Erreur api_affectations")
         return JsonResponse({'error': str(e)}, status=500)
 
 
+def _affectation_en_conflit(employe, date_aff, heure_debut, heure_fin, exclure_pk=None):
+    """
+    Premiere affectation active de l'employe dont le creneau chevauche (une requete).
+    Une affectation annulee qui commence a la meme heure bloque aussi
+    (unicite employe / date / heure de debut).
+    """
+    return premier_conflit(
+        Affectation.objects.filter(employe=employe, date=date_aff)
+        .filter(~Q(statut='ANNULE') | Q(heure_debut=heure_debut)).select_related('poste'),
+        heure_debut, heure_fin, 'heure_debut', 'heure_fin',
+        exclure_pk=exclure_pk, bornes_incluses=False
+    )
+
+
 @require_POST
 @login_required
 def api_affectation_create(request):
@@ -90,10 +130,9 @@ def api_affectation_create(request):
         return JsonResponse({'success': False, 'error': 'Permission refusee'}, status=403)
 
     try:
-        visible = get_visible_employees(request.user)
         employe_matricule = request.POST.get('employe')
 
-        if not visible.filter(matricule=employe_matricule).exists():
+        if not peut_voir_employe(request.user, employe_matricule):
             return JsonResponse({'success': False, 'error': 'Employe non autorise'}, status=403)
 
         employe = ZY00.objects.get(matricule=employe_matricule)
@@ -108,14 +147,8 @@ def api_affectation_create(request):
         date_aff = request.POST.get('date')
         heure_debut = request.POST.get('heure_debut')
         heure_fin = request.POST.get('heure_fin')
-        chevauchement = Affectation.objects.filter(
-            employe=employe,
-            date=date_aff,
-            heure_debut__lt=heure_fin,
-            heure_fin__gt=heure_debut,
-        )
-        if chevauchement.exists():
-            aff_existante = chevauchement.first()
+        aff_existante = _affectation_en_conflit(employe, date_aff, heure_debut, heure_fin)
+        if aff_existante:
             return JsonResponse({
                 'success': False,
                 'error': f'Chevauchement : {employe.nom} est deja affecte de '
@@ -159,8 +192,7 @@ def api_affectation_detail(request, pk):
             pk=pk
         )
 
-        visible = get_visible_employees(request.user)
-        if not visible.filter(matricule=affectation.employe.matricule).exists():
+        if not peut_voir_employe(request.user, affectation.employe_id):
             return JsonResponse({'success': False, 'error': 'Acces refuse'}, status=403)
 
         data = {
@@ -193,15 +225,14 @@ def api_affectation_update(request, pk):
 
     try:
         affectation = get_object_or_404(Affectation, pk=pk)
-        visible = get_visible_employees(request.user)
 
-        if not visible.filter(matricule=affectation.employe.matricule).exists():
+        if not peut_voir_employe(request.user, affectation.employe_id):
             return JsonResponse({'success': False, 'error': 'Acces refuse'}, status=403)
 
         with transaction.atomic():
             employe_matricule = request.POST.get('employe')
             if employe_matricule:
-                if not visible.filter(matricule=employe_matricule).exists():
+                if not peut_voir_employe(request.user, employe_matricule):
                     return JsonResponse({'success': False, 'error': 'Employe non autorise'}, status=403)
                 affectation.employe = ZY00.objects.get(matricule=employe_matricule)
 
@@ -221,14 +252,11 @@ def api_affectation_update(request, pk):
                     setattr(affectation, field, value)
 
             # Detection de chevauchement (exclure l'affectation courante)
-            chevauchement = Affectation.objects.filter(
-                employe=affectation.employe,
-                date=affectation.date,
-                heure_debut__lt=affectation.heure_fin,
-                heure_fin__gt=affectation.heure_debut,
-            ).exclude(pk=pk)
-            if chevauchement.exists():
-                aff_existante = chevauchement.first()
+            aff_existante = _affectation_en_conflit(
+                affectation.employe, affectation.date, affectation.heure_debut, affectation.heure_fin,
+                exclure_pk=pk
+            )
+            if aff_existante:
                 return JsonResponse({
                     'success': False,
                     'error': f'Chevauchement : {affectation.employe.nom} est deja affecte de '
@@ -254,9 +282,8 @@ def api_affectation_delete(request, pk):
 
     try:
         affectation = get_object_or_404(Affectation, pk=pk)
-        visible = get_visible_employees(request.user)
 
-        if not visible.filter(matricule=affectation.employe.matricule).exists():
+        if not peut_voir_employe(request.user, affectation.employe_id):
             return JsonResponse({'success': False, 'error': 'Acces refuse'}, status=403)
 
         with transaction.atomic():
@@ -268,52 +295,151 @@ def api_affectation_delete(request, pk):
         return JsonResponse({'success': False, 'error': str(e)}, status=400)
 
 
+# ===== GENERATION DEPUIS LES MODELES DE ROTATION =====
+
+def _generer_affectations(request, apercu):
+    """Apercu (rapport de conflits) ou generation des affectations des modeles."""
+    if not can_edit_planning(request.user):
+        return JsonResponse({'success': False, 'error': 'Permission refusee'}, status=403)
+
+    try:
+        planning_id = request.POST.get('planning')
+        if not get_visible_plannings(request.user).filter(id=planning_id).exists():
+            return JsonResponse({'success': False, 'error': 'Planning non autorise'}, status=403)
+        planning = get_object_or_404(Planning, id=planning_id)
+
+        try:
+            date_debut = date.fromisoformat(request.POST.get('date_debut', ''))
+            date_fin = date.fromisoformat(request.POST.get('date_fin', ''))
+        except ValueError:
+            return JsonResponse({'success': False, 'error': 'Dates invalides (AAAA-MM-JJ)'}, status=400)
+        if date_fin < date_debut:
+            return JsonResponse({'success': False, 'error': 'La date de fin precede la date de debut'}, status=400)
+        if (date_fin - date_debut).days >= GENERATION_JOURS_MAX:
+            return JsonResponse({
+                'success': False,
+                'error': f'Periode limitee a {GENERATION_JOURS_MAX} jours'
+            }, status=400)
+        if date_debut < planning.date_debut or date_fin > planning.date_fin:
+            return JsonResponse({
+                'success': False,
+                'error': f'La periode doit etre comprise dans celle du planning '
+                         f'({planning.date_debut:%d/%m/%Y} - {planning.date_fin:%d/%m/%Y})'
+            }, status=400)
+
+        modeles = GenerationService.charger_modeles(request.POST.getlist('modeles'))
+        if not modeles:
+            return JsonResponse({'success': False, 'error': 'Aucun modele de rotation actif'}, status=400)
+
+        # Perimetre deja resolu : None pour un admin (tous les employes actifs)
+        employes_autorises = resoudre_perimetre(request.user).employes
+
+        rapport = GenerationService.generer(
+            modeles, planning, date_debut, date_fin,
+            user=request.user, employes_autorises=employes_autorises, apercu=apercu,
+        )
+        if apercu:
+            message = f"{rapport['prevues'] - len(rapport['conflits'])} affectation(s) a creer"
+        else:
+            message = f"{rapport['creees']} affectation(s) creee(s)"
+        if rapport['conflits']:
+            message += f", {len(rapport['conflits'])} creneau(x) en conflit ecarte(s)"
+
+        return JsonResponse({'success': True, 'message': message, **rapport})
+
+    except Exception as e:
+        logger.exception("Erreur generation des affectations")
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+
+
+@require_POST
+@login_required
+def api_generation_apercu(request):
+    """Apercu d'une generation : affectations prevues et conflits, sans enregistrement."""
+    return _generer_affectations(request, apercu=True)
+
+
+@require_POST
+@login_required
+def api_generation(request):
+    """Genere les affectations des modeles de rotation (creneaux en conflit ecartes)."""
+    return _generer_affectations(request, apercu=False)
+
+
+# ===== DISPONIBILITES =====
+
+@require_http_methods(["GET"])
+@login_required
+def api_disponibilites(request):
+    """Matrice de disponibilite du perimetre (employes x jours), ?start=&end= AAAA-MM-JJ."""
+    if get_planning_role(request.user) is None:
+        return JsonResponse({'error': 'Acces refuse'}, status=403)
+
+    start, end = _fenetre(request)
+    try:
+        date_debut, date_fin = DisponibiliteService.periode(start or date.today().isoformat(), end)
+    except ValueError:
+        return JsonResponse({'error': 'Dates invalides (AAAA-MM-JJ)'}, status=400)
+
+    try:
+        donnees = DisponibiliteService.donnees(request.user, date_debut, date_fin)
+        return HttpResponse(encoder_json(donnees), content_type='application/json')
+    except Exception as e:
+        logger.exception("Erreur api_disponibilites")
+        return JsonResponse({'error': str(e)}, status=500)
+
+
 # ===== EVENEMENTS =====
 
 @require_http_methods(["GET"])
 @login_required
 def api_evenements(request):
-    """Liste des evenements au format FullCalendar."""
+    """Liste des evenements au format FullCalendar (en cache par perimetre et fenetre)."""
     try:
-        start = request.GET.get('start', '')
-        end = request.GET.get('end', '')
-
-        visible = get_visible_employees(request.user)
-        qs = Evenement.objects.filter(
-            employes__in=visible
-        ).distinct().prefetch_related('employes')
-
-        if start:
-            qs = qs.filter(date_fin__gte=start[:10])
-        if end:
-            qs = qs.filter(date_debut__lte=end[:10])
-
-        events = []
-        for ev in qs:
-            participants = list(ev.employes.values_list('matricule', flat=True))
-            participants_noms = [
-                f'{e.nom} {e.prenoms}' for e in ev.employes.all()
-            ]
-
-            events.append({
-                'id': f'evt-{ev.id}',
-                'title': ev.titre,
-                'start': ev.date_debut.isoformat(),
-                'end': ev.date_fin.isoformat(),
-                'backgroundColor': COULEURS_EVENEMENT.get(ev.type_evenement, '#858796'),
-                'borderColor': COULEURS_EVENEMENT.get(ev.type_evenement, '#858796'),
-                'extendedProps': {
-                    'type': 'evenement',
-                    'pk': ev.id,
-                    'type_evenement': ev.type_evenement,
-                    'description': ev.description,
-                    'lieu': ev.lieu,
-                    'participants': participants,
-                    'participants_noms': participants_noms,
-                }
-            })
-
-        return JsonResponse(events, safe=False)
+        start, end = _fenetre(request)
+
+        def calculer():
+            qs = filtrer_par_perimetre(Evenement.objects.all(), request.user, 'employes').distinct()
+            if start:
+                qs = qs.filter(date_fin__gte=start)
+            if end:
+                qs = qs.filter(date_debut__lte=end)
+            evenements = list(qs.values(
+                'id', 'titre', 'description', 'date_debut', 'date_fin', 'type_evenement', 'lieu'
+            ))
+
+            # Participants de tous les evenements en une requete
+            participants = defaultdict(list)
+            for evenement_id, matricule, nom, prenoms in Evenement.employes.through.objects.filter(
+                evenement_id__in=[ev['id'] for ev in evenements]
+            ).values_list('evenement_id', 'zy00__matricule', 'zy00__nom', 'zy00__prenoms'):
+                participants[evenement_id].append((matricule, f'{nom} {prenoms}'))
+
+            events = []
+            for ev in evenements:
+                couleur = COULEURS_EVENEMENT.get(ev['type_evenement'], '#858796')
+                events.append({
+                    'id': f"evt-{ev['id']}",
+                    'title': ev['titre'],
+                    'start': ev['date_debut'].isoformat(),
+                    'end': ev['date_fin'].isoformat(),
+                    'backgroundColor': couleur,
+                    'borderColor': couleur,
+                    'extendedProps': {
+                        'type': 'evenement',
+                        'pk': ev['id'],
+                        'type_evenement': ev['type_evenement'],
+                        'description': ev['description'],
+                        'lieu': ev['lieu'],
+                        'participants': [matricule for matricule, _ in participants[ev['id']]],
+                        'participants_noms': [nom for _, nom in participants[ev['id']]],
+                    }
+                })
+            return events
+
+        return reponse_json_en_cache(
+            request, CACHE_FLUX_CALENDRIER, calculer, 'evenements', cle_perimetre(request.user), start, end
+        )
 
     except Exception as e:
         logger.exception("Erreur api_evenements")
@@ -0,0 +1,48 @@
+# project_management/management/commands/detecter_anomalies_imputations.py
+"""
+Commande Django pour détecter les anomalies d'imputations et les stocker
+pour les tableaux de bord (dépassements journaliers, travail le week-end,
+inactivité des employés actifs).
+
+À planifier quotidiennement (cron / systemd timer).
+
+Usage:
+    python manage.py detecter_anomalies_imputations
+    python manage.py detecter_anomalies_imputations --jours 30
+"""
+import time
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from project_management.services.anomalie_service import AnomalieImputationService
+
+
+class Command(BaseCommand):
+    help = "Détecte les anomalies d'imputations et les enregistre pour les tableaux de bord"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--jours',
+            type=int,
+            default=90,
+            help='Période analysée pour les dépassements et le week-end, en jours (défaut: 90, 0 = tout)'
+        )
+
+    def handle(self, *args, **options):
+        date_debut = None
+        if options['jours'] > 0:
+            date_debut = timezone.now().date() - timedelta(days=options['jours'])
+
+        self.stdout.write(self.style.WARNING(f"\n{'='*70}"))
+        self.stdout.write(self.style.WARNING("🔍 DÉTECTION DES ANOMALIES D'IMPUTATIONS"))
+        self.stdout.write(self.style.WARNING(f"{'='*70}\n"))
+
+        debut = time.monotonic()
+        resultats = AnomalieImputationService.executer(date_debut=date_debut)
+
+        for type_anomalie, nombre in sorted(resultats['par_type'].items()):
+            self.stdout.write(f"   {type_anomalie:<30} {nombre:>5}")
+
+        self.stdout.write(self.style.SUCCESS(f"\n✅ Total: {resultats['total']} anomalie(s) enregistrée(s)"))
+        self.stdout.write(f"⏱️  Durée: {time.monotonic() - debut:.2f} secondes")
+        self.stdout.write(self.style.WARNING(f"{'='*70}\n"))
@@ -0,0 +1,47 @@
+# project_management/management/commands/reconstruire_cumuls_imputations.py
+"""
+Commande Django pour reconstruire les cumuls journaliers d'imputations
+(JRCumulImputation) et le temps passé des tickets.
+
+Les cumuls sont maintenus automatiquement à chaque imputation ; cette
+commande sert après un import en masse ou une correction directe en base.
+
+Usage:
+    python manage.py reconstruire_cumuls_imputations
+    python manage.py reconstruire_cumuls_imputations --projet PROJ-0001
+"""
+import time
+from django.core.management.base import BaseCommand, CommandError
+from project_management.models import JRProject, JRTicket
+from project_management.services.cumul_service import CumulImputationService
+
+
+class Command(BaseCommand):
+    help = "Reconstruit les cumuls journaliers d'imputations à partir des imputations validées"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--projet',
+            type=str,
+            help='Code du projet à reconstruire (par défaut : tous les projets)'
+        )
+
+    def handle(self, *args, **options):
+        tickets = None
+        if options['projet']:
+            try:
+                projet = JRProject.objects.get(code=options['projet'])
+            except JRProject.DoesNotExist:
+                raise CommandError(f"Projet introuvable: {options['projet']}")
+            tickets = JRTicket.objects.filter(projet=projet)
+
+        self.stdout.write(self.style.WARNING(f"\n{'='*70}"))
+        self.stdout.write(self.style.WARNING("⏱️  RECONSTRUCTION DES CUMULS D'IMPUTATIONS"))
+        self.stdout.write(self.style.WARNING(f"{'='*70}\n"))
+
+        debut = time.monotonic()
+        nb_cumuls = CumulImputationService.reconstruire(tickets=tickets)
+
+        self.stdout.write(self.style.SUCCESS(f"✅ {nb_cumuls} cumul(s) journalier(s) reconstruit(s)"))
+        self.stdout.write(f"⏱️  Durée: {time.monotonic() - debut:.2f} secondes")
+        self.stdout.write(self.style.WARNING(f"{'='*70}\n"))
@@ -0,0 +1,66 @@
+# Generated by Django 5.0.6 on 2026-10-19 02:22
+
+import django.db.models.deletion
+import uuid
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.db import migrations, models
+
+
+def initialiser_cumuls(apps, schema_editor):
+    """Alimente les cumuls journaliers à partir des imputations validées existantes."""
+    JRImputation = apps.get_model('project_management', 'JRImputation')
+    JRCumulImputation = apps.get_model('project_management', 'JRCumulImputation')
+
+    agregats = {}
+    lignes = JRImputation.objects.filter(statut_validation='VALIDE').values_list(
+        'employe_id', 'ticket_id', 'ticket__projet_id', 'type_activite',
+        'date_imputation', 'heures', 'minutes'
+    ).order_by().iterator(chunk_size=1000)
+    for employe_id, ticket_id, projet_id, type_activite, date, heures, minutes in lignes:
+        cumul = agregats.setdefault((employe_id, ticket_id, projet_id, type_activite, date), [0, 0])
+        cumul[0] += int((Decimal(heures or 0) * 60).to_integral_value(ROUND_HALF_UP)) + int(minutes or 0)
+        cumul[1] += 1
+
+    JRCumulImputation.objects.bulk_create(
+        [
+            JRCumulImputation(
+                id=uuid.uuid4(), employe_id=employe_id, ticket_id=ticket_id, projet_id=projet_id,
+                type_activite=type_activite, date=date, minutes=total[0], nb_imputations=total[1]
+            )
+            for (employe_id, ticket_id, projet_id, type_activite, date), total in agregats.items()
+        ],
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0002_alter_zyre_unique_together'),
+        ('project_management', '0002_alter_jrticket_statut'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JRCumulImputation',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('type_activite', models.CharField(choices=[('DEVELOPPEMENT', 'Développement'), ('ANALYSE', 'Analyse'), ('TEST', 'Test'), ('REUNION', 'Réunion'), ('DOCUMENTATION', 'Documentation'), ('SUPPORT', 'Support'), ('AUTRE', 'Autre')], max_length=30, verbose_name="Type d'activité")),
+                ('date', models.DateField(verbose_name='Date')),
+                ('minutes', models.PositiveIntegerField(default=0, verbose_name='Minutes validées')),
+                ('nb_imputations', models.PositiveIntegerField(default=0, verbose_name="Nombre d'imputations")),
+                ('employe', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pm_cumuls_imputations', to='employee.zy00', verbose_name='Employé')),
+                ('projet', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cumuls_imputations', to='project_management.jrproject', verbose_name='Projet')),
+                ('ticket', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cumuls_imputations', to='project_management.jrticket', verbose_name='Ticket')),
+            ],
+            options={
+                'verbose_name': "Cumul journalier d'imputations",
+                'verbose_name_plural': "Cumuls journaliers d'imputations",
+                'ordering': ['-date'],
+                'indexes': [models.Index(fields=['employe', 'date'], name='project_man_employe_0a9770_idx'), models.Index(fields=['projet', 'date'], name='project_man_projet__947c71_idx')],
+                'unique_together': {('employe', 'ticket', 'type_activite', 'date')},
+            },
+        ),
+        migrations.RunPython(initialiser_cumuls, migrations.RunPython.noop),
+    ]
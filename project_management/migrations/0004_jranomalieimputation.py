@@ -0,0 +1,35 @@
+# Generated by Django 5.0.6 on 2026-10-19 02:25
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0002_alter_zyre_unique_together'),
+        ('project_management', '0003_jrcumulimputation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JRAnomalieImputation',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('type_anomalie', models.CharField(choices=[('DEPASSEMENT_JOURNALIER', 'Dépassement journalier'), ('TRAVAIL_WEEKEND', 'Travail le week-end'), ('INACTIVITE', 'Inactivité')], max_length=30, verbose_name="Type d'anomalie")),
+                ('gravite', models.CharField(choices=[('haute', 'Haute'), ('moyenne', 'Moyenne')], default='moyenne', max_length=10, verbose_name='Gravité')),
+                ('date_concernee', models.DateField(blank=True, null=True, verbose_name='Date concernée')),
+                ('description', models.TextField(verbose_name='Description')),
+                ('date_detection', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Date de détection')),
+                ('employe', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pm_anomalies_imputations', to='employee.zy00', verbose_name='Employé')),
+            ],
+            options={
+                'verbose_name': "Anomalie d'imputation",
+                'verbose_name_plural': "Anomalies d'imputations",
+                'ordering': ['-date_detection', 'employe'],
+                'indexes': [models.Index(fields=['employe', 'type_anomalie'], name='project_man_employe_23d432_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.6 on 2026-10-19 02:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0002_alter_zyre_unique_together'),
+        ('project_management', '0004_jranomalieimputation'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='jrticket',
+            name='ordre_backlog',
+            field=models.FloatField(default=0, verbose_name='Ordre dans le backlog'),
+        ),
+        migrations.AddIndex(
+            model_name='jrticket',
+            index=models.Index(fields=['projet', 'dans_backlog', 'ordre_backlog'], name='project_man_projet__a0dbad_idx'),
+        ),
+    ]
@@ -2,7 +2,6 @@ import uuid
 from django.db import models
 from django.core.validators import FileExtensionValidator
 from django.utils import timezone
-from django.db.models import Sum
 from django.conf import settings
 
 
@@ -329,7 +328,9 @@ class JRTicket(models.Model):
         default=False,
         verbose_name="Dans le backlog"
     )
-    ordre_backlog = models.PositiveIntegerField(
+    # Rang fractionnaire : un déplacement prend la moyenne des rangs voisins
+    # et ne modifie qu'une ligne (voir BacklogService)
+    ordre_backlog = models.FloatField(
         default=0,
         verbose_name="Ordre dans le backlog"
     )
@@ -338,6 +339,9 @@ class JRTicket(models.Model):
         verbose_name = "Ticket"
         verbose_name_plural = "Tickets"
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['projet', 'dans_backlog', 'ordre_backlog']),
+        ]
     
     def __str__(self):
         return f"{self.code} - {self.titre}"
@@ -663,9 +667,8 @@ class JRImputation(models.Model):
         self.date_validation = timezone.now()
         self.commentaire_validation = commentaire
         self.save()
-        
-        # Mettre à jour le temps passé sur le ticket
-        self.mettre_a_jour_temps_ticket()
+        # Le cumul journalier et le temps passé sur le ticket sont mis à jour
+        # par les signaux de JRImputation (voir CumulImputationService)
     
     def rejeter(self, valide_par, commentaire):
         """Rejette l'imputation"""
@@ -676,20 +679,146 @@ class JRImputation(models.Model):
         self.save()
     
     def mettre_a_jour_temps_ticket(self):
-        """Met à jour le temps total passé sur le ticket"""
-        if self.statut_validation == 'VALIDE':
-            total_temps = JRImputation.objects.filter(
-                ticket=self.ticket,
-                statut_validation='VALIDE'
-            ).aggregate(
-                total=Sum(
-                    models.F('heures') + models.F('minutes') / 60.0,
-                    output_field=models.FloatField()
-                )
-            )['total'] or 0
-
-            self.ticket.temps_passe = total_temps
-            self.ticket.save()
+        """Met à jour le temps total passé sur le ticket (à partir des cumuls)"""
+        from .services.cumul_service import CumulImputationService
+        CumulImputationService.recalculer_temps_ticket(self.ticket)
+
+
+class JRCumulImputation(models.Model):
+    """
+    Cumul journalier des imputations validées par
+    (employé, ticket, type d'activité, date).
+
+    Maintenu de façon incrémentale par les signaux de JRImputation :
+    les rapports et tableaux de bord lisent ces cumuls (un enregistrement
+    par jour) au lieu de reparcourir toutes les imputations.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    employe = models.ForeignKey(
+        'employee.ZY00',
+        on_delete=models.CASCADE,
+        related_name='pm_cumuls_imputations',
+        verbose_name="Employé"
+    )
+
+    ticket = models.ForeignKey(
+        JRTicket,
+        on_delete=models.CASCADE,
+        related_name='cumuls_imputations',
+        verbose_name="Ticket"
+    )
+
+    projet = models.ForeignKey(
+        JRProject,
+        on_delete=models.CASCADE,
+        related_name='cumuls_imputations',
+        verbose_name="Projet"
+    )
+
+    type_activite = models.CharField(
+        max_length=30,
+        choices=JRImputation.TYPE_ACTIVITE_CHOICES,
+        verbose_name="Type d'activité"
+    )
+
+    date = models.DateField(verbose_name="Date")
+
+    minutes = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Minutes validées"
+    )
+
+    nb_imputations = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Nombre d'imputations"
+    )
+
+    class Meta:
+        verbose_name = "Cumul journalier d'imputations"
+        verbose_name_plural = "Cumuls journaliers d'imputations"
+        ordering = ['-date']
+        unique_together = ['employe', 'ticket', 'type_activite', 'date']
+        indexes = [
+            models.Index(fields=['employe', 'date']),
+            models.Index(fields=['projet', 'date']),
+        ]
+
+    def __str__(self):
+        return f"{self.employe_id} - {self.ticket_id} - {self.date} - {self.minutes} min"
+
+    @property
+    def total_heures(self):
+        """Retourne le cumul en heures"""
+        return self.minutes / 60
+
+
+class JRAnomalieImputation(models.Model):
+    """
+    Anomalie détectée sur les imputations d'un employé.
+
+    Alimentée par la tâche planifiée `detecter_anomalies_imputations` :
+    chaque exécution remplace l'ensemble des anomalies, que les tableaux
+    de bord lisent directement au lieu de les recalculer à la demande.
+    """
+
+    TYPE_ANOMALIE_CHOICES = [
+        ('DEPASSEMENT_JOURNALIER', 'Dépassement journalier'),
+        ('TRAVAIL_WEEKEND', 'Travail le week-end'),
+        ('INACTIVITE', 'Inactivité'),
+    ]
+
+    GRAVITE_CHOICES = [
+        ('haute', 'Haute'),
+        ('moyenne', 'Moyenne'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    employe = models.ForeignKey(
+        'employee.ZY00',
+        on_delete=models.CASCADE,
+        related_name='pm_anomalies_imputations',
+        verbose_name="Employé"
+    )
+
+    type_anomalie = models.CharField(
+        max_length=30,
+        choices=TYPE_ANOMALIE_CHOICES,
+        verbose_name="Type d'anomalie"
+    )
+
+    gravite = models.CharField(
+        max_length=10,
+        choices=GRAVITE_CHOICES,
+        default='moyenne',
+        verbose_name="Gravité"
+    )
+
+    date_concernee = models.DateField(
+        null=True,
+        blank=True,
+        verbose_name="Date concernée"
+    )
+
+    description = models.TextField(verbose_name="Description")
+
+    date_detection = models.DateTimeField(
+        default=timezone.now,
+        verbose_name="Date de détection"
+    )
+
+    class Meta:
+        verbose_name = "Anomalie d'imputation"
+        verbose_name_plural = "Anomalies d'imputations"
+        ordering = ['-date_detection', 'employe']
+        indexes = [
+            models.Index(fields=['employe', 'type_anomalie']),
+        ]
+
+    def __str__(self):
+        return f"{self.employe_id} - {self.get_type_anomalie_display()} - {self.description}"
 
 
 class JRSprint(models.Model):
@@ -1,5 +1,8 @@
 from .client_service import ClientService
 from .ticket_service import TicketService
+from .backlog_service import BacklogService
 from .imputation_service import ImputationService
+from .cumul_service import CumulImputationService
+from .anomalie_service import AnomalieImputationService
 from .workflow_service import WorkflowService
 from .notification_service import NotificationService
@@ -0,0 +1,191 @@
+"""
+Service de détection des anomalies d'imputations.
+
+La détection s'appuie sur les cumuls journaliers (JRCumulImputation) :
+- un seul parcours des totaux par (employé, jour) pour les dépassements
+  journaliers et le travail le week-end ;
+- une seule requête groupée Max('date') par employé pour l'inactivité.
+
+Les anomalies sont stockées (JRAnomalieImputation) par la tâche planifiée
+`detecter_anomalies_imputations` et lues telles quelles par les tableaux de bord.
+"""
+import logging
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Max, Q, Sum
+from django.utils import timezone
+
+from ..models import JRAnomalieImputation, JRCumulImputation
+
+logger = logging.getLogger(__name__)
+
+# Seuils de détection
+MINUTES_MAX_PAR_JOUR = 24 * 60
+JOURS_INACTIVITE = 7
+
+TAILLE_LOT = 1000
+
+
+class AnomalieImputationService:
+    """Service pour la détection et le stockage des anomalies d'imputations"""
+
+    @staticmethod
+    def detecter(employe=None, projet=None, date_debut=None):
+        """
+        Détecte les anomalies dans les imputations validées.
+
+        Args:
+            employe: limiter à un employé (optionnel)
+            projet: limiter à un projet (optionnel)
+            date_debut: ignorer les jours antérieurs pour les dépassements
+                et le travail le week-end (optionnel)
+
+        Returns:
+            list: anomalies sous forme de dictionnaires
+                  (type, description, gravite, employe, date)
+        """
+        cumuls = JRCumulImputation.objects.all()
+        if employe is not None:
+            cumuls = cumuls.filter(employe=employe)
+        if projet is not None:
+            cumuls = cumuls.filter(projet=projet)
+
+        anomalies = []
+
+        # Dépassements journaliers et week-end : un seul parcours des totaux par jour
+        totaux_jours = cumuls
+        if date_debut:
+            totaux_jours = totaux_jours.filter(date__gte=date_debut)
+        totaux_jours = totaux_jours.values(
+            'employe', 'employe__nom', 'employe__prenoms', 'date'
+        ).annotate(
+            total_minutes=Sum('minutes'),
+            nombre=Sum('nb_imputations')
+        ).order_by('employe', 'date')
+
+        weekend = {}
+        for jour in totaux_jours.iterator(chunk_size=TAILLE_LOT):
+            nom_employe = f"{jour['employe__nom']} {jour['employe__prenoms']}"
+
+            # Anomalie 1: Plus de 24h imputées en une journée
+            if jour['total_minutes'] > MINUTES_MAX_PAR_JOUR:
+                anomalies.append({
+                    'type': 'depassement_journalier',
+                    'description': (
+                        f"{nom_employe}: {round(jour['total_minutes'] / 60, 2)}h imputées "
+                        f"le {jour['date'].strftime('%d/%m/%Y')}"
+                    ),
+                    'gravite': 'haute',
+                    'employe': jour['employe'],
+                    'date': jour['date'],
+                })
+
+            # Anomalie 2: Imputations le week-end (samedi=5, dimanche=6)
+            if jour['date'].weekday() >= 5:
+                cumul = weekend.setdefault(jour['employe'], {'nom': nom_employe, 'nombre': 0, 'derniere': None})
+                cumul['nombre'] += jour['nombre']
+                cumul['derniere'] = jour['date']
+
+        for employe_id, cumul in weekend.items():
+            anomalies.append({
+                'type': 'travail_weekend',
+                'description': f"{cumul['nom']}: {cumul['nombre']} imputation(s) le week-end",
+                'gravite': 'moyenne',
+                'employe': employe_id,
+                'date': cumul['derniere'],
+            })
+
+        # Anomalie 3: Employés actifs sans imputation depuis plus de JOURS_INACTIVITE jours
+        if employe is None:
+            aujourd_hui = timezone.now().date()
+            inactifs = cumuls.filter(employe__etat='actif').values(
+                'employe', 'employe__nom', 'employe__prenoms'
+            ).annotate(
+                derniere_date=Max('date')
+            ).filter(
+                derniere_date__lt=aujourd_hui - timedelta(days=JOURS_INACTIVITE)
+            ).order_by('employe')
+
+            for inactif in inactifs:
+                jours_sans_imputation = (aujourd_hui - inactif['derniere_date']).days
+                anomalies.append({
+                    'type': 'inactivite',
+                    'description': (
+                        f"{inactif['employe__nom']} {inactif['employe__prenoms']} "
+                        f"n'a pas d'imputation depuis {jours_sans_imputation} jours"
+                    ),
+                    'gravite': 'moyenne',
+                    'employe': inactif['employe'],
+                    'date': inactif['derniere_date'],
+                })
+
+        return anomalies
+
+    @staticmethod
+    def enregistrer(anomalies):
+        """
+        Remplace les anomalies stockées par celles fournies.
+
+        Returns:
+            int: nombre d'anomalies enregistrées
+        """
+        date_detection = timezone.now()
+        with transaction.atomic():
+            JRAnomalieImputation.objects.all().delete()
+            JRAnomalieImputation.objects.bulk_create(
+                [
+                    JRAnomalieImputation(
+                        employe_id=anomalie['employe'],
+                        type_anomalie=anomalie['type'].upper(),
+                        gravite=anomalie['gravite'],
+                        date_concernee=anomalie['date'],
+                        description=anomalie['description'],
+                        date_detection=date_detection,
+                    )
+                    for anomalie in anomalies
+                ],
+                batch_size=TAILLE_LOT
+            )
+        return len(anomalies)
+
+    @staticmethod
+    def executer(date_debut=None):
+        """
+        Détecte puis stocke les anomalies (tâche planifiée).
+
+        Returns:
+            dict: nombre d'anomalies par type et total
+        """
+        anomalies = AnomalieImputationService.detecter(date_debut=date_debut)
+        total = AnomalieImputationService.enregistrer(anomalies)
+
+        par_type = {}
+        for anomalie in anomalies:
+            par_type[anomalie['type']] = par_type.get(anomalie['type'], 0) + 1
+
+        logger.info(f"Anomalies d'imputations détectées: {total}")
+        return {'total': total, 'par_type': par_type}
+
+    @staticmethod
+    def get_anomalies(employe=None):
+        """Retourne les anomalies stockées lors de la dernière détection"""
+        queryset = JRAnomalieImputation.objects.select_related('employe')
+        if employe is not None:
+            queryset = queryset.filter(employe=employe)
+        return queryset
+
+    @staticmethod
+    def get_anomalies_visibles(employe):
+        """
+        Retourne les anomalies visibles par un employé : les siennes et celles
+        des employés ayant imputé sur un projet dont il est chef de projet.
+        """
+        if employe is None:
+            return JRAnomalieImputation.objects.none()
+        intervenants = JRCumulImputation.objects.filter(
+            projet__chef_projet=employe
+        ).values('employe_id')
+        return AnomalieImputationService.get_anomalies().filter(
+            Q(employe=employe) | Q(employe_id__in=intervenants)
+        )
@@ -0,0 +1,168 @@
+"""
+Service de gestion de l'ordre du backlog.
+
+L'ordre repose sur des rangs fractionnaires (JRTicket.ordre_backlog) :
+- déplacer un ticket lui attribue la moyenne des rangs de ses voisins,
+  une seule ligne est modifiée ;
+- une réorganisation complète passe par un bulk_update des seuls tickets
+  dont le rang change, avec une entrée d'audit récapitulative.
+
+Les mises à jour ne passent pas par JRTicket.save() : elles ne déclenchent
+ni les signaux de notification ni un log d'audit par ticket.
+"""
+import logging
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Max
+
+from ..models import JRTicket
+
+logger = logging.getLogger(__name__)
+
+# Écart entre deux rangs consécutifs après renumérotation
+ESPACEMENT = 1024.0
+
+# En deçà de cet écart entre deux voisins, le backlog est renuméroté
+ECART_MINIMUM = 1e-6
+
+TAILLE_LOT = 500
+
+
+class BacklogService:
+    """Service pour l'ordonnancement du backlog des projets"""
+
+    @staticmethod
+    def get_backlog(projet):
+        """Retourne les tickets du backlog d'un projet, dans l'ordre"""
+        return JRTicket.objects.filter(
+            projet=projet,
+            dans_backlog=True
+        ).order_by('ordre_backlog', 'created_at')
+
+    @staticmethod
+    def rang_fin(projet):
+        """Retourne le rang à attribuer à un ticket ajouté en fin de backlog"""
+        dernier = JRTicket.objects.filter(
+            projet=projet,
+            dans_backlog=True
+        ).aggregate(dernier=Max('ordre_backlog'))['dernier']
+        return (dernier or 0) + ESPACEMENT
+
+    @staticmethod
+    def deplacer(ticket, avant=None, apres=None, _renumerote=False):
+        """
+        Déplace un ticket du backlog entre deux voisins.
+
+        Args:
+            ticket: ticket déplacé
+            avant: identifiant du ticket qui précède la nouvelle position (None = début)
+            apres: identifiant du ticket qui suit la nouvelle position (None = fin)
+
+        Returns:
+            float: nouveau rang du ticket
+        """
+        avant, apres = BacklogService._uuid(avant), BacklogService._uuid(apres)
+        voisins = dict(
+            JRTicket.objects.filter(
+                projet_id=ticket.projet_id,
+                dans_backlog=True,
+                pk__in=[pk for pk in (avant, apres) if pk]
+            ).values_list('pk', 'ordre_backlog')
+        )
+        rang_avant = voisins.get(avant)
+        rang_apres = voisins.get(apres)
+
+        if rang_avant is None and rang_apres is None:
+            rang = BacklogService.rang_fin(ticket.projet_id)
+        elif rang_avant is None:
+            rang = rang_apres - ESPACEMENT
+        elif rang_apres is None:
+            rang = rang_avant + ESPACEMENT
+        elif rang_apres - rang_avant > ECART_MINIMUM:
+            rang = (rang_avant + rang_apres) / 2
+        elif not _renumerote:
+            # Plus de place entre les voisins : renuméroter puis réessayer
+            BacklogService.renumeroter(ticket.projet_id)
+            return BacklogService.deplacer(ticket, avant=avant, apres=apres, _renumerote=True)
+        else:
+            # Voisins incohérents (ordre affiché périmé) : placer après le précédent
+            rang = rang_avant + ECART_MINIMUM
+
+        JRTicket.objects.filter(pk=ticket.pk).update(ordre_backlog=rang)
+        ticket.ordre_backlog = rang
+        return rang
+
+    @staticmethod
+    def reorganiser(tickets_ordonnes, utilisateur=None):
+        """
+        Applique un ordre complet au backlog en une seule écriture groupée.
+
+        Args:
+            tickets_ordonnes: identifiants des tickets dans le nouvel ordre
+            utilisateur: auteur de la réorganisation (pour l'audit)
+
+        Returns:
+            int: nombre de tickets dont le rang a changé
+        """
+        identifiants = [BacklogService._uuid(pk) for pk in tickets_ordonnes]
+        tickets = JRTicket.objects.filter(
+            pk__in=[pk for pk in identifiants if pk],
+            dans_backlog=True
+        ).only('pk', 'code', 'projet_id', 'ordre_backlog').in_bulk()
+
+        modifies = []
+        for position, pk in enumerate(identifiants, start=1):
+            ticket = tickets.get(pk)
+            if ticket is None:
+                continue
+            rang = position * ESPACEMENT
+            if ticket.ordre_backlog != rang:
+                ticket.ordre_backlog = rang
+                modifies.append(ticket)
+
+        if not modifies:
+            return 0
+
+        with transaction.atomic():
+            JRTicket.objects.bulk_update(modifies, ['ordre_backlog'], batch_size=TAILLE_LOT)
+            BacklogService._journaliser(modifies, len(tickets), utilisateur)
+
+        return len(modifies)
+
+    @staticmethod
+    def renumeroter(projet):
+        """Redistribue les rangs du backlog d'un projet avec un écart régulier"""
+        ordre = BacklogService.get_backlog(projet).values_list('pk', flat=True)
+        return BacklogService.reorganiser(list(ordre))
+
+    @staticmethod
+    def _journaliser(modifies, nb_tickets, utilisateur):
+        """Crée une entrée d'audit unique résumant la réorganisation"""
+        from core.models import ZDLOG
+        from core.signals import get_current_request, get_current_user
+
+        projets = sorted({str(ticket.projet_id) for ticket in modifies})
+        ZDLOG.log_action(
+            table_name='JRTicket',
+            record_id=','.join(projets)[:100],
+            type_mouvement=ZDLOG.TYPE_MODIFICATION,
+            user=utilisateur or get_current_user(),
+            request=get_current_request(),
+            nouvelle_valeur={'ordre_backlog': {str(t.pk): t.ordre_backlog for t in modifies}},
+            description=(
+                f"Réorganisation du backlog : {len(modifies)} ticket(s) déplacé(s) "
+                f"sur {nb_tickets} ({', '.join(t.code for t in modifies[:10])}"
+                f"{'…' if len(modifies) > 10 else ''})"
+            )
+        )
+
+    @staticmethod
+    def _uuid(valeur):
+        """Convertit un identifiant reçu (chaîne) en UUID, None si invalide"""
+        if not valeur:
+            return None
+        try:
+            return JRTicket._meta.pk.to_python(valeur)
+        except ValidationError:
+            return None
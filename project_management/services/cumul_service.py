@@ -0,0 +1,272 @@
+"""
+Service de gestion des cumuls journaliers d'imputations (JRCumulImputation).
+
+Les cumuls sont maintenus de façon incrémentale à chaque sauvegarde,
+validation ou suppression d'une imputation : seule l'imputation modifiée
+est prise en compte (delta), sans réagréger l'historique complet.
+Les rapports, le tableau de bord et les sprints lisent ensuite ces cumuls.
+"""
+import logging
+from datetime import timedelta
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+
+from ..models import JRCumulImputation, JRImputation, JRTicket
+
+logger = logging.getLogger(__name__)
+
+# Seules les imputations validées alimentent les cumuls
+STATUT_COMPTABILISE = 'VALIDE'
+
+TAILLE_LOT = 1000
+
+
+class CumulImputationService:
+    """Service pour la maintenance et la lecture des cumuls d'imputations"""
+
+    # ------------------------------------------------------------------
+    # Maintenance incrémentale
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def minutes_heures(heures):
+        """Convertit des heures décimales en minutes, arrondies au plus proche"""
+        return int((Decimal(heures or 0) * 60).to_integral_value(ROUND_HALF_UP))
+
+    @staticmethod
+    def minutes_imputation(imputation):
+        """Retourne la durée d'une imputation en minutes (sans erreur d'arrondi)"""
+        return CumulImputationService.minutes_heures(imputation.heures) + int(imputation.minutes or 0)
+
+    @staticmethod
+    def contribution(imputation):
+        """
+        Retourne la contribution d'une imputation aux cumuls, ou None si
+        l'imputation n'est pas comptabilisée (non validée).
+        """
+        if imputation is None or imputation.statut_validation != STATUT_COMPTABILISE:
+            return None
+        return {
+            'employe_id': imputation.employe_id,
+            'ticket_id': imputation.ticket_id,
+            'type_activite': imputation.type_activite,
+            'date': imputation.date_imputation,
+            'minutes': CumulImputationService.minutes_imputation(imputation),
+        }
+
+    @staticmethod
+    def synchroniser(ancienne, nouvelle):
+        """
+        Applique le passage d'une contribution à une autre
+        (création, modification, validation, rejet ou suppression).
+
+        Args:
+            ancienne: contribution avant modification (dict ou None)
+            nouvelle: contribution après modification (dict ou None)
+        """
+        if ancienne == nouvelle:
+            return
+
+        with transaction.atomic():
+            if ancienne:
+                CumulImputationService._appliquer_delta(ancienne, -ancienne['minutes'], -1)
+            if nouvelle:
+                CumulImputationService._appliquer_delta(nouvelle, nouvelle['minutes'], 1)
+
+            tickets = {c['ticket_id'] for c in (ancienne, nouvelle) if c}
+            for ticket_id in tickets:
+                CumulImputationService.recalculer_temps_ticket(ticket_id)
+
+    @staticmethod
+    def _appliquer_delta(contribution, minutes, nombre):
+        """Ajoute (ou retire) une contribution au cumul journalier correspondant"""
+        cle = {
+            'employe_id': contribution['employe_id'],
+            'ticket_id': contribution['ticket_id'],
+            'type_activite': contribution['type_activite'],
+            'date': contribution['date'],
+        }
+        cumuls = JRCumulImputation.objects.filter(**cle)
+
+        if nombre < 0:
+            cumuls.update(
+                minutes=F('minutes') + minutes,
+                nb_imputations=F('nb_imputations') + nombre
+            )
+            cumuls.filter(nb_imputations__lte=0).delete()
+            return
+
+        if cumuls.update(minutes=F('minutes') + minutes, nb_imputations=F('nb_imputations') + nombre):
+            return
+
+        projet_id = JRTicket.objects.filter(pk=cle['ticket_id']).values_list('projet_id', flat=True).first()
+        if projet_id is None:
+            return
+        try:
+            with transaction.atomic():
+                JRCumulImputation.objects.create(
+                    projet_id=projet_id, minutes=minutes, nb_imputations=nombre, **cle
+                )
+        except IntegrityError:
+            # Cumul créé entre-temps par une autre transaction
+            cumuls.update(minutes=F('minutes') + minutes, nb_imputations=F('nb_imputations') + nombre)
+
+    @staticmethod
+    def recalculer_temps_ticket(ticket):
+        """
+        Met à jour le temps passé d'un ticket à partir de ses cumuls journaliers.
+
+        La mise à jour passe par un UPDATE direct : elle ne déclenche ni
+        l'historique ni les notifications liées à la sauvegarde du ticket.
+
+        Args:
+            ticket: instance JRTicket ou identifiant
+        """
+        ticket_id = getattr(ticket, 'pk', ticket)
+        total_minutes = JRCumulImputation.objects.filter(
+            ticket_id=ticket_id
+        ).aggregate(total=Sum('minutes'))['total'] or 0
+
+        temps_passe = (Decimal(total_minutes) / 60).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+        JRTicket.objects.filter(pk=ticket_id).update(temps_passe=temps_passe)
+
+        if isinstance(ticket, JRTicket):
+            ticket.temps_passe = temps_passe
+        return temps_passe
+
+    @staticmethod
+    def reconstruire(tickets=None):
+        """
+        Reconstruit entièrement les cumuls à partir des imputations validées.
+
+        Args:
+            tickets: queryset ou liste de tickets à limiter (optionnel)
+
+        Returns:
+            int: nombre de cumuls créés
+        """
+        imputations = JRImputation.objects.filter(statut_validation=STATUT_COMPTABILISE)
+        cumuls = JRCumulImputation.objects.all()
+        if tickets is not None:
+            imputations = imputations.filter(ticket__in=tickets)
+            cumuls = cumuls.filter(ticket__in=tickets)
+
+        agregats = {}
+        lignes = imputations.values_list(
+            'employe_id', 'ticket_id', 'ticket__projet_id', 'type_activite',
+            'date_imputation', 'heures', 'minutes'
+        ).order_by().iterator(chunk_size=TAILLE_LOT)
+        for employe_id, ticket_id, projet_id, type_activite, date, heures, minutes in lignes:
+            cle = (employe_id, ticket_id, projet_id, type_activite, date)
+            cumul = agregats.setdefault(cle, [0, 0])
+            cumul[0] += CumulImputationService.minutes_heures(heures) + int(minutes or 0)
+            cumul[1] += 1
+
+        with transaction.atomic():
+            cumuls.delete()
+            JRCumulImputation.objects.bulk_create(
+                [
+                    JRCumulImputation(
+                        employe_id=employe_id, ticket_id=ticket_id, projet_id=projet_id,
+                        type_activite=type_activite, date=date,
+                        minutes=total[0], nb_imputations=total[1]
+                    )
+                    for (employe_id, ticket_id, projet_id, type_activite, date), total in agregats.items()
+                ],
+                batch_size=TAILLE_LOT
+            )
+
+            tickets_recalcules = JRTicket.objects.all() if tickets is None else JRTicket.objects.filter(
+                pk__in=[getattr(t, 'pk', t) for t in tickets]
+            )
+            for ticket_id in tickets_recalcules.values_list('pk', flat=True).iterator(chunk_size=TAILLE_LOT):
+                CumulImputationService.recalculer_temps_ticket(ticket_id)
+
+        logger.info(f"Cumuls d'imputations reconstruits: {len(agregats)} cumul(s)")
+        return len(agregats)
+
+    # ------------------------------------------------------------------
+    # Lecture
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def get_cumuls(employe=None, projet=None, tickets=None, date_debut=None, date_fin=None):
+        """Retourne les cumuls journaliers filtrés"""
+        queryset = JRCumulImputation.objects.all()
+
+        if employe is not None:
+            queryset = queryset.filter(employe=employe)
+        if projet is not None:
+            queryset = queryset.filter(projet=projet)
+        if tickets is not None:
+            queryset = queryset.filter(ticket__in=tickets)
+        if date_debut:
+            queryset = queryset.filter(date__gte=date_debut)
+        if date_fin:
+            queryset = queryset.filter(date__lte=date_fin)
+
+        return queryset
+
+    @staticmethod
+    def get_totaux(cumuls):
+        """Retourne le total en minutes et le nombre d'imputations d'un ensemble de cumuls"""
+        totaux = cumuls.aggregate(
+            total_minutes=Sum('minutes'),
+            total_imputations=Sum('nb_imputations')
+        )
+        return {
+            'total_minutes': totaux['total_minutes'] or 0,
+            'total_imputations': totaux['total_imputations'] or 0,
+        }
+
+    @staticmethod
+    def get_minutes(employe=None, projet=None, tickets=None, date_debut=None, date_fin=None):
+        """Retourne le total de minutes validées sur un périmètre"""
+        return CumulImputationService.get_totaux(
+            CumulImputationService.get_cumuls(employe, projet, tickets, date_debut, date_fin)
+        )['total_minutes']
+
+    @staticmethod
+    def get_minutes_par_jour(employe=None, projet=None, tickets=None, date_debut=None, date_fin=None):
+        """Retourne les minutes validées par jour : {date: minutes}"""
+        cumuls = CumulImputationService.get_cumuls(employe, projet, tickets, date_debut, date_fin)
+        return dict(
+            cumuls.values('date').annotate(total=Sum('minutes')).order_by('date').values_list('date', 'total')
+        )
+
+    @staticmethod
+    def get_burndown(tickets, date_debut, date_fin):
+        """
+        Burndown d'un ensemble de tickets, lu dans les cumuls (un point par jour).
+
+        Le reste à faire est l'estimation des tickets moins les minutes validées
+        jusqu'au jour inclus ; la courbe idéale décroît linéairement sur la période.
+
+        Returns:
+            dict: estimation (minutes) et jours [{date, minutes, restant, ideal}]
+        """
+        estimation = CumulImputationService.minutes_heures(
+            tickets.aggregate(total=Sum('estimation_heures'))['total']
+        )
+        consommees = CumulImputationService.get_minutes(
+            tickets=tickets, date_fin=date_debut - timedelta(days=1)
+        )
+        par_jour = CumulImputationService.get_minutes_par_jour(
+            tickets=tickets, date_debut=date_debut, date_fin=date_fin
+        )
+
+        nb_jours = (date_fin - date_debut).days
+        jours = []
+        for decalage in range(nb_jours + 1):
+            jour = date_debut + timedelta(days=decalage)
+            minutes = par_jour.get(jour, 0)
+            consommees += minutes
+            jours.append({
+                'date': jour,
+                'minutes': minutes,
+                'restant': max(estimation - consommees, 0),
+                'ideal': round(estimation * (nb_jours - decalage) / nb_jours) if nb_jours else 0,
+            })
+        return {'estimation': estimation, 'jours': jours}
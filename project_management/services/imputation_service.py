@@ -1,6 +1,8 @@
 from django.db import models
 from django.utils import timezone
 from ..models import JRImputation, JRTicket, JRProject
+from .anomalie_service import AnomalieImputationService
+from .cumul_service import CumulImputationService
 from employee.models import ZY00
 
 
@@ -33,11 +35,10 @@ class ImputationService:
         imputation.valide_par = valide_par
         imputation.date_validation = timezone.now()
         imputation.commentaire_validation = commentaire
+        # Le cumul journalier et le temps passé du ticket sont mis à jour
+        # par les signaux de JRImputation
         imputation.save()
         
-        # Mettre à jour le temps passé sur le ticket
-        ImputationService.mettre_a_jour_temps_ticket(imputation.ticket)
-        
         return imputation
     
     @staticmethod
@@ -53,16 +54,8 @@ class ImputationService:
     
     @staticmethod
     def mettre_a_jour_temps_ticket(ticket):
-        """Met à jour le temps total passé sur un ticket"""
-        total_temps = JRImputation.objects.filter(
-            ticket=ticket,
-            statut_validation='VALIDE'
-        ).aggregate(
-            total=models.Sum(models.F('heures') + models.F('minutes') / 60.0)
-        )['total'] or 0
-        
-        ticket.temps_passe = total_temps
-        ticket.save()
+        """Met à jour le temps total passé sur un ticket (à partir des cumuls journaliers)"""
+        CumulImputationService.recalculer_temps_ticket(ticket)
     
     @staticmethod
     def get_imputations_en_attente(projet=None):
@@ -77,40 +70,24 @@ class ImputationService:
     @staticmethod
     def get_temps_par_employe(employe, date_debut=None, date_fin=None):
         """Retourne le temps imputé par un employé sur une période"""
-        queryset = JRImputation.objects.filter(
-            employe=employe,
-            statut_validation='VALIDE'
-        )
-        
-        if date_debut:
-            queryset = queryset.filter(date_imputation__gte=date_debut)
-        
-        if date_fin:
-            queryset = queryset.filter(date_imputation__lte=date_fin)
-        
-        return queryset.aggregate(
-            total_heures=models.Sum(models.F('heures') + models.F('minutes') / 60.0),
-            total_imputations=models.Count('id')
+        totaux = CumulImputationService.get_totaux(
+            CumulImputationService.get_cumuls(employe=employe, date_debut=date_debut, date_fin=date_fin)
         )
+        return {
+            'total_heures': totaux['total_minutes'] / 60,
+            'total_imputations': totaux['total_imputations'],
+        }
     
     @staticmethod
     def get_temps_par_projet(projet, date_debut=None, date_fin=None):
         """Retourne le temps imputé sur un projet sur une période"""
-        queryset = JRImputation.objects.filter(
-            ticket__projet=projet,
-            statut_validation='VALIDE'
-        )
-        
-        if date_debut:
-            queryset = queryset.filter(date_imputation__gte=date_debut)
-        
-        if date_fin:
-            queryset = queryset.filter(date_imputation__lte=date_fin)
-        
-        return queryset.aggregate(
-            total_heures=models.Sum(models.F('heures') + models.F('minutes') / 60.0),
-            total_imputations=models.Count('id')
+        totaux = CumulImputationService.get_totaux(
+            CumulImputationService.get_cumuls(projet=projet, date_debut=date_debut, date_fin=date_fin)
         )
+        return {
+            'total_heures': totaux['total_minutes'] / 60,
+            'total_imputations': totaux['total_imputations'],
+        }
     
     @staticmethod
     def get_rapport_hebdomadaire(employe, semaine=None):
@@ -120,46 +97,48 @@ class ImputationService:
         
         # Calculer les dates de la semaine
         annee = timezone.now().date().year
-        date_debut = timezone.datetime.strptime(f'{annee}-{semeine}-1', "%Y-%W-%w").date()
+        date_debut = timezone.datetime.strptime(f'{annee}-{semaine}-1', "%Y-%W-%w").date()
         date_fin = date_debut + timezone.timedelta(days=6)
         
+        # Regrouper par projet à partir des cumuls journaliers
+        cumuls = CumulImputationService.get_cumuls(
+            employe=employe, date_debut=date_debut, date_fin=date_fin
+        )
+        temps_par_projet = {}
+        total_minutes = 0
+        total_imputations = 0
+        
+        lignes = cumuls.values(
+            'projet__code', 'projet__nom', 'ticket__code'
+        ).annotate(
+            total=models.Sum('minutes'),
+            nombre=models.Sum('nb_imputations')
+        ).order_by()
+        for ligne in lignes:
+            projet = temps_par_projet.setdefault(ligne['projet__code'], {
+                'nom': ligne['projet__nom'],
+                'heures': 0,
+                'tickets': []
+            })
+            projet['heures'] += ligne['total'] / 60
+            projet['tickets'].append(ligne['ticket__code'])
+            total_minutes += ligne['total']
+            total_imputations += ligne['nombre']
+        
         imputations = JRImputation.objects.filter(
             employe=employe,
             date_imputation__range=[date_debut, date_fin],
             statut_validation='VALIDE'
         ).select_related('ticket', 'ticket__projet')
         
-        # Regrouper par projet
-        temps_par_projet = {}
-        total_heures = 0
-        
-        for imp in imputations:
-            projet = imp.ticket.projet
-            if projet.code not in temps_par_projet:
-                temps_par_projet[projet.code] = {
-                    'nom': projet.nom,
-                    'heures': 0,
-                    'tickets': set()
-                }
-            
-            temps_par_projet[projet.code]['heures'] += imp.total_heures
-            temps_par_projet[projet.code]['tickets'].add(imp.ticket.code)
-            total_heures += imp.total_heures
-        
-        # Convertir les sets en listes
-        for projet_code in temps_par_projet:
-            temps_par_projet[projet_code]['tickets'] = list(
-                temps_par_projet[projet_code]['tickets']
-            )
-        
         return {
             'employe': f"{employe.nom} {employe.prenoms}",
             'semaine': semaine,
             'annee': annee,
             'date_debut': date_debut,
             'date_fin': date_fin,
-            'total_heures': total_heures,
-            'total_imputations': imputations.count(),
+            'total_heures': total_minutes / 60,
+            'total_imputations': total_imputations,
             'temps_par_projet': temps_par_projet,
             'imputations_detail': imputations.order_by('date_imputation')
         }
@@ -172,37 +151,50 @@ class ImputationService:
         if annee is None:
             annee = timezone.now().year
         
-        imputations = JRImputation.objects.filter(
-            ticket__projet=projet,
-            date_imputation__year=annee,
-            date_imputation__month=mois,
-            statut_validation='VALIDE'
-        ).select_related('employe', 'ticket')
+        cumuls = CumulImputationService.get_cumuls(projet=projet).filter(
+            date__year=annee,
+            date__month=mois
+        )
+        libelles_types = dict(JRImputation.TYPE_ACTIVITE_CHOICES)
+        
+        # Regrouper par employé (une ligne par employé, ticket et type d'activité)
+        lignes = cumuls.values(
+            'employe', 'ticket__code', 'type_activite'
+        ).annotate(
+            total=models.Sum('minutes'),
+            nombre=models.Sum('nb_imputations')
+        ).order_by()
+        lignes = list(lignes)
+        employes = ZY00.objects.in_bulk({ligne['employe'] for ligne in lignes})
         
-        # Regrouper par employé
         temps_par_employe = {}
-        total_heures = 0
+        par_type_activite = {}
+        total_minutes = 0
+        total_imputations = 0
         
-        for imp in imputations:
-            employe_key = f"{imp.employe.nom} {imp.employe.prenoms}"
+        for ligne in lignes:
+            employe = employes[ligne['employe']]
+            employe_key = f"{employe.nom} {employe.prenoms}"
             if employe_key not in temps_par_employe:
                 temps_par_employe[employe_key] = {
-                    'employe': imp.employe,
+                    'employe': employe,
                     'heures': 0,
                     'tickets': set(),
                     'par_type_activite': {}
                 }
             
-            temps_par_employe[employe_key]['heures'] += imp.total_heures
-            temps_par_employe[employe_key]['tickets'].add(imp.ticket.code)
+            heures = ligne['total'] / 60
+            temps_par_employe[employe_key]['heures'] += heures
+            temps_par_employe[employe_key]['tickets'].add(ligne['ticket__code'])
             
             # Par type d'activité
-            type_activite = imp.get_type_activite_display()
-            if type_activite not in temps_par_employe[employe_key]['par_type_activite']:
-                temps_par_employe[employe_key]['par_type_activite'][type_activite] = 0
-            temps_par_employe[employe_key]['par_type_activite'][type_activite] += imp.total_heures
+            type_activite = libelles_types.get(ligne['type_activite'], ligne['type_activite'])
+            par_type = temps_par_employe[employe_key]['par_type_activite']
+            par_type[type_activite] = par_type.get(type_activite, 0) + heures
+            par_type_activite[type_activite] = par_type_activite.get(type_activite, 0) + heures
             
-            total_heures += imp.total_heures
+            total_minutes += ligne['total']
+            total_imputations += ligne['nombre']
         
         # Convertir les sets en listes
         for employe_key in temps_par_employe:
@@ -214,12 +206,10 @@ class ImputationService:
             'projet': projet,
             'mois': mois,
             'annee': annee,
-            'total_heures': total_heures,
-            'total_imputations': imputations.count(),
+            'total_heures': total_minutes / 60,
+            'total_imputations': total_imputations,
             'temps_par_employe': temps_par_employe,
-            'par_type_activite': ImputationService.get_temps_par_type_activite(
-                imputations
-            )
+            'par_type_activite': par_type_activite
         }
     
     @staticmethod
@@ -237,63 +227,8 @@ class ImputationService:
     
     @staticmethod
     def detecter_anomalies(employe=None, projet=None):
-        """Détecte des anomalies dans les imputations"""
-        anomalies = []
-        
-        queryset = JRImputation.objects.filter(statut_validation='VALIDE')
-        
-        if employe:
-            queryset = queryset.filter(employe=employe)
-        
-        if projet:
-            queryset = queryset.filter(ticket__projet=projet)
-        
-        # Anomalie 1: Plus de 24h imputées en une journée
-        heures_par_jour = queryset.values('employe', 'date_imputation').annotate(
-            total_heures=models.Sum(models.F('heures') + models.F('minutes') / 60.0)
-        ).filter(total_heures__gt=24)
-        
-        for item in heures_par_jour:
-            anomalies.append({
-                'type': 'depassement_journalier',
-                'description': f"{item['total_heures']}h imputées le {item['date_imputation']}",
-                'gravite': 'haute'
-            })
-        
-        # Anomalie 2: Imputations le week-end
-        imputations_weekend = queryset.filter(
-            date_imputation__week_day__in=[6, 7]  # Samedi=6, Dimanche=7
-        ).count()
-        
-        if imputations_weekend > 0:
-            anomalies.append({
-                'type': 'travail_weekend',
-                'description': f"{imputations_weekend} imputation(s) le week-end",
-                'gravite': 'moyenne'
-            })
-        
-        # Anomalie 3: Jours sans imputation pour les employés actifs
-        if employe is None:
-            from employee.models import ZY00
-            employes_actifs = ZY00.objects.filter(statut='ACTIF')
-            
-            for emp in employes_actifs:
-                dernieres_imputations = queryset.filter(
-                    employe=emp
-                ).order_by('-date_imputation')[:5]
-                
-                if dernieres_imputations.count() > 0:
-                    derniere_date = dernieres_imputations[0].date_imputation
-                    jours_sans_imputation = (timezone.now().date() - derniere_date).days
-                    
-                    if jours_sans_imputation > 7:
-                        anomalies.append({
-                            'type': 'inactivite',
-                            'description': f"{emp} n'a pas d'imputation depuis {jours_sans_imputation} jours",
-                            'gravite': 'moyenne'
-                        })
-        
-        return anomalies
+        """Détecte des anomalies dans les imputations (voir AnomalieImputationService)"""
+        return AnomalieImputationService.detecter(employe=employe, projet=projet)
     
     @staticmethod
     def exporter_donnees(format='excel', filtres=None):
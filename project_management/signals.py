@@ -2,10 +2,11 @@
 Signaux Django pour le module Project Management.
 Gère les notifications automatiques lors des événements clés.
 """
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
-from .models import JRTicket, JRProject, JRCommentaire
+from .models import JRTicket, JRProject, JRCommentaire, JRImputation, JRCumulImputation
+from .services.cumul_service import CumulImputationService
 from .services.notification_service import NotificationService
 
 
@@ -16,6 +17,7 @@ from .services.notification_service import NotificationService
 # Dictionnaire pour stocker les anciennes valeurs avant modification
 _ticket_old_values = {}
 _project_old_values = {}
+_imputation_old_values = {}
 
 
 # ============================================================================
@@ -33,6 +35,7 @@ def ticket_pre_save(sender, instance, **kwargs):
             _ticket_old_values[instance.pk] = {
                 'statut': old_instance.statut,
                 'assigne': old_instance.assigne,
+                'projet_id': old_instance.projet_id,
             }
         except JRTicket.DoesNotExist:
             pass
@@ -52,6 +55,10 @@ def ticket_post_save(sender, instance, created, **kwargs):
         old_values = _ticket_old_values.pop(instance.pk, None)
 
         if old_values:
+            # Ticket déplacé vers un autre projet : rattacher ses cumuls
+            if old_values['projet_id'] != instance.projet_id:
+                JRCumulImputation.objects.filter(ticket=instance).update(projet_id=instance.projet_id)
+
             # Vérifier si le statut a changé
             if old_values['statut'] != instance.statut:
                 NotificationService.notifier_changement_statut_ticket(
@@ -119,6 +126,44 @@ def project_post_save(sender, instance, created, **kwargs):
                 )
 
 
+# ============================================================================
+# SIGNAUX POUR LES IMPUTATIONS (CUMULS JOURNALIERS)
+# ============================================================================
+
+@receiver(pre_save, sender=JRImputation)
+def imputation_pre_save(sender, instance, raw=False, **kwargs):
+    """
+    Capture la contribution de l'imputation aux cumuls avant modification.
+    """
+    if raw or not instance.pk:
+        return
+    try:
+        old_instance = JRImputation.objects.get(pk=instance.pk)
+        _imputation_old_values[instance.pk] = CumulImputationService.contribution(old_instance)
+    except JRImputation.DoesNotExist:
+        pass
+
+
+@receiver(post_save, sender=JRImputation)
+def imputation_post_save(sender, instance, created, raw=False, **kwargs):
+    """
+    Répercute la création, la modification ou la validation d'une imputation
+    sur les cumuls journaliers et le temps passé du ticket.
+    """
+    if raw:
+        return
+    ancienne = _imputation_old_values.pop(instance.pk, None)
+    CumulImputationService.synchroniser(ancienne, CumulImputationService.contribution(instance))
+
+
+@receiver(post_delete, sender=JRImputation)
+def imputation_post_delete(sender, instance, **kwargs):
+    """
+    Retire une imputation supprimée des cumuls journaliers.
+    """
+    CumulImputationService.synchroniser(CumulImputationService.contribution(instance), None)
+
+
 # ============================================================================
 # SIGNAUX POUR LES COMMENTAIRES
 # ============================================================================
@@ -4,3 +4,6 @@ from .test_forms import *
 from .test_services import *
 from .test_permissions import *
 from .test_notifications import *
+from .test_cumuls import *
+from .test_anomalies import *
+from .test_backlog import *
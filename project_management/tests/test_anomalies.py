@@ -0,0 +1,123 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+from django.utils import timezone
+
+from employee.models import ZY00
+from ..models import JRClient, JRProject, JRTicket, JRImputation, JRAnomalieImputation
+from ..services import AnomalieImputationService
+
+
+class AnomalieImputationServiceTest(TestCase):
+    """Tests pour la détection des anomalies d'imputations"""
+
+    def setUp(self):
+        self.employe = ZY00.objects.create(
+            matricule='ANOM0001',
+            nom='Anomalie',
+            prenoms='Test',
+            date_naissance=date(1990, 1, 1),
+            sexe='M',
+            type_id='CNI',
+            numero_id='IDANOM0001',
+            date_validite_id=date(2020, 1, 1),
+            date_expiration_id=date(2030, 1, 1),
+            etat='actif'
+        )
+        client = JRClient.objects.create(
+            raison_sociale='Client Anomalie',
+            contact_principal='Contact',
+            email_contact='contact@test.com'
+        )
+        self.projet = JRProject.objects.create(
+            nom='Projet Anomalie',
+            client=client,
+            date_debut=date(2026, 1, 1),
+            date_fin_prevue=date(2026, 12, 31)
+        )
+        self.tickets = [
+            JRTicket.objects.create(titre=f'Ticket {i}', description='Description', projet=self.projet)
+            for i in range(2)
+        ]
+
+    def _imputer(self, ticket, jour, heures):
+        imputation = JRImputation.objects.create(
+            employe=self.employe,
+            ticket=ticket,
+            date_imputation=jour,
+            heures=Decimal(heures),
+            description='Travail'
+        )
+        imputation.valider(self.employe)
+        return imputation
+
+    def test_depassement_weekend_et_inactivite(self):
+        """Les trois types d'anomalies sont détectés à partir des cumuls"""
+        samedi = date(2026, 3, 7)
+        self._imputer(self.tickets[0], samedi, '14')
+        self._imputer(self.tickets[1], samedi, '12')
+
+        anomalies = AnomalieImputationService.detecter()
+        types = sorted(anomalie['type'] for anomalie in anomalies)
+
+        self.assertEqual(types, ['depassement_journalier', 'inactivite', 'travail_weekend'])
+        weekend = next(a for a in anomalies if a['type'] == 'travail_weekend')
+        self.assertIn('2 imputation(s)', weekend['description'])
+
+    def test_employe_actif_recent_sans_anomalie(self):
+        """Un employé ayant imputé récemment en semaine n'a pas d'anomalie"""
+        jour = timezone.now().date()
+        while jour.weekday() >= 5:
+            jour -= timedelta(days=1)
+        self._imputer(self.tickets[0], jour, '7')
+
+        self.assertEqual(AnomalieImputationService.detecter(), [])
+
+    def test_executer_remplace_les_anomalies_stockees(self):
+        """Chaque exécution remplace les anomalies enregistrées"""
+        self._imputer(self.tickets[0], date(2026, 3, 7), '8')
+
+        resultats = AnomalieImputationService.executer()
+        self.assertEqual(resultats['total'], 2)
+        self.assertEqual(JRAnomalieImputation.objects.filter(employe=self.employe).count(), 2)
+
+        self.employe.etat = 'inactif'
+        self.employe.save()
+        AnomalieImputationService.executer()
+        self.assertEqual(
+            list(AnomalieImputationService.get_anomalies().values_list('type_anomalie', flat=True)),
+            ['TRAVAIL_WEEKEND']
+        )
+
+    def test_anomalies_visibles_par_le_chef_de_projet(self):
+        """Un chef de projet voit les anomalies des intervenants de ses projets, pas les autres"""
+        chef = ZY00.objects.create(
+            matricule='ANOM0002', nom='Chef', prenoms='Projet', date_naissance=date(1985, 1, 1),
+            sexe='F', type_id='CNI', numero_id='IDANOM0002', date_validite_id=date(2020, 1, 1),
+            date_expiration_id=date(2030, 1, 1), etat='actif'
+        )
+        autre = ZY00.objects.create(
+            matricule='ANOM0003', nom='Autre', prenoms='Test', date_naissance=date(1990, 1, 1),
+            sexe='M', type_id='CNI', numero_id='IDANOM0003', date_validite_id=date(2020, 1, 1),
+            date_expiration_id=date(2030, 1, 1), etat='actif'
+        )
+        self._imputer(self.tickets[0], date(2026, 3, 7), '8')
+        AnomalieImputationService.executer()
+        JRAnomalieImputation.objects.create(
+            employe=autre, type_anomalie='TRAVAIL_WEEKEND', description='Hors périmètre'
+        )
+
+        self.assertFalse(AnomalieImputationService.get_anomalies_visibles(chef).exists())
+        self.assertFalse(AnomalieImputationService.get_anomalies_visibles(None).exists())
+
+        self.projet.chef_projet = chef
+        self.projet.save()
+        self.assertEqual(
+            set(AnomalieImputationService.get_anomalies_visibles(chef).values_list('employe_id', flat=True)),
+            {self.employe.pk}
+        )
+        self.assertEqual(
+            set(AnomalieImputationService.get_anomalies_visibles(autre).values_list('employe_id', flat=True)),
+            {autre.pk}
+        )
@@ -0,0 +1,71 @@
+from datetime import date
+
+from django.test import TestCase
+
+from core.models import ZDLOG
+from ..models import JRClient, JRProject, JRTicket
+from ..services import BacklogService
+from ..services.backlog_service import ESPACEMENT
+
+
+class BacklogServiceTest(TestCase):
+    """Tests pour l'ordonnancement du backlog par rangs fractionnaires"""
+
+    def setUp(self):
+        client = JRClient.objects.create(
+            raison_sociale='Client Backlog',
+            contact_principal='Contact',
+            email_contact='contact@test.com'
+        )
+        self.projet = JRProject.objects.create(
+            nom='Projet Backlog',
+            client=client,
+            date_debut=date(2026, 1, 1),
+            date_fin_prevue=date(2026, 12, 31)
+        )
+        self.tickets = []
+        for i in range(4):
+            ticket = JRTicket.objects.create(
+                titre=f'Ticket {i}',
+                description='Description',
+                projet=self.projet,
+                dans_backlog=True,
+                ordre_backlog=BacklogService.rang_fin(self.projet)
+            )
+            self.tickets.append(ticket)
+
+    def _ordre(self):
+        return list(BacklogService.get_backlog(self.projet).values_list('pk', flat=True))
+
+    def test_deplacer_ne_modifie_qu_une_ligne(self):
+        """Déplacer un ticket entre deux voisins : une lecture et une écriture"""
+        t0, t1, t2, t3 = self.tickets
+
+        with self.assertNumQueries(2):
+            rang = BacklogService.deplacer(t3, avant=str(t0.pk), apres=str(t1.pk))
+
+        self.assertEqual(rang, 1.5 * ESPACEMENT)
+        self.assertEqual(self._ordre(), [t0.pk, t3.pk, t1.pk, t2.pk])
+
+    def test_deplacer_renumerote_quand_l_ecart_est_epuise(self):
+        """Quand les voisins n'ont plus d'écart, le backlog est renuméroté"""
+        t0, t1, t2, t3 = self.tickets
+        JRTicket.objects.filter(pk=t1.pk).update(ordre_backlog=t0.ordre_backlog + 1e-9)
+
+        BacklogService.deplacer(t3, avant=t0.pk, apres=t1.pk)
+
+        self.assertEqual(self._ordre(), [t0.pk, t3.pk, t1.pk, t2.pk])
+
+    def test_reorganiser_ecriture_groupee_et_audit_unique(self):
+        """La réorganisation complète écrit les rangs en lot avec un seul log d'audit"""
+        nouvel_ordre = [t.pk for t in reversed(self.tickets)]
+        logs_avant = ZDLOG.objects.filter(TABLE_NAME='JRTicket').count()
+
+        nb_modifies = BacklogService.reorganiser([str(pk) for pk in nouvel_ordre])
+
+        self.assertEqual(nb_modifies, 4)
+        self.assertEqual(self._ordre(), nouvel_ordre)
+        self.assertEqual(ZDLOG.objects.filter(TABLE_NAME='JRTicket').count(), logs_avant + 1)
+
+        # Ordre inchangé : aucune écriture
+        self.assertEqual(BacklogService.reorganiser(nouvel_ordre), 0)
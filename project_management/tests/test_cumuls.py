@@ -0,0 +1,159 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+
+from employee.models import ZY00
+from ..models import JRClient, JRProject, JRTicket, JRImputation, JRCumulImputation
+from ..services import CumulImputationService, ImputationService
+
+
+class CumulImputationServiceTest(TestCase):
+    """Tests pour les cumuls journaliers d'imputations"""
+
+    def setUp(self):
+        self.employe = ZY00.objects.create(
+            matricule='CUMUL001',
+            nom='Cumul',
+            prenoms='Test',
+            date_naissance=date(1990, 1, 1),
+            sexe='M',
+            type_id='CNI',
+            numero_id='IDCUMUL001',
+            date_validite_id=date(2020, 1, 1),
+            date_expiration_id=date(2030, 1, 1),
+            etat='actif'
+        )
+        self.client_pm = JRClient.objects.create(
+            raison_sociale='Client Cumul',
+            contact_principal='Contact',
+            email_contact='contact@test.com'
+        )
+        self.projet = JRProject.objects.create(
+            nom='Projet Cumul',
+            client=self.client_pm,
+            date_debut=date(2026, 1, 1),
+            date_fin_prevue=date(2026, 12, 31)
+        )
+        self.ticket = JRTicket.objects.create(
+            titre='Ticket Cumul',
+            description='Description',
+            projet=self.projet
+        )
+        self.jour = date(2026, 3, 2)
+
+    def _imputer(self, heures, minutes=0, jour=None, type_activite='DEVELOPPEMENT', ticket=None):
+        return JRImputation.objects.create(
+            employe=self.employe,
+            ticket=ticket or self.ticket,
+            date_imputation=jour or self.jour,
+            heures=Decimal(heures),
+            minutes=minutes,
+            description='Travail',
+            type_activite=type_activite
+        )
+
+    def test_seules_les_imputations_validees_sont_cumulees(self):
+        """Une imputation en attente n'alimente pas les cumuls ; sa validation oui"""
+        imputation = self._imputer('2.5', 15)
+        self.assertFalse(JRCumulImputation.objects.exists())
+
+        imputation.valider(self.employe)
+
+        cumul = JRCumulImputation.objects.get()
+        self.assertEqual(cumul.minutes, 165)
+        self.assertEqual(cumul.nb_imputations, 1)
+        self.assertEqual(cumul.projet, self.projet)
+        self.ticket.refresh_from_db()
+        self.assertEqual(self.ticket.temps_passe, Decimal('2.75'))
+
+    def test_modification_et_suppression_appliquent_un_delta(self):
+        """Modifier ou supprimer une imputation validée met à jour le cumul du jour"""
+        premiere = self._imputer('1')
+        premiere.valider(self.employe)
+        autre_ticket = JRTicket.objects.create(titre='Autre', description='Autre', projet=self.projet)
+        seconde = self._imputer('2', ticket=autre_ticket)
+        seconde.valider(self.employe)
+
+        premiere.heures = Decimal('3')
+        premiere.save()
+        self.assertEqual(
+            CumulImputationService.get_minutes(employe=self.employe, date_debut=self.jour), 300
+        )
+
+        premiere.delete()
+        self.assertFalse(JRCumulImputation.objects.filter(ticket=self.ticket).exists())
+        self.ticket.refresh_from_db()
+        self.assertEqual(self.ticket.temps_passe, Decimal('0'))
+        self.assertEqual(CumulImputationService.get_minutes(projet=self.projet), 120)
+
+    def test_heures_decimales_arrondies_a_la_minute(self):
+        """2,05 h font 123 minutes (et non 122 par troncature d'un flottant)"""
+        self._imputer('2.05').valider(self.employe)
+        self._imputer('8.2', ticket=JRTicket.objects.create(
+            titre='Autre', description='Autre', projet=self.projet
+        )).valider(self.employe)
+
+        self.assertEqual(CumulImputationService.get_minutes(tickets=[self.ticket]), 123)
+        self.assertEqual(CumulImputationService.get_minutes(employe=self.employe), 615)
+
+        JRCumulImputation.objects.all().delete()
+        CumulImputationService.reconstruire()
+        self.assertEqual(CumulImputationService.get_minutes(employe=self.employe), 615)
+
+    def test_burndown_lu_dans_les_cumuls(self):
+        """Le reste à faire décroît des minutes validées, jour par jour"""
+        JRTicket.objects.filter(pk=self.ticket.pk).update(estimation_heures=Decimal('8'))
+        self._imputer('1', jour=self.jour - timedelta(days=1)).valider(self.employe)
+        self._imputer('2').valider(self.employe)
+        self._imputer('1.5', jour=self.jour + timedelta(days=2)).valider(self.employe)
+
+        burndown = CumulImputationService.get_burndown(
+            JRTicket.objects.filter(pk=self.ticket.pk), self.jour, self.jour + timedelta(days=2)
+        )
+
+        self.assertEqual(burndown['estimation'], 480)
+        self.assertEqual(
+            [(jour['minutes'], jour['restant'], jour['ideal']) for jour in burndown['jours']],
+            [(120, 300, 480), (0, 300, 240), (90, 210, 0)]
+        )
+
+    def test_rejet_retire_l_imputation_des_cumuls(self):
+        """Une imputation validée puis rejetée sort des cumuls"""
+        imputation = self._imputer('4')
+        imputation.valider(self.employe)
+        imputation.rejeter(self.employe, 'Erreur de saisie')
+
+        self.assertFalse(JRCumulImputation.objects.exists())
+
+    def test_rapport_mensuel_lu_dans_les_cumuls(self):
+        """Le rapport mensuel regroupe les cumuls par employé et type d'activité"""
+        self._imputer('2').valider(self.employe)
+        self._imputer('1', 30, jour=self.jour + timedelta(days=1), type_activite='TEST').valider(self.employe)
+
+        rapport = ImputationService.get_rapport_mensuel(self.projet, mois=3, annee=2026)
+
+        self.assertEqual(rapport['total_heures'], 3.5)
+        self.assertEqual(rapport['total_imputations'], 2)
+        self.assertEqual(rapport['par_type_activite'], {'Développement': 2.0, 'Test': 1.5})
+        employe_key = f"{self.employe.nom} {self.employe.prenoms}"
+        self.assertEqual(rapport['temps_par_employe'][employe_key]['tickets'], [self.ticket.code])
+
+    def test_reconstruire(self):
+        """La reconstruction retrouve les cumuls maintenus incrémentalement"""
+        self._imputer('2').valider(self.employe)
+        self._imputer('1', 45, jour=self.jour + timedelta(days=1)).valider(self.employe)
+        attendus = list(JRCumulImputation.objects.order_by('date').values_list('date', 'minutes', 'nb_imputations'))
+
+        JRCumulImputation.objects.all().delete()
+        nb_cumuls = CumulImputationService.reconstruire()
+
+        self.assertEqual(nb_cumuls, 2)
+        self.assertEqual(
+            list(JRCumulImputation.objects.order_by('date').values_list('date', 'minutes', 'nb_imputations')),
+            attendus
+        )
+        self.assertEqual(
+            CumulImputationService.get_minutes_par_jour(employe=self.employe),
+            {self.jour: 120, self.jour + timedelta(days=1): 105}
+        )
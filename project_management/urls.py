@@ -57,6 +57,7 @@ urlpatterns = [
     path('backlog/projet/<uuid:pk>/ajouter/', views.backlog_ajouter_ticket, name='backlog_ajouter_ticket'),
     path('backlog/projet/<uuid:pk>/retirer/', views.backlog_retirer_ticket, name='backlog_retirer_ticket'),
     path('backlog/reorganiser/', views.backlog_reorganiser, name='backlog_reorganiser'),
+    path('backlog/deplacer/', views.backlog_deplacer_ticket, name='backlog_deplacer_ticket'),
     path('backlog/projet/<uuid:pk>/priorisation/', views.backlog_priorisation, name='backlog_priorisation'),
     path('backlog/projet/<uuid:pk>/changer-priorite/', views.backlog_changer_priorite, name='backlog_changer_priorite'),
     path('backlog/projet/<uuid:pk>/planning-sprint/', views.backlog_planning_sprint, name='backlog_planning_sprint'),
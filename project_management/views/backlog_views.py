@@ -1,7 +1,7 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.db.models import Q, Max, Count, Sum
+from django.db.models import Q, Count, Sum
 from django.http import JsonResponse
 from django.views.decorators.http import require_POST
 from django.utils.decorators import method_decorator
@@ -10,6 +10,7 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 
 from ..models import JRTicket, JRProject
 from ..forms import BacklogForm
+from ..services.backlog_service import BacklogService
 
 
 @method_decorator(login_required, name='dispatch')
@@ -101,12 +102,8 @@ def backlog_ajouter_ticket(request, pk):
         
         if not ticket.dans_backlog:
             ticket.dans_backlog = True
-            # Définir l'ordre comme le plus élevé existant + 1
-            max_ordre = JRTicket.objects.filter(
-                projet=projet,
-                dans_backlog=True
-            ).aggregate(max_ordre=Max('ordre_backlog'))['max_ordre'] or 0
-            ticket.ordre_backlog = max_ordre + 1
+            # Placer le ticket en fin de backlog (rang fractionnaire, lecture indexée)
+            ticket.ordre_backlog = BacklogService.rang_fin(projet)
             ticket.save()
             
             messages.success(request, f'Ticket {ticket.code} ajouté au backlog.')
@@ -141,27 +138,48 @@ def backlog_retirer_ticket(request, pk):
 @login_required
 @require_POST
 def backlog_reorganiser(request):
-    """Vue pour réorganiser l'ordre des tickets dans le backlog (AJAX)"""
+    """
+    Vue pour réorganiser l'ordre complet des tickets dans le backlog (AJAX).
+    Les rangs modifiés sont écrits en une seule requête groupée.
+    """
     ticket_orders = request.POST.get('orders', '{}')
     
     try:
         import json
         orders = json.loads(ticket_orders)
+        tickets_ordonnes = sorted(orders, key=lambda ticket_id: float(orders[ticket_id]))
         
-        for ticket_id, ordre in orders.items():
-            try:
-                ticket = JRTicket.objects.get(pk=ticket_id, dans_backlog=True)
-                ticket.ordre_backlog = int(ordre)
-                ticket.save()
-            except JRTicket.DoesNotExist:
-                continue
+        nb_modifies = BacklogService.reorganiser(tickets_ordonnes, utilisateur=request.user)
         
-        return JsonResponse({'success': True})
+        return JsonResponse({'success': True, 'modifies': nb_modifies})
     
-    except (json.JSONDecodeError, ValueError):
+    except (json.JSONDecodeError, ValueError, TypeError, AttributeError):
         return JsonResponse({'success': False, 'error': 'Format invalide'})
 
 
+@login_required
+@require_POST
+def backlog_deplacer_ticket(request):
+    """
+    Vue pour déplacer un ticket du backlog par glisser-déposer (AJAX).
+    Seul le ticket déplacé est modifié : son rang devient la moyenne
+    des rangs de ses nouveaux voisins.
+    """
+    ticket = get_object_or_404(
+        JRTicket,
+        pk=BacklogService._uuid(request.POST.get('ticket_id')),
+        dans_backlog=True
+    )
+    
+    rang = BacklogService.deplacer(
+        ticket,
+        avant=request.POST.get('avant'),
+        apres=request.POST.get('apres')
+    )
+    
+    return JsonResponse({'success': True, 'ordre_backlog': rang})
+
+
 @login_required
 def backlog_priorisation(request, pk):
     """Vue pour la priorisation du backlog"""
@@ -1,12 +1,13 @@
 from django.shortcuts import render
 from django.contrib.auth.decorators import login_required
-from django.db.models import Count, Sum, Q, FloatField, ExpressionWrapper, Value
-from django.db.models.functions import Coalesce
+from django.db.models import Count
 from django.http import JsonResponse
 from django.utils import timezone
 from datetime import timedelta
 
 from ..models import JRClient, JRProject, JRTicket, JRImputation, JRSprint
+from ..services.anomalie_service import AnomalieImputationService
+from ..services.cumul_service import CumulImputationService
 from employee.models import ZY00
 
 
@@ -62,29 +63,11 @@ def dashboard(request):
     heures_semaine = 0
     mes_tickets = []
 
-    # Fonction pour calculer les heures correctement (retourne les minutes totales)
-    def calculer_minutes(queryset):
-        total_minutes = 0
-        for imp in queryset:
-            total_minutes += int(float(imp.heures) * 60) + (imp.minutes or 0)
-        return total_minutes
-
     if employe:
-        # Heures ce mois (en minutes pour éviter les erreurs d'arrondi)
-        imputations_mois = JRImputation.objects.filter(
-            date_imputation__gte=debut_mois,
-            statut_validation='VALIDE',
-            employe=employe
-        )
-        heures_ce_mois = calculer_minutes(imputations_mois)
-
-        # Heures cette semaine (en minutes)
-        imputations_semaine = JRImputation.objects.filter(
-            date_imputation__gte=debut_semaine,
-            statut_validation='VALIDE',
-            employe=employe
-        )
-        heures_semaine = calculer_minutes(imputations_semaine)
+        # Heures ce mois et cette semaine, lues dans les cumuls journaliers
+        # (en minutes pour éviter les erreurs d'arrondi)
+        heures_ce_mois = CumulImputationService.get_minutes(employe=employe, date_debut=debut_mois)
+        heures_semaine = CumulImputationService.get_minutes(employe=employe, date_debut=debut_semaine)
 
         # Mes tickets assignés (tous les tickets non terminés)
         mes_tickets = JRTicket.objects.filter(
@@ -99,9 +82,11 @@ def dashboard(request):
         statut__in=['OUVERT', 'EN_COURS', 'EN_REVUE']
     ).select_related('projet', 'assigne').count()
 
-    # Imputations en attente de validation
+    # Imputations en attente de validation et anomalies détectées (tâche planifiée)
     imputations_en_attente = 0
+    anomalies_imputations = 0
     if employe:
+        anomalies_imputations = AnomalieImputationService.get_anomalies_visibles(employe).count()
         projets_chef = JRProject.objects.filter(chef_projet=employe)
         imputations_en_attente = JRImputation.objects.filter(
             statut_validation='EN_ATTENTE',
@@ -142,6 +127,7 @@ def dashboard(request):
         # Alertes
         'tickets_retard': tickets_retard,
         'imputations_en_attente': imputations_en_attente,
+        'anomalies_imputations': anomalies_imputations,
     }
 
     return render(request, 'project_management/dashboard.html', context)
@@ -179,16 +165,7 @@ def dashboard_stats_api(request):
     heures_semaine = 0
 
     if employe:
-        heures_semaine = JRImputation.objects.filter(
-            date_imputation__gte=debut_semaine,
-            statut_validation='VALIDE',
-            employe=employe
-        ).aggregate(
-            total=ExpressionWrapper(
-                Coalesce(Sum('heures'), Value(0)) + Coalesce(Sum('minutes'), Value(0)) / 60.0,
-                output_field=FloatField()
-            )
-        )['total'] or 0
+        heures_semaine = CumulImputationService.get_minutes(employe=employe, date_debut=debut_semaine) / 60
 
     stats = {
         'total_projets': total_projets,
@@ -268,6 +245,15 @@ def projets_actifs_api(request):
 @login_required
 def alertes_api(request):
     """API pour les alertes"""
+    employe = None
+    try:
+        employe = ZY00.objects.get(user=request.user)
+    except ZY00.DoesNotExist:
+        try:
+            employe = ZY00.objects.get(username=request.user.username)
+        except ZY00.DoesNotExist:
+            pass
+
     alertes = []
 
     # Tickets en retard
@@ -301,6 +287,17 @@ def alertes_api(request):
             'date': timezone.now().strftime('%d/%m/%Y %H:%M'),
         })
 
+    # Anomalies d'imputations enregistrées par la détection planifiée
+    # (celles de l'employé et des intervenants de ses projets)
+    for anomalie in AnomalieImputationService.get_anomalies_visibles(employe):
+        alertes.append({
+            'type': 'anomalie_imputation',
+            'titre': f"Anomalie d'imputation : {anomalie.get_type_anomalie_display()}",
+            'message': anomalie.description,
+            'priorite': anomalie.gravite,
+            'date': timezone.localtime(anomalie.date_detection).strftime('%d/%m/%Y %H:%M'),
+        })
+
     return JsonResponse(alertes, safe=False)
 
 
@@ -330,16 +327,7 @@ def stats_personnelles_api(request):
 
     # Temps ce mois
     debut_mois = timezone.now().date().replace(day=1)
-    temps_mois = JRImputation.objects.filter(
-        employe=employe,
-        date_imputation__gte=debut_mois,
-        statut_validation='VALIDE'
-    ).aggregate(
-        total=ExpressionWrapper(
-            Coalesce(Sum('heures'), Value(0)) + Coalesce(Sum('minutes'), Value(0)) / 60.0,
-            output_field=FloatField()
-        )
-    )['total'] or 0
+    temps_mois = CumulImputationService.get_minutes(employe=employe, date_debut=debut_mois) / 60
 
     # Taux de complétion
     taux_completion = 0
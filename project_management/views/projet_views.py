@@ -14,7 +14,7 @@ from django.utils import timezone
 from ..models import JRProject, JRClient, JRTicket, JRImputation
 from ..forms import ProjetForm, ProjetSearchForm
 from ..mixins import ProjectPermissionMixin, project_permission_required
-from employee.models import ZY00
+from employee.services.recherche_service import RechercheEmployeService
 
 
 @method_decorator(login_required, name='dispatch')
@@ -284,27 +284,8 @@ def projet_stats_api(request):
 def search_employes_api(request):
     """API pour rechercher des employés (autocomplete)"""
     try:
-        query = request.GET.get('q', '').strip()
-        if len(query) < 2:
-            return JsonResponse({'results': []})
-
-        employes = ZY00.objects.filter(
-            Q(nom__icontains=query) |
-            Q(prenoms__icontains=query) |
-            Q(matricule__icontains=query)
-        ).filter(etat='actif').order_by('nom', 'prenoms')[:15]
-
-        results = [
-            {
-                'id': str(emp.pk),  # pk = matricule (clé primaire de ZY00)
-                'text': f"{emp.nom} {emp.prenoms or ''} ({emp.matricule})",
-                'nom': emp.nom,
-                'prenoms': emp.prenoms or '',
-                'matricule': emp.matricule,
-            }
-            for emp in employes
-        ]
-
+        # id = matricule (clé primaire de ZY00)
+        results = RechercheEmployeService.autocompletion(request.GET.get('q', ''), limite=15)
         return JsonResponse({'results': results})
     except Exception as e:
         return JsonResponse({'error': str(e), 'results': []}, status=500)
@@ -10,7 +10,8 @@ from django.views.generic import ListView, CreateView, UpdateView
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.utils.decorators import method_decorator
 
-from ..models import JRSprint, JRProject, JRTicket, JRImputation
+from ..models import JRSprint, JRProject, JRTicket
+from ..services.cumul_service import CumulImputationService
 from ..forms import SprintForm, SprintSearchForm, SprintTicketForm
 
 
@@ -118,18 +119,11 @@ def sprint_detail(request, pk):
         'termines': tickets.filter(statut='TERMINE').count(),
     }
     
-    # Imputations du sprint
-    imputations = JRImputation.objects.filter(
-        ticket__in=tickets,
-        statut_validation='VALIDE'
-    ).select_related('employe', 'ticket')
-    
-    # Temps total par employé
-    temps_par_employe = imputations.values('employe__nom', 'employe__prenoms').annotate(
-        total_heures=ExpressionWrapper(
-            Sum('heures') + Sum('minutes') / 60.0,
-            output_field=FloatField()
-        )
+    # Temps total par employé (cumuls journaliers des tickets du sprint)
+    temps_par_employe = CumulImputationService.get_cumuls(tickets=tickets).values(
+        'employe__nom', 'employe__prenoms'
+    ).annotate(
+        total_heures=ExpressionWrapper(Sum('minutes') / 60.0, output_field=FloatField())
     ).order_by('-total_heures')
     
     # Estimation vs réel
@@ -307,25 +301,18 @@ def sprint_rapport(request, pk):
         'BASSE': tickets.filter(priorite='BASSE').count(),
     }
 
-    # Imputations du sprint
-    imputations = JRImputation.objects.filter(
-        ticket__in=tickets,
-        statut_validation='VALIDE'
-    ).select_related('employe', 'ticket')
+    # Cumuls journaliers des tickets du sprint
+    cumuls = CumulImputationService.get_cumuls(tickets=tickets)
 
-    # Calculer les minutes totales imputées
-    minutes_totales = 0
-    for imp in imputations:
-        minutes_totales += int(float(imp.heures or 0) * 60) + int(imp.minutes or 0)
+    # Minutes totales imputées et burndown jour par jour du sprint
+    minutes_totales = CumulImputationService.get_totaux(cumuls)['total_minutes']
+    burndown = CumulImputationService.get_burndown(tickets, sprint.date_debut, sprint.date_fin)
 
     # Statistiques par membre de l'équipe
-    team_stats_raw = imputations.values(
+    team_stats_raw = cumuls.values(
         'employe__nom', 'employe__prenoms', 'employe__matricule'
     ).annotate(
-        heures_imputees=ExpressionWrapper(
-            Sum('heures') + Sum('minutes') / 60.0,
-            output_field=FloatField()
-        ),
+        heures_imputees=ExpressionWrapper(Sum('minutes') / 60.0, output_field=FloatField()),
         tickets_count=Count('ticket', distinct=True)
     ).order_by('-heures_imputees')
 
@@ -356,6 +343,7 @@ def sprint_rapport(request, pk):
         'tickets_par_statut': tickets_par_statut,
         'tickets_par_priorite': tickets_par_priorite,
         'minutes_totales': minutes_totales,
+        'burndown': burndown,
         'team_stats': team_stats,
     }
 
@@ -116,13 +116,24 @@ function calculerAcquisitionsConfirmed() {
         data: form.serialize(),
         success: function(response) {
             if (response.success) {
-                // Afficher les résultats
-                showCalculResults(response.resultats);
-
-                // Recharger la page après 3 secondes
-                setTimeout(() => {
-                    window.location.reload();
-                }, 3000);
+                // Calcul exécuté en tâche de fond : suivi de l'avancement
+                suivreTache(response.url_suivi, {
+                    progression: function(tache) {
+                        submitBtn.html(`<i class="fas fa-spinner fa-spin"></i> Calcul en cours... ${tache.progression}%`);
+                    },
+                    terminee: function(tache) {
+                        showCalculResults(tache.resultat.resultats);
+
+                        // Recharger la page après 3 secondes
+                        setTimeout(() => {
+                            window.location.reload();
+                        }, 3000);
+                    },
+                    echec: function(tache) {
+                        showErrorMessage(tache.erreur || 'Erreur lors du calcul');
+                        submitBtn.prop('disabled', false).html('<i class="fas fa-calculator"></i> Calculer');
+                    }
+                });
             } else {
                 showErrorMessage(response.error || 'Erreur lors du calcul');
                 submitBtn.prop('disabled', false).html('<i class="fas fa-calculator"></i> Calculer');
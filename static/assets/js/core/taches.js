@@ -0,0 +1,82 @@
+// static/assets/js/core/taches.js
+
+/**
+ * Suivi des tâches de fond (core.taches) par polling AJAX.
+ *
+ * Usage :
+ *   suivreTache(response.url_suivi, {
+ *       progression: (tache) => ...,   // à chaque interrogation
+ *       terminee: (tache) => ...,      // statut TERMINE
+ *       echec: (tache) => ...,         // statut ECHEC ou erreur réseau
+ *   });
+ */
+function suivreTache(url, options) {
+    const opts = Object.assign({
+        intervalle: 1000,
+        intervalleMax: 5000,
+        progression: function() {},
+        terminee: function() {},
+        echec: function() {},
+    }, options || {});
+
+    let intervalle = opts.intervalle;
+
+    function interroger() {
+        fetch(url, { headers: { 'X-Requested-With': 'XMLHttpRequest' }, credentials: 'same-origin' })
+            .then(function(response) {
+                if (!response.ok) {
+                    throw new Error('Suivi de la tâche impossible (' + response.status + ')');
+                }
+                return response.json();
+            })
+            .then(function(tache) {
+                opts.progression(tache);
+                if (tache.statut === 'TERMINE') {
+                    opts.terminee(tache);
+                } else if (tache.statut === 'ECHEC') {
+                    opts.echec(tache);
+                } else {
+                    // Espacement progressif des interrogations pour les tâches longues
+                    intervalle = Math.min(intervalle * 1.5, opts.intervalleMax);
+                    setTimeout(interroger, intervalle);
+                }
+            })
+            .catch(function(erreur) {
+                opts.echec({ statut: 'ECHEC', erreur: erreur.message });
+            });
+    }
+
+    interroger();
+}
+
+/**
+ * Bandeau d'avancement pour les pages rechargées après le lancement d'une
+ * tâche (paramètre ?tache=<uuid>) : recharge la page sans le paramètre
+ * quand la tâche est finie.
+ */
+function suivreTacheBandeau(element) {
+    const barre = element.querySelector('.progress-bar');
+    const message = element.querySelector('.tache-message');
+
+    suivreTache(element.dataset.urlSuivi, {
+        progression: function(tache) {
+            barre.style.width = tache.progression + '%';
+            barre.textContent = tache.progression + '%';
+            message.textContent = tache.message || tache.statut_libelle;
+        },
+        terminee: function() {
+            const url = new URL(window.location.href);
+            url.searchParams.delete('tache');
+            window.location.replace(url.toString());
+        },
+        echec: function(tache) {
+            element.classList.remove('alert-info');
+            element.classList.add('alert-danger');
+            message.textContent = 'Échec : ' + (tache.erreur || 'erreur inconnue');
+        },
+    });
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    document.querySelectorAll('[data-url-suivi]').forEach(suivreTacheBandeau);
+});
@@ -0,0 +1,234 @@
+/**
+ * DisponibilitesEquipe - Matrice de disponibilite de l'equipe (employes x jours).
+ * Composant : templates/planning/includes/disponibilites.html
+ *
+ * DisponibilitesEquipe.simuler(matricule, debut, fin) met en evidence une
+ * demande d'absence et affiche l'effectif restant si elle est approuvee.
+ */
+const DisponibilitesEquipe = (function() {
+    'use strict';
+
+    // Etats <= ETAT_EN_ATTENTE (disponible, en poste, demande en attente) : compte dans l'effectif
+    const ETAT_EN_ATTENTE = 2;
+    const JOURS_SEMAINE = ['D', 'L', 'M', 'M', 'J', 'V', 'S'];
+    const DUREE_DEFAUT = 14;
+    const DUREE_MAX = 62;
+
+    let racine, donnees, simulation = null;
+    let debut, fin;
+
+    function echapper(texte) {
+        const div = document.createElement('div');
+        div.textContent = texte == null ? '' : String(texte);
+        return div.innerHTML.replace(/"/g, '&quot;');
+    }
+
+    // ===== DATES (AAAA-MM-JJ) =====
+
+    function versDate(iso) {
+        return new Date(iso + 'T00:00:00');
+    }
+
+    function versIso(d) {
+        const mois = String(d.getMonth() + 1).padStart(2, '0');
+        const jour = String(d.getDate()).padStart(2, '0');
+        return d.getFullYear() + '-' + mois + '-' + jour;
+    }
+
+    function ajouterJours(iso, jours) {
+        const d = versDate(iso);
+        d.setDate(d.getDate() + jours);
+        return versIso(d);
+    }
+
+    function lundi(iso) {
+        const d = versDate(iso);
+        d.setDate(d.getDate() - ((d.getDay() + 6) % 7));
+        return versIso(d);
+    }
+
+    function ecart(isoDebut, isoFin) {
+        return Math.round((versDate(isoFin) - versDate(isoDebut)) / 86400000);
+    }
+
+    // ===== CHARGEMENT =====
+
+    function init() {
+        racine = document.getElementById('disponibilitesEquipe');
+        if (!racine) {
+            return;
+        }
+        debut = racine.dataset.debut || lundi(versIso(new Date()));
+        fin = racine.dataset.fin || ajouterJours(debut, DUREE_DEFAUT - 1);
+
+        racine.querySelectorAll('[data-dispo-navigation]').forEach(function(bouton) {
+            bouton.addEventListener('click', function() {
+                const decalage = parseInt(bouton.dataset.dispoNavigation, 10);
+                debut = ajouterJours(debut, decalage);
+                fin = ajouterJours(fin, decalage);
+                charger();
+            });
+        });
+        charger();
+    }
+
+    function charger() {
+        const url = racine.dataset.url + '?start=' + debut + '&end=' + fin;
+        return fetch(url, { credentials: 'same-origin' })
+            .then(function(r) {
+                if (!r.ok) {
+                    throw new Error('HTTP ' + r.status);
+                }
+                return r.json();
+            })
+            .then(function(json) {
+                donnees = json;
+                afficher();
+            })
+            .catch(function() {
+                grille().innerHTML = '<div class="text-center text-danger py-3">Disponibilites indisponibles</div>';
+            });
+    }
+
+    function grille() {
+        return racine.querySelector('.disponibilites-grille');
+    }
+
+    // ===== AFFICHAGE =====
+
+    function libelleCase(i, j) {
+        const etat = donnees.etats[i][j];
+        const parties = [donnees.legende[etat]];
+        const typeAbsence = donnees.types_absence[donnees.absences[i][j]];
+        const poste = donnees.postes_travail[donnees.postes[i][j]];
+        const ferie = donnees.feries[donnees.jours[j]];
+        if (typeAbsence) parties.push(typeAbsence.libelle);
+        if (poste) parties.push(poste);
+        if (ferie) parties.push(ferie);
+        return echapper(parties.join(' - '));
+    }
+
+    function effectifsSimules() {
+        const presents = donnees.presents.slice();
+        if (!simulation) {
+            return presents;
+        }
+        const ligne = donnees.etats[simulation.rang];
+        donnees.jours.forEach(function(jour, j) {
+            if (jour >= simulation.debut && jour <= simulation.fin && ligne[j] <= ETAT_EN_ATTENTE) {
+                presents[j] -= 1;
+            }
+        });
+        return presents;
+    }
+
+    function afficher() {
+        if (!donnees.employes.length) {
+            grille().innerHTML = '<div class="text-center text-muted py-3">Aucun employe dans votre perimetre</div>';
+            return;
+        }
+
+        if (simulation) {
+            simulation.rang = donnees.employes.findIndex(function(e) {
+                return e.matricule === simulation.matricule;
+            });
+            if (simulation.rang < 0) {
+                simulation = null;
+            }
+        }
+
+        let html = '<table class="table table-bordered table-sm"><thead><tr><th class="dispo-nom">Employe</th>';
+        donnees.jours.forEach(function(jour) {
+            const d = versDate(jour);
+            html += '<th>' + JOURS_SEMAINE[d.getDay()] + '<br>' + jour.substring(8, 10) + '/' + jour.substring(5, 7) + '</th>';
+        });
+        html += '</tr></thead><tbody>';
+
+        donnees.employes.forEach(function(employe, i) {
+            html += '<tr><td class="dispo-nom" title="' + echapper(employe.matricule) + '">' + echapper(employe.nom) + '</td>';
+            donnees.jours.forEach(function(jour, j) {
+                let classes = 'dispo-case dispo-etat-' + donnees.etats[i][j];
+                if (simulation && simulation.rang === i && jour >= simulation.debut && jour <= simulation.fin) {
+                    classes += ' dispo-simulee';
+                }
+                html += '<td class="' + classes + '" title="' + libelleCase(i, j) + '"></td>';
+            });
+            html += '</tr>';
+        });
+
+        const simules = effectifsSimules();
+        html += '</tbody><tfoot><tr><td class="dispo-nom"><strong>Presents</strong></td>';
+        donnees.presents.forEach(function(presents, j) {
+            if (simules[j] < presents) {
+                html += '<td class="dispo-baisse" title="Avant validation : ' + presents + '">' + simules[j] + '</td>';
+            } else {
+                html += '<td>' + presents + '</td>';
+            }
+        });
+        html += '</tr></tfoot></table>';
+        grille().innerHTML = html;
+
+        afficherLegende();
+        afficherSimulation(simules);
+    }
+
+    function afficherLegende() {
+        let html = '';
+        Object.keys(donnees.legende).forEach(function(etat) {
+            html += '<span class="dispo-case dispo-etat-' + etat + '"></span>' + donnees.legende[etat];
+        });
+        racine.querySelector('.disponibilites-legende').innerHTML = html;
+    }
+
+    function afficherSimulation(simules) {
+        const zone = racine.querySelector('.disponibilites-simulation');
+        if (!simulation) {
+            zone.classList.add('d-none');
+            return;
+        }
+        let minimum = null, jourMinimum = null;
+        donnees.jours.forEach(function(jour, j) {
+            const ouvre = donnees.etats.some(function(ligne) { return ligne[j] <= ETAT_EN_ATTENTE; });
+            if (ouvre && jour >= simulation.debut && jour <= simulation.fin && (minimum === null || simules[j] < minimum)) {
+                minimum = simules[j];
+                jourMinimum = jour;
+            }
+        });
+        zone.classList.remove('d-none');
+        zone.innerHTML = '<i class="fas fa-info-circle mr-1"></i> Si la demande de <strong>'
+            + echapper(donnees.employes[simulation.rang].nom) + '</strong> est approuvee : '
+            + (minimum === null
+                ? 'aucun jour ouvre concerne sur la periode affichee.'
+                : 'effectif minimum <strong>' + minimum + '/' + donnees.effectif + '</strong> le '
+                  + jourMinimum.substring(8, 10) + '/' + jourMinimum.substring(5, 7) + '.');
+    }
+
+    // ===== SIMULATION D'UNE DEMANDE =====
+
+    function simuler(matricule, dateDebut, dateFin) {
+        simulation = { matricule: matricule, debut: dateDebut, fin: dateFin, rang: -1 };
+        if (donnees && dateDebut >= debut && dateFin <= fin) {
+            afficher();
+            return;
+        }
+        // Fenetre recentree sur la demande (a partir de son lundi)
+        debut = lundi(dateDebut);
+        fin = ajouterJours(debut, Math.min(Math.max(ecart(debut, dateFin) + 1, DUREE_DEFAUT), DUREE_MAX) - 1);
+        charger();
+    }
+
+    function annulerSimulation() {
+        simulation = null;
+        if (donnees) {
+            afficher();
+        }
+    }
+
+    document.addEventListener('DOMContentLoaded', init);
+
+    return {
+        recharger: function() { return racine ? charger() : null; },
+        simuler: simuler,
+        annulerSimulation: annulerSimulation
+    };
+})();
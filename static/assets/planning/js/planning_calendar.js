@@ -10,6 +10,13 @@ const PlanningApp = (function() {
 
     // ===== INITIALISATION =====
 
+    function rechargerDisponibilites() {
+        // Matrice de disponibilite (composant facultatif de la page)
+        if (typeof DisponibilitesEquipe !== 'undefined') {
+            DisponibilitesEquipe.recharger();
+        }
+    }
+
     function init() {
         // Toastr config
         toastr.options = {
@@ -400,6 +407,7 @@ const PlanningApp = (function() {
                 toastr.success(data.message || 'Affectation enregistree');
                 $('#modalAffectation').modal('hide');
                 calendar.refetchEvents();
+                rechargerDisponibilites();
             } else {
                 toastr.error(data.error || 'Erreur');
             }
@@ -429,6 +437,7 @@ const PlanningApp = (function() {
                 toastr.success(data.message || 'Affectation supprimee');
                 $('#modalAffectation').modal('hide');
                 calendar.refetchEvents();
+                rechargerDisponibilites();
             } else {
                 toastr.error(data.error || 'Erreur');
             }